@@ -0,0 +1,60 @@
+"""Benchmark the standard normal sampler used by the cssm simulators.
+
+Run with ``python benchmarks/gaussian_sampler.py``. Reports the cost per draw of
+the cssm sampler (which the kernels use to refill their noise buffers) next to
+numpy's ziggurat sampler as a reference, and the resulting throughput of the
+``ddm_flexbound`` kernel.
+"""
+
+import time
+
+import cssm
+import numpy as np
+
+from ssms.basic_simulators import boundary_functions as bf
+
+N_DRAWS = 20_000_000
+N_REPEATS = 5
+
+
+def _best_of(fun, n_repeats=N_REPEATS):
+    times = []
+    for _ in range(n_repeats):
+        start = time.perf_counter()
+        fun()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    out = np.empty(N_DRAWS, dtype=np.float32)
+    t_cssm = _best_of(lambda: cssm._standard_normal(N_DRAWS, 1, out=out))
+    print(f"cssm._standard_normal:      {t_cssm / N_DRAWS * 1e9:6.2f} ns/draw")
+
+    rng = np.random.default_rng(1)
+    t_numpy = _best_of(lambda: rng.standard_normal(out=out, dtype=np.float32))
+    print(f"numpy Generator (float32): {t_numpy / N_DRAWS * 1e9:6.2f} ns/draw")
+
+    n_trials = 10
+    ones = np.ones(n_trials, dtype=np.float32)
+    t_ddm = _best_of(
+        lambda: cssm.ddm_flexbound(
+            v=0.5 * ones,
+            a=1.5 * ones,
+            z=0.5 * ones,
+            t=0.3 * ones,
+            deadline=999 * ones,
+            s=ones,
+            n_samples=2000,
+            n_trials=n_trials,
+            boundary_fun=bf.constant,
+            boundary_params={},
+            random_state=1,
+        ),
+        n_repeats=3,
+    )
+    print(f"ddm_flexbound, {n_trials} x 2000 samples: {t_ddm:.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Benchmark the fixed per-call cost of ``simulator`` for small calls.
+
+Run with ``python benchmarks/simulator_overhead.py``. Times HSSM-style calls of the
+``ddm`` model with ``n_samples=1`` and a few hundred trials, in the default mode and
+in the low-latency mode (``layout="records"`` with a preallocated ``out`` buffer),
+also through a handle from ``ssms.prepare`` that resolves the model setup once.
+The overhead of ``simulator`` itself is measured by swapping the kernel for a stub
+that returns a stored result; the kernel time is reported next to it.
+"""
+
+import time
+
+import numpy as np
+
+from ssms.basic_simulators.simulator import prepare, simulator
+from ssms.config import model_config
+
+N_TRIALS = 300
+N_CALLS = 500
+N_REPEATS = 5
+
+
+def _best_of(fun, n_calls=N_CALLS, n_repeats=N_REPEATS):
+    fun()
+    times = []
+    for _ in range(n_repeats):
+        start = time.perf_counter()
+        for _ in range(n_calls):
+            fun()
+        times.append((time.perf_counter() - start) / n_calls)
+    return min(times)
+
+
+def _capture_kernel_call(config, call):
+    """Run call once and return the kernel arguments and result it produced."""
+    kernel = config["simulator"]
+    captured = {}
+
+    def spy(**kwargs):
+        result = kernel(**kwargs)
+        # simulator adds to and replaces entries of the dictionary it gets
+        captured["kwargs"], captured["result"] = kwargs, dict(result)
+        return result
+
+    spy.__name__ = kernel.__name__
+    config["simulator"] = spy
+    try:
+        call()
+    finally:
+        config["simulator"] = kernel
+    return captured["kwargs"], captured["result"]
+
+
+def _stub_kernel(config, result):
+    """A kernel that returns result right away, writing into out if given."""
+
+    def stub(out=None, **kwargs):
+        outputs = {"records": out} if out is not None else result
+        return {**outputs, "metadata": result["metadata"]}
+
+    stub.__name__ = config["simulator"].__name__
+    return stub
+
+
+def main():
+    # The stored configuration, not the copy model_config hands out on lookup
+    config = dict.__getitem__(model_config, "ddm")
+    kernel = config["simulator"]
+    theta = np.tile(model_config["ddm"]["default_params"], (N_TRIALS, 1))
+    out = np.empty((N_TRIALS, 2), dtype=np.float32)
+    calls = {
+        "default": lambda: simulator(theta, model="ddm", n_samples=1, random_state=1),
+        "low-latency": lambda: simulator(
+            theta, model="ddm", n_samples=1, random_state=1, layout="records", out=out
+        ),
+    }
+    for name, call in calls.items():
+        kwargs, result = _capture_kernel_call(config, call)
+        t_kernel = _best_of(lambda kwargs=kwargs: kernel(**kwargs))
+        config["simulator"] = _stub_kernel(config, result)
+        try:
+            t_overhead = _best_of(call)
+            if name == "low-latency":
+                # A handle takes the kernel from the configuration it is prepared with
+                prepared = prepare("ddm", n_samples=1, layout="records")
+                t_prepared = _best_of(lambda: prepared(theta, random_state=1, out=out))
+        finally:
+            config["simulator"] = kernel
+        print(
+            f"{name:>11}: simulator overhead {t_overhead * 1e6:8.1f} us, "
+            f"kernel {t_kernel * 1e6:8.1f} us"
+        )
+    print(f"{'prepared':>11}: simulator overhead {t_prepared * 1e6:8.1f} us")
+
+
+if __name__ == "__main__":
+    main()
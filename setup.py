@@ -1,16 +1,38 @@
+import sys
+
 from setuptools import setup, Extension, find_packages
 import numpy
 
+# OpenMP flags for the parallel kernels. Apple clang ships without OpenMP,
+# in which case the kernels compile to (and run as) serial loops.
+if sys.platform == "win32":
+    openmp_compile_args = ["/openmp"]
+    openmp_link_args = []
+elif sys.platform == "darwin":
+    openmp_compile_args = []
+    openmp_link_args = []
+else:
+    openmp_compile_args = ["-fopenmp"]
+    openmp_link_args = ["-fopenmp"]
+
+cssm_extension = Extension(
+    "cssm",
+    ["src/cssm.pyx"],
+    language="c++",
+    extra_compile_args=openmp_compile_args,
+    extra_link_args=openmp_link_args,
+)
+
 # Try to build with Cython if available
 try:
     from Cython.Build import cythonize
 
     ext_modules = cythonize(
-        [Extension("cssm", ["src/cssm.pyx"], language="c++")],
+        [cssm_extension],
         compiler_directives={"language_level": "3"},
     )
 except ImportError:
-    ext_modules = [Extension("cssm", ["src/cssm.pyx"], language="c++")]
+    ext_modules = [cssm_extension]
 
 # Use find_packages to automatically discover all packages
 packages = find_packages(include=["ssms", "ssms.*"])
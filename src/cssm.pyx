@@ -6,180 +6,1749 @@
 
 # Functions for DDM data simulation
 import cython
-from libc.stdlib cimport rand, RAND_MAX, srand
-from libc.math cimport log, sqrt, pow, fmax, atan, sin, cos, tan, M_PI, M_PI_2
-from libc.time cimport time
+from cython.parallel cimport prange, threadid
+from libc.stdint cimport int8_t, uint16_t, uint32_t, uint64_t, int64_t
+from libc.math cimport log, exp, expm1, sinh, sqrt, pow, fmax, fabs, erfc, atan, sin, cos, tan, lgamma, M_PI, M_PI_2, M_SQRT2, INFINITY
+
+cdef extern from "<math.h>" nogil:
+    float fabsf(float x)
+    float copysignf(float x, float y)
 
 import numpy as np
 cimport numpy as np
 import numbers
+import functools
 
 DTYPE = np.float32
 
-cdef set_seed(random_state):
+# Random number generation ------------------------------------------------------------------------
+# Every kernel owns an explicit RngState (xoshiro256++) instead of relying on
+# the process-global libc rand(). A state is derived from a 256 bit key, which
+# is produced by a numpy SeedSequence, and a 64 bit stream id. Distinct stream
+# ids yield statistically independent sequences, so trials or threads can each
+# receive their own stream while remaining reproducible for a fixed seed.
+
+cdef struct RngState:
+    uint64_t s[4]
+
+cdef inline uint64_t rotl(uint64_t x, int k) noexcept nogil:
+    return (x << k) | (x >> (64 - k))
+
+cdef inline uint64_t splitmix64(uint64_t* x) noexcept nogil:
+    """
+    Advance a SplitMix64 counter and return its mixed output.
+
+    Args:
+        x (uint64_t*): Counter, updated in place.
+
+    Returns:
+        uint64_t: The next SplitMix64 output.
+    """
+    cdef uint64_t z
+    x[0] += 0x9E3779B97F4A7C15ULL
+    z = x[0]
+    z = (z ^ (z >> 30)) * 0xBF58476D1CE4E5B9ULL
+    z = (z ^ (z >> 27)) * 0x94D049BB133111EBULL
+    return z ^ (z >> 31)
+
+cdef inline uint64_t rng_next(RngState* rng) noexcept nogil:
     """
-    Set the random seed for the simulation.
+    Advance an xoshiro256++ state and return 64 random bits.
 
     Args:
-        random_state: An integer seed or None. If None, the current time is used as seed.
+        rng (RngState*): Generator state, updated in place.
+
+    Returns:
+        uint64_t: 64 uniformly distributed random bits.
+    """
+    cdef uint64_t result = rotl(rng.s[0] + rng.s[3], 23) + rng.s[0]
+    cdef uint64_t t = rng.s[1] << 17
+
+    rng.s[2] ^= rng.s[0]
+    rng.s[3] ^= rng.s[1]
+    rng.s[1] ^= rng.s[2]
+    rng.s[0] ^= rng.s[3]
+    rng.s[2] ^= t
+    rng.s[3] = rotl(rng.s[3], 45)
+    return result
 
-    This function sets a random state globally for the simulation.
+cdef void rng_seed_stream(RngState* rng, const uint64_t* key, uint64_t stream) noexcept nogil:
     """
-    if random_state is None:
-        return srand(time(NULL))
-    if isinstance(random_state, numbers.Integral):
-        return srand(random_state)
+    Initialize a generator state for one stream of a seed key.
+
+    Args:
+        rng (RngState*): Generator state to initialize.
+        key (const uint64_t*): 256 bit seed key (4 words), see rng_key_from_seed.
+        stream (uint64_t): Stream id, e.g. a trial or thread index.
+    """
+    cdef uint64_t x = stream
+    cdef int i
+
+    for i in range(4):
+        x ^= key[i]
+        rng.s[i] = splitmix64(&x)
+
+cdef void rng_key_from_seed(random_state, uint64_t* key):
+    """
+    Fill a 256 bit seed key from a random_state.
+
+    Args:
+        random_state: An integer seed, a numpy.random.SeedSequence, a
+            numpy.random.Generator or BitGenerator, or None. A generator supplies
+            the key from its own stream, which it advances. If None, fresh
+            entropy is drawn from the operating system.
+        key (uint64_t*): Output buffer for the 4 word key.
+    """
+    cdef int i
+    if isinstance(random_state, np.random.Generator):
+        random_state = random_state.bit_generator
+    if isinstance(random_state, np.random.BitGenerator):
+        words = random_state.random_raw(4)
+    else:
+        if isinstance(random_state, np.random.SeedSequence):
+            seed_seq = random_state
+        else:
+            seed_seq = np.random.SeedSequence(random_state)
+        words = seed_seq.generate_state(4, dtype=np.uint64)
+    for i in range(4):
+        key[i] = words[i]
+
+cdef void rng_init(RngState* rng, random_state, uint64_t stream = 0):
+    """
+    Initialize a generator state from a random_state.
+
+    Args:
+        rng (RngState*): Generator state to initialize.
+        random_state: An integer seed, a numpy.random.SeedSequence, a
+            numpy.random.Generator or BitGenerator, or None.
+        stream (uint64_t): Stream id (default: 0).
+    """
+    cdef uint64_t key[4]
+    rng_key_from_seed(random_state, key)
+    rng_seed_stream(rng, key, stream)
 
 # Method to draw random samples from a gaussian
-cdef float random_uniform():
+cdef inline double random_uniform(RngState* rng) noexcept nogil:
     """
-    Generate a random float from a uniform distribution between 0 and 1.
+    Generate a random number from a uniform distribution on the open interval (0, 1).
+
+    Args:
+        rng (RngState*): Generator state.
 
     Returns:
-        float: A random float between 0 and 1.
+        double: A random number strictly between 0 and 1.
     """
-    cdef float r = rand()
-    return r / RAND_MAX
+    return ((rng_next(rng) >> 11) + 0.5) * (1.0 / 9007199254740992.0)
 
-cdef float random_exponential():
+cdef inline double random_exponential(RngState* rng) noexcept nogil:
     """
-    Generate a random float from an exponential distribution with rate 1.
+    Generate a random number from an exponential distribution with rate 1.
+
+    Args:
+        rng (RngState*): Generator state.
 
     Returns:
-        float: A random float from an exponential distribution.
+        double: A random number from an exponential distribution.
+    """
+    return - log(random_uniform(rng))
+
+# Ziggurat tables for the standard normal distribution (Marsaglia & Tsang, 2000),
+# 256 layers with 52 bit mantissas. Filled once at import by init_ziggurat().
+cdef double ZIGGURAT_NOR_R = 3.6541528853610088
+cdef double ZIGGURAT_NOR_INV_R = 1.0 / 3.6541528853610088
+cdef uint64_t ziggurat_ki[256]
+cdef double ziggurat_wi[256]
+cdef double ziggurat_fi[256]
+cdef double ziggurat_sign[2]
+
+cdef void init_ziggurat() noexcept:
     """
-    return - log(random_uniform())
+    Compute the layer tables of the ziggurat normal sampler.
+    """
+    cdef double m1 = 4503599627370496.0 # 2^52
+    cdef double dn = ZIGGURAT_NOR_R
+    cdef double tn = dn
+    cdef double vn = 4.92867323399e-3 # area of one layer
+    cdef double q = vn / exp(-0.5 * dn * dn)
+    cdef int i
 
-cdef float random_stable(float alpha):
+    ziggurat_sign[0] = 1.0
+    ziggurat_sign[1] = -1.0
+    ziggurat_ki[0] = <uint64_t> ((dn / q) * m1)
+    ziggurat_ki[1] = 0
+    ziggurat_wi[0] = q / m1
+    ziggurat_wi[255] = dn / m1
+    ziggurat_fi[0] = 1.0
+    ziggurat_fi[255] = exp(-0.5 * dn * dn)
+
+    for i in range(254, 0, -1):
+        dn = sqrt(-2.0 * log(vn / dn + exp(-0.5 * dn * dn)))
+        ziggurat_ki[i + 1] = <uint64_t> ((dn / tn) * m1)
+        tn = dn
+        ziggurat_fi[i] = exp(-0.5 * dn * dn)
+        ziggurat_wi[i] = dn / m1
+
+init_ziggurat()
+
+cdef double random_gaussian_tail(RngState* rng, bint negative) noexcept nogil:
     """
-    Generate a random float from a stable distribution.
+    Sample from the tail of the standard normal beyond the base layer of the ziggurat.
 
     Args:
-        alpha (float): The stability parameter of the distribution.
+        rng (RngState*): Generator state.
+        negative (bool): Whether to return the negative tail.
 
     Returns:
-        float: A random float from a stable distribution.
+        double: A standard normal variate with absolute value above ZIGGURAT_NOR_R.
     """
-    cdef float eta, u, w, x
+    cdef double xx, yy
+    while True:
+        xx = -ZIGGURAT_NOR_INV_R * log(random_uniform(rng))
+        yy = -log(random_uniform(rng))
+        if yy + yy > xx * xx:
+            if negative:
+                return -(ZIGGURAT_NOR_R + xx)
+            return ZIGGURAT_NOR_R + xx
+
+cdef inline float random_gaussian(RngState* rng) noexcept nogil:
+    """
+    Generate a random float from a standard normal distribution.
 
-    u = M_PI * (random_uniform() - 0.5)
-    w = random_exponential()
+    Uses the ziggurat method: a single 64 bit draw is accepted without any
+    transcendental function calls in roughly 99% of the cases.
 
-    if alpha == 1.0:
-        eta = M_PI_2 # useless but kept to remain faithful to wikipedia entry
-        x = (1.0 / eta) * ((M_PI_2) * tan(u))
-    else:
-        x = (sin(alpha * u) / (pow(cos(u), 1 / alpha))) * pow(cos(u - (alpha * u)) / w, (1.0 - alpha) / alpha)
-    return x
+    Args:
+        rng (RngState*): Generator state.
+
+    Returns:
+        float: A random float from a standard normal distribution.
+    """
+    cdef uint64_t r, rabs
+    cdef int idx
+    cdef bint negative
+    cdef double x
+
+    while True:
+        r = rng_next(rng)
+        idx = r & 0xff
+        r >>= 8
+        negative = r & 0x1
+        rabs = (r >> 1) & 0x000fffffffffffffULL
+        # rabs < 2^52, so the signed conversion is exact; the sign is applied
+        # through a lookup rather than a (poorly predictable) branch
+        x = (<int64_t> rabs) * ziggurat_wi[idx] * ziggurat_sign[negative]
+        if rabs < ziggurat_ki[idx]:
+            return x # rectangular part of a layer, the most likely case
+        if idx == 0:
+            return random_gaussian_tail(rng, negative)
+        if ((ziggurat_fi[idx - 1] - ziggurat_fi[idx]) * random_uniform(rng) + ziggurat_fi[idx]) < exp(-0.5 * x * x):
+            return x
+
+cdef inline int sign(float x) noexcept nogil:
+    """
+    Determine the sign of a float.
+
+    Args:
+        x (float): The input float.
 
-cdef float[:] draw_random_stable(int n, float alpha):
+    Returns:
+        int: 1 if x is positive, -1 if x is negative, 0 if x is zero.
     """
-    Generate an array of random floats from a stable distribution.
+    return (x > 0) - (x < 0)
+
+cdef void fill_gaussian(RngState* rng, float* out, int n) noexcept nogil:
+    """
+    Fill a preallocated buffer with random floats from a standard normal distribution.
 
     Args:
+        rng (RngState*): Generator state.
+        out (float*): The output buffer.
         n (int): The number of random floats to generate.
-        alpha (float): The stability parameter of the distribution.
+    """
+    cdef int i
+    for i in range(n):
+        out[i] = random_gaussian(rng)
+
+# @cythonboundscheck(False)
+cdef float[:] draw_gaussian(RngState* rng, int n):
+    """
+    Generate an array of random floats from a standard normal distribution.
+
+    Args:
+        rng (RngState*): Generator state.
+        n (int): The number of random floats to generate.
+
+    Returns:
+        float[:]: An array of random floats from a standard normal distribution.
+    """
+    # Draws standard normal variables - need to have the variance rescaled
+    cdef float[:] result = np.empty(n, dtype=DTYPE)
+    if n > 0:
+        fill_gaussian(rng, &result[0], n)
+    return result
+
+# Kernels that walk all their samples on one generator keep their gaussian noise in a
+# buffer and refill it when it is used up. Walks rarely last until max_t, so the buffer
+# holds at most NOISE_BUFFER_SIZE draws, which keeps small calls from paying for
+# max_t / delta_t draws up front.
+cdef int NOISE_BUFFER_SIZE = 4096
+
+cdef inline int noise_buffer_size(float max_t, float delta_t):
+    """
+    Length of the gaussian noise buffer of a kernel.
+
+    Args:
+        max_t (float): Maximum simulation time.
+        delta_t (float): Time step size.
 
     Returns:
-        float[:]: An array of random floats from a stable distribution.
+        int: The draws of one walk until max_t, at most NOISE_BUFFER_SIZE.
+    """
+    return min(int((max_t / delta_t) + 1), NOISE_BUFFER_SIZE)
+
+def _standard_normal(int n, random_state = None, out = None):
+    """
+    Draw standard normal samples with the sampler used by the kernels.
+
+    Intended for testing and benchmarking the random number generator.
+
+    Args:
+        n (int): The number of samples.
+        random_state (int, numpy.random.SeedSequence, numpy.random.Generator or None): Seed for random number generator.
+        out (np.ndarray or None): Optional preallocated float32 buffer of length n,
+            filled in place.
+
+    Returns:
+        np.ndarray: Array of n float32 samples.
+    """
+    cdef RngState rng
+    rng_init(&rng, random_state)
+    if out is None:
+        return np.asarray(draw_gaussian(&rng, n))
+
+    cdef float[::1] out_view = out
+    if out_view.shape[0] != n:
+        raise ValueError('out must have length n')
+    if n > 0:
+        fill_gaussian(&rng, &out_view[0], n)
+    return out
+
+# Alpha-stable noise ------------------------------------------------------------------------------
+# Symmetric alpha-stable variates, with characteristic function exp(-|t|^alpha), are drawn with
+# the Chambers-Mallows-Stuck method. Kernels keep a buffer of them, refilled in one batch, like
+# their buffer of gaussian values. A batch first draws all uniforms and then evaluates the
+# transcendental functions in a separate loop. That loop uses the branch-free single precision
+# approximations below instead of libm calls, so that the compiler can vectorize it, and the
+# constants that only depend on alpha are computed once per batch. alpha = 1 (Cauchy) and
+# alpha = 2 (gaussian with variance 2) use the ziggurat sampler instead.
+
+cdef enum:
+    STABLE_GENERAL = 0
+    STABLE_CAUCHY = 1
+    STABLE_GAUSSIAN = 2
+
+cdef struct StableSpec:
+    int kind
+    float alpha
+    float inv_alpha         # 1 / alpha
+    float exponent          # (1 - alpha) / alpha
+    float shift             # |1 - alpha|
+
+cdef union FloatBits:
+    float f
+    uint32_t u
+
+cdef inline float sin_approx(float x) noexcept nogil:
+    """
+    Sine for |x| <= pi / 2 (Taylor polynomial of degree 11, absolute error < 6e-8).
+    """
+    cdef float x2 = x * x
+    return x * (<float> 1.0 + x2 * (<float> (-1.0 / 6) + x2 * (<float> (1.0 / 120) + x2 * (
+        <float> (-1.0 / 5040) + x2 * (<float> (1.0 / 362880) + x2 * <float> (-1.0 / 39916800))))))
+
+cdef inline float log_approx(float x) noexcept nogil:
+    """
+    Natural logarithm of a positive, normal float (relative error of the series < 1e-9).
+    """
+    cdef FloatBits bits
+    cdef uint32_t offset
+    cdef float m, t, t2
+    cdef int e
+    # x = 2^e m with m in [sqrt(2) / 2, sqrt(2)), from the bits of x relative to those of sqrt(2) / 2
+    bits.f = x
+    offset = bits.u - 0x3f3504f3
+    e = (<int> offset) >> 23
+    bits.u = (offset & 0x007fffff) + 0x3f3504f3
+    m = bits.f
+    # log(m) = 2 atanh(t)
+    t = (m - <float> 1.0) / (m + <float> 1.0)
+    t2 = t * t
+    return e * <float> 0.6931471805599453 + <float> 2.0 * t * (<float> 1.0 + t2 * (
+        <float> (1.0 / 3) + t2 * (<float> (1.0 / 5) + t2 * (<float> (1.0 / 7) + t2 * <float> (1.0 / 9)))))
+
+cdef inline float exp_approx(float x) noexcept nogil:
+    """
+    Exponential function (relative error < 1e-8 before rounding), saturating at about 2^127 and
+    flushing results below 2^-126 to zero.
+    """
+    cdef FloatBits bits
+    cdef float r
+    cdef int k, scale
+    # x = k log(2) + r with |r| <= log(2) / 2; the offset makes the truncation a rounding
+    k = <int> (x * <float> 1.4426950408889634 + <float> 128.5) - 128
+    scale = min(k, 127)
+    r = (x - scale * <float> 0.693145751953125) - scale * <float> 1.428606765330187e-06
+    bits.u = <uint32_t> (scale + 127) << 23
+    bits.f = bits.f * (<float> 1.0 + r * (<float> 1.0 + r * (<float> 0.5 + r * (<float> (1.0 / 6) + r * (
+        <float> (1.0 / 24) + r * (<float> (1.0 / 120) + r * (<float> (1.0 / 720) + r * <float> (1.0 / 5040))))))))
+    # Integer masks rather than float comparisons keep the callers' loops vectorizable
+    bits.u &= -(<uint32_t> (k >= -126))
+    return bits.f
+
+cdef StableSpec stable_spec(float alpha) noexcept nogil:
+    """
+    Constants of the alpha-stable sampler for a stability parameter alpha in (0, 2].
+    """
+    cdef StableSpec spec
+    spec.alpha = alpha
+    spec.inv_alpha = 1.0 / alpha
+    spec.exponent = (1.0 - alpha) / alpha
+    spec.shift = fabs(1.0 - alpha)
+    if alpha == 1.0:
+        spec.kind = STABLE_CAUCHY
+    elif alpha == 2.0:
+        spec.kind = STABLE_GAUSSIAN
+    else:
+        spec.kind = STABLE_GENERAL
+    return spec
+
+cdef void fill_stable(RngState* rng, const StableSpec* spec, float* out, float* scratch, int n) noexcept nogil:
+    """
+    Fill a preallocated buffer with symmetric alpha-stable random floats.
+
+    Args:
+        rng (RngState*): Generator state.
+        spec (const StableSpec*): Constants of the distribution, from stable_spec().
+        out (float*): The output buffer.
+        scratch (float*): Scratch buffer of the same length.
+        n (int): The number of random floats to generate.
     """
     cdef int i
-    cdef float[:] result = np.zeros(n, dtype = DTYPE)
+    cdef uint64_t r
+    cdef float v, a, w, sin_au, cos_u, cos_shift_u
+    cdef float pi = M_PI
+    cdef float half_pi = M_PI_2
+    cdef float alpha_pi = spec.alpha * M_PI
+    cdef float exponent = spec.exponent
+    cdef float inv_alpha = spec.inv_alpha
+    cdef float shift = spec.shift
+    if spec.kind == STABLE_GAUSSIAN:
+        for i in range(n):
+            out[i] = <float> M_SQRT2 * random_gaussian(rng)
+    elif spec.kind == STABLE_CAUCHY:
+        # The ratio of two independent standard normals is standard Cauchy
+        for i in range(n):
+            out[i] = random_gaussian(rng) / random_gaussian(rng)
+    else:
+        # Two uniforms (2 j + 1) / 2^24 per 64 bit draw, exact in single precision and in
+        # (0, 1): the angle v in half-turns, in (-1/2, 1/2), and the exponential variate's uniform
+        for i in range(n):
+            r = rng_next(rng)
+            out[i] = <float> <int> (2 * (r >> 41) + 1) * <float> 5.960464477539063e-08 - <float> 0.5
+            scratch[i] = <float> <int> (2 * ((r >> 18) & 0x7fffff) + 1) * <float> 5.960464477539063e-08
+        for i in range(n):
+            v = out[i]
+            w = -log_approx(scratch[i])
+            # sin(alpha u) for u = pi v, with the argument reflected into [-pi / 2, pi / 2]
+            a = alpha_pi * v
+            sin_au = sin_approx(copysignf(half_pi - fabsf(half_pi - fabsf(a)), a))
+            # cos(u) and cos((1 - alpha) u) as sines of the distance to the pole, which keeps
+            # them accurate in the tails
+            cos_u = sin_approx(pi * (<float> 0.5 - fabsf(v)))
+            cos_shift_u = sin_approx(pi * (<float> 0.5 - shift * fabsf(v)))
+            # sin(alpha u) / cos(u)^(1 / alpha) * (cos((1 - alpha) u) / w)^((1 - alpha) / alpha)
+            out[i] = sin_au * exp_approx(exponent * log_approx(cos_shift_u / w)
+                                         - inv_alpha * log_approx(cos_u))
+
+cdef float[:] draw_stable(RngState* rng, const StableSpec* spec, int n):
+    """
+    Generate an array of symmetric alpha-stable random floats.
 
-    for i in range(n):
-        result[i] = random_stable(alpha)
+    Args:
+        rng (RngState*): Generator state.
+        spec (const StableSpec*): Constants of the distribution, from stable_spec().
+        n (int): The number of random floats to generate.
+
+    Returns:
+        float[:]: An array of alpha-stable random floats.
+    """
+    cdef float[:] result = np.empty(n, dtype = DTYPE)
+    cdef float[:] scratch = np.empty(n, dtype = DTYPE)
+    if n > 0:
+        fill_stable(rng, spec, &result[0], &scratch[0], n)
     return result
 
-cdef float random_gaussian():
+def _alpha_stable(int n, float alpha, random_state = None):
     """
-    Generate a random float from a standard normal distribution.
+    Draw symmetric alpha-stable samples with the sampler used by the kernels.
+
+    Intended for testing and benchmarking the random number generator.
+
+    Args:
+        n (int): The number of samples.
+        alpha (float): Stability parameter, in (0, 2].
+        random_state (int, numpy.random.SeedSequence, numpy.random.Generator or None): Seed for random number generator.
 
     Returns:
-        float: A random float from a standard normal distribution.
+        np.ndarray: Array of n float32 samples.
+    """
+    if not 0 < alpha <= 2:
+        raise ValueError('alpha must be in (0, 2]')
+    cdef RngState rng
+    rng_init(&rng, random_state)
+    cdef StableSpec spec = stable_spec(alpha)
+    return np.asarray(draw_stable(&rng, &spec, n))
+
+# Exact first passage sampling --------------------------------------------------------------------
+# A Wiener process with drift v and noise s that starts in the middle of a symmetric
+# interval of half-width r leaves it after a time (r / s)^2 * J, where J ~ J*(1, v r / s^2)
+# (Devroye, 2009; Polson, Scott & Windle, 2013), and independently of that time leaves
+# through the upper end with probability 1 / (1 + exp(-2 v r / s^2)). Between two constant
+# absorbing bounds, repeatedly exiting the largest symmetric interval around the particle
+# that fits between the bounds yields exact (rt, choice) samples without a time grid.
+
+# Truncation point of the alternating series representation of the J* density
+cdef double J_TRUNC = 0.64
+cdef double J_TRUNC_RECIP = 1.0 / 0.64
+
+cdef inline double log_norm_cdf(double x) noexcept nogil:
+    """
+    Logarithm of the standard normal cdf (-inf where the cdf underflows).
+    """
+    return log(0.5 * erfc(-x / sqrt(2.0)))
+
+cdef inline double jacobi_coef(int n, double x) noexcept nogil:
+    """
+    n-th term of the alternating series representation of the J*(1, 0) density at x.
+
+    Args:
+        n (int): Index of the term.
+        x (double): Point at which the density is evaluated.
+
+    Returns:
+        double: The coefficient a_n(x).
     """
-    cdef float x1, x2, w
-    w = 2.0
+    cdef double k = (n + 0.5) * M_PI
+    if x > J_TRUNC:
+        return k * exp(-0.5 * k * k * x)
+    if x > 0:
+        return exp(-1.5 * (log(0.5 * M_PI) + log(x)) + log(k) - 2.0 * (n + 0.5) * (n + 0.5) / x)
+    return 0.0
+
+cdef double random_truncated_inverse_gaussian(RngState* rng, double z) noexcept nogil:
+    """
+    Sample an inverse Gaussian IG(1 / z, 1) variate truncated to (0, J_TRUNC).
 
-    while(w >= 1.0):
-        x1 = 2.0 * random_uniform() - 1.0
-        x2 = 2.0 * random_uniform() - 1.0
-        w = x1 * x1 + x2 * x2
+    Args:
+        rng (RngState*): Generator state.
+        z (double): Tilting parameter (non-negative).
 
-    w = ((-2.0 * log(w)) / w) ** 0.5
-    return x1 * w
+    Returns:
+        double: The truncated inverse Gaussian variate.
+    """
+    cdef double x = J_TRUNC + 1.0
+    cdef double alpha, e1, e2, mu, y, half_mu, mu_y
+
+    if J_TRUNC_RECIP > z:
+        # mean above the truncation point: sample from the z = 0 case and accept with exp(-z^2 x / 2)
+        alpha = 0.0
+        while random_uniform(rng) > alpha:
+            e1 = random_exponential(rng)
+            e2 = random_exponential(rng)
+            while e1 * e1 > 2.0 * e2 / J_TRUNC:
+                e1 = random_exponential(rng)
+                e2 = random_exponential(rng)
+            x = 1.0 + e1 * J_TRUNC
+            x = J_TRUNC / (x * x)
+            alpha = exp(-0.5 * z * z * x)
+    else:
+        mu = 1.0 / z
+        while x > J_TRUNC:
+            y = random_gaussian(rng)
+            y *= y
+            half_mu = 0.5 * mu
+            mu_y = mu * y
+            x = mu + half_mu * mu_y - half_mu * sqrt(4.0 * mu_y + mu_y * mu_y)
+            if random_uniform(rng) > mu / (mu + x):
+                x = mu * mu / x
+    return x
 
-cdef int sign(float x):
+cdef double random_jacobi_star(RngState* rng, double z) noexcept nogil:
     """
-    Determine the sign of a float.
+    Sample from the tilted Jacobi distribution J*(1, z).
+
+    J*(1, z) is the exit time of a standard Wiener process with drift z from (-1, 1),
+    started at 0. Uses Devroye's alternating series method.
 
     Args:
-        x (float): The input float.
+        rng (RngState*): Generator state.
+        z (double): Drift (only its absolute value matters).
 
     Returns:
-        int: 1 if x is positive, -1 if x is negative, 0 if x is zero.
+        double: The exit time.
     """
-    return (x > 0) - (x < 0)
+    cdef double fz, b, a, p_texpon, x, s, y
+    cdef int n
+
+    z = fabs(z)
+    fz = 0.125 * M_PI * M_PI + 0.5 * z * z
+
+    # Probability of proposing from the exponential tail rather than the inverse Gaussian head
+    b = sqrt(1.0 / J_TRUNC) * (J_TRUNC * z - 1.0)
+    a = -sqrt(1.0 / J_TRUNC) * (J_TRUNC * z + 1.0)
+    p_texpon = 1.0 / (1.0 + 4.0 / M_PI * (exp(log(fz) + fz * J_TRUNC - z + log_norm_cdf(b)) +
+                                          exp(log(fz) + fz * J_TRUNC + z + log_norm_cdf(a))))
+
+    while True:
+        if random_uniform(rng) < p_texpon:
+            x = J_TRUNC + random_exponential(rng) / fz
+        else:
+            x = random_truncated_inverse_gaussian(rng, z)
+
+        s = jacobi_coef(0, x)
+        y = random_uniform(rng) * s
+        n = 0
+        while True:
+            n += 1
+            if n % 2 == 1:
+                s -= jacobi_coef(n, x)
+                if y <= s:
+                    return x
+            else:
+                s += jacobi_coef(n, x)
+                if y > s:
+                    break
 
-cdef float csum(float[:] x):
+cdef double wiener_first_passage(RngState* rng, double v, double a, double x, double s,
+                                 int* choice) noexcept nogil:
     """
-    Calculate the sum of elements in an array.
+    Exact first passage of x + v t + s W_t through one of the constant bounds 0 and a.
 
     Args:
-        x (float[:]): The input array.
+        rng (RngState*): Generator state.
+        v (double): Drift rate.
+        a (double): Upper bound (the lower bound is 0).
+        x (double): Starting point.
+        s (double): Noise standard deviation.
+        choice (int*): Set to 1 if the upper bound is hit, -1 for the lower bound, and
+            0 if the process never reaches either bound (s = 0 and v = 0).
 
     Returns:
-        float: The sum of all elements in the array.
+        double: The first passage time (INFINITY if no bound is ever reached).
     """
-    cdef int i
-    cdef int n = x.shape[0]
-    cdef float total = 0
-    
-    for i in range(n):
-        total += x[i]
-    
-    return total
+    cdef double t = 0.0
+    cdef double r, mu
+
+    if x >= a:
+        choice[0] = 1
+        return 0.0
+    if x <= 0:
+        choice[0] = -1
+        return 0.0
+
+    if s <= 0:
+        # Deterministic motion
+        if v > 0:
+            choice[0] = 1
+            return (a - x) / v
+        if v < 0:
+            choice[0] = -1
+            return x / (-v)
+        choice[0] = 0
+        return INFINITY
+
+    while True:
+        r = min(x, a - x)
+        mu = v * r / (s * s)
+        t += (r / s) * (r / s) * random_jacobi_star(rng, mu)
+        if random_uniform(rng) * (1.0 + exp(-2.0 * mu)) < 1.0:
+            # exit through the upper end of the interval
+            if r == a - x:
+                choice[0] = 1
+                return t
+            x += r
+        else:
+            if r == x:
+                choice[0] = -1
+                return t
+            x -= r
+
+# Shared helpers for the parallel kernels --------------------------------------------------------
+# Parallel kernels give every (trial, sample) pair its own RNG stream, with stream id
+# k * n_samples + n, so results do not depend on the number of threads or on scheduling.
 
-## @cythonboundscheck(False)
-cdef void assign_random_gaussian_pair(float[:] out, int assign_ix):
+# Maximum number of floats held by one block of precomputed boundaries (16 MB)
+cdef Py_ssize_t BOUNDARY_BLOCK_SIZE = 1 << 22
+
+cdef inline float smooth_rt(RngState* rng, float t_particle, float deadline_tmp,
+                            float delta_t, bint smooth_unif) noexcept nogil:
     """
-    Generate a pair of random floats from a standard normal distribution and assign them to an array.
+    Draw the uniform offset used to smooth a discretized reaction time.
 
     Args:
-        out (float[:]): The output array to store the generated values.
-        assign_ix (int): The starting index in the output array to assign the values.
+        rng (RngState*): Generator state.
+        t_particle (float): Time at which the walk terminated.
+        deadline_tmp (float): Effective deadline of the walk.
+        delta_t (float): Time step of the simulation.
+        smooth_unif (bool): Whether smoothing is applied at all.
+
+    Returns:
+        float: The offset to add to the reaction time.
     """
-    cdef float x1, x2, w
-    w = 2.0
+    if not smooth_unif:
+        return 0.0
+    if t_particle == 0.0:
+        return random_uniform(rng) * 0.5 * delta_t
+    if t_particle < deadline_tmp:
+        return (0.5 - random_uniform(rng)) * delta_t
+    return 0.0
+
+cdef inline float exact_rt(double fpt, float t, float deadline, float deadline_tmp) noexcept nogil:
+    """
+    Reaction time from an exact first passage time.
 
-    while(w >= 1.0):
-        x1 = (2.0 * random_uniform()) - 1.0
-        x2 = (2.0 * random_uniform()) - 1.0
-        w = (x1 * x1) + (x2 * x2)
+    Walks that outlast the effective deadline are censored there, like the Euler
+    kernels do, but keep the choice of their eventual boundary crossing.
 
-    w = ((-2.0 * log(w)) / w) ** 0.5
-    out[assign_ix] = x1 * w
-    out[assign_ix + 1] = x2 * w # this was x2 * 2 ..... :0 
+    Args:
+        fpt (double): First passage time of the decision process.
+        t (float): Non-decision time.
+        deadline (float): Deadline of the trial.
+        deadline_tmp (float): Effective deadline of the walk, min(max_t, deadline - t).
 
-# @cythonboundscheck(False)
-cdef float[:] draw_gaussian(int n):
+    Returns:
+        float: The reaction time, or -999 if the deadline is exceeded.
     """
-    Generate an array of random floats from a standard normal distribution.
+    cdef float rt = min(fpt, deadline_tmp) + t
+    if rt >= deadline or deadline <= 0:
+        return -999
+    return rt
+
+# Simulation methods, in the order of METHOD_NAMES
+cdef enum:
+    METHOD_EULER = 0
+    METHOD_EXACT = 1
+    METHOD_BRIDGE = 2
+
+METHOD_NAMES = ('euler', 'exact', 'bridge')
+
+cdef int parse_method(method, allowed) except -1:
+    """
+    Validate the method argument of a kernel.
 
     Args:
-        n (int): The number of random floats to generate.
+        method (str): Requested simulation method.
+        allowed (tuple): Methods supported by the kernel.
 
     Returns:
-        float[:]: An array of random floats from a standard normal distribution.
+        int: One of METHOD_EULER, METHOD_EXACT or METHOD_BRIDGE.
     """
-    # Draws standard normal variables - need to have the variance rescaled
-    cdef int i
-    cdef float[:] result = np.zeros(n, dtype=DTYPE)
-    for i in range(n // 2):
+    if method not in allowed:
+        raise ValueError('method must be one of ' + ', '.join(['"' + m + '"' for m in allowed]))
+    return METHOD_NAMES.index(method)
 
-        assign_random_gaussian_pair(result, i * 2)
-    if n % 2 == 1:
-        result[n - 1] = random_gaussian()
-    return result
+cdef void check_constant_boundary(np.ndarray boundary_block, Py_ssize_t n_rows) except *:
+    """
+    Raise a ValueError unless every boundary in a block is constant over time.
+    """
+    rows = boundary_block[:n_rows]
+    if np.any(rows != rows[:, :1]):
+        raise ValueError('method="exact" requires a constant boundary')
+
+# Sample output -----------------------------------------------------------------------------------
+# Kernels store their (rt, choice) pairs through a SampleOutput. By default it holds float32
+# reaction times and int32 choices. With return_steps=True it holds the number of delta_t steps
+# of every walk instead, as uint16 (uint32 when max_t / delta_t does not fit) with the largest
+# value of the type marking omissions, next to int8 choices. This quarters the output of long
+# simulations and keeps the step counts exact; reaction times follow as steps * delta_t + t.
+# Step counts are not smoothed.
+#
+# The layout of the arrays is one of
+#   'sample_major': shape (n_samples, n_trials, 1), the historical layout.
+#   'trial_major':  shape (n_trials, n_samples), so the samples of a trial are contiguous.
+#   'records':      a single float32 array of (rt, choice) rows of shape
+#                   (n_trials * n_samples, 2), trial by trial, under the key 'records'.
+#                   The rows can be written into a buffer of the caller instead.
+
+OUTPUT_LAYOUTS = ('sample_major', 'trial_major', 'records')
+
+cdef struct SampleOutput:
+    float* rts              # reaction times, or NULL when storing steps or records
+    int* choices
+    uint16_t* steps16       # step counts, one of steps16 and steps32 is set
+    uint32_t* steps32
+    int8_t* choices8
+    float* records          # (rt, choice) rows
+    Py_ssize_t sample_stride    # sample n of trial k is stored at
+    Py_ssize_t trial_stride     # n * sample_stride + k * trial_stride
+
+cdef dict init_sample_output(SampleOutput* out, bint return_steps, layout,
+                             int n_samples, int n_trials, float max_t, float delta_t,
+                             buffer = None):
+    """
+    Allocate the outputs of a kernel.
+
+    Args:
+        out (SampleOutput*): Output layout to fill in.
+        return_steps (bool): Whether to store step counts instead of reaction times.
+        layout (str): One of OUTPUT_LAYOUTS.
+        n_samples, n_trials (int): Shape of the simulation.
+        max_t (float): Maximum simulation time.
+        delta_t (float): Time step size.
+        buffer (np.ndarray or None): Preallocated C-contiguous float32 array of shape
+            (..., 2) with n_trials * n_samples rows, used for layout 'records'.
+
+    Returns:
+        dict: The arrays backing out, under the keys 'rts' and 'choices', 'steps' and
+            'choices', or 'records'.
+    """
+    if layout not in OUTPUT_LAYOUTS:
+        raise ValueError('layout must be one of ' + ', '.join(['"' + l + '"' for l in OUTPUT_LAYOUTS]))
+    if return_steps and layout == 'records':
+        raise ValueError('return_steps cannot be combined with layout="records"')
+    if buffer is not None:
+        if layout != 'records':
+            raise ValueError('out requires layout="records"')
+        valid = (isinstance(buffer, np.ndarray) and buffer.dtype == DTYPE
+                 and buffer.flags.c_contiguous
+                 and buffer.ndim >= 1 and buffer.shape[buffer.ndim - 1] == 2
+                 and buffer.size == 2 * n_trials * n_samples)
+        if not valid:
+            raise ValueError('out must be a C-contiguous float32 array of shape (..., 2) '
+                             'with n_trials * n_samples rows')
+
+    out.rts = NULL
+    out.choices = NULL
+    out.steps16 = NULL
+    out.steps32 = NULL
+    out.choices8 = NULL
+    out.records = NULL
+    if layout == 'sample_major':
+        shape = (n_samples, n_trials, 1)
+        out.sample_stride = n_trials
+        out.trial_stride = 1
+    else:
+        shape = (n_trials, n_samples)
+        out.sample_stride = 1
+        out.trial_stride = n_samples
+    cdef float[::1] rts_view
+    cdef int[::1] choices_view
+    cdef uint16_t[::1] steps16_view
+    cdef uint32_t[::1] steps32_view
+    cdef int8_t[::1] choices8_view
+    cdef float[:, ::1] records_view
+    # Without samples the pointers stay NULL, nothing is stored
+    cdef bint empty = n_trials * n_samples == 0
+
+    if layout == 'records':
+        records = np.zeros((n_trials * n_samples, 2), dtype = DTYPE) if buffer is None else buffer
+        if empty:
+            return {'records': records}
+        records_view = records.reshape(-1, 2)
+        out.records = &records_view[0, 0]
+        return {'records': records}
+
+    if not return_steps:
+        rts = np.zeros(shape, dtype = DTYPE)
+        choices = np.zeros(shape, dtype = np.intc)
+        if empty:
+            return {'rts': rts, 'choices': choices}
+        rts_view = rts.reshape(-1)
+        choices_view = choices.reshape(-1)
+        out.rts = &rts_view[0]
+        out.choices = &choices_view[0]
+        return {'rts': rts, 'choices': choices}
+
+    # Walks end at most two steps past max_t
+    cdef double max_steps = np.ceil(max_t / delta_t) + 2
+    steps_dtype = np.uint16 if max_steps < np.iinfo(np.uint16).max else np.uint32
+    steps = np.zeros(shape, dtype = steps_dtype)
+    choices = np.zeros(shape, dtype = np.int8)
+    if empty:
+        return {'steps': steps, 'choices': choices}
+    if steps_dtype == np.uint16:
+        steps16_view = steps.reshape(-1)
+        out.steps16 = &steps16_view[0]
+    else:
+        steps32_view = steps.reshape(-1)
+        out.steps32 = &steps32_view[0]
+    choices8_view = choices.reshape(-1)
+    out.choices8 = &choices8_view[0]
+    return {'steps': steps, 'choices': choices}
+
+cdef inline void store_sample(const SampleOutput* out, Py_ssize_t n, Py_ssize_t k,
+                              float rt, Py_ssize_t steps, int choice) noexcept nogil:
+    """
+    Store sample n of trial k.
+
+    Args:
+        out (const SampleOutput*): Output layout of the kernel.
+        n, k (Py_ssize_t): Sample and trial index.
+        rt (float): Reaction time, -999 for an omission.
+        steps (Py_ssize_t): Number of delta_t steps the walk took.
+        choice (int): The choice.
+    """
+    cdef Py_ssize_t i = n * out.sample_stride + k * out.trial_stride
+    if out.rts != NULL:
+        out.rts[i] = rt
+        out.choices[i] = choice
+    elif out.records != NULL:
+        out.records[2 * i] = rt
+        out.records[2 * i + 1] = choice
+    else:
+        if out.steps16 != NULL:
+            out.steps16[i] = 0xffff if rt == -999 else <uint16_t> steps
+        else:
+            out.steps32[i] = 0xffffffff if rt == -999 else <uint32_t> steps
+        out.choices8[i] = <int8_t> choice
+
+# Trajectory recording ----------------------------------------------------------------------------
+# Kernels record the paths of the first record_trajectories samples of the first trial, or of
+# every trial with trajectories_per_trial=True. Each sample writes its state through a
+# TrajectoryRow: recorded samples point into the output array, all others point at a small
+# sink with a step of zero. Walkers thus store unconditionally instead of branching on the
+# sample index in the inner loop, and nothing is allocated unless trajectories are requested.
+
+# Floats of padding between the per-thread sinks of parallel kernels (one cache line)
+cdef Py_ssize_t TRAJECTORY_SINK_PAD = 16
+
+cdef struct Trajectories:
+    float* data             # output array, NULL if nothing is recorded
+    Py_ssize_t n_record     # recorded samples per trial
+    bint per_trial          # record samples of every trial, not just the first
+    Py_ssize_t n_rows       # time steps per path
+    Py_ssize_t n_cols       # values per time step
+
+cdef struct TrajectoryRow:
+    float* data             # start of the path, or the sink
+    Py_ssize_t step         # floats per time step, 0 for the sink
+    Py_ssize_t last         # last time step that is stored
+
+cdef object init_trajectories(Trajectories* trajectories, int record_trajectories,
+                              bint trajectories_per_trial, int n_samples, int n_trials,
+                              float max_t, float delta_t, Py_ssize_t n_cols):
+    """
+    Allocate the trajectory output of a kernel.
+
+    Args:
+        trajectories (Trajectories*): Recording layout, filled in by this function.
+        record_trajectories (int): Number of samples per trial whose paths are recorded.
+        trajectories_per_trial (bool): Whether to record samples of every trial instead of
+            only those of the first trial.
+        n_samples (int): Number of samples per trial.
+        n_trials (int): Number of trials.
+        max_t (float): Maximum simulation time.
+        delta_t (float): Time step size.
+        n_cols (Py_ssize_t): Number of values recorded per time step.
+
+    Returns:
+        np.ndarray or None: Paths of shape (record_trajectories, max_t / delta_t + 1, n_cols),
+            with a leading n_trials axis if trajectories_per_trial, padded with -999 after a
+            walk terminates. None if no trajectories are recorded.
+    """
+    if record_trajectories < 0:
+        raise ValueError('record_trajectories must be a non-negative integer')
+
+    trajectories.data = NULL
+    trajectories.n_record = min(record_trajectories, n_samples)
+    trajectories.per_trial = trajectories_per_trial
+    trajectories.n_rows = int(max_t / delta_t) + 1
+    trajectories.n_cols = n_cols
+    if trajectories.n_record == 0:
+        return None
+
+    traj = np.full((n_trials if trajectories_per_trial else 1, trajectories.n_record,
+                    trajectories.n_rows, n_cols), -999, dtype = DTYPE)
+    cdef float[:, :, :, ::1] traj_view = traj
+    trajectories.data = &traj_view[0, 0, 0, 0]
+    return traj if trajectories_per_trial else traj[0]
+
+cdef inline TrajectoryRow trajectory_row(const Trajectories* trajectories, Py_ssize_t n,
+                                         Py_ssize_t k, float* sink) noexcept nogil:
+    """
+    Where sample n of trial k records its path.
+
+    Args:
+        trajectories (const Trajectories*): Recording layout of the kernel.
+        n (Py_ssize_t): Sample index.
+        k (Py_ssize_t): Trial index.
+        sink (float*): Scratch space of at least n_cols floats for unrecorded samples.
+
+    Returns:
+        TrajectoryRow: Row into the output array, or into the sink.
+    """
+    cdef TrajectoryRow row
+    row.last = trajectories.n_rows - 1
+    if trajectories.data == NULL or n >= trajectories.n_record or (k > 0 and not trajectories.per_trial):
+        row.data = sink
+        row.step = 0
+    else:
+        row.data = trajectories.data + (((k if trajectories.per_trial else 0) * trajectories.n_record + n)
+                                        * trajectories.n_rows * trajectories.n_cols)
+        row.step = trajectories.n_cols
+    return row
+
+cdef inline void record_state(TrajectoryRow* row, Py_ssize_t ix, Py_ssize_t col, float value) noexcept nogil:
+    """
+    Store a value of a path at time step ix. Steps past the end overwrite the last row.
+    """
+    row.data[min(ix, row.last) * row.step + col] = value
+
+# Native boundaries -------------------------------------------------------------------------------
+# The functions of ssms.basic_simulators.boundary_functions are mirrored here in C. When a
+# kernel receives one of them, it does not call it in Python on the full max_t / delta_t
+# grid for every trial. Walkers read the boundary through a BoundaryBuffer instead, which
+# is evaluated on first use, in chunks, up to the step being looked at. A trial that ends
+# after a few hundred steps thus costs a few hundred evaluations. Any other callable,
+# e.g. a user-defined boundary, is still evaluated in Python on the whole grid.
+
+cdef enum:
+    BOUNDARY_PYTHON = 0
+    BOUNDARY_CONSTANT = 1
+    BOUNDARY_ANGLE = 2
+    BOUNDARY_WEIBULL_CDF = 3
+    BOUNDARY_GENERALIZED_LOGISTIC = 4
+    BOUNDARY_CONFLICT_GAMMA = 5
+
+# Boundary functions with a native implementation: kind and (parameter, default) pairs
+NATIVE_BOUNDARIES = {
+    'constant': (BOUNDARY_CONSTANT, ()),
+    'angle': (BOUNDARY_ANGLE, (('theta', 1.0),)),
+    'weibull_cdf': (BOUNDARY_WEIBULL_CDF, (('alpha', 1.0), ('beta', 1.0))),
+    'generalized_logistic': (BOUNDARY_GENERALIZED_LOGISTIC, (('B', 2.0), ('M', 3.0), ('v', 0.5))),
+    'conflict_gamma': (BOUNDARY_CONFLICT_GAMMA, (('theta', 0.5), ('scale', 1.0),
+                                                 ('alphaGamma', 1.01), ('scaleGamma', 0.3))),
+}
+
+# Coefficients stored per trial
+cdef Py_ssize_t BOUNDARY_N_PARAMS = 5
+# Number of grid points evaluated at once
+cdef Py_ssize_t BOUNDARY_CHUNK = 64
+
+cdef struct BoundarySpec:
+    int kind
+    bint multiplicative
+    const double* params
+    Py_ssize_t n_t
+    float delta_t
+
+cdef struct BoundaryBuffer:
+    const BoundarySpec* spec
+    float* data
+    Py_ssize_t n_bound
+    Py_ssize_t n_filled
+    Py_ssize_t k
+    float a
+
+cdef int boundary_kind(boundary_fun, boundary_params):
+    """
+    Native implementation of a boundary function, BOUNDARY_PYTHON if there is none.
+    """
+    if getattr(boundary_fun, '__module__', None) != 'ssms.basic_simulators.boundary_functions':
+        return BOUNDARY_PYTHON
+    native = NATIVE_BOUNDARIES.get(getattr(boundary_fun, '__name__', None))
+    if native is None or not set(boundary_params).issubset([name for name, _ in native[1]]):
+        return BOUNDARY_PYTHON
+    return native[0]
+
+cdef void prepare_boundary_params(int kind, double* p) noexcept nogil:
+    """
+    Turn the parameters of one trial into the coefficients used by boundary_shape.
+    """
+    if kind == BOUNDARY_ANGLE:
+        p[0] = -sin(p[0]) / cos(p[0])
+    elif kind == BOUNDARY_GENERALIZED_LOGISTIC:
+        p[2] = 1.0 / p[2]
+    elif kind == BOUNDARY_CONFLICT_GAMMA:
+        # (theta, scale, alphaGamma, scaleGamma) -> (slope, scale / scaleGamma,
+        # alphaGamma - 1, 1 / scaleGamma, log(Gamma(alphaGamma)))
+        p[4] = lgamma(p[2])
+        p[0] = -sin(p[0]) / cos(p[0])
+        p[1] = p[1] / p[3]
+        p[2] = p[2] - 1.0
+        p[3] = 1.0 / p[3]
+
+cdef object init_boundary(BoundarySpec* spec, boundary_fun, boundary_multiplicative, boundary_params,
+                          int n_trials, Py_ssize_t n_t, float delta_t):
+    """
+    Select how the boundary of a kernel is evaluated.
+
+    Args:
+        spec (BoundarySpec*): Specification to initialize.
+        boundary_fun (callable): Function defining the shape of the boundary.
+        boundary_multiplicative (bool): If True, boundary function is multiplied by 'a', else added to 'a'.
+        boundary_params (dict): Parameters for the boundary function, one value per trial.
+        n_trials (int): Number of trials.
+        n_t (Py_ssize_t): Length of the time grid, max_t / delta_t + 1.
+        delta_t (float): Time step size.
+
+    Returns:
+        np.ndarray or None: The per-trial coefficients spec points into, which must be
+            kept alive while spec is in use, or None for boundaries evaluated in Python.
+    """
+    cdef double[:, ::1] params_view
+    cdef Py_ssize_t k
+
+    spec.kind = boundary_kind(boundary_fun, boundary_params)
+    spec.multiplicative = boundary_multiplicative
+    spec.params = NULL
+    spec.n_t = n_t
+    spec.delta_t = delta_t
+    if spec.kind == BOUNDARY_PYTHON:
+        return None
+
+    params = np.zeros((max(1, n_trials), BOUNDARY_N_PARAMS), dtype = np.float64)
+    for j, (name, default) in enumerate(NATIVE_BOUNDARIES[boundary_fun.__name__][1]):
+        params[:n_trials, j] = np.asarray(boundary_params.get(name, default), dtype = np.float64)
+    params_view = params
+    for k in range(n_trials):
+        prepare_boundary_params(spec.kind, &params_view[k, 0])
+    spec.params = &params_view[0, 0]
+    return params
+
+cdef inline double boundary_shape(int kind, const double* p, double t) noexcept nogil:
+    """
+    Value of a native boundary function at time t, given the coefficients of the trial.
+    """
+    cdef double x
+    if kind == BOUNDARY_ANGLE:
+        return p[0] * t
+    if kind == BOUNDARY_WEIBULL_CDF:
+        return exp(-pow(t / p[1], p[0]))
+    if kind == BOUNDARY_GENERALIZED_LOGISTIC:
+        return 1.0 - 1.0 / pow(1.0 + exp(-p[0] * (t - p[1])), p[2])
+    if kind == BOUNDARY_CONFLICT_GAMMA:
+        x = t * p[3]
+        if x > 0:
+            return p[1] * exp(p[2] * log(x) - x - p[4]) + p[0] * t
+        # Gamma density at zero
+        if p[2] == 0:
+            return p[1] * exp(-p[4])
+        return 0.0 if p[2] > 0 else p[1] * INFINITY
+    return 1.0
+
+cdef inline BoundaryBuffer boundary_buffer(const BoundarySpec* spec, float* data, Py_ssize_t n_bound,
+                                           Py_ssize_t n_filled, Py_ssize_t k, float a) noexcept nogil:
+    """
+    Boundary of trial k stored in data, of which the first n_filled values are valid.
+    """
+    cdef BoundaryBuffer buf
+    buf.spec = spec
+    buf.data = data
+    buf.n_bound = n_bound
+    buf.n_filled = n_filled
+    buf.k = k
+    buf.a = a
+    return buf
+
+cdef void fill_boundary(BoundaryBuffer* buf, Py_ssize_t n_fill) noexcept nogil:
+    """
+    Evaluate a native boundary up to, but excluding, grid index n_fill.
+
+    Points past the end of the time grid repeat its last value.
+    """
+    cdef const BoundarySpec* spec = buf.spec
+    cdef const double* p = spec.params + buf.k * BOUNDARY_N_PARAMS
+    cdef double shape
+    cdef float t
+    cdef Py_ssize_t ix
+
+    for ix in range(buf.n_filled, n_fill):
+        # Same float32 grid as np.arange(0, max_t + delta_t, delta_t).astype(DTYPE)
+        t = <float> (min(ix, spec.n_t - 1) * <double> spec.delta_t)
+        shape = boundary_shape(spec.kind, p, t)
+        buf.data[ix] = buf.a * shape if spec.multiplicative else buf.a + shape
+    buf.n_filled = max(buf.n_filled, n_fill)
+
+cdef inline float boundary_at(BoundaryBuffer* buf, Py_ssize_t ix) noexcept nogil:
+    """
+    (Upper) boundary at grid index ix, evaluated on first use.
+
+    Indices past the end of the buffer return its last value.
+    """
+    if ix >= buf.n_filled:
+        ix = min(ix, buf.n_bound - 1)
+        if ix >= buf.n_filled:
+            fill_boundary(buf, min(buf.n_bound, ix + BOUNDARY_CHUNK))
+    return buf.data[ix]
+
+cdef void evaluate_boundary(BoundaryBuffer* buf, np.ndarray boundary, Py_ssize_t k, float a, t_s,
+                            boundary_fun, boundary_params, bint lazy) except *:
+    """
+    Prepare the boundary of trial k in a buffer backed by the array boundary.
+
+    Native boundaries are evaluated by boundary_at as the walkers advance if lazy, else
+    right away on the whole grid. Other boundary functions are called on t_s.
+
+    Args:
+        buf (BoundaryBuffer*): Buffer of the kernel.
+        boundary (np.ndarray): Array behind the buffer, of the same length as t_s.
+        k (Py_ssize_t): Trial index.
+        a (float): Boundary separation of the trial.
+        t_s (np.ndarray): Time grid.
+        boundary_fun (callable): Function defining the shape of the boundary.
+        boundary_params (dict): Parameters for the boundary function.
+        lazy (bool): Whether the walkers read the boundary through boundary_at.
+    """
+    buf.k = k
+    buf.a = a
+    buf.n_filled = 0
+    if buf.spec.kind != BOUNDARY_PYTHON:
+        if not lazy:
+            fill_boundary(buf, buf.n_bound)
+        return
+
+    boundary_params_tmp = {key: boundary_params[key][k] for key in boundary_params.keys()}
+    if buf.spec.multiplicative:
+        boundary[:] = np.multiply(a, boundary_fun(t = t_s, **boundary_params_tmp)).astype(DTYPE)
+    else:
+        boundary[:] = np.add(a, boundary_fun(t = t_s, **boundary_params_tmp)).astype(DTYPE)
+    buf.n_filled = buf.n_bound
+
+# Native drifts -----------------------------------------------------------------------------------
+# Likewise for the functions of ssms.basic_simulators.drift_functions used by the kernels with
+# time varying drift. A DriftBuffer holds one column with the drift of the trial, or two
+# with its target and distractor parts for ddm_flex_leak2, and is evaluated on first use.
+
+cdef enum:
+    DRIFT_PYTHON = 0
+    DRIFT_CONSTANT = 1
+    DRIFT_GAMMA = 2
+    DRIFT_CONFLICT_DS = 3
+    DRIFT_CONFLICT_DSSTIMFLEX = 4
+    DRIFT_CONFLICT_STIMFLEX = 5
+    DRIFT_ATTEND = 6
+    DRIFT_ATTEND_SIMPLE = 7
+
+# Drift functions with a native implementation: kind and (parameter, default) pairs.
+# Offsets of None (until the end of the trial) are stored as INFINITY.
+NATIVE_DRIFTS = {
+    'constant': (DRIFT_CONSTANT, ()),
+    'gamma_drift': (DRIFT_GAMMA, (('shape', 2.0), ('scale', 0.01), ('c', 1.5))),
+    'conflict_ds_drift': (DRIFT_CONFLICT_DS, (('tinit', 0.0), ('dinit', 0.0), ('tslope', 1.0), ('dslope', 1.0),
+                                              ('tfixedp', 1.0), ('tcoh', 1.5), ('dcoh', 1.5))),
+    'conflict_dsstimflex_drift': (DRIFT_CONFLICT_DSSTIMFLEX,
+                                  (('tinit', 0.0), ('dinit', 0.0), ('tslope', 1.0), ('dslope', 1.0),
+                                   ('tfixedp', 1.0), ('tcoh', 1.0), ('dcoh', 1.0), ('tonset', 0.0),
+                                   ('donset', 0.0), ('rel_first', 1.0))),
+    'conflict_stimflex_drift': (DRIFT_CONFLICT_STIMFLEX,
+                                (('vt', 0.0), ('vd', 0.0), ('tcoh', 1.0), ('dcoh', 1.0), ('tonset', 0.0),
+                                 ('donset', 0.0), ('toffset', INFINITY), ('doffset', INFINITY),
+                                 ('rel_first', 0.0), ('sum_drifts', 1.0))),
+    'attend_drift': (DRIFT_ATTEND, (('ptarget', -0.3), ('pouter', -0.3), ('pinner', 0.3), ('r', 0.5),
+                                    ('sda', 2.0))),
+    'attend_drift_simple': (DRIFT_ATTEND_SIMPLE, (('ptarget', -0.3), ('pouter', -0.3), ('r', 0.5),
+                                                  ('sda', 2.0))),
+}
+
+# Coefficients stored per trial
+cdef Py_ssize_t DRIFT_N_PARAMS = 10
+# Standard deviation of attention below which the spotlight stops shrinking
+cdef float ATTEND_MIN_SDA = 0.001
+
+cdef struct DriftSpec:
+    int kind
+    const double* params
+    Py_ssize_t n_cols
+    Py_ssize_t n_t
+    float delta_t
+
+cdef struct DriftBuffer:
+    const DriftSpec* spec
+    float* data
+    Py_ssize_t n_bound
+    Py_ssize_t n_filled
+    Py_ssize_t k
+    float v
+
+cdef object native_drift(drift_fun, drift_params, Py_ssize_t n_cols):
+    """
+    Native implementation of a drift function with its fixed keyword arguments.
+
+    Drift functions defined through functools.partial, e.g. conflict_stimflexrel1_drift,
+    are unwrapped. Returns None if there is no native implementation, if drift_params
+    holds arguments it does not know or if its output does not have n_cols columns.
+    """
+    fixed = {}
+    if isinstance(drift_fun, functools.partial) and not drift_fun.args:
+        fixed = drift_fun.keywords
+        drift_fun = drift_fun.func
+    if getattr(drift_fun, '__module__', None) != 'ssms.basic_simulators.drift_functions':
+        return None
+    native = NATIVE_DRIFTS.get(getattr(drift_fun, '__name__', None))
+    if native is None:
+        return None
+    names = [name for name, _ in native[1]]
+    if (not set(fixed).union(drift_params).issubset(names) or set(fixed).intersection(drift_params)
+            or 'sum_drifts' in drift_params):
+        return None
+    if (2 if fixed.get('sum_drifts', True) is False else 1) != n_cols:
+        return None
+    return native, fixed
+
+cdef void prepare_drift_params(int kind, double* p) noexcept nogil:
+    """
+    Turn the parameters of one trial into the coefficients used by drift_shape.
+    """
+    cdef float first
+    if kind == DRIFT_GAMMA:
+        # (shape, scale, c) -> (shape - 1, scale, c / normalization)
+        p[0] = p[0] - 1.0
+        p[2] = p[2] / (pow(p[0], p[0]) * pow(p[1], p[0]) * exp(-p[0]))
+    elif kind == DRIFT_CONFLICT_DSSTIMFLEX and p[9] != 0:
+        # Onsets relative to the first one, in the float precision of the parameters
+        first = min(<float> p[7], <float> p[8])
+        p[7] = <float> p[7] - first
+        p[8] = <float> p[8] - first
+    elif kind == DRIFT_CONFLICT_STIMFLEX and p[8] != 0:
+        first = min(<float> p[4], <float> p[5])
+        p[4] = <float> p[4] - first
+        p[5] = <float> p[5] - first
+
+cdef object init_drift(DriftSpec* spec, drift_fun, drift_params, int n_trials, Py_ssize_t n_cols,
+                       Py_ssize_t n_t, float delta_t):
+    """
+    Select how the drift of a kernel is evaluated.
+
+    Args:
+        spec (DriftSpec*): Specification to initialize.
+        drift_fun (callable): Function defining the drift rate over time.
+        drift_params (dict): Parameters for the drift function, one value per trial.
+        n_trials (int): Number of trials.
+        n_cols (Py_ssize_t): 1 for a single drift, 2 for separate target and distractor drifts.
+        n_t (Py_ssize_t): Length of the time grid, max_t / delta_t + 1.
+        delta_t (float): Time step size.
+
+    Returns:
+        np.ndarray or None: The per-trial coefficients spec points into, which must be
+            kept alive while spec is in use, or None for drifts evaluated in Python.
+    """
+    cdef double[:, ::1] params_view
+    cdef Py_ssize_t k
+
+    spec.kind = DRIFT_PYTHON
+    spec.params = NULL
+    spec.n_cols = n_cols
+    spec.n_t = n_t
+    spec.delta_t = delta_t
+    native = native_drift(drift_fun, drift_params, n_cols)
+    if native is None:
+        return None
+    (kind, defaults), fixed = native
+    spec.kind = kind
+
+    params = np.zeros((max(1, n_trials), DRIFT_N_PARAMS), dtype = np.float64)
+    for j, (name, default) in enumerate(defaults):
+        params[:n_trials, j] = np.asarray(drift_params.get(name, fixed.get(name, default)), dtype = np.float64)
+    params_view = params
+    for k in range(n_trials):
+        prepare_drift_params(spec.kind, &params_view[k, 0])
+    spec.params = &params_view[0, 0]
+    return params
+
+cdef inline double normal_cdf(double x) noexcept nogil:
+    """
+    Standard normal distribution function.
+    """
+    return 0.5 * erfc(-x / sqrt(2.0))
+
+cdef inline double ds_support(double t, double init_p, double fix_point, double slope) noexcept nogil:
+    """
+    Solution of x' = slope * (fix_point - x) with x(0) = init_p, as in ds_support_analytic.
+    """
+    return (init_p - fix_point) * exp(-(slope * t)) + fix_point
+
+cdef void drift_shape(int kind, const double* p, float t, double* out) noexcept nogil:
+    """
+    Target and distractor parts of a native drift function at time t.
+
+    The drift is out[0] + out[1]; drift functions without separate parts leave out[1] at zero.
+    """
+    cdef float sda
+    cdef double phi_05
+    out[0] = 0.0
+    out[1] = 0.0
+    if kind == DRIFT_GAMMA:
+        out[0] = p[2] * pow(t, p[0]) * exp(-t / p[1])
+    elif kind == DRIFT_CONFLICT_DS:
+        out[0] = ds_support(t, p[0], p[4], p[2]) * p[5]
+        out[1] = ds_support(t, p[1], 0.0, p[3]) * p[6]
+    elif kind == DRIFT_CONFLICT_DSSTIMFLEX:
+        if t >= <float> p[7]:
+            out[0] = ds_support(t, p[0], p[4], p[2]) * p[5]
+        if t >= <float> p[8]:
+            out[1] = ds_support(t, p[1], 0.0, p[3]) * p[6]
+    elif kind == DRIFT_CONFLICT_STIMFLEX:
+        if t >= <float> p[4] and t <= p[6]:
+            out[0] = p[0] * p[2]
+        if t >= <float> p[5] and t <= p[7]:
+            out[1] = p[1] * p[3]
+    elif kind == DRIFT_ATTEND:
+        # Outer flankers, inner flankers and target under a shrinking spotlight
+        sda = max(<float> p[4] - <float> p[3] * t, ATTEND_MIN_SDA)
+        phi_05 = normal_cdf(0.5 / sda)
+        out[0] = (2 * p[1] * normal_cdf(-1.5 / sda)
+                  + 2 * p[2] * (normal_cdf(1.5 / sda) - phi_05)
+                  + p[0] * (phi_05 - normal_cdf(-0.5 / sda)))
+    elif kind == DRIFT_ATTEND_SIMPLE:
+        sda = max(<float> p[3] - <float> p[2] * t, ATTEND_MIN_SDA)
+        phi_05 = normal_cdf(0.5 / sda)
+        out[0] = 2 * p[1] * (1.0 - phi_05) + 2 * p[0] * (phi_05 - 0.5)
+
+cdef inline DriftBuffer drift_buffer(const DriftSpec* spec, float* data, Py_ssize_t n_bound) noexcept nogil:
+    """
+    Empty drift buffer backed by data, which holds n_bound rows of spec.n_cols values.
+    """
+    cdef DriftBuffer buf
+    buf.spec = spec
+    buf.data = data
+    buf.n_bound = n_bound
+    buf.n_filled = 0
+    buf.k = 0
+    buf.v = 0.0
+    return buf
+
+cdef void fill_drift(DriftBuffer* buf, Py_ssize_t n_fill) noexcept nogil:
+    """
+    Evaluate a native drift up to, but excluding, grid index n_fill.
+    """
+    cdef const DriftSpec* spec = buf.spec
+    cdef const double* p = spec.params + buf.k * DRIFT_N_PARAMS
+    cdef double parts[2]
+    cdef float t
+    cdef Py_ssize_t ix
+
+    for ix in range(buf.n_filled, n_fill):
+        # Same float32 grid as np.arange(0, max_t + delta_t, delta_t).astype(DTYPE)
+        t = <float> (min(ix, spec.n_t - 1) * <double> spec.delta_t)
+        drift_shape(spec.kind, p, t, parts)
+        if spec.n_cols == 1:
+            buf.data[ix] = buf.v + (parts[0] + parts[1])
+        else:
+            buf.data[2 * ix] = parts[0]
+            buf.data[2 * ix + 1] = parts[1]
+    buf.n_filled = max(buf.n_filled, n_fill)
+
+cdef inline float drift_at(DriftBuffer* buf, Py_ssize_t ix, Py_ssize_t col) noexcept nogil:
+    """
+    Column col of the drift at grid index ix, evaluated on first use.
+
+    Indices past the end of the buffer return its last value.
+    """
+    if ix >= buf.n_filled:
+        ix = min(ix, buf.n_bound - 1)
+        if ix >= buf.n_filled:
+            fill_drift(buf, min(buf.n_bound, ix + BOUNDARY_CHUNK))
+    return buf.data[ix * buf.spec.n_cols + col]
+
+cdef void evaluate_drift(DriftBuffer* buf, np.ndarray drift, Py_ssize_t k, float v, t_s,
+                         drift_fun, drift_params) except *:
+    """
+    Prepare the drift of trial k in a buffer backed by the array drift.
+
+    Native drifts are evaluated by drift_at as the walkers advance, other drift functions
+    are called on t_s. With a single column, v is added to the drift function.
+
+    Args:
+        buf (DriftBuffer*): Buffer of the kernel.
+        drift (np.ndarray): Array behind the buffer, of shape (len(t_s),) or (len(t_s), 2).
+        k (Py_ssize_t): Trial index.
+        v (float): Constant drift of the trial.
+        t_s (np.ndarray): Time grid.
+        drift_fun (callable): Function defining the drift rate over time.
+        drift_params (dict): Parameters for the drift function.
+    """
+    buf.k = k
+    buf.v = v
+    buf.n_filled = 0
+    if buf.spec.kind != DRIFT_PYTHON:
+        return
+
+    drift_params_tmp = {key: drift_params[key][k] for key in drift_params.keys()}
+    if buf.spec.n_cols == 1:
+        drift[:] = np.add(v, drift_fun(t = t_s, **drift_params_tmp)).astype(DTYPE)
+    else:
+        drift[:, :] = drift_fun(t = t_s, **drift_params_tmp).astype(DTYPE)
+    buf.n_filled = buf.n_bound
+
+# Brownian-bridge stepping ------------------------------------------------------------------------
+# With method="bridge" a walk that ends a step inside the bounds may still have crossed
+# one of them in between. Conditional on its end points, the path is a Brownian bridge,
+# which crosses a linear boundary b0 -> b1 with probability exp(-2 (b0 - y0) (b1 - y1) / (s^2 h)).
+# Checking this after every step removes the O(sqrt(delta_t)) bias of missed crossings,
+# so coarse steps give the accuracy of much finer Euler steps. Far from both bounds the
+# walker takes up to BRIDGE_MAX_STRIDE grid steps at once.
+
+# Largest number of grid steps taken at once
+cdef Py_ssize_t BRIDGE_MAX_STRIDE = 8
+# Distance to the bounds, in standard deviations of a step, required for a larger step
+cdef float BRIDGE_SAFETY = 5.0
+# Crossing probabilities below exp(BRIDGE_LOG_P_MIN) are treated as zero
+cdef double BRIDGE_LOG_P_MIN = -16.0
+
+cdef inline Py_ssize_t bridge_stride(float y, float drift, float s, BoundaryBuffer* boundary,
+                                     Py_ssize_t ix, float delta_t, float t_left) noexcept nogil:
+    """
+    Number of grid steps the walker can take at once.
+
+    The stride is the largest power of two up to BRIDGE_MAX_STRIDE for which the walker
+    stays BRIDGE_SAFETY standard deviations (plus the drift) away from both bounds at
+    the start and at the end of the step, and does not step past the deadline.
+
+    Args:
+        y (float): Current position of the walker.
+        drift (float): Current drift of the walker.
+        s (float): Noise standard deviation.
+        boundary (BoundaryBuffer*): Boundary of the trial.
+        ix (Py_ssize_t): Current index into the boundary.
+        delta_t (float): Grid step size.
+        t_left (float): Time left until the effective deadline.
+
+    Returns:
+        Py_ssize_t: Number of grid steps, at least 1.
+    """
+    cdef Py_ssize_t stride = BRIDGE_MAX_STRIDE
+    cdef float h, margin
+    cdef float y_abs = fabs(y)
+
+    while stride > 1:
+        h = stride * delta_t
+        if ix + stride < boundary.n_bound and h <= t_left:
+            margin = BRIDGE_SAFETY * s * sqrt(h) + fabs(drift) * h
+            if (boundary_at(boundary, ix) - y_abs > margin
+                    and boundary_at(boundary, ix + stride) - y_abs > margin):
+                return stride
+        stride >>= 1
+    return 1
+
+cdef inline int bridge_crossing(RngState* rng, float y0, float y1, float b0, float b1,
+                                float var) noexcept nogil:
+    """
+    Check whether a step that ended inside the bounds crossed one of them in between.
+
+    The bounds are (-b, b) with b linearly interpolated from b0 to b1 over the step,
+    and both end points must lie inside them.
+
+    Args:
+        rng (RngState*): Generator state.
+        y0 (float): Position at the start of the step.
+        y1 (float): Position at the end of the step.
+        b0 (float): Upper boundary at the start of the step.
+        b1 (float): Upper boundary at the end of the step.
+        var (float): Variance of the step noise, s^2 h for a Brownian step.
+
+    Returns:
+        int: 1 if the upper bound was crossed, -1 if the lower bound was crossed, else 0.
+    """
+    cdef double log_p_up, log_p_low, p_up, u
+
+    if var <= 0:
+        return 0
+    log_p_up = -2.0 * (b0 - y0) * (b1 - y1) / var
+    log_p_low = -2.0 * (b0 + y0) * (b1 + y1) / var
+    if log_p_up < BRIDGE_LOG_P_MIN and log_p_low < BRIDGE_LOG_P_MIN:
+        return 0
+    p_up = exp(log_p_up)
+    u = random_uniform(rng)
+    if u < p_up:
+        return 1
+    if u < p_up + exp(log_p_low):
+        return -1
+    return 0
+
+cdef float bridge_walk(RngState* rng, float* y, float v, DriftBuffer* drift, float g, float s,
+                       BoundaryBuffer* boundary, float delta_t,
+                       float deadline_tmp, TrajectoryRow* traj, Py_ssize_t* n_steps) noexcept nogil:
+    """
+    Run a single walker between symmetric bounds with Brownian-bridge crossing checks.
+
+    The drift at grid index ix is v + drift[ix] - g * y, which covers the plain, flexible
+    drift, leaky and Ornstein-Uhlenbeck walkers.
+
+    Args:
+        rng (RngState*): Generator state.
+        y (float*): Starting position on input, final position on output. A crossing
+            detected inside a step puts the walker on the crossed bound.
+        v (float): Constant part of the drift.
+        drift (DriftBuffer*): Time varying part of the drift, or NULL.
+        g (float): Leak of the drift towards zero.
+        s (float): Noise standard deviation.
+        boundary (BoundaryBuffer*): Boundary of the trial.
+        delta_t (float): Grid step size.
+        deadline_tmp (float): Effective deadline of the walk.
+        traj (TrajectoryRow*): Where the path is recorded. Grid points skipped by larger
+            steps are linearly interpolated.
+        n_steps (Py_ssize_t*): Where the number of delta_t steps taken is stored, or NULL.
+
+    Returns:
+        float: Time at which the walk terminated.
+    """
+    cdef float y_cur = y[0]
+    cdef float y_new, mu, h, b_new
+    cdef float t_particle = 0.0
+    cdef Py_ssize_t ix = 0
+    cdef Py_ssize_t steps = 0
+    cdef Py_ssize_t stride, j
+    cdef int crossed = 0
+
+    record_state(traj, 0, 0, y_cur)
+
+    while (y_cur >= (-1) * boundary_at(boundary, ix)) and (y_cur <= boundary_at(boundary, ix)) and (t_particle <= deadline_tmp):
+        mu = v - g * y_cur
+        if drift != NULL:
+            mu = mu + drift_at(drift, ix, 0)
+        stride = bridge_stride(y_cur, mu, s, boundary, ix, delta_t, deadline_tmp - t_particle)
+        h = stride * delta_t
+        y_new = y_cur + mu * h + s * sqrt(h) * random_gaussian(rng)
+        b_new = boundary_at(boundary, ix + stride)
+        if (y_new >= (-1) * b_new) and (y_new <= b_new):
+            crossed = bridge_crossing(rng, y_cur, y_new, boundary_at(boundary, ix), b_new, s * s * h)
+            if crossed != 0:
+                y_new = crossed * b_new
+        for j in range(1, stride + 1):
+            record_state(traj, ix + j, 0, y_cur + (y_new - y_cur) * j / stride)
+        y_cur = y_new
+        t_particle += h
+        steps += stride
+        ix = min(ix + stride, boundary.n_bound - 1)
+        if crossed != 0:
+            break
+
+    y[0] = y_cur
+    if n_steps != NULL:
+        n_steps[0] = steps
+    return t_particle
+
+cdef float ou_exact_walk(RngState* rng, float* y, float v, float g, float s,
+                         BoundaryBuffer* boundary, float delta_t,
+                         float deadline_tmp, TrajectoryRow* traj, Py_ssize_t* n_steps) noexcept nogil:
+    """
+    Run an Ornstein-Uhlenbeck walker with exact transitions between symmetric bounds.
+
+    Over a step h the process dy = (v - g y) dt + s dW moves to a normal with mean
+    y exp(-g h) + v (1 - exp(-g h)) / g and variance s^2 (1 - exp(-2 g h)) / (2 g), so the
+    positions on the grid have the law of the continuous process for any delta_t. Crossings
+    within a step are caught with the check of bridge_walk, taken for the Ornstein-Uhlenbeck
+    bridge: with z = exp(g t) (y - v / g) the process is a time-changed Brownian motion, and
+    the crossing probability of a bound keeps its Brownian form with variance
+    s^2 sinh(g h) / g. This is exact for bounds that, mapped the same way, are linear in
+    the new time. For others, such as constant bounds with g != 0, it is an approximation
+    that improves as g * delta_t shrinks.
+
+    Args:
+        rng (RngState*): Generator state.
+        y (float*): Starting position on input, final position on output. A crossing
+            detected inside a step puts the walker on the crossed bound.
+        v (float): Drift.
+        g (float): Decay of the drift towards zero.
+        s (float): Noise standard deviation.
+        boundary (BoundaryBuffer*): Boundary of the trial.
+        delta_t (float): Grid step size.
+        deadline_tmp (float): Effective deadline of the walk.
+        traj (TrajectoryRow*): Where the path is recorded.
+        n_steps (Py_ssize_t*): Where the number of delta_t steps taken is stored, or NULL.
+
+    Returns:
+        float: Time at which the walk terminated.
+    """
+    cdef double gh = g * delta_t
+    cdef float decay = exp(-gh)
+    cdef float shift = v * delta_t if g == 0 else -v * expm1(-gh) / g
+    cdef float var = s * s * delta_t if g == 0 else -s * s * expm1(-2 * gh) / (2 * g)
+    cdef float sd = sqrt(var)
+    # Variance of the crossing check, s^2 sinh(g h) / g
+    cdef float var_bridge = s * s * delta_t if g == 0 else s * s * sinh(gh) / g
+    cdef float y_cur = y[0]
+    cdef float y_new, b_new
+    cdef float t_particle = 0.0
+    cdef Py_ssize_t ix = 0
+    cdef int crossed = 0
+
+    record_state(traj, 0, 0, y_cur)
+
+    while (y_cur >= (-1) * boundary_at(boundary, ix)) and (y_cur <= boundary_at(boundary, ix)) and (t_particle <= deadline_tmp):
+        y_new = y_cur * decay + shift + sd * random_gaussian(rng)
+        b_new = boundary_at(boundary, ix + 1)
+        if (y_new >= (-1) * b_new) and (y_new <= b_new):
+            crossed = bridge_crossing(rng, y_cur, y_new, boundary_at(boundary, ix), b_new, var_bridge)
+            if crossed != 0:
+                y_new = crossed * b_new
+        y_cur = y_new
+        t_particle += delta_t
+        ix += 1
+        record_state(traj, ix, 0, y_cur)
+        if crossed != 0:
+            break
+
+    y[0] = y_cur
+    if n_steps != NULL:
+        n_steps[0] = ix
+    return t_particle
+
+cdef int boundary_block_trials(int n_trials, Py_ssize_t n_bound):
+    """
+    Number of trials whose boundaries are precomputed at once.
+
+    Args:
+        n_trials (int): Total number of trials.
+        n_bound (Py_ssize_t): Length of a single boundary trace.
+
+    Returns:
+        int: Block size, at least 1 and at most n_trials.
+    """
+    return max(1, min(n_trials, BOUNDARY_BLOCK_SIZE // n_bound))
+
+cdef void compute_boundary_block(np.ndarray boundary_block, const float[:] a_view,
+                                 Py_ssize_t k_start, Py_ssize_t k_end, t_s,
+                                 const BoundarySpec* spec,
+                                 boundary_fun, boundary_multiplicative, boundary_params):
+    """
+    Evaluate the boundary function for a block of trials.
+
+    Row k - k_start of boundary_block holds the boundary of trial k. The block is one
+    column longer than t_s; the last column repeats the final boundary value so that
+    walkers can safely look one step past max_t.
+
+    Args:
+        boundary_block (np.ndarray): Output array of shape (block size, len(t_s) + 1).
+        a_view (float[:]): Boundary separation for each trial.
+        k_start (Py_ssize_t): First trial of the block.
+        k_end (Py_ssize_t): One past the last trial of the block.
+        t_s (np.ndarray): Time grid at which the boundary is evaluated.
+        spec (BoundarySpec*): Native boundary set up by init_boundary.
+        boundary_fun (callable): Function defining the shape of the boundary.
+        boundary_multiplicative (bool): If True, boundary function is multiplied by 'a', else added to 'a'.
+        boundary_params (dict): Parameters for the boundary function.
+    """
+    cdef Py_ssize_t k
+    cdef Py_ssize_t n_t = t_s.shape[0]
+    cdef float[:, ::1] block_view
+    cdef BoundaryBuffer row
+
+    if spec.kind != BOUNDARY_PYTHON:
+        block_view = boundary_block
+        for k in range(k_start, k_end):
+            row = boundary_buffer(spec, &block_view[k - k_start, 0], n_t + 1, 0, k, a_view[k])
+            fill_boundary(&row, n_t + 1)
+        return
+
+    for k in range(k_start, k_end):
+        boundary_params_tmp = {key: boundary_params[key][k] for key in boundary_params.keys()}
+        if boundary_multiplicative:
+            boundary_block[k - k_start, :n_t] = np.multiply(a_view[k], boundary_fun(t = t_s, **boundary_params_tmp))
+        else:
+            boundary_block[k - k_start, :n_t] = np.add(a_view[k], boundary_fun(t = t_s, **boundary_params_tmp))
+        boundary_block[k - k_start, n_t] = boundary_block[k - k_start, n_t - 1]
 
 # Simulate (rt, choice) tuples from: Full DDM with flexible bounds --------------------------------
 # @cythonboundscheck(False)
@@ -200,6 +1769,11 @@ def full_ddm_hddm_base(np.ndarray[float, ndim = 1] v, # = 0,
                        random_state = None,
                        smooth_unif  = False,
                        return_option = 'full', # 'full' or 'minimal'
+                       method = 'euler',
+                       record_trajectories = 0,
+                       trajectories_per_trial = False,
+                       layout = 'sample_major',
+                       out = None,
                        **kwargs,
                        ):
     """
@@ -219,50 +1793,67 @@ def full_ddm_hddm_base(np.ndarray[float, ndim = 1] v, # = 0,
         max_t (float): Maximum time for simulation.
         n_samples (int): Number of samples to simulate per trial.
         n_trials (int): Number of trials to simulate.
-        random_state (int or None): Seed for random number generator.
+        random_state (int, numpy.random.Generator or None): Seed for random number generator.
         smooth_unif (bool): Whether to apply uniform smoothing to reaction times.
         return_option (str): 'full' for complete output, 'minimal' for basic output.
+        method (str): 'euler' for Euler-Maruyama steps of size delta_t or 'exact' for exact
+            first passage sampling, which ignores smooth_unif and the trajectory.
+        record_trajectories (int): Number of samples whose paths are returned as the 'trajectory'
+            metadata (default: 0).
+        trajectories_per_trial (bool): Whether to record the first record_trajectories samples
+            of every trial instead of only those of the first trial (default: False).
+        layout (str): 'sample_major' for outputs of shape (n_samples, n_trials, 1),
+            'trial_major' for C-contiguous outputs of shape (n_trials, n_samples), or 'records'
+            for a single float32 array of (rt, choice) rows of shape (n_trials * n_samples, 2),
+            trial by trial, under 'records' (default: 'sample_major').
+        out (np.ndarray or None): Optional preallocated C-contiguous float32 array of shape
+            (..., 2) with n_trials * n_samples rows that the records are written to, for layout
+            'records' (default: None).
         **kwargs: Additional keyword arguments.
 
     Returns:
         dict: A dictionary containing simulated reaction times, choices, and metadata.
     """
 
-    set_seed(random_state)
+    cdef bint exact = parse_method(method, ('euler', 'exact')) == METHOD_EXACT
+    cdef RngState rng
+    rng_init(&rng, random_state)
     # cdef int cov_length = np.max([v.size, a.size, w.size, t.size]).astype(int)
 
     # Param views
-    cdef float[:] v_view  = v
-    cdef float[:] a_view = a
-    cdef float[:] z_view = z
-    cdef float[:] t_view = t
-    cdef float[:] sz_view = sz
-    cdef float[:] sv_view = sv
-    cdef float[:] st_view = st
-    cdef float[:] deadline_view = deadline
-    cdef float[:] s_view = s
+    cdef const float[:] v_view = v
+    cdef const float[:] a_view = a
+    cdef const float[:] z_view = z
+    cdef const float[:] t_view = t
+    cdef const float[:] sz_view = sz
+    cdef const float[:] sv_view = sv
+    cdef const float[:] st_view = st
+    cdef const float[:] deadline_view = deadline
+    cdef const float[:] s_view = s
     # Data-structs for trajectory storage
-    traj = np.zeros((int(max_t / delta_t) + 1, 1), dtype = DTYPE)
-    traj[:, :] = -999 
-    cdef float[:, :] traj_view = traj
+    cdef Trajectories trajectories
+    cdef TrajectoryRow traj_row
+    cdef float traj_sink[1]
+    traj = init_trajectories(&trajectories, record_trajectories, trajectories_per_trial,
+                             n_samples, n_trials, max_t, delta_t, 1)
 
-    rts = np.zeros((n_samples, n_trials, 1), dtype = DTYPE)
-    choices = np.zeros((n_samples, n_trials, 1), dtype = np.intc)
-
-    cdef float[:, :, :] rts_view = rts
-    cdef int[:, :, :] choices_view = choices
+    cdef SampleOutput sample_output
+    outputs = init_sample_output(&sample_output, False, layout, n_samples, n_trials,
+                                 max_t, delta_t, out)
 
     cdef float delta_t_sqrt = sqrt(delta_t) # correct scalar so we can use standard normal samples for the brownian motion
     
     # Boundary storage for the upper bound
-    cdef int num_draws = int((max_t / delta_t) + 1)
+    cdef int num_draws = noise_buffer_size(max_t, delta_t)
     t_s = np.arange(0, max_t + delta_t, delta_t).astype(DTYPE)
 
-    cdef float y, t_particle, t_tmp, smooth_u, deadline_tmp, sqrt_st
+    cdef float y, t_particle, t_tmp, smooth_u, deadline_tmp, sqrt_st, rt
     cdef Py_ssize_t n, ix, k
     cdef Py_ssize_t m = 0
     cdef float drift_increment = 0.0
-    cdef float[:] gaussian_values = draw_gaussian(num_draws) 
+    cdef double fpt
+    cdef int choice
+    cdef float[:] gaussian_values = draw_gaussian(&rng, num_draws) 
 
     # Loop over trials
     for k in range(n_trials): 
@@ -275,23 +1866,28 @@ def full_ddm_hddm_base(np.ndarray[float, ndim = 1] v, # = 0,
             
             # get drift by random displacement of v 
             drift_increment = (v_view[k] + sv_view[k] * gaussian_values[m]) * delta_t
-            t_tmp = t_view[k] + (2 * (random_uniform() - 0.5) * st_view[k])
+            t_tmp = t_view[k] + (2 * (random_uniform(&rng) - 0.5) * st_view[k])
             
             # apply uniform displacement on y
-            y += 2 * (random_uniform() - 0.5) * sz_view[k]
+            y += 2 * (random_uniform(&rng) - 0.5) * sz_view[k]
             
             # increment m appropriately
             m += 1
             if m == num_draws:
-                gaussian_values = draw_gaussian(num_draws)
+                fill_gaussian(&rng, &gaussian_values[0], num_draws)
                 m = 0
+
+            if exact:
+                fpt = wiener_first_passage(&rng, drift_increment / delta_t, a_view[k], y, s_view[k], &choice)
+                store_sample(&sample_output, n, k, exact_rt(fpt, t_tmp, deadline_view[k], deadline_tmp),
+                             0, 0 if choice == -1 else 1)
+                continue
             
             t_particle = 0.0 # reset time
             ix = 0 # reset boundary index
             
-            if n == 0:
-                if k == 0:
-                    traj_view[0, 0] = y
+            traj_row = trajectory_row(&trajectories, n, k, traj_sink)
+            record_state(&traj_row, 0, 0, y)
 
             # Random walker
             while y >= 0 and y <= a_view[k] and t_particle <= deadline_tmp:
@@ -300,37 +1896,31 @@ def full_ddm_hddm_base(np.ndarray[float, ndim = 1] v, # = 0,
                 ix += 1
                 m += 1
                 
-                if n == 0:
-                    if k == 0:
-                        traj_view[ix, 0] = y
+                record_state(&traj_row, ix, 0, y)
                 if m == num_draws:
-                    gaussian_values = draw_gaussian(num_draws)
+                    fill_gaussian(&rng, &gaussian_values[0], num_draws)
                     m = 0
 
             # Apply smoothing with uniform if desired
             if smooth_unif :
                 if t_particle == 0.0:
-                    smooth_u = random_uniform() * 0.5 * delta_t
+                    smooth_u = random_uniform(&rng) * 0.5 * delta_t
                 elif t_particle < deadline_tmp:
-                    smooth_u = (0.5 - random_uniform()) * delta_t
+                    smooth_u = (0.5 - random_uniform(&rng)) * delta_t
                 else:
                     smooth_u = 0.0
             else:
                 smooth_u = 0.0
 
-            rts_view[n, k, 0] = t_particle + t_tmp + smooth_u # Store rt
-            
-            if y < 0:
-                choices_view[n, k, 0] = 0 # Store choice
-            else:
-                choices_view[n, k, 0] = 1
+            rt = t_particle + t_tmp + smooth_u
 
-            # If the rt exceeds the deadline, set rt to -999 and choice to -1 
-            if (rts_view[n, k, 0] >= deadline_view[k]) | (deadline_view[k] <= 0):
-                rts_view[n, k, 0] = -999
+            # If the rt exceeds the deadline, set rt to -999
+            if (rt >= deadline_view[k]) | (deadline_view[k] <= 0):
+                rt = -999
+            store_sample(&sample_output, n, k, rt, ix, 0 if y < 0 else 1)
 
     if return_option == 'full':
-        return {'rts': rts, 'choices': choices, 'metadata': {'v': v,
+        return {**outputs, 'metadata': {'v': v,
                                 'a': a,
                                 'z': z,
                                 't': t,
@@ -348,7 +1938,7 @@ def full_ddm_hddm_base(np.ndarray[float, ndim = 1] v, # = 0,
                                 'boundary_fun_type': 'constant',
                                 'trajectory': traj}}
     elif return_option == 'minimal':
-        return {'rts': rts, 'choices': choices, 'metadata': {'simulator': 'full_ddm_hddm_base', 
+        return {**outputs, 'metadata': {'simulator': 'full_ddm_hddm_base', 
                                                              'possible_choices': [0, 1],
                                                              'n_samples': n_samples,
                                                              'n_trials': n_trials,
@@ -358,6 +1948,61 @@ def full_ddm_hddm_base(np.ndarray[float, ndim = 1] v, # = 0,
 # -------------------------------------------------------------------------------------------------
 
 
+cdef void ddm_sample(const uint64_t* key, uint64_t stream,
+                     float v, float a, float z, float t, float deadline, float s,
+                     float delta_t, float max_t, bint smooth_unif, bint exact,
+                     TrajectoryRow* traj,
+                     const SampleOutput* out, Py_ssize_t n, Py_ssize_t k) noexcept nogil:
+    """
+    Simulate a single (rt, choice) pair from the simple DDM.
+
+    Args:
+        key (const uint64_t*): Seed key of the simulation.
+        stream (uint64_t): Stream id of this sample.
+        v, a, z, t, deadline, s (float): Parameters of the trial.
+        delta_t (float): Time step size.
+        max_t (float): Maximum simulation time.
+        smooth_unif (bool): Whether to apply uniform smoothing to the reaction time.
+        exact (bool): Whether to use the exact first passage sampler instead of Euler steps.
+        traj (TrajectoryRow*): Where the path is recorded.
+        out (const SampleOutput*): Output of the kernel.
+        n, k (Py_ssize_t): Sample and trial index.
+    """
+    cdef RngState rng
+    cdef float y = z * a # starting point
+    cdef float t_particle = 0.0
+    cdef float deadline_tmp = min(max_t, deadline - t)
+    cdef float sqrt_st = sqrt(delta_t) * s
+    cdef float rt
+    cdef double fpt
+    cdef Py_ssize_t ix = 0
+    cdef int choice
+
+    rng_seed_stream(&rng, key, stream)
+    if exact:
+        fpt = wiener_first_passage(&rng, v, a, y, s, &choice)
+        store_sample(out, n, k, exact_rt(fpt, t, deadline, deadline_tmp), 0,
+                     choice if choice != 0 else sign(y))
+        return
+
+    record_state(traj, 0, 0, y)
+
+    # Random walker
+    while y <= a and y >= 0 and t_particle <= deadline_tmp:
+        y += v * delta_t + sqrt_st * random_gaussian(&rng) # update particle position
+        t_particle += delta_t
+        ix += 1
+        record_state(traj, ix, 0, y)
+
+    # Note that for purposes of consistency with Navarro and Fuss,
+    # the choice corresponding the lower barrier is +1, higher barrier is -1
+    rt = t_particle + t + smooth_rt(&rng, t_particle, deadline_tmp, delta_t, smooth_unif)
+
+    # If the rt exceeds the deadline, set rt to -999
+    if rt >= deadline or deadline <= 0:
+        rt = -999
+    store_sample(out, n, k, rt, ix, sign(y))
+
 # Simulate (rt, choice) tuples from: SIMPLE DDM -----------------------------------------------
 # Simplest algorithm
 # delete random comment
@@ -378,6 +2023,13 @@ def ddm(np.ndarray[float, ndim = 1] v, # drift by timestep 'delta_t'
         random_state = None,
         return_option = 'full', # 'full' or 'minimal'
         smooth_unif  = False,
+        int n_threads = 1,
+        method = 'euler',
+        record_trajectories = 0,
+        trajectories_per_trial = False,
+        return_steps = False,
+        layout = 'sample_major',
+        out = None,
         **kwargs):
     """
     Simulate reaction times and choices from a simple drift diffusion model (DDM).
@@ -393,9 +2045,28 @@ def ddm(np.ndarray[float, ndim = 1] v, # drift by timestep 'delta_t'
         delta_t (float): Time step size (default: 0.001).
         n_samples (int): Number of samples per trial (default: 20000).
         n_trials (int): Number of trials to simulate (default: 10).
-        random_state (int or None): Seed for random number generator (default: None).
+        random_state (int, numpy.random.Generator or None): Seed for random number generator (default: None).
         return_option (str): 'full' or 'minimal' return format (default: 'full').
         smooth_unif (bool): Whether to apply uniform smoothing to reaction times (default: False).
+        n_threads (int): Number of threads used to simulate samples in parallel (default: 1).
+        method (str): 'euler' for Euler-Maruyama steps of size delta_t or 'exact' for exact
+            first passage sampling, which ignores smooth_unif and the trajectory (default: 'euler').
+        record_trajectories (int): Number of samples whose paths are returned as the 'trajectory'
+            metadata (default: 0).
+        trajectories_per_trial (bool): Whether to record the first record_trajectories samples
+            of every trial instead of only those of the first trial (default: False).
+        return_steps (bool): Whether to return the number of delta_t steps of every walk
+            under 'steps' instead of the reaction times, as uint16 (uint32 if max_t / delta_t
+            does not fit) with the largest value of the type for omissions, and the choices
+            as int8. Reaction times are steps * delta_t + t. Not available with
+            method 'exact' (default: False).
+        layout (str): 'sample_major' for outputs of shape (n_samples, n_trials, 1),
+            'trial_major' for C-contiguous outputs of shape (n_trials, n_samples), or 'records'
+            for a single float32 array of (rt, choice) rows of shape (n_trials * n_samples, 2),
+            trial by trial, under 'records' (default: 'sample_major').
+        out (np.ndarray or None): Optional preallocated C-contiguous float32 array of shape
+            (..., 2) with n_trials * n_samples rows that the records are written to, for layout
+            'records' (default: None).
         **kwargs: Additional keyword arguments.
 
     Returns:
@@ -406,87 +2077,49 @@ def ddm(np.ndarray[float, ndim = 1] v, # drift by timestep 'delta_t'
         ValueError: If return_option is neither 'full' nor 'minimal'.
     """
 
-    set_seed(random_state)
+    cdef bint exact = parse_method(method, ('euler', 'exact')) == METHOD_EXACT
+    if exact and return_steps:
+        raise ValueError('return_steps requires method="euler"')
+    cdef uint64_t key[4]
+    rng_key_from_seed(random_state, key)
     # Param views
-    cdef float[:] v_view = v
-    cdef float[:] a_view = a
-    cdef float[:] z_view = z
-    cdef float[:] t_view = t
-    cdef float[:] s_view = s
-    cdef float[:] deadline_view = deadline
-
+    cdef const float[:] v_view = v
+    cdef const float[:] a_view = a
+    cdef const float[:] z_view = z
+    cdef const float[:] t_view = t
+    cdef const float[:] s_view = s
+    cdef const float[:] deadline_view = deadline
     # Data-structs for trajectory storage
-    traj = np.zeros((int(max_t / delta_t) + 1, 1), dtype = DTYPE)
-    traj[:, :] = -999 
-    cdef float[:, :] traj_view = traj
-
-    rts = np.zeros((n_samples, n_trials, 1), dtype = DTYPE)
-    choices = np.zeros((n_samples, n_trials, 1), dtype = np.intc)
-    cdef float[:, :, :] rts_view = rts
-    cdef int[:, :, :] choices_view = choices
-
-    cdef float delta_t_sqrt = sqrt(delta_t)
-    #cdef float sqrt_st = delta_t_sqrt * s
-
-    cdef float y, t_particle, smooth_u, deadline_tmp, sqrt_st
-
-    #cdef int n
-    cdef Py_ssize_t n, ix, k
-    cdef int m = 0
-    cdef int num_draws = int(max_t / delta_t + 1)
-    cdef float[:] gaussian_values = draw_gaussian(num_draws)
-    
-    for k in range(n_trials):
-        # Loop over samples
-        deadline_tmp = min(max_t, deadline_view[k] - t_view[k])
-        sqrt_st = delta_t_sqrt * s_view[k]
-        for n in range(n_samples):
-            y = z_view[k] * a_view[k] # reset starting point
-            t_particle = 0.0 # reset time
-            ix = 0 # reset boundary index
-
-            if n == 0:
-                if k == 0:
-                    traj_view[0, 0] = y
-
-            # Random walker
-            while y <= a_view[k] and y >= 0 and t_particle <= deadline_tmp:
-                y += v_view[k] * delta_t + sqrt_st * gaussian_values[m] # update particle position
-                t_particle += delta_t
-                m += 1
-                ix += 1
-
-                if n == 0:
-                    if k == 0:
-                        traj_view[ix, 0] = y
-
-                if m == num_draws:
-                    gaussian_values = draw_gaussian(num_draws)
-                    m = 0
-
-            # Note that for purposes of consistency with Navarro and Fuss, 
-            # the choice corresponding the lower barrier is +1, higher barrier is -1
-
-            # Apply smoothing with uniform if desired
-            if smooth_unif :
-                if t_particle == 0.0:
-                    smooth_u = random_uniform() * 0.5 * delta_t
-                elif t_particle < deadline_tmp:
-                    smooth_u = (0.5 - random_uniform()) * delta_t
-                else:
-                    smooth_u = 0.0
-            else:
-                smooth_u = 0.0
-
-            rts_view[n, k, 0] = t_particle + t_view[k] + smooth_u # store rt
-            choices_view[n, k, 0] = sign(y) # store choice
-
-            # If the rt exceeds the deadline, set rt to -999 and choice to -1 
-            if (rts_view[n, k, 0] >= deadline_view[k]) | (deadline_view[k] <= 0):
-                rts_view[n, k, 0] = -999
+    cdef Trajectories trajectories
+    cdef TrajectoryRow traj_row
+    traj = init_trajectories(&trajectories, record_trajectories, trajectories_per_trial,
+                             n_samples, n_trials, max_t, delta_t, 1)
+    # Per-thread sinks for the samples that are not recorded
+    traj_sink = np.empty((max(1, n_threads), 1 + TRAJECTORY_SINK_PAD), dtype = DTYPE)
+    cdef float[:, ::1] traj_sink_view = traj_sink
+
+    cdef SampleOutput sample_output
+    outputs = init_sample_output(&sample_output, return_steps, layout, n_samples, n_trials,
+                                 max_t, delta_t, out)
+
+    cdef float max_t_c = max_t
+    cdef bint smooth_unif_c = smooth_unif
+    cdef Py_ssize_t i, n, k
+    cdef Py_ssize_t n_total = <Py_ssize_t> n_samples * n_trials
+
+    # Samples are independent given their RNG stream, so (trial, sample) pairs are
+    # distributed over threads; walk lengths vary a lot, hence dynamic scheduling
+    for i in prange(n_total, nogil = True, schedule = 'dynamic', num_threads = n_threads):
+        k = i // n_samples
+        n = i % n_samples
+        traj_row = trajectory_row(&trajectories, n, k, &traj_sink_view[threadid(), 0])
+        ddm_sample(key, i, v_view[k], a_view[k], z_view[k], t_view[k], deadline_view[k], s_view[k],
+                   delta_t, max_t_c, smooth_unif_c, exact,
+                   &traj_row,
+                   &sample_output, n, k)
 
     if return_option == 'full':
-        return {'rts': rts, 'choices': choices,  'metadata': {'v': v,
+        return {**outputs, 'metadata': {'v': v,
                                                             'a': a,
                                                             'z': z,
                                                             't': t,
@@ -501,7 +2134,7 @@ def ddm(np.ndarray[float, ndim = 1] v, # drift by timestep 'delta_t'
                                                             'possible_choices': [-1, 1],
                                                             'trajectory': traj}}
     elif return_option == 'minimal':
-        return {'rts': rts, 'choices': choices,  'metadata': {'simulator': 'ddm', 
+        return {**outputs, 'metadata': {'simulator': 'ddm', 
                                                              'possible_choices': [-1, 1],
                                                              'boundary_fun_type': 'constant',
                                                              'n_samples': n_samples,
@@ -509,6 +2142,64 @@ def ddm(np.ndarray[float, ndim = 1] v, # drift by timestep 'delta_t'
     else:
         raise ValueError('return_option must be either "full" or "minimal"')
 
+cdef void ddm_flexbound_sample(const uint64_t* key, uint64_t stream,
+                               float v, float z, float t, float deadline, float s,
+                               BoundaryBuffer* boundary, float delta_t, float max_t,
+                               bint smooth_unif, int method,
+                               TrajectoryRow* traj,
+                               const SampleOutput* out, Py_ssize_t n, Py_ssize_t k) noexcept nogil:
+    """
+    Simulate a single (rt, choice) pair from the DDM with flexible boundaries.
+
+    Args:
+        key (const uint64_t*): Seed key of the simulation.
+        stream (uint64_t): Stream id of this sample.
+        v, z, t, deadline, s (float): Parameters of the trial.
+        boundary (BoundaryBuffer*): Boundary of the trial.
+        delta_t (float): Time step size.
+        max_t (float): Maximum simulation time.
+        smooth_unif (bool): Whether to apply uniform smoothing to the reaction time.
+        method (int): METHOD_EULER, METHOD_EXACT (constant boundary only) or METHOD_BRIDGE.
+        traj (TrajectoryRow*): Where the path is recorded.
+        out (const SampleOutput*): Output of the kernel.
+        n, k (Py_ssize_t): Sample and trial index.
+    """
+    cdef RngState rng
+    cdef float y = (-1) * boundary_at(boundary, 0) + (z * 2 * (boundary_at(boundary, 0))) # starting position
+    cdef float t_particle = 0.0
+    # if deadline >> max_t, then deadline_tmp = max_t, regardless of t-value, otherwise deadline applies
+    cdef float deadline_tmp = min(max_t, deadline - t)
+    cdef float sqrt_st = sqrt(delta_t) * s
+    cdef float rt
+    cdef double fpt
+    cdef Py_ssize_t ix = 0
+    cdef int choice
+
+    rng_seed_stream(&rng, key, stream)
+    if method == METHOD_EXACT:
+        fpt = wiener_first_passage(&rng, v, 2 * boundary_at(boundary, 0), y + boundary_at(boundary, 0), s, &choice)
+        store_sample(out, n, k, exact_rt(fpt, t, deadline, deadline_tmp), 0,
+                     choice if choice != 0 else sign(y))
+        return
+
+    if method == METHOD_BRIDGE:
+        t_particle = bridge_walk(&rng, &y, v, NULL, 0.0, s, boundary, delta_t,
+                                 deadline_tmp, traj, &ix)
+    else:
+        record_state(traj, 0, 0, y)
+
+        # Random walker
+        while (y >= (-1) * boundary_at(boundary, ix)) and (y <= boundary_at(boundary, ix)) and (t_particle <= deadline_tmp):
+            y += (v * delta_t) + (sqrt_st * random_gaussian(&rng))
+            t_particle += delta_t
+            ix += 1
+            record_state(traj, ix, 0, y)
+
+    rt = t_particle + t + smooth_rt(&rng, t_particle, deadline_tmp, delta_t, smooth_unif)
+    if rt >= deadline or deadline <= 0:
+        rt = -999
+    store_sample(out, n, k, rt, ix, sign(y))
+
 # Simulate (rt, choice) tuples from: DDM WITH FLEXIBLE BOUNDARIES ------------------------------------
 # @cythonboundscheck(False)
 # @cythonwraparound(False)
@@ -517,138 +2208,157 @@ def ddm_flexbound(np.ndarray[float, ndim = 1] v,
                   np.ndarray[float, ndim = 1] z,
                   np.ndarray[float, ndim = 1] t,
                   np.ndarray[float, ndim = 1] deadline,
-                  np.ndarray[float, ndim = 1] s, # noise sigma
-                  float max_t = 20,
-                  float delta_t = 0.001,
-                  int n_samples = 20000,
-                  int n_trials = 1,
-                  boundary_fun = None, # function of t (and potentially other parameters) that takes in (t, *args)
-                  boundary_multiplicative = True,
-                  boundary_params = {},
-                  random_state = None,
-                  return_option = 'full',
-                  smooth_unif  = False,
-                  **kwargs,
-                  ):
-    """
-    Simulate reaction times and choices from a drift diffusion model with flexible boundaries.
-
-    Args:
-        v (np.ndarray): Drift rate for each trial.
-        a (np.ndarray): Boundary separation for each trial.
-        z (np.ndarray): Starting point bias for each trial (between 0 and 1).
-        t (np.ndarray): Non-decision time for each trial.
-        deadline (np.ndarray): Maximum allowed reaction time for each trial.
-        s (np.ndarray): Noise (sigma) for each trial.
-        max_t (float): Maximum time for simulation.
-        delta_t (float): Time step for simulation.
-        n_samples (int): Number of samples to simulate per trial.
-        n_trials (int): Number of trials to simulate.
-        boundary_fun (callable): Function defining the shape of the boundary.
-        boundary_multiplicative (bool): If True, boundary function is multiplied by 'a', else added to 'a'.
-        boundary_params (dict): Parameters for the boundary function.
-        random_state (int or None): Seed for random number generator.
-        return_option (str): 'full' for complete output, 'minimal' for basic output.
-        smooth_unif (bool): Whether to apply uniform smoothing to reaction times.
-        **kwargs: Additional keyword arguments.
-
-    Returns:
-        dict: A dictionary containing simulated reaction times, choices, and metadata.
-    """
-
-    set_seed(random_state)
-    #cdef int cov_length = np.max([v.size, a.size, w.size, t.size]).astype(int)
-    # Param views:
-    cdef float[:] v_view  = v
-    cdef float[:] a_view = a
-    cdef float[:] z_view = z
-    cdef float[:] t_view = t
-    cdef float[:] deadline_view = deadline
-    cdef float[:] s_view = s
-    traj = np.zeros((int(max_t / delta_t) + 1, 1), dtype = DTYPE)
-    traj[:, :] = -999 
-    cdef float[:,:] traj_view = traj
-
-    rts = np.zeros((n_samples, n_trials, 1), dtype = DTYPE)
-    choices = np.zeros((n_samples, n_trials, 1), dtype = np.intc)
-
-    cdef float[:, :, :] rts_view = rts
-    cdef int[:, :, :] choices_view = choices
-
-    cdef float delta_t_sqrt = sqrt(delta_t) # correct scalar so we can use standard normal samples for the brownian motion
-    #cdef float sqrt_st = delta_t_sqrt * s # scalar to ensure the correct variance for the gaussian step
-
-    # Boundary storage for the upper bound
-    cdef int num_draws = int((max_t / delta_t) + 1)
-    t_s = np.arange(0, max_t + delta_t, delta_t).astype(DTYPE)
-    boundary = np.zeros(t_s.shape, dtype = DTYPE)
-
-    cdef float y, t_particle, smooth_u, deadline_tmp, sqrt_st
-    cdef Py_ssize_t n
-    cdef Py_ssize_t ix
-    cdef Py_ssize_t m = 0
-    cdef Py_ssize_t k
-    cdef float[:] gaussian_values = draw_gaussian(num_draws)
-    cdef float[:] boundary_view = boundary
-
-    # Loop over samples
-    for k in range(n_trials):
-        # Precompute boundary evaluations
-        boundary_params_tmp = {key: boundary_params[key][k] for key in boundary_params.keys()}
-        if boundary_multiplicative:
-            boundary[:] = np.multiply(a_view[k], boundary_fun(t = t_s, **boundary_params_tmp)).astype(DTYPE)
-        else:
-            boundary[:] = np.add(a_view[k], boundary_fun(t = t_s, **boundary_params_tmp)).astype(DTYPE)
-    
-        deadline_tmp = min(max_t, deadline_view[k] - t_view[k]) 
-        sqrt_st = delta_t_sqrt * s_view[k]
-        for n in range(n_samples):
-            y = (-1) * boundary_view[0] + (z_view[k] * 2 * (boundary_view[0]))  # reset starting position 
-            t_particle = 0.0 # reset time
-            ix = 0 # reset boundary index
-            # if deadline >> max_t, then deadline_tmp = max_t, regardless of t-value, otherwise deadline applies
-            # Can improve with less checks
-            if n == 0:
-                if k == 0:
-                    traj_view[0, 0] = y
-
-            # Random walker
-            while (y >= (-1) * boundary_view[ix]) and (y <= boundary_view[ix]) and (t_particle <= deadline_tmp):
-                y += (v_view[k] * delta_t) + (sqrt_st * gaussian_values[m])
-                t_particle += delta_t
-                ix += 1
-                m += 1
-                
-                # Can improve with less checks
-                if n == 0:
-                    if k == 0:
-                        traj_view[ix, 0] = y
-                
-                # Can improve with less checks
-                if m == num_draws:
-                    gaussian_values = draw_gaussian(num_draws)
-                    m = 0
-
-            if smooth_unif :
-                if t_particle == 0.0:
-                    smooth_u = random_uniform() * 0.5 * delta_t
-                elif t_particle < deadline_tmp:
-                    smooth_u = (0.5 - random_uniform()) * delta_t
-                else:
-                    smooth_u = 0.0
-            else:
-                smooth_u = 0.0
+                  np.ndarray[float, ndim = 1] s, # noise sigma
+                  float max_t = 20,
+                  float delta_t = 0.001,
+                  int n_samples = 20000,
+                  int n_trials = 1,
+                  boundary_fun = None, # function of t (and potentially other parameters) that takes in (t, *args)
+                  boundary_multiplicative = True,
+                  boundary_params = {},
+                  random_state = None,
+                  return_option = 'full',
+                  smooth_unif  = False,
+                  int n_threads = 1,
+                  method = 'euler',
+                  record_trajectories = 0,
+                  trajectories_per_trial = False,
+                  return_steps = False,
+                  layout = 'sample_major',
+                  out = None,
+                  **kwargs,
+                  ):
+    """
+    Simulate reaction times and choices from a drift diffusion model with flexible boundaries.
 
-            rts_view[n, k, 0] = t_particle + t_view[k] + smooth_u # Store rt
+    Args:
+        v (np.ndarray): Drift rate for each trial.
+        a (np.ndarray): Boundary separation for each trial.
+        z (np.ndarray): Starting point bias for each trial (between 0 and 1).
+        t (np.ndarray): Non-decision time for each trial.
+        deadline (np.ndarray): Maximum allowed reaction time for each trial.
+        s (np.ndarray): Noise (sigma) for each trial.
+        max_t (float): Maximum time for simulation.
+        delta_t (float): Time step for simulation.
+        n_samples (int): Number of samples to simulate per trial.
+        n_trials (int): Number of trials to simulate.
+        boundary_fun (callable): Function defining the shape of the boundary.
+        boundary_multiplicative (bool): If True, boundary function is multiplied by 'a', else added to 'a'.
+        boundary_params (dict): Parameters for the boundary function.
+        random_state (int, numpy.random.Generator or None): Seed for random number generator.
+        return_option (str): 'full' for complete output, 'minimal' for basic output.
+        smooth_unif (bool): Whether to apply uniform smoothing to reaction times.
+        n_threads (int): Number of threads used to simulate samples in parallel.
+        method (str): 'euler' for Euler-Maruyama steps of size delta_t, 'exact' for exact
+            first passage sampling, which requires a constant boundary and ignores smooth_unif
+            and the trajectory, or 'bridge' for Euler steps with Brownian-bridge crossing
+            checks and larger steps away from the bounds.
+        record_trajectories (int): Number of samples whose paths are returned as the 'trajectory'
+            metadata (default: 0).
+        trajectories_per_trial (bool): Whether to record the first record_trajectories samples
+            of every trial instead of only those of the first trial (default: False).
+        return_steps (bool): Whether to return the number of delta_t steps of every walk
+            under 'steps' instead of the reaction times, as uint16 (uint32 if max_t / delta_t
+            does not fit) with the largest value of the type for omissions, and the choices
+            as int8. Reaction times are steps * delta_t + t (default: False).
+        layout (str): 'sample_major' for outputs of shape (n_samples, n_trials, 1),
+            'trial_major' for C-contiguous outputs of shape (n_trials, n_samples), or 'records'
+            for a single float32 array of (rt, choice) rows of shape (n_trials * n_samples, 2),
+            trial by trial, under 'records' (default: 'sample_major').
+        out (np.ndarray or None): Optional preallocated C-contiguous float32 array of shape
+            (..., 2) with n_trials * n_samples rows that the records are written to, for layout
+            'records' (default: None).
+        **kwargs: Additional keyword arguments.
 
-            #rts_view[n, k, 0] = t_particle + t_view[k] # Store rt
-            choices_view[n, k, 0] = sign(y) # Store choice
+    Returns:
+        dict: A dictionary containing simulated reaction times, choices, and metadata.
+    """
 
-            if (rts_view[n, k, 0] >= deadline_view[k]) | (deadline_view[k] <= 0):
-                rts_view[n, k, 0] = -999
+    cdef int method_c = parse_method(method, ('euler', 'exact', 'bridge'))
+    if method_c == METHOD_EXACT and return_steps:
+        raise ValueError('return_steps requires method="euler" or method="bridge"')
+    cdef uint64_t key[4]
+    rng_key_from_seed(random_state, key)
+    # Param views:
+    cdef const float[:] v_view = v
+    cdef const float[:] a_view = a
+    cdef const float[:] z_view = z
+    cdef const float[:] t_view = t
+    cdef const float[:] deadline_view = deadline
+    cdef const float[:] s_view = s
+    cdef Trajectories trajectories
+    cdef TrajectoryRow traj_row
+    traj = init_trajectories(&trajectories, record_trajectories, trajectories_per_trial,
+                             n_samples, n_trials, max_t, delta_t, 1)
+    # Per-thread sinks for the samples that are not recorded
+    traj_sink = np.empty((max(1, n_threads), 1 + TRAJECTORY_SINK_PAD), dtype = DTYPE)
+    cdef float[:, ::1] traj_sink_view = traj_sink
+
+    cdef SampleOutput sample_output
+    outputs = init_sample_output(&sample_output, return_steps, layout, n_samples, n_trials,
+                                 max_t, delta_t, out)
+
+    # Boundary storage. Native boundaries are evaluated lazily in one buffer per thread,
+    # which is kept while the thread simulates samples of the same trial. Other boundaries
+    # (and all of them for method="exact") are evaluated for blocks of trials at a time.
+    t_s = np.arange(0, max_t + delta_t, delta_t).astype(DTYPE)
+    cdef Py_ssize_t n_bound = t_s.shape[0] + 1
+    cdef BoundarySpec boundary_spec
+    cdef BoundaryBuffer boundary_buf
+    boundary_coefs = init_boundary(&boundary_spec, boundary_fun, boundary_multiplicative, boundary_params,
+                                   n_trials, t_s.shape[0], delta_t)
+    cdef bint lazy = (boundary_spec.kind != BOUNDARY_PYTHON) and (method_c != METHOD_EXACT)
+    cdef int block_trials = 1 if lazy else boundary_block_trials(n_trials, n_bound)
+    boundary_block = np.zeros((block_trials, n_bound), dtype = DTYPE)
+    cdef float[:, ::1] boundary_view = boundary_block
+    boundary_threads = np.zeros((max(1, n_threads) if lazy else 1, n_bound), dtype = DTYPE)
+    cdef float[:, ::1] boundary_threads_view = boundary_threads
+    # Trial held by the buffer of each thread and how far it has been evaluated
+    cdef Py_ssize_t[:] boundary_trial_view = np.full(max(1, n_threads), -1, dtype = np.intp)
+    cdef Py_ssize_t[:] boundary_filled_view = np.zeros(max(1, n_threads), dtype = np.intp)
+
+    cdef bint smooth_unif_c = smooth_unif
+    cdef Py_ssize_t i, n, k, k_start, k_end, tid
+
+    for k_start in range(0, n_trials, block_trials):
+        k_end = min(n_trials, k_start + block_trials)
+        if not lazy:
+            # Precompute boundary evaluations
+            compute_boundary_block(boundary_block, a_view, k_start, k_end, t_s, &boundary_spec,
+                                   boundary_fun, boundary_multiplicative, boundary_params)
+            if method_c == METHOD_EXACT:
+                check_constant_boundary(boundary_block, k_end - k_start)
+
+        for i in prange(k_start * n_samples, k_end * n_samples, nogil = True,
+                        schedule = 'dynamic', num_threads = n_threads):
+            k = i // n_samples
+            n = i % n_samples
+            tid = threadid()
+            traj_row = trajectory_row(&trajectories, n, k, &traj_sink_view[tid, 0])
+            if lazy:
+                boundary_buf = boundary_buffer(&boundary_spec, &boundary_threads_view[tid, 0], n_bound,
+                                               boundary_filled_view[tid] if boundary_trial_view[tid] == k else 0,
+                                               k, a_view[k])
+            else:
+                boundary_buf = boundary_buffer(&boundary_spec, &boundary_view[k - k_start, 0], n_bound,
+                                               n_bound, k, a_view[k])
+            ddm_flexbound_sample(key, i, v_view[k], z_view[k], t_view[k], deadline_view[k], s_view[k],
+                                 &boundary_buf, delta_t, max_t,
+                                 smooth_unif_c, method_c,
+                                 &traj_row,
+                                 &sample_output, n, k)
+            boundary_trial_view[tid] = k
+            boundary_filled_view[tid] = boundary_buf.n_filled
+
+    if lazy and n_trials > 0:
+        compute_boundary_block(boundary_block, a_view, n_trials - 1, n_trials, t_s, &boundary_spec,
+                               boundary_fun, boundary_multiplicative, boundary_params)
+
+    # Boundary of the last trial
+    boundary = boundary_block[(n_trials - 1) % block_trials, :t_s.shape[0]].copy()
 
     if return_option == 'full':
-        return {'rts': rts, 'choices': choices,  'metadata': {'v': v,
+        return {**outputs, 'metadata': {'v': v,
                                                               'a': a,
                                                               'z': z,
                                                               't': t,
@@ -666,7 +2376,7 @@ def ddm_flexbound(np.ndarray[float, ndim = 1] v,
                                                               'boundary': boundary,
                                                              }}
     elif return_option == 'minimal':
-        return {'rts': rts, 'choices': choices,  'metadata': {'simulator': 'ddm_flexbound', 
+        return {**outputs, 'metadata': {'simulator': 'ddm_flexbound', 
                                                              'possible_choices': [-1, 1],
                                                              'boundary_fun_type': boundary_fun.__name__,
                                                              'n_samples': n_samples,
@@ -697,6 +2407,12 @@ def ddm_flex(np.ndarray[float, ndim = 1] v,
              random_state = None,
              return_option = 'full',
              smooth_unif  = False,
+             method = 'euler',
+             record_trajectories = 0,
+             trajectories_per_trial = False,
+             return_steps = False,
+             layout = 'sample_major',
+             out = None,
              **kwargs):
     """
     Simulate reaction times and choices from a drift diffusion model with flexible boundaries and flexible drift.
@@ -717,9 +2433,26 @@ def ddm_flex(np.ndarray[float, ndim = 1] v,
         boundary_multiplicative (bool): If True, boundary function is multiplicative; if False, additive.
         boundary_params (dict): Parameters for the boundary function.
         drift_params (dict): Parameters for the drift function.
-        random_state (int or None): Seed for random number generator (default: None).
+        random_state (int, numpy.random.Generator or None): Seed for random number generator (default: None).
         return_option (str): 'full' or 'minimal' return format (default: 'full').
         smooth_unif (bool): Whether to apply uniform smoothing to reaction times (default: False).
+        method (str): 'euler' for Euler-Maruyama steps of size delta_t or 'bridge' for Euler
+            steps with Brownian-bridge crossing checks and larger steps away from the bounds.
+        record_trajectories (int): Number of samples whose paths are returned as the 'trajectory'
+            metadata (default: 0).
+        trajectories_per_trial (bool): Whether to record the first record_trajectories samples
+            of every trial instead of only those of the first trial (default: False).
+        return_steps (bool): Whether to return the number of delta_t steps of every walk
+            under 'steps' instead of the reaction times, as uint16 (uint32 if max_t / delta_t
+            does not fit) with the largest value of the type for omissions, and the choices
+            as int8. Reaction times are steps * delta_t + t (default: False).
+        layout (str): 'sample_major' for outputs of shape (n_samples, n_trials, 1),
+            'trial_major' for C-contiguous outputs of shape (n_trials, n_samples), or 'records'
+            for a single float32 array of (rt, choice) rows of shape (n_trials * n_samples, 2),
+            trial by trial, under 'records' (default: 'sample_major').
+        out (np.ndarray or None): Optional preallocated C-contiguous float32 array of shape
+            (..., 2) with n_trials * n_samples rows that the records are written to, for layout
+            'records' (default: None).
         **kwargs: Additional keyword arguments.
 
     Returns:
@@ -730,104 +2463,111 @@ def ddm_flex(np.ndarray[float, ndim = 1] v,
         ValueError: If return_option is neither 'full' nor 'minimal'.
     """
 
-    set_seed(random_state)
+    cdef int method_c = parse_method(method, ('euler', 'bridge'))
+    cdef RngState rng
+    rng_init(&rng, random_state)
     # Param views:
-    cdef float[:] v_view = v
-    cdef float[:] a_view = a
-    cdef float[:] z_view = z
-    cdef float[:] t_view = t
-    cdef float[:] deadline_view = deadline
-    cdef float[:] s_view = s
-
-    traj = np.zeros((int(max_t / delta_t) + 1, 1), dtype = DTYPE)
-    traj[:, :] = -999 
-    cdef float[:,:] traj_view = traj
-
-    rts = np.zeros((n_samples, n_trials, 1), dtype = DTYPE)
-    choices = np.zeros((n_samples, n_trials, 1), dtype = np.intc)
-
-    cdef float[:, :, :] rts_view = rts
-    cdef int[:, :, :] choices_view = choices
+    cdef const float[:] v_view = v
+    cdef const float[:] a_view = a
+    cdef const float[:] z_view = z
+    cdef const float[:] t_view = t
+    cdef const float[:] deadline_view = deadline
+    cdef const float[:] s_view = s
+    cdef Trajectories trajectories
+    cdef TrajectoryRow traj_row
+    cdef float traj_sink[1]
+    traj = init_trajectories(&trajectories, record_trajectories, trajectories_per_trial,
+                             n_samples, n_trials, max_t, delta_t, 1)
+
+    cdef SampleOutput sample_output
+    outputs = init_sample_output(&sample_output, return_steps, layout, n_samples, n_trials,
+                                 max_t, delta_t, out)
 
     cdef float delta_t_sqrt = sqrt(delta_t) # correct scalar so we can use standard normal samples for the brownian motion
     #cdef float sqrt_st = delta_t_sqrt * s # scalar to ensure the correct variance for the gaussian step
 
     # Boundary storage for the upper bound
-    cdef int num_draws = int((max_t / delta_t) + 1)
+    cdef int num_draws = noise_buffer_size(max_t, delta_t)
     t_s = np.arange(0, max_t + delta_t, delta_t).astype(DTYPE)
     boundary = np.zeros(t_s.shape, dtype = DTYPE)
     drift = np.zeros(t_s.shape, dtype = DTYPE)
-    cdef float y, t_particle, smooth_u, deadline_tmp, sqrt_st
+    cdef float y, t_particle, smooth_u, deadline_tmp, sqrt_st, rt
     cdef Py_ssize_t n 
     cdef Py_ssize_t ix
     cdef Py_ssize_t m = 0
     cdef Py_ssize_t k
-    cdef float[:] gaussian_values = draw_gaussian(num_draws)
+    cdef float[:] gaussian_values = draw_gaussian(&rng, num_draws)
     cdef float[:] boundary_view = boundary
+    cdef BoundarySpec boundary_spec
+    boundary_coefs = init_boundary(&boundary_spec, boundary_fun, boundary_multiplicative, boundary_params,
+                                   n_trials, t_s.shape[0], delta_t)
+    cdef BoundaryBuffer boundary_buf = boundary_buffer(&boundary_spec, &boundary_view[0], boundary_view.shape[0],
+                                                       0, 0, 0.0)
     cdef float[:] drift_view = drift
+    cdef DriftSpec drift_spec
+    drift_coefs = init_drift(&drift_spec, drift_fun, drift_params, n_trials, 1, t_s.shape[0], delta_t)
+    cdef DriftBuffer drift_buf = drift_buffer(&drift_spec, &drift_view[0], drift_view.shape[0])
 
     # Loop over samples
     for k in range(n_trials):
         # Precompute boundary evaluations and drift evaluations
         
         # Drift
-        drift_params_tmp = {key: drift_params[key][k] for key in drift_params.keys()}
-        drift[:] = np.add(v_view[k], drift_fun(t = t_s, **drift_params_tmp)).astype(DTYPE)
+        evaluate_drift(&drift_buf, drift, k, v_view[k], t_s, drift_fun, drift_params)
 
         # Boundary
-        boundary_params_tmp = {key: boundary_params[key][k] for key in boundary_params.keys()}
-        if boundary_multiplicative:
-            boundary[:] = np.multiply(a_view[k], boundary_fun(t = t_s, **boundary_params_tmp)).astype(DTYPE)
-        else:
-            boundary[:] = np.add(a_view[k], boundary_fun(t = t_s, **boundary_params_tmp)).astype(DTYPE)
+        evaluate_boundary(&boundary_buf, boundary, k, a_view[k], t_s, boundary_fun, boundary_params, True)
 
         deadline_tmp = min(max_t, deadline_view[k] - t_view[k])
         sqrt_st = delta_t_sqrt * s_view[k]
         for n in range(n_samples):
-            y = (-1) * boundary_view[0] + (z_view[k] * 2 * (boundary_view[0]))  # reset starting position 
+            y = (-1) * boundary_at(&boundary_buf, 0) + (z_view[k] * 2 * (boundary_at(&boundary_buf, 0)))  # reset starting position 
             t_particle = 0.0 # reset time
             ix = 0 # reset boundary index
             
-            # Can improve with less checks
-            if n == 0:
-                if k == 0:
-                    traj_view[0, 0] = y
+            traj_row = trajectory_row(&trajectories, n, k, traj_sink)
+            record_state(&traj_row, 0, 0, y)
 
             # Random walker
-            while (y >= (-1) * boundary_view[ix]) and (y <= boundary_view[ix]) and (t_particle <= deadline_tmp):
-                y += (drift_view[ix] * delta_t) + (sqrt_st * gaussian_values[m])
-                t_particle += delta_t
-                ix += 1
-                m += 1
+            if method_c == METHOD_BRIDGE:
+                t_particle = bridge_walk(&rng, &y, 0.0, &drift_buf, 0.0, s_view[k],
+                                         &boundary_buf, delta_t, deadline_tmp,
+                                         &traj_row, &ix)
+            else:
+                while (y >= (-1) * boundary_at(&boundary_buf, ix)) and (y <= boundary_at(&boundary_buf, ix)) and (t_particle <= deadline_tmp):
+                    y += (drift_at(&drift_buf, ix, 0) * delta_t) + (sqrt_st * gaussian_values[m])
+                    t_particle += delta_t
+                    ix += 1
+                    m += 1
                 
-                # Can improve with less checks
-                if n == 0:
-                    if k == 0:
-                        traj_view[ix, 0] = y
+                    record_state(&traj_row, ix, 0, y)
                 
-                # Can improve with less checks
-                if m == num_draws:
-                    gaussian_values = draw_gaussian(num_draws)
-                    m = 0
+                    # Can improve with less checks
+                    if m == num_draws:
+                        fill_gaussian(&rng, &gaussian_values[0], num_draws)
+                        m = 0
 
             if smooth_unif :
                 if t_particle == 0.0:
-                    smooth_u = random_uniform() * 0.5 * delta_t
+                    smooth_u = random_uniform(&rng) * 0.5 * delta_t
                 elif t_particle < deadline_tmp:
-                    smooth_u = (0.5 - random_uniform()) * delta_t
+                    smooth_u = (0.5 - random_uniform(&rng)) * delta_t
                 else:
                     smooth_u = 0.0
             else:
                 smooth_u = 0.0
 
-            rts_view[n, k, 0] = t_particle + t_view[k] + smooth_u # Store rt
-            choices_view[n, k, 0] = sign(y) # Store choice
-
-            if (rts_view[n, k, 0] >= deadline_view[k]) | (deadline_view[k] <= 0):
-                rts_view[n, k, 0] = -999
+            rt = t_particle + t_view[k] + smooth_u
+            if (rt >= deadline_view[k]) | (deadline_view[k] <= 0):
+                rt = -999
+            store_sample(&sample_output, n, k, rt, ix, sign(y))
             
+    # Whole boundary and drift of the last trial for the metadata
+    fill_boundary(&boundary_buf, boundary_buf.n_bound)
+    fill_drift(&drift_buf, drift_buf.n_bound)
+
     if return_option == 'full':
-        return {'rts': rts, 'choices': choices,  'metadata': {'v': v,
+        return {**outputs, 'metadata': {'v': v,
                                                             'a': a,
                                                             'z': z,
                                                             't': t,
@@ -847,7 +2587,7 @@ def ddm_flex(np.ndarray[float, ndim = 1] v,
                                                             'drift': drift,
                                                             'boundary': boundary}}
     elif return_option == 'minimal':
-        return {'rts': rts, 'choices': choices,  'metadata': {'simulator': 'ddm_flex', 
+        return {**outputs, 'metadata': {'simulator': 'ddm_flex', 
                                                              'possible_choices': [-1, 1],
                                                              'boundary_fun_type': boundary_fun.__name__,
                                                              'drift_fun_type': boundary_fun.__name__,
@@ -880,6 +2620,12 @@ def ddm_flex_leak(np.ndarray[float, ndim = 1] v,
              random_state = None,
              return_option = 'full',
              smooth_unif  = False,
+             method = 'euler',
+             record_trajectories = 0,
+             trajectories_per_trial = False,
+             return_steps = False,
+             layout = 'sample_major',
+             out = None,
              **kwargs):
     """
     Simulate reaction times and choices from a drift diffusion model with flexible boundaries, flexible drift, and decay.
@@ -901,9 +2647,26 @@ def ddm_flex_leak(np.ndarray[float, ndim = 1] v,
         boundary_multiplicative (bool): If True, boundary function is multiplicative; if False, additive.
         boundary_params (dict): Parameters for the boundary function.
         drift_params (dict): Parameters for the drift function.
-        random_state (int or None): Seed for random number generator (default: None).
+        random_state (int, numpy.random.Generator or None): Seed for random number generator (default: None).
         return_option (str): 'full' or 'minimal' return format (default: 'full').
         smooth_unif (bool): Whether to apply uniform smoothing to reaction times (default: False).
+        method (str): 'euler' for Euler-Maruyama steps of size delta_t or 'bridge' for Euler
+            steps with Brownian-bridge crossing checks and larger steps away from the bounds.
+        record_trajectories (int): Number of samples whose paths are returned as the 'trajectory'
+            metadata (default: 0).
+        trajectories_per_trial (bool): Whether to record the first record_trajectories samples
+            of every trial instead of only those of the first trial (default: False).
+        return_steps (bool): Whether to return the number of delta_t steps of every walk
+            under 'steps' instead of the reaction times, as uint16 (uint32 if max_t / delta_t
+            does not fit) with the largest value of the type for omissions, and the choices
+            as int8. Reaction times are steps * delta_t + t (default: False).
+        layout (str): 'sample_major' for outputs of shape (n_samples, n_trials, 1),
+            'trial_major' for C-contiguous outputs of shape (n_trials, n_samples), or 'records'
+            for a single float32 array of (rt, choice) rows of shape (n_trials * n_samples, 2),
+            trial by trial, under 'records' (default: 'sample_major').
+        out (np.ndarray or None): Optional preallocated C-contiguous float32 array of shape
+            (..., 2) with n_trials * n_samples rows that the records are written to, for layout
+            'records' (default: None).
         **kwargs: Additional keyword arguments.
 
     Returns:
@@ -914,106 +2677,113 @@ def ddm_flex_leak(np.ndarray[float, ndim = 1] v,
         ValueError: If return_option is neither 'full' nor 'minimal'.
     """
 
-    set_seed(random_state)
+    cdef int method_c = parse_method(method, ('euler', 'bridge'))
+    cdef RngState rng
+    rng_init(&rng, random_state)
     # Param views:
-    cdef float[:] v_view = v
-    cdef float[:] a_view = a
-    cdef float[:] z_view = z
-    cdef float[:] g_view = g
-    cdef float[:] t_view = t
-    cdef float[:] deadline_view = deadline
-    cdef float[:] s_view = s
-
-    traj = np.zeros((int(max_t / delta_t) + 1, 1), dtype = DTYPE)
-    traj[:, :] = -999 
-    cdef float[:,:] traj_view = traj
-
-    rts = np.zeros((n_samples, n_trials, 1), dtype = DTYPE)
-    choices = np.zeros((n_samples, n_trials, 1), dtype = np.intc)
-
-    cdef float[:, :, :] rts_view = rts
-    cdef int[:, :, :] choices_view = choices
+    cdef const float[:] v_view = v
+    cdef const float[:] a_view = a
+    cdef const float[:] z_view = z
+    cdef const float[:] g_view = g
+    cdef const float[:] t_view = t
+    cdef const float[:] deadline_view = deadline
+    cdef const float[:] s_view = s
+    cdef Trajectories trajectories
+    cdef TrajectoryRow traj_row
+    cdef float traj_sink[1]
+    traj = init_trajectories(&trajectories, record_trajectories, trajectories_per_trial,
+                             n_samples, n_trials, max_t, delta_t, 1)
+
+    cdef SampleOutput sample_output
+    outputs = init_sample_output(&sample_output, return_steps, layout, n_samples, n_trials,
+                                 max_t, delta_t, out)
 
     cdef float delta_t_sqrt = sqrt(delta_t) # correct scalar so we can use standard normal samples for the brownian motion
     #cdef float sqrt_st = delta_t_sqrt * s # scalar to ensure the correct variance for the gaussian step
 
     # Boundary storage for the upper bound
-    cdef int num_draws = int((max_t / delta_t) + 1)
+    cdef int num_draws = noise_buffer_size(max_t, delta_t)
     t_s = np.arange(0, max_t + delta_t, delta_t).astype(DTYPE)
     boundary = np.zeros(t_s.shape, dtype = DTYPE)
     drift = np.zeros(t_s.shape, dtype = DTYPE)
-    cdef float y, t_particle, smooth_u, deadline_tmp, sqrt_st
+    cdef float y, t_particle, smooth_u, deadline_tmp, sqrt_st, rt
     cdef Py_ssize_t n 
     cdef Py_ssize_t ix
     cdef Py_ssize_t m = 0
     cdef Py_ssize_t k
-    cdef float[:] gaussian_values = draw_gaussian(num_draws)
+    cdef float[:] gaussian_values = draw_gaussian(&rng, num_draws)
     cdef float[:] boundary_view = boundary
+    cdef BoundarySpec boundary_spec
+    boundary_coefs = init_boundary(&boundary_spec, boundary_fun, boundary_multiplicative, boundary_params,
+                                   n_trials, t_s.shape[0], delta_t)
+    cdef BoundaryBuffer boundary_buf = boundary_buffer(&boundary_spec, &boundary_view[0], boundary_view.shape[0],
+                                                       0, 0, 0.0)
     cdef float[:] drift_view = drift
+    cdef DriftSpec drift_spec
+    drift_coefs = init_drift(&drift_spec, drift_fun, drift_params, n_trials, 1, t_s.shape[0], delta_t)
+    cdef DriftBuffer drift_buf = drift_buffer(&drift_spec, &drift_view[0], drift_view.shape[0])
 
     # Loop over samples
     for k in range(n_trials):
         # Precompute boundary evaluations and drift evaluations
         
         # Drift
-        drift_params_tmp = {key: drift_params[key][k] for key in drift_params.keys()}
-        drift[:] = np.add(v_view[k], drift_fun(t = t_s, **drift_params_tmp)).astype(DTYPE)
+        evaluate_drift(&drift_buf, drift, k, v_view[k], t_s, drift_fun, drift_params)
 
         # Boundary
-        boundary_params_tmp = {key: boundary_params[key][k] for key in boundary_params.keys()}
-        if boundary_multiplicative:
-            boundary[:] = np.multiply(a_view[k], boundary_fun(t = t_s, **boundary_params_tmp)).astype(DTYPE)
-        else:
-            boundary[:] = np.add(a_view[k], boundary_fun(t = t_s, **boundary_params_tmp)).astype(DTYPE)
+        evaluate_boundary(&boundary_buf, boundary, k, a_view[k], t_s, boundary_fun, boundary_params, True)
 
         deadline_tmp = min(max_t, deadline_view[k] - t_view[k])
         sqrt_st = delta_t_sqrt * s_view[k]
         for n in range(n_samples):
-            y = (-1) * boundary_view[0] + (z_view[k] * 2 * (boundary_view[0]))  # reset starting position 
+            y = (-1) * boundary_at(&boundary_buf, 0) + (z_view[k] * 2 * (boundary_at(&boundary_buf, 0)))  # reset starting position 
             t_particle = 0.0 # reset time
             ix = 0 # reset boundary index
             
             
-            # Can improve with less checks
-            if n == 0:
-                if k == 0:
-                    traj_view[0, 0] = y
+            traj_row = trajectory_row(&trajectories, n, k, traj_sink)
+            record_state(&traj_row, 0, 0, y)
 
             # Random walker
-            while (y >= (-1) * boundary_view[ix]) and (y <= boundary_view[ix]) and (t_particle <= deadline_tmp):
-                y += ((drift_view[ix] - (g_view[k] * y)) * delta_t) + (sqrt_st * gaussian_values[m])
-                t_particle += delta_t
-                ix += 1
-                m += 1
+            if method_c == METHOD_BRIDGE:
+                t_particle = bridge_walk(&rng, &y, 0.0, &drift_buf, g_view[k], s_view[k],
+                                         &boundary_buf, delta_t, deadline_tmp,
+                                         &traj_row, &ix)
+            else:
+                while (y >= (-1) * boundary_at(&boundary_buf, ix)) and (y <= boundary_at(&boundary_buf, ix)) and (t_particle <= deadline_tmp):
+                    y += ((drift_at(&drift_buf, ix, 0) - (g_view[k] * y)) * delta_t) + (sqrt_st * gaussian_values[m])
+                    t_particle += delta_t
+                    ix += 1
+                    m += 1
                 
-                # Can improve with less checks
-                if n == 0:
-                    if k == 0:
-                        traj_view[ix, 0] = y
+                    record_state(&traj_row, ix, 0, y)
                 
-                # Can improve with less checks
-                if m == num_draws:
-                    gaussian_values = draw_gaussian(num_draws)
-                    m = 0
+                    # Can improve with less checks
+                    if m == num_draws:
+                        fill_gaussian(&rng, &gaussian_values[0], num_draws)
+                        m = 0
 
             if smooth_unif :
                 if t_particle == 0.0:
-                    smooth_u = random_uniform() * 0.5 * delta_t
+                    smooth_u = random_uniform(&rng) * 0.5 * delta_t
                 elif t_particle < deadline_tmp:
-                    smooth_u = (0.5 - random_uniform()) * delta_t
+                    smooth_u = (0.5 - random_uniform(&rng)) * delta_t
                 else:
                     smooth_u = 0.0
             else:
                 smooth_u = 0.0
 
-            rts_view[n, k, 0] = t_particle + t_view[k] + smooth_u # Store rt
-            choices_view[n, k, 0] = sign(y) # Store choice
-
-            if (rts_view[n, k, 0] >= deadline_view[k]) | (deadline_view[k] <= 0):
-                rts_view[n, k, 0] = -999
+            rt = t_particle + t_view[k] + smooth_u
+            if (rt >= deadline_view[k]) | (deadline_view[k] <= 0):
+                rt = -999
+            store_sample(&sample_output, n, k, rt, ix, sign(y))
     
+    # Whole boundary and drift of the last trial for the metadata
+    fill_boundary(&boundary_buf, boundary_buf.n_bound)
+    fill_drift(&drift_buf, drift_buf.n_bound)
+
     if return_option == 'full':
-        return {'rts': rts, 'choices': choices,  'metadata': {'v': v,
+        return {**outputs, 'metadata': {'v': v,
                                                             'a': a,
                                                             'z': z,
                                                             'g': g,
@@ -1034,7 +2804,7 @@ def ddm_flex_leak(np.ndarray[float, ndim = 1] v,
                                                             'drift': drift,
                                                             'boundary': boundary}}
     elif return_option == 'minimal':
-        return {'rts': rts, 'choices': choices,  'metadata': {'simulator': 'ddm_flex_leak', 
+        return {**outputs, 'metadata': {'simulator': 'ddm_flex_leak', 
                                                              'possible_choices': [-1, 1],
                                                              'boundary_fun_type': boundary_fun.__name__,
                                                              'drift_fun_type': boundary_fun.__name__,
@@ -1071,6 +2841,12 @@ def ddm_flex_leak2(
     random_state = None,
     return_option = 'full',
     smooth_unif  = False,
+    method = 'euler',
+    record_trajectories = 0,
+    trajectories_per_trial = False,
+    return_steps = False,
+    layout = 'sample_major',
+    out = None,
     **kwargs):
     """
     Simulate reaction times and choices from a sequential sampling model that pools choice evidence across two sensory 
@@ -1102,9 +2878,26 @@ def ddm_flex_leak2(
         boundary_multiplicative (bool): If True, boundary function is multiplicative; if False, additive.
         boundary_params (dict): Parameters for the boundary function.
         drift_params (dict): Parameters for the drift function.
-        random_state (int or None): Seed for random number generator (default: None).
+        random_state (int, numpy.random.Generator or None): Seed for random number generator (default: None).
         return_option (str): 'full' or 'minimal' return format (default: 'full').
         smooth_unif (bool): Whether to apply uniform smoothing to reaction times (default: False).
+        method (str): 'euler' for Euler-Maruyama steps of size delta_t or 'bridge' for Euler
+            steps with Brownian-bridge crossing checks and larger steps away from the bounds.
+        record_trajectories (int): Number of samples whose paths are returned as the 'trajectory'
+            metadata (default: 0).
+        trajectories_per_trial (bool): Whether to record the first record_trajectories samples
+            of every trial instead of only those of the first trial (default: False).
+        return_steps (bool): Whether to return the number of delta_t steps of every walk
+            under 'steps' instead of the reaction times, as uint16 (uint32 if max_t / delta_t
+            does not fit) with the largest value of the type for omissions, and the choices
+            as int8. Reaction times are steps * delta_t + t (default: False).
+        layout (str): 'sample_major' for outputs of shape (n_samples, n_trials, 1),
+            'trial_major' for C-contiguous outputs of shape (n_trials, n_samples), or 'records'
+            for a single float32 array of (rt, choice) rows of shape (n_trials * n_samples, 2),
+            trial by trial, under 'records' (default: 'sample_major').
+        out (np.ndarray or None): Optional preallocated C-contiguous float32 array of shape
+            (..., 2) with n_trials * n_samples rows that the records are written to, for layout
+            'records' (default: None).
         **kwargs: Additional keyword arguments.
 
     Returns:
@@ -1115,27 +2908,28 @@ def ddm_flex_leak2(
         ValueError: If return_option is neither 'full' nor 'minimal'.
     """
 
-    set_seed(random_state)
+    cdef int method_c = parse_method(method, ('euler', 'bridge'))
+    cdef RngState rng
+    rng_init(&rng, random_state)
     # Param views:
-    cdef float[:] a_view = a
-    cdef float[:] z_view = z
-    cdef float[:] g_t_view = gt
-    cdef float[:] g_d_view = gd
-    cdef float[:] t_view = t
-    cdef float[:] deadline_view = deadline
-    cdef float[:] s_view = s
-
-    cdef int num_draws = int((max_t / delta_t) + 1)
+    cdef const float[:] a_view = a
+    cdef const float[:] z_view = z
+    cdef const float[:] g_t_view = gt
+    cdef const float[:] g_d_view = gd
+    cdef const float[:] t_view = t
+    cdef const float[:] deadline_view = deadline
+    cdef const float[:] s_view = s
+    cdef int num_draws = noise_buffer_size(max_t, delta_t)
     
-    traj = np.zeros((num_draws, 3), dtype = DTYPE)
-    traj[:, :] = -999
-    cdef float[:, :] traj_view = traj
-
-    rts = np.zeros((n_samples, n_trials, 1), dtype = DTYPE)
-    choices = np.zeros((n_samples, n_trials, 1), dtype = np.intc)
+    cdef Trajectories trajectories
+    cdef TrajectoryRow traj_row
+    cdef float traj_sink[3]
+    traj = init_trajectories(&trajectories, record_trajectories, trajectories_per_trial,
+                             n_samples, n_trials, max_t, delta_t, 3)
 
-    cdef float[:, :, :] rts_view = rts
-    cdef int[:, :, :] choices_view = choices
+    cdef SampleOutput sample_output
+    outputs = init_sample_output(&sample_output, return_steps, layout, n_samples, n_trials,
+                                 max_t, delta_t, out)
 
     cdef float delta_t_sqrt = sqrt(delta_t) # correct scalar so we can use standard normal samples for the brownian motion
 
@@ -1143,87 +2937,122 @@ def ddm_flex_leak2(
     t_s = np.arange(0, max_t + delta_t, delta_t).astype(DTYPE)
     boundary = np.zeros(t_s.shape, dtype = DTYPE)
     drift = np.zeros((t_s.shape[0], 2), dtype = DTYPE)
-    cdef float y_t, y_d, y_start, y, t_particle, smooth_u, deadline_tmp, sqrt_st
+    cdef float y_t, y_d, y_start, y, t_particle, smooth_u, deadline_tmp, sqrt_st, rt
+    cdef float mu_t, mu_d, y_new, b_new, h, noise, w
+    cdef Py_ssize_t n_bound = t_s.shape[0]
+    cdef Py_ssize_t stride, j
+    cdef int crossed
     cdef Py_ssize_t n 
     cdef Py_ssize_t ix
     cdef Py_ssize_t m = 0
     cdef Py_ssize_t k
-    cdef float[:] gaussian_values = draw_gaussian(num_draws)
+    cdef float[:] gaussian_values = draw_gaussian(&rng, num_draws)
     cdef float[:] boundary_view = boundary
+    cdef BoundarySpec boundary_spec
+    boundary_coefs = init_boundary(&boundary_spec, boundary_fun, boundary_multiplicative, boundary_params,
+                                   n_trials, t_s.shape[0], delta_t)
+    cdef BoundaryBuffer boundary_buf = boundary_buffer(&boundary_spec, &boundary_view[0], boundary_view.shape[0],
+                                                       0, 0, 0.0)
     cdef float[:, :] drift_view = drift
+    cdef DriftSpec drift_spec
+    drift_coefs = init_drift(&drift_spec, drift_fun, drift_params, n_trials, 2, t_s.shape[0], delta_t)
+    cdef DriftBuffer drift_buf = drift_buffer(&drift_spec, &drift_view[0, 0], drift_view.shape[0])
 
     # Loop over samples
     for k in range(n_trials):
         # Precompute boundary evaluations and drift evaluations
         
         # Drift
-        drift_params_tmp = {key: drift_params[key][k] for key in drift_params.keys()}
-        drift[:, :] = drift_fun(t = t_s, **drift_params_tmp).astype(DTYPE)
+        evaluate_drift(&drift_buf, drift, k, 0.0, t_s, drift_fun, drift_params)
 
         # Boundary
-        boundary_params_tmp = {key: boundary_params[key][k] for key in boundary_params.keys()}
-        if boundary_multiplicative:
-            boundary[:] = np.multiply(a_view[k], boundary_fun(t = t_s, **boundary_params_tmp)).astype(DTYPE)
-        else:
-            boundary[:] = np.add(a_view[k], boundary_fun(t = t_s, **boundary_params_tmp)).astype(DTYPE)
+        evaluate_boundary(&boundary_buf, boundary, k, a_view[k], t_s, boundary_fun, boundary_params, True)
 
         deadline_tmp = min(max_t, deadline_view[k] - t_view[k])
         sqrt_st = delta_t_sqrt * s_view[k]
         for n in range(n_samples):
-            y_start = (-1) * boundary_view[0] + (z_view[k] * 2 * (boundary_view[0]))  # reset starting position
+            y_start = (-1) * boundary_at(&boundary_buf, 0) + (z_view[k] * 2 * (boundary_at(&boundary_buf, 0)))  # reset starting position
             y = y_start
             y_t = 0.0
             y_d = 0.0
             t_particle = 0.0 # reset time
             ix = 0 # reset boundary index
             
-            # Can improve with less checks
-            if n == 0:
-                if k == 0:
-                    traj_view[0, 0] = y
-                    traj_view[0, 1] = y_t
-                    traj_view[0, 2] = y_d
+            traj_row = trajectory_row(&trajectories, n, k, traj_sink)
+            record_state(&traj_row, 0, 0, y)
+            record_state(&traj_row, 0, 1, y_t)
+            record_state(&traj_row, 0, 2, y_d)
 
             # Random walker
-            while (y >= (-1) * boundary_view[ix]) and (y <= boundary_view[ix]) and (t_particle <= deadline_tmp):
-                y_t += ((drift_view[ix, 0] - (g_t_view[k] * y_t)) * delta_t) + (sqrt_st/2 * gaussian_values[m])
-                y_d += ((drift_view[ix, 1] - (g_d_view[k] * y_d)) * delta_t) + (sqrt_st/2 * gaussian_values[m])
-                y = y_start + y_t + y_d
+            if method_c == METHOD_BRIDGE:
+                # Brownian-bridge crossing checks on the combined DV
+                crossed = 0
+                while (y >= (-1) * boundary_at(&boundary_buf, ix)) and (y <= boundary_at(&boundary_buf, ix)) and (t_particle <= deadline_tmp):
+                    mu_t = drift_at(&drift_buf, ix, 0) - (g_t_view[k] * y_t)
+                    mu_d = drift_at(&drift_buf, ix, 1) - (g_d_view[k] * y_d)
+                    stride = bridge_stride(y, mu_t + mu_d, s_view[k], &boundary_buf, ix,
+                                           delta_t, deadline_tmp - t_particle)
+                    h = stride * delta_t
+                    noise = s_view[k] * sqrt(h) / 2 * random_gaussian(&rng)
+                    y_new = y + (mu_t + mu_d) * h + 2 * noise
+                    b_new = boundary_at(&boundary_buf, ix + stride)
+                    if (y_new >= (-1) * b_new) and (y_new <= b_new):
+                        crossed = bridge_crossing(&rng, y, y_new, boundary_at(&boundary_buf, ix), b_new, s_view[k] * s_view[k] * h)
+
+                    for j in range(1, stride + 1):
+                        w = <float> j / stride
+                        record_state(&traj_row, ix + j, 0, y + w * ((crossed * b_new if crossed != 0 else y_new) - y))
+                        record_state(&traj_row, ix + j, 1, y_t + w * (mu_t * h + noise))
+                        record_state(&traj_row, ix + j, 2, y_d + w * (mu_d * h + noise))
+
+                    y_t += mu_t * h + noise
+                    y_d += mu_d * h + noise
+                    y = y_start + y_t + y_d
+                    t_particle += h
+                    ix = min(ix + stride, n_bound - 1)
+                    if crossed != 0:
+                        y = crossed * b_new
+                        break
+            else:
+                while (y >= (-1) * boundary_at(&boundary_buf, ix)) and (y <= boundary_at(&boundary_buf, ix)) and (t_particle <= deadline_tmp):
+                    y_t += ((drift_at(&drift_buf, ix, 0) - (g_t_view[k] * y_t)) * delta_t) + (sqrt_st/2 * gaussian_values[m])
+                    y_d += ((drift_at(&drift_buf, ix, 1) - (g_d_view[k] * y_d)) * delta_t) + (sqrt_st/2 * gaussian_values[m])
+                    y = y_start + y_t + y_d
 
-                t_particle += delta_t
-                ix += 1
-                m += 1
+                    t_particle += delta_t
+                    ix += 1
+                    m += 1
                 
-                # Can improve with less checks
-                if n == 0:
-                    if k == 0:
-                        traj_view[ix, 0] = y
-                        traj_view[ix, 1] = y_t
-                        traj_view[ix, 2] = y_d
+                    record_state(&traj_row, ix, 0, y)
+                    record_state(&traj_row, ix, 1, y_t)
+                    record_state(&traj_row, ix, 2, y_d)
                 
-                # Can improve with less checks
-                if m == num_draws:
-                    gaussian_values = draw_gaussian(num_draws)
-                    m = 0
+                    # Can improve with less checks
+                    if m == num_draws:
+                        fill_gaussian(&rng, &gaussian_values[0], num_draws)
+                        m = 0
 
             if smooth_unif :
                 if t_particle == 0.0:
-                    smooth_u = random_uniform() * 0.5 * delta_t
+                    smooth_u = random_uniform(&rng) * 0.5 * delta_t
                 elif t_particle < deadline_tmp:
-                    smooth_u = (0.5 - random_uniform()) * delta_t
+                    smooth_u = (0.5 - random_uniform(&rng)) * delta_t
                 else:
                     smooth_u = 0.0
             else:
                 smooth_u = 0.0
 
-            rts_view[n, k, 0] = t_particle + t_view[k] + smooth_u # Store rt
-            choices_view[n, k, 0] = sign(y) # Store choice
-
-            if (rts_view[n, k, 0] >= deadline_view[k]) | (deadline_view[k] <= 0):
-                rts_view[n, k, 0] = -999
+            rt = t_particle + t_view[k] + smooth_u
+            if (rt >= deadline_view[k]) | (deadline_view[k] <= 0):
+                rt = -999
+            store_sample(&sample_output, n, k, rt, ix, sign(y))
     
+    # Whole boundary and drift of the last trial for the metadata
+    fill_boundary(&boundary_buf, boundary_buf.n_bound)
+    fill_drift(&drift_buf, drift_buf.n_bound)
+
     if return_option == 'full':
-        return {'rts': rts, 'choices': choices,  'metadata': {'vt': vt,
+        return {**outputs, 'metadata': {'vt': vt,
                                                             'vd': vd,
                                                             'a': a,
                                                             'z': z,
@@ -1246,7 +3075,7 @@ def ddm_flex_leak2(
                                                             'drift': drift,
                                                             'boundary': boundary}}
     elif return_option == 'minimal':
-        return {'rts': rts, 'choices': choices,  'metadata': {'simulator': 'ddm_flex_leak', 
+        return {**outputs, 'metadata': {'simulator': 'ddm_flex_leak', 
                                                              'possible_choices': [-1, 1],
                                                              'boundary_fun_type': boundary_fun.__name__,
                                                              'drift_fun_type': boundary_fun.__name__,
@@ -1278,6 +3107,11 @@ def levy_flexbound(np.ndarray[float, ndim = 1] v,
                    random_state = None,
                    return_option = 'full',
                    smooth_unif = False,
+                   record_trajectories = 0,
+                   trajectories_per_trial = False,
+                   return_steps = False,
+                   layout = 'sample_major',
+                   out = None,
                    **kwargs):
     """
     Simulate reaction times and choices from a Levy Flight model with flexible boundaries.
@@ -1297,9 +3131,24 @@ def levy_flexbound(np.ndarray[float, ndim = 1] v,
         boundary_fun (callable): Function defining the shape of the boundary over time.
         boundary_multiplicative (bool): If True, boundary function is multiplicative; if False, additive.
         boundary_params (dict): Parameters for the boundary function.
-        random_state (int or None): Seed for random number generator (default: None).
+        random_state (int, numpy.random.Generator or None): Seed for random number generator (default: None).
         return_option (str): 'full' for complete output, 'minimal' for basic output (default: 'full').
         smooth_unif (bool): Whether to apply uniform smoothing to reaction times (default: False).
+        record_trajectories (int): Number of samples whose paths are returned as the 'trajectory'
+            metadata (default: 0).
+        trajectories_per_trial (bool): Whether to record the first record_trajectories samples
+            of every trial instead of only those of the first trial (default: False).
+        return_steps (bool): Whether to return the number of delta_t steps of every walk
+            under 'steps' instead of the reaction times, as uint16 (uint32 if max_t / delta_t
+            does not fit) with the largest value of the type for omissions, and the choices
+            as int8. Reaction times are steps * delta_t + t (default: False).
+        layout (str): 'sample_major' for outputs of shape (n_samples, n_trials, 1),
+            'trial_major' for C-contiguous outputs of shape (n_trials, n_samples), or 'records'
+            for a single float32 array of (rt, choice) rows of shape (n_trials * n_samples, 2),
+            trial by trial, under 'records' (default: 'sample_major').
+        out (np.ndarray or None): Optional preallocated C-contiguous float32 array of shape
+            (..., 2) with n_trials * n_samples rows that the records are written to, for layout
+            'records' (default: None).
         **kwargs: Additional keyword arguments.
 
     Returns:
@@ -1310,92 +3159,100 @@ def levy_flexbound(np.ndarray[float, ndim = 1] v,
         ValueError: If return_option is neither 'full' nor 'minimal'.
     """
 
-    set_seed(random_state)
+    cdef RngState rng
+    rng_init(&rng, random_state)
     #cdef int cov_length = np.max([v.size, a.size, w.size, t.size]).astype(int)
     # Param views:
-    cdef float[:] v_view  = v
-    cdef float[:] a_view = a
-    cdef float[:] z_view = z
-    cdef float[:] alpha_view = alpha
-    cdef float[:] t_view = t
-    cdef float[:] deadline_view = deadline
-    cdef float[:] s_view = s
+    cdef const float[:] v_view = v
+    cdef const float[:] a_view = a
+    cdef const float[:] z_view = z
+    cdef const float[:] alpha_view = alpha
+    cdef const float[:] t_view = t
+    cdef const float[:] deadline_view = deadline
+    cdef const float[:] s_view = s
     # Data-struct for trajectory storage
-    traj = np.zeros((int(max_t / delta_t) + 1, 1), dtype = DTYPE)
-    traj[:, :] = -999 
-    cdef float[:,:] traj_view = traj
-
-    rts = np.zeros((n_samples, n_trials, 1), dtype = DTYPE)
-    choices = np.zeros((n_samples, n_trials, 1), dtype = np.intc)
+    cdef Trajectories trajectories
+    cdef TrajectoryRow traj_row
+    cdef float traj_sink[1]
+    traj = init_trajectories(&trajectories, record_trajectories, trajectories_per_trial,
+                             n_samples, n_trials, max_t, delta_t, 1)
 
-    cdef float[:,:, :] rts_view = rts
-    cdef int[:,:, :] choices_view = choices
+    cdef SampleOutput sample_output
+    outputs = init_sample_output(&sample_output, return_steps, layout, n_samples, n_trials,
+                                 max_t, delta_t, out)
 
     cdef float delta_t_alpha # = pow(delta_t, 1.0 / alpha) # correct scalar so we can use standard normal samples for the brownian motion
 
     # Boundary storage for the upper bound
-    cdef int num_draws = int((max_t / delta_t) + 1)
+    cdef int num_draws = noise_buffer_size(max_t, delta_t)
     t_s = np.arange(0, max_t + delta_t, delta_t).astype(DTYPE)
     boundary = np.zeros(t_s.shape, dtype = DTYPE)
     cdef float[:] boundary_view = boundary
+    cdef BoundarySpec boundary_spec
+    boundary_coefs = init_boundary(&boundary_spec, boundary_fun, boundary_multiplicative, boundary_params,
+                                   n_trials, t_s.shape[0], delta_t)
+    cdef BoundaryBuffer boundary_buf = boundary_buffer(&boundary_spec, &boundary_view[0], boundary_view.shape[0],
+                                                       0, 0, 0.0)
 
-    cdef float y, t_particle, smooth_u, deadline_tmp, sqrt_st
+    cdef float y, t_particle, smooth_u, deadline_tmp, sqrt_st, rt
     cdef Py_ssize_t n, ix, k
     cdef Py_ssize_t m = 0
-    cdef float[:] alpha_stable_values = draw_random_stable(num_draws, alpha_view[0])
+    cdef StableSpec stable = stable_spec(alpha_view[0])
+    cdef float[:] alpha_stable_values = draw_stable(&rng, &stable, num_draws)
+    cdef float[:] stable_scratch = np.empty(num_draws, dtype = DTYPE)
 
     for k in range(n_trials):
         # AF-TODO: check if this is correct
         delta_t_alpha = s_view[k] * pow(delta_t, 1.0 / alpha_view[k])
-        boundary_params_tmp = {key: boundary_params[key][k] for key in boundary_params.keys()}
+        # Values left in the buffer were drawn for the alpha of an earlier trial
+        if alpha_view[k] != stable.alpha:
+            stable = stable_spec(alpha_view[k])
+            fill_stable(&rng, &stable, &alpha_stable_values[0], &stable_scratch[0], num_draws)
+            m = 0
 
         # Precompute boundary evaluations
-        if boundary_multiplicative:
-            boundary[:] = np.multiply(a_view[k], boundary_fun(t = t_s, **boundary_params_tmp)).astype(DTYPE)
-        else:
-            boundary[:] = np.add(a_view[k], boundary_fun(t = t_s, **boundary_params_tmp)).astype(DTYPE)
+        evaluate_boundary(&boundary_buf, boundary, k, a_view[k], t_s, boundary_fun, boundary_params, True)
 
         deadline_tmp = min(max_t, deadline_view[k] - t_view[k])
         # Loop over samples
         for n in range(n_samples):
-            y = (-1) * boundary_view[0] + (z_view[k] * 2 * (boundary_view[0]))  # reset starting position 
+            y = (-1) * boundary_at(&boundary_buf, 0) + (z_view[k] * 2 * (boundary_at(&boundary_buf, 0)))  # reset starting position 
             t_particle = 0.0 # reset time
             ix = 0 # reset boundary index
-            if n == 0:
-                if k == 0:
-                    traj_view[0, 0] = y
+            traj_row = trajectory_row(&trajectories, n, k, traj_sink)
+            record_state(&traj_row, 0, 0, y)
 
             # Random walker
-            while y >= (-1) * boundary_view[ix] and y <= boundary_view[ix] and t_particle <= deadline_tmp:
+            while y >= (-1) * boundary_at(&boundary_buf, ix) and y <= boundary_at(&boundary_buf, ix) and t_particle <= deadline_tmp:
                 y += (v_view[k] * delta_t) + (delta_t_alpha * alpha_stable_values[m])
                 t_particle += delta_t
                 ix += 1
                 m += 1
-                if n == 0:
-                    if k == 0:
-                        traj_view[ix, 0] = y
+                record_state(&traj_row, ix, 0, y)
                 if m == num_draws:
-                    alpha_stable_values = draw_random_stable(num_draws, alpha_view[k])
+                    fill_stable(&rng, &stable, &alpha_stable_values[0], &stable_scratch[0], num_draws)
                     m = 0
 
             if smooth_unif:
                 if t_particle == 0.0:
-                    smooth_u = random_uniform() * 0.5 * delta_t
+                    smooth_u = random_uniform(&rng) * 0.5 * delta_t
                 elif t_particle < deadline_tmp:
-                    smooth_u = (0.5 - random_uniform()) * delta_t
+                    smooth_u = (0.5 - random_uniform(&rng)) * delta_t
                 else:
                     smooth_u = 0.0
             else:
                 smooth_u = 0.0
 
-            rts_view[n, k, 0] = t_particle + t_view[k] + smooth_u # Store rt
-            choices_view[n, k, 0] = sign(y) # Store choice
-
-            if (rts_view[n, k, 0] >= deadline_view[k]) | (deadline_view[k] <= 0):
-                rts_view[n, k, 0] = -999
+            rt = t_particle + t_view[k] + smooth_u
+            if (rt >= deadline_view[k]) | (deadline_view[k] <= 0):
+                rt = -999
+            store_sample(&sample_output, n, k, rt, ix, sign(y))
         
+    # Whole boundary of the last trial for the metadata
+    fill_boundary(&boundary_buf, boundary_buf.n_bound)
+
     if return_option == 'full':
-        return {'rts': rts, 'choices': choices, 'metadata': {'v': v,
+        return {**outputs, 'metadata': {'v': v,
                                                             'a': a,
                                                             'z': z,
                                                             't': t,
@@ -1412,7 +3269,7 @@ def levy_flexbound(np.ndarray[float, ndim = 1] v,
                                                             'trajectory': traj,
                                                             'boundary': boundary}}
     elif return_option == 'minimal':
-        return {'rts': rts, 'choices': choices,  'metadata': {'simulator': 'levy_flexbound', 
+        return {**outputs, 'metadata': {'simulator': 'levy_flexbound', 
                                                              'possible_choices': [-1, 1],
                                                              'boundary_fun_type': boundary_fun.__name__,
                                                              'n_samples': n_samples,
@@ -1421,6 +3278,141 @@ def levy_flexbound(np.ndarray[float, ndim = 1] v,
     else:
         raise ValueError('return_option must be either "full" or "minimal"')
 
+# Variability distributions -----------------------------------------------------------------------
+# full_ddm_rv adds random offsets to z, v and t of every sample. Besides callables that
+# return arrays of offsets (e.g. functools.partial(scipy.stats.norm.rvs, ...)), it accepts
+# declarative specs that are sampled natively, one draw per sample:
+#   ("uniform", lo, hi), ("normal", mu, sd), ("truncnorm", mu, sd, lo, hi), ("rayleigh", scale)
+# where every parameter is a scalar or holds one value per trial. None means no offset.
+
+cdef enum:
+    DIST_PYTHON = -1
+    DIST_NONE = 0
+    DIST_UNIFORM = 1
+    DIST_NORMAL = 2
+    DIST_TRUNCNORM = 3
+    DIST_RAYLEIGH = 4
+
+# Distribution kind and number of parameters of each spec
+NATIVE_DISTRIBUTIONS = {
+    'uniform': (DIST_UNIFORM, 2),
+    'normal': (DIST_NORMAL, 2),
+    'truncnorm': (DIST_TRUNCNORM, 4),
+    'rayleigh': (DIST_RAYLEIGH, 1),
+}
+# Parameters stored per trial
+cdef Py_ssize_t DIST_N_PARAMS = 4
+
+cdef struct DistSpec:
+    int kind
+    const double* params  # DIST_N_PARAMS values per trial
+
+cdef object init_distribution(DistSpec* spec, dist, int n_trials):
+    """
+    Select how the offsets of a variability distribution are drawn.
+
+    Args:
+        spec (DistSpec*): Specification to initialize.
+        dist (tuple, callable or None): Distribution spec, callable with a size argument,
+            or None.
+        n_trials (int): Number of trials.
+
+    Returns:
+        np.ndarray or None: The per-trial parameters spec points into, which must be
+            kept alive while spec is in use, or None.
+
+    Raises:
+        ValueError: If dist is not a valid distribution spec.
+    """
+    cdef double[:, ::1] params_view
+    spec.params = NULL
+    if dist is None:
+        spec.kind = DIST_NONE
+        return None
+    if callable(dist):
+        spec.kind = DIST_PYTHON
+        return None
+    if (not isinstance(dist, tuple) or len(dist) == 0 or dist[0] not in NATIVE_DISTRIBUTIONS
+            or len(dist) != NATIVE_DISTRIBUTIONS[dist[0]][1] + 1):
+        raise ValueError('distribution specs must be one of ("uniform", lo, hi), ("normal", mu, sd), '
+                         '("truncnorm", mu, sd, lo, hi) or ("rayleigh", scale), got ' + repr(dist))
+    spec.kind = NATIVE_DISTRIBUTIONS[dist[0]][0]
+
+    params = np.zeros((max(1, n_trials), DIST_N_PARAMS), dtype = np.float64)
+    for j, value in enumerate(dist[1:]):
+        params[:n_trials, j] = np.asarray(value, dtype = np.float64)
+    if spec.kind == DIST_TRUNCNORM:
+        # Bounds in standard deviations from the mean
+        with np.errstate(divide = 'ignore', invalid = 'ignore'):
+            params[:, 2:] = (params[:, 2:] - params[:, :1]) / params[:, 1:2]
+    params_view = params
+    spec.params = &params_view[0, 0]
+    return params
+
+cdef double truncated_gaussian(RngState* rng, double lo, double hi) noexcept nogil:
+    """
+    Standard normal random number restricted to [lo, hi], with lo < hi.
+
+    Intervals away from zero use the exponential or uniform proposals of Robert (1995),
+    others rejection from the normal or the uniform distribution.
+
+    Args:
+        rng (RngState*): Generator state.
+        lo (double): Lower bound, possibly -INFINITY.
+        hi (double): Upper bound, possibly INFINITY.
+
+    Returns:
+        double: The random number.
+    """
+    cdef double z, rate
+    if hi <= 0:
+        return -truncated_gaussian(rng, -hi, -lo)
+    if lo < 0:
+        if hi - lo >= 2.5066282746310002: # sqrt(2 pi)
+            while True:
+                z = random_gaussian(rng)
+                if lo <= z <= hi:
+                    return z
+        while True:
+            z = lo + (hi - lo) * random_uniform(rng)
+            if random_uniform(rng) <= exp(-0.5 * z * z):
+                return z
+    rate = 0.5 * (lo + sqrt(lo * lo + 4.0))
+    if hi - lo < exp(0.5 - 0.5 * rate * lo) / rate:
+        while True:
+            z = lo + (hi - lo) * random_uniform(rng)
+            if random_uniform(rng) <= exp(0.5 * (lo * lo - z * z)):
+                return z
+    while True:
+        z = lo + random_exponential(rng) / rate
+        if z <= hi and random_uniform(rng) <= exp(-0.5 * (z - rate) * (z - rate)):
+            return z
+
+cdef inline float sample_distribution(RngState* rng, const DistSpec* spec, Py_ssize_t k) noexcept nogil:
+    """
+    Draw a random number from a native variability distribution for trial k.
+    """
+    cdef const double* p = spec.params + k * DIST_N_PARAMS
+    if spec.kind == DIST_UNIFORM:
+        return p[0] + (p[1] - p[0]) * random_uniform(rng)
+    if spec.kind == DIST_NORMAL:
+        return p[0] + p[1] * random_gaussian(rng)
+    if spec.kind == DIST_TRUNCNORM:
+        if p[1] <= 0:
+            return p[0]
+        return p[0] + p[1] * truncated_gaussian(rng, p[2], p[3])
+    if spec.kind == DIST_RAYLEIGH:
+        return p[0] * sqrt(2.0 * random_exponential(rng))
+    return 0.0
+
+cdef object draw_offsets(const DistSpec* spec, dist, int n_samples, int n_trials):
+    """
+    Offsets of a distribution given as a callable, of shape (n_trials, n_samples).
+    """
+    if spec.kind != DIST_PYTHON:
+        return np.zeros((1, 1), dtype = DTYPE)
+    return np.ascontiguousarray(dist(size = (n_samples, n_trials)).T, dtype = DTYPE)
+
 # Simulate (rt, choice) tuples from: Full DDM with flexible bounds --------------------------------
 # @cythonboundscheck(False)
 # @cythonwraparound(False)
@@ -1443,6 +3435,10 @@ def full_ddm_rv(np.ndarray[float, ndim = 1] v, # = 0,
                 random_state = None,
                 return_option = 'full',
                 smooth_unif = False,
+                record_trajectories = 0,
+                trajectories_per_trial = False,
+                layout = 'sample_major',
+                out = None,
                 **kwargs):
     """
     Simulate reaction times and choices from a full drift diffusion model with flexible boundaries and random variability.
@@ -1452,9 +3448,13 @@ def full_ddm_rv(np.ndarray[float, ndim = 1] v, # = 0,
         a (np.ndarray): Boundary separation for each trial.
         z (np.ndarray): Starting point (between 0 and 1) for each trial.
         t (np.ndarray): Non-decision time for each trial.
-        z_dist: Distribution function for starting point variability.
-        v_dist: Distribution function for drift rate variability.
-        t_dist: Distribution function for non-decision time variability.
+        z_dist (tuple, callable or None): Distribution of the starting point offsets, as a spec
+            ("uniform", lo, hi), ("normal", mu, sd), ("truncnorm", mu, sd, lo, hi) or
+            ("rayleigh", scale) with scalar or per-trial parameters, sampled natively for every
+            sample, or as a callable returning an array of offsets for a size argument.
+            None means no offset.
+        v_dist (tuple, callable or None): Distribution of the drift rate offsets, as z_dist.
+        t_dist (tuple, callable or None): Distribution of the non-decision time offsets, as z_dist.
         deadline (np.ndarray): Maximum reaction time allowed for each trial.
         s (np.ndarray): Noise standard deviation for each trial.
         delta_t (float): Time step size for simulation (default: 0.001).
@@ -1464,9 +3464,20 @@ def full_ddm_rv(np.ndarray[float, ndim = 1] v, # = 0,
         boundary_fun (callable): Function defining the decision boundary over time.
         boundary_multiplicative (bool): If True, boundary function is multiplicative; if False, additive.
         boundary_params (dict): Parameters for the boundary function.
-        random_state (int or None): Seed for random number generator (default: None).
+        random_state (int, numpy.random.Generator or None): Seed for random number generator (default: None).
         return_option (str): 'full' or 'minimal' return format (default: 'full').
         smooth_unif (bool): Whether to apply uniform smoothing to reaction times (default: False).
+        record_trajectories (int): Number of samples whose paths are returned as the 'trajectory'
+            metadata (default: 0).
+        trajectories_per_trial (bool): Whether to record the first record_trajectories samples
+            of every trial instead of only those of the first trial (default: False).
+        layout (str): 'sample_major' for outputs of shape (n_samples, n_trials, 1),
+            'trial_major' for C-contiguous outputs of shape (n_trials, n_samples), or 'records'
+            for a single float32 array of (rt, choice) rows of shape (n_trials * n_samples, 2),
+            trial by trial, under 'records' (default: 'sample_major').
+        out (np.ndarray or None): Optional preallocated C-contiguous float32 array of shape
+            (..., 2) with n_trials * n_samples rows that the records are written to, for layout
+            'records' (default: None).
         **kwargs: Additional keyword arguments.
 
     Returns:
@@ -1477,125 +3488,126 @@ def full_ddm_rv(np.ndarray[float, ndim = 1] v, # = 0,
         ValueError: If return_option is neither 'full' nor 'minimal'.
     """
 
-    set_seed(random_state)
+    cdef RngState rng
+    rng_init(&rng, random_state)
     # cdef int cov_length = np.max([v.size, a.size, w.size, t.size]).astype(int)
     # Param views
     #set_random_state(random_state)
-    cdef float[:] v_view = v
-    cdef float[:] a_view = a
-    cdef float[:] z_view = z
-    cdef float[:] t_view = t
-    cdef float[:] deadline_view = deadline
-    cdef float[:] s_view = s
-    sz_samplewise = np.zeros((n_trials, n_samples), dtype = DTYPE)
-    sv_samplewise = np.zeros((n_trials, n_samples), dtype = DTYPE)
-    st_samplewise = np.zeros((n_trials, n_samples), dtype = DTYPE)
-
-    cdef float[:, :] sz_samplewise_view = sz_samplewise
-    cdef float[:, :] sv_samplewise_view = sv_samplewise
-    cdef float[:, :] st_samplewise_view = st_samplewise
+    cdef const float[:] v_view = v
+    cdef const float[:] a_view = a
+    cdef const float[:] z_view = z
+    cdef const float[:] t_view = t
+    cdef const float[:] deadline_view = deadline
+    cdef const float[:] s_view = s
+    # Offset distributions, with arrays of offsets only for those given as callables
+    cdef DistSpec z_spec, v_spec, t_spec
+    z_params = init_distribution(&z_spec, z_dist, n_trials)
+    v_params = init_distribution(&v_spec, v_dist, n_trials)
+    t_params = init_distribution(&t_spec, t_dist, n_trials)
+    cdef float[:, ::1] sz_samplewise_view = draw_offsets(&z_spec, z_dist, n_samples, n_trials)
+    cdef float[:, ::1] sv_samplewise_view = draw_offsets(&v_spec, v_dist, n_samples, n_trials)
+    cdef float[:, ::1] st_samplewise_view = draw_offsets(&t_spec, t_dist, n_samples, n_trials)
 
     # Data-structs for trajectory storage
-    traj = np.zeros((int(max_t / delta_t) + 1, 1), dtype = DTYPE)
-    traj[:, :] = -999 
-    cdef float[:, :] traj_view = traj
-
-    rts = np.zeros((n_samples, n_trials, 1), dtype = DTYPE)
-    choices = np.zeros((n_samples, n_trials, 1), dtype = np.intc)
+    cdef Trajectories trajectories
+    cdef TrajectoryRow traj_row
+    cdef float traj_sink[1]
+    traj = init_trajectories(&trajectories, record_trajectories, trajectories_per_trial,
+                             n_samples, n_trials, max_t, delta_t, 1)
 
-    cdef float[:, :, :] rts_view = rts
-    cdef int[:, :, :] choices_view = choices
+    cdef SampleOutput sample_output
+    outputs = init_sample_output(&sample_output, False, layout, n_samples, n_trials,
+                                 max_t, delta_t, out)
 
     cdef float delta_t_sqrt = sqrt(delta_t) # correct scalar so we can use standard normal samples for the brownian motion
     #cdef float sqrt_st = delta_t_sqrt * s # scalar to ensure the correct variance for the gaussian step
 
     # Boundary storage for the upper bound
-    cdef int num_draws = int((max_t / delta_t) + 1)
+    cdef int num_draws = noise_buffer_size(max_t, delta_t)
     t_s = np.arange(0, max_t + delta_t, delta_t).astype(DTYPE)
     boundary = np.zeros(t_s.shape, dtype = DTYPE)
     cdef float[:] boundary_view = boundary
+    cdef BoundarySpec boundary_spec
+    boundary_coefs = init_boundary(&boundary_spec, boundary_fun, boundary_multiplicative, boundary_params,
+                                   n_trials, t_s.shape[0], delta_t)
+    cdef BoundaryBuffer boundary_buf = boundary_buffer(&boundary_spec, &boundary_view[0], boundary_view.shape[0],
+                                                       0, 0, 0.0)
 
-    cdef float y, t_particle, t_tmp, smooth_u, deadline_tmp, sqrt_st
+    cdef float y, t_particle, t_tmp, smooth_u, deadline_tmp, sqrt_st, rt
     cdef Py_ssize_t n, ix, k
     cdef Py_ssize_t m = 0
     cdef float drift_increment = 0.0
-    cdef float[:] gaussian_values = draw_gaussian(num_draws)
+    cdef float[:] gaussian_values = draw_gaussian(&rng, num_draws)
 
-    # Loop over trials
-    sv_samplewise[:, :] = v_dist(size = (n_samples, n_trials)).T
-    sz_samplewise[:, :] = z_dist(size = (n_samples, n_trials)).T
-    st_samplewise[:, :] = t_dist(size = (n_samples, n_trials)).T
+    cdef float sz, sv, st
 
+    # Loop over trials
     for k in range(n_trials):
-        boundary_params_tmp = {key: boundary_params[key][k] for key in boundary_params.keys()}
-
         # Precompute boundary evaluations
-        if boundary_multiplicative:
-            # print(a)
-            boundary[:] = np.multiply(a_view[k], boundary_fun(t = t_s, **boundary_params_tmp)).astype(DTYPE)
-        else:
-            # print(a)
-            boundary[:] = np.add(a_view[k], boundary_fun(t = t_s, **boundary_params_tmp)).astype(DTYPE)
+        evaluate_boundary(&boundary_buf, boundary, k, a_view[k], t_s, boundary_fun, boundary_params, True)
 
         sqrt_st = delta_t_sqrt * s_view[k]
 
         # Loop over samples
         for n in range(n_samples):
+            sz = sz_samplewise_view[k, n] if z_spec.kind == DIST_PYTHON else sample_distribution(&rng, &z_spec, k)
+            sv = sv_samplewise_view[k, n] if v_spec.kind == DIST_PYTHON else sample_distribution(&rng, &v_spec, k)
+            st = st_samplewise_view[k, n] if t_spec.kind == DIST_PYTHON else sample_distribution(&rng, &t_spec, k)
+
             # displaced_starting_point
-            y = (-1) * boundary_view[0] + ((z_view[k] + sz_samplewise_view[k, n]) * 2.0 * (boundary_view[0]))
+            y = (-1) * boundary_at(&boundary_buf, 0) + ((z_view[k] + sz) * 2.0 * (boundary_at(&boundary_buf, 0)))
             
             # displaced drift
-            drift_increment = (v_view[k] + sv_samplewise_view[k, n]) * delta_t
+            drift_increment = (v_view[k] + sv) * delta_t
 
             # displaced t
-            t_tmp = t_view[k] + st_samplewise_view[k, n]
+            t_tmp = t_view[k] + st
             deadline_tmp = min(max_t, deadline_view[k] - t_tmp)
             
             # increment m appropriately
             m += 1
             if m == num_draws:
-                    gaussian_values = draw_gaussian(num_draws)
+                    fill_gaussian(&rng, &gaussian_values[0], num_draws)
                     m = 0
             
             t_particle = 0.0 # reset time
             ix = 0 # reset boundary index
             
-            if n == 0:
-                if k == 0:
-                    traj_view[0, 0] = y
+            traj_row = trajectory_row(&trajectories, n, k, traj_sink)
+            record_state(&traj_row, 0, 0, y)
 
             # Random walker
-            while y >= (-1) * boundary_view[ix] and y <= boundary_view[ix] and t_particle <= deadline_tmp:
+            while y >= (-1) * boundary_at(&boundary_buf, ix) and y <= boundary_at(&boundary_buf, ix) and t_particle <= deadline_tmp:
                 y += drift_increment + (sqrt_st * gaussian_values[m])
                 t_particle += delta_t
                 ix += 1
                 m += 1
                 
-                if n == 0:
-                    if k == 0:
-                        traj_view[ix, 0] = y
+                record_state(&traj_row, ix, 0, y)
                 if m == num_draws:
-                    gaussian_values = draw_gaussian(num_draws)
+                    fill_gaussian(&rng, &gaussian_values[0], num_draws)
                     m = 0
 
             if smooth_unif:
                 if t_particle == 0.0:
-                    smooth_u = random_uniform() * 0.5 * delta_t
+                    smooth_u = random_uniform(&rng) * 0.5 * delta_t
                 elif t_particle < deadline_tmp:
-                    smooth_u = (0.5 - random_uniform()) * delta_t
+                    smooth_u = (0.5 - random_uniform(&rng)) * delta_t
                 else:
                     smooth_u = 0.0
             else:
                 smooth_u = 0.0
 
-            rts_view[n, k, 0] = t_particle + t_tmp + smooth_u # Store rt
-            choices_view[n, k, 0] = np.sign(y) # Store choice
-
-            if (rts_view[n, k, 0] >= deadline_view[k]) | (deadline_view[k] <= 0):
-                rts_view[n, k, 0] = -999
+            rt = t_particle + t_tmp + smooth_u
+            if (rt >= deadline_view[k]) | (deadline_view[k] <= 0):
+                rt = -999
+            store_sample(&sample_output, n, k, rt, ix, sign(y))
     
+    # Whole boundary of the last trial for the metadata
+    fill_boundary(&boundary_buf, boundary_buf.n_bound)
+
     if return_option == 'full':
-        return {'rts': rts, 'choices': choices, 'metadata': {'v': v,
+        return {**outputs, 'metadata': {'v': v,
                                                             'a': a,
                                                             'z': z,
                                                             't': t,
@@ -1615,7 +3627,7 @@ def full_ddm_rv(np.ndarray[float, ndim = 1] v, # = 0,
                                                             'trajectory': traj,
                                                             'boundary': boundary}}
     elif return_option == 'minimal':
-        return {'rts': rts, 'choices': choices,  'metadata': {'simulator': 'full_ddm_rv', 
+        return {**outputs, 'metadata': {'simulator': 'full_ddm_rv', 
                                                              'possible_choices': [-1, 1],
                                                              'boundary_fun_type': boundary_fun.__name__,
                                                              'n_samples': n_samples,
@@ -1627,6 +3639,70 @@ def full_ddm_rv(np.ndarray[float, ndim = 1] v, # = 0,
 # -------------------------------------------------------------------------------------------------
 
 
+cdef void full_ddm_sample(const uint64_t* key, uint64_t stream,
+                          float v, float z, float t, float sz, float sv, float st,
+                          float deadline, float s,
+                          const float* boundary, float delta_t, float max_t,
+                          bint smooth_unif, bint exact,
+                          TrajectoryRow* traj,
+                          const SampleOutput* out, Py_ssize_t n, Py_ssize_t k) noexcept nogil:
+    """
+    Simulate a single (rt, choice) pair from the full DDM with flexible boundaries.
+
+    Args:
+        key (const uint64_t*): Seed key of the simulation.
+        stream (uint64_t): Stream id of this sample.
+        v, z, t, sz, sv, st, deadline, s (float): Parameters of the trial.
+        boundary (const float*): Precomputed (upper) boundary of the trial.
+        delta_t (float): Time step size.
+        max_t (float): Maximum simulation time.
+        smooth_unif (bool): Whether to apply uniform smoothing to the reaction time.
+        exact (bool): Whether to use the exact first passage sampler (constant boundary only).
+        traj (TrajectoryRow*): Where the path is recorded.
+        out (const SampleOutput*): Output of the kernel.
+        n, k (Py_ssize_t): Sample and trial index.
+    """
+    cdef RngState rng
+    cdef float y, t_tmp, drift, rt
+    cdef float t_particle = 0.0
+    cdef float deadline_tmp = min(max_t, deadline - t)
+    cdef float sqrt_st = sqrt(delta_t) * s
+    cdef double fpt
+    cdef Py_ssize_t ix = 0
+    cdef int choice
+
+    rng_seed_stream(&rng, key, stream)
+
+    # initialize starting point
+    y = ((-1) * boundary[0]) + (z * 2.0 * (boundary[0]))
+
+    # get drift by random displacement of v
+    drift = v + sv * random_gaussian(&rng)
+    t_tmp = t + (2 * (random_uniform(&rng) - 0.5) * st)
+
+    # apply uniform displacement on y
+    y += 2 * (random_uniform(&rng) - 0.5) * sz
+
+    if exact:
+        fpt = wiener_first_passage(&rng, drift, 2 * boundary[0], y + boundary[0], s, &choice)
+        store_sample(out, n, k, exact_rt(fpt, t_tmp, deadline, deadline_tmp), 0,
+                     choice if choice != 0 else sign(y))
+        return
+
+    record_state(traj, 0, 0, y)
+
+    # Random walker
+    while y >= (-1) * boundary[ix] and y <= boundary[ix] and t_particle <= deadline_tmp:
+        y += drift * delta_t + (sqrt_st * random_gaussian(&rng))
+        t_particle += delta_t
+        ix += 1
+        record_state(traj, ix, 0, y)
+
+    rt = t_particle + t_tmp + smooth_rt(&rng, t_particle, deadline_tmp, delta_t, smooth_unif)
+    if rt >= deadline or deadline <= 0:
+        rt = -999
+    store_sample(out, n, k, rt, ix, sign(y))
+
 # Simulate (rt, choice) tuples from: Full DDM with flexible bounds --------------------------------
 # @cythonboundscheck(False)
 # @cythonwraparound(False)
@@ -1649,6 +3725,12 @@ def full_ddm(np.ndarray[float, ndim = 1] v, # = 0,
              random_state = None,
              return_option = 'full',
              smooth_unif = False,
+             int n_threads = 1,
+             method = 'euler',
+             record_trajectories = 0,
+             trajectories_per_trial = False,
+             layout = 'sample_major',
+             out = None,
              **kwargs):
     """
     Simulate reaction times and choices from a full drift diffusion model with flexible boundaries.
@@ -1670,9 +3752,24 @@ def full_ddm(np.ndarray[float, ndim = 1] v, # = 0,
         boundary_fun (callable): Function defining the shape of the boundary over time.
         boundary_multiplicative (bool): If True, boundary function is multiplicative; if False, additive.
         boundary_params (dict): Parameters for the boundary function.
-        random_state (int or None): Seed for random number generator (default: None).
+        random_state (int, numpy.random.Generator or None): Seed for random number generator (default: None).
         return_option (str): 'full' for complete output, 'minimal' for basic output (default: 'full').
         smooth_unif (bool): Whether to apply uniform smoothing to reaction times (default: False).
+        n_threads (int): Number of threads used to simulate samples in parallel (default: 1).
+        method (str): 'euler' for Euler-Maruyama steps of size delta_t or 'exact' for exact
+            first passage sampling, which requires a constant boundary and ignores smooth_unif
+            and the trajectory (default: 'euler').
+        record_trajectories (int): Number of samples whose paths are returned as the 'trajectory'
+            metadata (default: 0).
+        trajectories_per_trial (bool): Whether to record the first record_trajectories samples
+            of every trial instead of only those of the first trial (default: False).
+        layout (str): 'sample_major' for outputs of shape (n_samples, n_trials, 1),
+            'trial_major' for C-contiguous outputs of shape (n_trials, n_samples), or 'records'
+            for a single float32 array of (rt, choice) rows of shape (n_trials * n_samples, 2),
+            trial by trial, under 'records' (default: 'sample_major').
+        out (np.ndarray or None): Optional preallocated C-contiguous float32 array of shape
+            (..., 2) with n_trials * n_samples rows that the records are written to, for layout
+            'records' (default: None).
         **kwargs: Additional keyword arguments.
 
     Returns:
@@ -1683,117 +3780,69 @@ def full_ddm(np.ndarray[float, ndim = 1] v, # = 0,
         ValueError: If return_option is neither 'full' nor 'minimal'.
     """
 
-    set_seed(random_state)
-    # cdef int cov_length = np.max([v.size, a.size, w.size, t.size]).astype(int)
+    cdef bint exact = parse_method(method, ('euler', 'exact')) == METHOD_EXACT
+    cdef uint64_t key[4]
+    rng_key_from_seed(random_state, key)
     # Param views
-    #set_random_state(random_state)
-    cdef float[:] v_view  = v
-    cdef float[:] a_view = a
-    cdef float[:] z_view = z
-    cdef float[:] t_view = t
-    cdef float[:] sz_view = sz
-    cdef float[:] sv_view = sv
-    cdef float[:] st_view = st
-    cdef float[:] deadline_view = deadline
-    cdef float[:] s_view = s
-
+    cdef const float[:] v_view = v
+    cdef const float[:] a_view = a
+    cdef const float[:] z_view = z
+    cdef const float[:] t_view = t
+    cdef const float[:] sz_view = sz
+    cdef const float[:] sv_view = sv
+    cdef const float[:] st_view = st
+    cdef const float[:] deadline_view = deadline
+    cdef const float[:] s_view = s
     # Data-structs for trajectory storage
-    traj = np.zeros((int(max_t / delta_t) + 1, 1), dtype = DTYPE)
-    traj[:, :] = -999 
-    cdef float[:, :] traj_view = traj
-
-    rts = np.zeros((n_samples, n_trials, 1), dtype = DTYPE)
-    choices = np.zeros((n_samples, n_trials, 1), dtype = np.intc)
-
-    cdef float[:, :, :] rts_view = rts
-    cdef int[:, :, :] choices_view = choices
-
-    cdef float delta_t_sqrt = sqrt(delta_t) # correct scalar so we can use standard normal samples for the brownian motion
-    #cdef float sqrt_st = delta_t_sqrt * s # scalar to ensure the correct variance for the gaussian step
-
-    # Boundary storage for the upper bound
-    cdef int num_draws = int((max_t / delta_t) + 1)
+    cdef Trajectories trajectories
+    cdef TrajectoryRow traj_row
+    traj = init_trajectories(&trajectories, record_trajectories, trajectories_per_trial,
+                             n_samples, n_trials, max_t, delta_t, 1)
+    # Per-thread sinks for the samples that are not recorded
+    traj_sink = np.empty((max(1, n_threads), 1 + TRAJECTORY_SINK_PAD), dtype = DTYPE)
+    cdef float[:, ::1] traj_sink_view = traj_sink
+
+    cdef SampleOutput sample_output
+    outputs = init_sample_output(&sample_output, False, layout, n_samples, n_trials,
+                                 max_t, delta_t, out)
+
+    # Boundary storage, evaluated for blocks of trials at a time
     t_s = np.arange(0, max_t + delta_t, delta_t).astype(DTYPE)
-    boundary = np.zeros(t_s.shape, dtype = DTYPE)
-    cdef float[:] boundary_view = boundary
-
-    cdef float y, t_particle, t_tmp, smooth_u, deadline_tmp
-    cdef Py_ssize_t n, ix, k
-    cdef Py_ssize_t m = 0
-    cdef float drift_increment = 0.0
-    cdef float[:] gaussian_values = draw_gaussian(num_draws)
-
-    # Loop over trials
-    for k in range(n_trials):
-        boundary_params_tmp = {key: boundary_params[key][k] for key in boundary_params.keys()}
-
+    cdef Py_ssize_t n_bound = t_s.shape[0] + 1
+    cdef int block_trials = boundary_block_trials(n_trials, n_bound)
+    boundary_block = np.zeros((block_trials, n_bound), dtype = DTYPE)
+    cdef float[:, ::1] boundary_view = boundary_block
+    cdef BoundarySpec boundary_spec
+    boundary_coefs = init_boundary(&boundary_spec, boundary_fun, boundary_multiplicative, boundary_params,
+                                   n_trials, t_s.shape[0], delta_t)
+
+    cdef bint smooth_unif_c = smooth_unif
+    cdef Py_ssize_t i, n, k, k_start, k_end
+
+    for k_start in range(0, n_trials, block_trials):
+        k_end = min(n_trials, k_start + block_trials)
         # Precompute boundary evaluations
-        if boundary_multiplicative:
-            # print(a)
-            boundary[:] = np.multiply(a_view[k], boundary_fun(t = t_s, **boundary_params_tmp)).astype(DTYPE)
-        else:
-            # print(a)
-            boundary[:] = np.add(a_view[k], boundary_fun(t = t_s, **boundary_params_tmp)).astype(DTYPE)
-        
-        deadline_tmp = min(max_t, deadline_view[k] - t_view[k])
-        sqrt_st = delta_t_sqrt * s_view[k]
-        # Loop over samples
-        for n in range(n_samples):
-            # initialize starting point
-            y = ((-1) * boundary_view[0]) + (z_view[k] * 2.0 * (boundary_view[0]))  # reset starting position
-            
-            # get drift by random displacement of v 
-            drift_increment = (v_view[k] + sv_view[k] * gaussian_values[m]) * delta_t
-            t_tmp = t_view[k] + (2 * (random_uniform() - 0.5) * st_view[k])
-            
-            # apply uniform displacement on y
-            y += 2 * (random_uniform() - 0.5) * sz_view[k]
-            
-            # increment m appropriately
-            m += 1
-            if m == num_draws:
-                    gaussian_values = draw_gaussian(num_draws)
-                    m = 0
-            
-            t_particle = 0.0 # reset time
-            ix = 0 # reset boundary index
-            
-            if n == 0:
-                if k == 0:
-                    traj_view[0, 0] = y
-
-            # Random walker
-            while y >= (-1) * boundary_view[ix] and y <= boundary_view[ix] and t_particle <= deadline_tmp:
-                y += drift_increment + (sqrt_st * gaussian_values[m])
-                t_particle += delta_t
-                ix += 1
-                m += 1
-                
-                if n == 0:
-                    if k == 0:
-                        traj_view[ix, 0] = y
-                if m == num_draws:
-                    gaussian_values = draw_gaussian(num_draws)
-                    m = 0
-
-            if smooth_unif:
-                if t_particle == 0.0:
-                    smooth_u = random_uniform() * 0.5 * delta_t
-                elif t_particle < deadline_tmp:
-                    smooth_u = (0.5 - random_uniform()) * delta_t
-                else:
-                    smooth_u = 0.0
-            else:
-                smooth_u = 0.0
-
-            rts_view[n, k, 0] = t_particle + t_tmp + smooth_u # Store rt
-            choices_view[n, k, 0] = np.sign(y) # Store choice
+        compute_boundary_block(boundary_block, a_view, k_start, k_end, t_s, &boundary_spec,
+                               boundary_fun, boundary_multiplicative, boundary_params)
+        if exact:
+            check_constant_boundary(boundary_block, k_end - k_start)
+
+        for i in prange(k_start * n_samples, k_end * n_samples, nogil = True,
+                        schedule = 'dynamic', num_threads = n_threads):
+            k = i // n_samples
+            n = i % n_samples
+            traj_row = trajectory_row(&trajectories, n, k, &traj_sink_view[threadid(), 0])
+            full_ddm_sample(key, i, v_view[k], z_view[k], t_view[k],
+                            sz_view[k], sv_view[k], st_view[k], deadline_view[k], s_view[k],
+                            &boundary_view[k - k_start, 0], delta_t, max_t, smooth_unif_c, exact,
+                            &traj_row,
+                            &sample_output, n, k)
+
+    # Boundary of the last trial
+    boundary = boundary_block[(n_trials - 1) % block_trials, :t_s.shape[0]].copy()
 
-            if (rts_view[n, k, 0] >= deadline_view[k]) | (deadline_view[k] <= 0):
-                rts_view[n, k, 0] = -999
-    
     if return_option == 'full':
-        return {'rts': rts, 'choices': choices, 'metadata': {'v': v,
+        return {**outputs, 'metadata': {'v': v,
                                                             'a': a,
                                                             'z': z,
                                                             't': t,
@@ -1813,7 +3862,7 @@ def full_ddm(np.ndarray[float, ndim = 1] v, # = 0,
                                                             'trajectory': traj,
                                                             'boundary': boundary}}
     elif return_option == 'minimal':
-        return {'rts': rts, 'choices': choices,  'metadata': {'simulator': 'full_ddm', 
+        return {**outputs, 'metadata': {'simulator': 'full_ddm', 
                                                              'possible_choices': [-1, 1],
                                                              'boundary_fun_type': boundary_fun.__name__,
                                                              'n_samples': n_samples,
@@ -1844,6 +3893,12 @@ def ddm_sdv(np.ndarray[float, ndim = 1] v,
             random_state = None,
             return_option = 'full',
             smooth_unif = False,
+            method = 'euler',
+            record_trajectories = 0,
+            trajectories_per_trial = False,
+            return_steps = False,
+            layout = 'sample_major',
+            out = None,
             **kwargs):
     """
     Simulate reaction times and choices from a drift diffusion model with flexible boundaries and inter-trial variability in drift rate.
@@ -1863,9 +3918,26 @@ def ddm_sdv(np.ndarray[float, ndim = 1] v,
         boundary_fun (callable): Function defining the shape of the boundary over time.
         boundary_multiplicative (bool): If True, boundary function is multiplicative; if False, additive.
         boundary_params (dict): Parameters for the boundary function.
-        random_state (int or None): Seed for random number generator (default: None).
+        random_state (int, numpy.random.Generator or None): Seed for random number generator (default: None).
         return_option (str): 'full' for complete output, 'minimal' for basic output (default: 'full').
         smooth_unif (bool): Whether to apply uniform smoothing to reaction times (default: False).
+        method (str): 'euler' for Euler-Maruyama steps of size delta_t or 'bridge' for Euler
+            steps with Brownian-bridge crossing checks and larger steps away from the bounds.
+        record_trajectories (int): Number of samples whose paths are returned as the 'trajectory'
+            metadata (default: 0).
+        trajectories_per_trial (bool): Whether to record the first record_trajectories samples
+            of every trial instead of only those of the first trial (default: False).
+        return_steps (bool): Whether to return the number of delta_t steps of every walk
+            under 'steps' instead of the reaction times, as uint16 (uint32 if max_t / delta_t
+            does not fit) with the largest value of the type for omissions, and the choices
+            as int8. Reaction times are steps * delta_t + t (default: False).
+        layout (str): 'sample_major' for outputs of shape (n_samples, n_trials, 1),
+            'trial_major' for C-contiguous outputs of shape (n_trials, n_samples), or 'records'
+            for a single float32 array of (rt, choice) rows of shape (n_trials * n_samples, 2),
+            trial by trial, under 'records' (default: 'sample_major').
+        out (np.ndarray or None): Optional preallocated C-contiguous float32 array of shape
+            (..., 2) with n_trials * n_samples rows that the records are written to, for layout
+            'records' (default: None).
         **kwargs: Additional keyword arguments.
 
     Returns:
@@ -1876,57 +3948,59 @@ def ddm_sdv(np.ndarray[float, ndim = 1] v,
         ValueError: If return_option is neither 'full' nor 'minimal'.
     """
 
-    set_seed(random_state)
+    cdef int method_c = parse_method(method, ('euler', 'bridge'))
+    cdef RngState rng
+    rng_init(&rng, random_state)
     # Data-structs for trajectory storage
-    traj = np.zeros((int(max_t / delta_t) + 1, 1), dtype = DTYPE)
-    traj[:, :] = -999 
-    cdef float[:,:] traj_view = traj
+    cdef Trajectories trajectories
+    cdef TrajectoryRow traj_row
+    cdef float traj_sink[1]
+    traj = init_trajectories(&trajectories, record_trajectories, trajectories_per_trial,
+                             n_samples, n_trials, max_t, delta_t, 1)
 
     # Param views
-    cdef float[:] v_view  = v
-    cdef float[:] a_view = a
-    cdef float[:] z_view = z
-    cdef float[:] t_view = t
-    cdef float[:] sv_view = sv
-    cdef float[:] deadline_view = deadline
-    cdef float[:] s_view = s
-    
-    rts = np.zeros((n_samples, n_trials, 1), dtype = DTYPE)
-    choices = np.zeros((n_samples, n_trials, 1), dtype = np.intc)
-
-    cdef float[:, :, :] rts_view = rts
-    cdef int[:, :, :] choices_view = choices
+    cdef const float[:] v_view = v
+    cdef const float[:] a_view = a
+    cdef const float[:] z_view = z
+    cdef const float[:] t_view = t
+    cdef const float[:] sv_view = sv
+    cdef const float[:] deadline_view = deadline
+    cdef const float[:] s_view = s
+    cdef SampleOutput sample_output
+    outputs = init_sample_output(&sample_output, return_steps, layout, n_samples, n_trials,
+                                 max_t, delta_t, out)
 
     cdef float delta_t_sqrt = sqrt(delta_t) # correct scalar so we can use standard normal samples for the brownian motion
     #cdef float sqrt_st = delta_t_sqrt * s # scalar to ensure the correct variance for the gaussian step
 
     # Boundary storage for the upper bound
-    cdef int num_draws = int((max_t / delta_t) + 1)
+    cdef int num_draws = noise_buffer_size(max_t, delta_t)
     t_s = np.arange(0, max_t + delta_t, delta_t).astype(DTYPE)
     boundary = np.zeros(t_s.shape, dtype = DTYPE)
     cdef float[:] boundary_view = boundary
+    cdef BoundarySpec boundary_spec
+    boundary_coefs = init_boundary(&boundary_spec, boundary_fun, boundary_multiplicative, boundary_params,
+                                   n_trials, t_s.shape[0], delta_t)
+    cdef BoundaryBuffer boundary_buf = boundary_buffer(&boundary_spec, &boundary_view[0], boundary_view.shape[0],
+                                                       0, 0, 0.0)
 
-    cdef float y, t_particle, smooth_u, deadline_tmp, sqrt_st
+    cdef float y, t_particle, smooth_u, deadline_tmp, sqrt_st, rt
     cdef Py_ssize_t n, ix, k
     cdef Py_ssize_t m = 0
     cdef float drift_increment = 0.0
-    cdef float[:] gaussian_values = draw_gaussian(num_draws)
+    cdef float[:] gaussian_values = draw_gaussian(&rng, num_draws)
 
     for k in range(n_trials):
         # Precompute boundary evaluations
-        boundary_params_tmp = {key: boundary_params[key][k] for key in boundary_params.keys()}
 
-        if boundary_multiplicative:
-            boundary[:] = np.multiply(a_view[k], boundary_fun(t = t_s, **boundary_params_tmp)).astype(DTYPE)
-        else:
-            boundary[:] = np.add(a_view[k], boundary_fun(t = t_s, **boundary_params_tmp)).astype(DTYPE)
+        evaluate_boundary(&boundary_buf, boundary, k, a_view[k], t_s, boundary_fun, boundary_params, True)
 
         deadline_tmp = min(max_t, deadline_view[k] - t_view[k])
         sqrt_st = delta_t_sqrt * s_view[k]
         # Loop over samples
         for n in range(n_samples):
             # initialize starting point
-            y = ((-1) * boundary_view[0]) + (z_view[k] * 2.0 * (boundary_view[0]))  # reset starting position
+            y = ((-1) * boundary_at(&boundary_buf, 0)) + (z_view[k] * 2.0 * (boundary_at(&boundary_buf, 0)))  # reset starting position
             
             # get drift by random displacement of v 
             drift_increment = (v_view[k] + sv_view[k] * gaussian_values[m]) * delta_t
@@ -1934,49 +4008,53 @@ def ddm_sdv(np.ndarray[float, ndim = 1] v,
             # increment m appropriately
             m += 1
             if m == num_draws:
-                    gaussian_values = draw_gaussian(num_draws)
+                    fill_gaussian(&rng, &gaussian_values[0], num_draws)
                     m = 0
             
             t_particle = 0.0 # reset time
             ix = 0 # reset boundary index
             
-            if n == 0:
-                if k == 0:
-                    traj_view[0, 0] = y
+            traj_row = trajectory_row(&trajectories, n, k, traj_sink)
+            record_state(&traj_row, 0, 0, y)
 
             # Random walker
-            while y >= (-1) * boundary_view[ix] and y <= boundary_view[ix] and t_particle <= deadline_tmp:
-                y += drift_increment + (sqrt_st * gaussian_values[m])
-                t_particle += delta_t
-                ix += 1
-                m += 1
+            if method_c == METHOD_BRIDGE:
+                t_particle = bridge_walk(&rng, &y, drift_increment / delta_t, NULL, 0.0, s_view[k],
+                                         &boundary_buf, delta_t, deadline_tmp,
+                                         &traj_row, &ix)
+            else:
+                while y >= (-1) * boundary_at(&boundary_buf, ix) and y <= boundary_at(&boundary_buf, ix) and t_particle <= deadline_tmp:
+                    y += drift_increment + (sqrt_st * gaussian_values[m])
+                    t_particle += delta_t
+                    ix += 1
+                    m += 1
                 
-                if n == 0:
-                    if k == 0:
-                        traj_view[ix, 0] = y
+                    record_state(&traj_row, ix, 0, y)
 
-                if m == num_draws:
-                    gaussian_values = draw_gaussian(num_draws)
-                    m = 0
+                    if m == num_draws:
+                        fill_gaussian(&rng, &gaussian_values[0], num_draws)
+                        m = 0
 
             if smooth_unif:
                 if t_particle == 0.0:
-                    smooth_u = random_uniform() * 0.5 * delta_t
+                    smooth_u = random_uniform(&rng) * 0.5 * delta_t
                 elif t_particle < deadline_tmp:
-                    smooth_u = (0.5 - random_uniform()) * delta_t
+                    smooth_u = (0.5 - random_uniform(&rng)) * delta_t
                 else:
                     smooth_u = 0.0
             else:
                 smooth_u = 0.0
 
-            rts_view[n, k, 0] = t_particle + t_view[k] + smooth_u # Store rt
-            choices_view[n, k, 0] = np.sign(y) # Store choice
-
-            if (rts_view[n, k, 0] >= deadline_view[k]) | (deadline_view[k] <= 0):
-                rts_view[n, k, 0] = -999
+            rt = t_particle + t_view[k] + smooth_u
+            if (rt >= deadline_view[k]) | (deadline_view[k] <= 0):
+                rt = -999
+            store_sample(&sample_output, n, k, rt, ix, sign(y))
+
+    # Whole boundary of the last trial for the metadata
+    fill_boundary(&boundary_buf, boundary_buf.n_bound)
 
     if return_option == 'full':
-        return { 'rts': rts, 'choices': choices, 'metadata': {'v': v,
+        return {**outputs, 'metadata': {'v': v,
                                                             'a': a,
                                                             'z': z,
                                                             't': t,
@@ -1994,7 +4072,7 @@ def ddm_sdv(np.ndarray[float, ndim = 1] v,
                                                             'trajectory': traj,
                                                             'boundary': boundary}}
     elif return_option == 'minimal':
-        return {'rts': rts, 'choices': choices,  'metadata': {'simulator': 'ddm_sdv', 
+        return {**outputs, 'metadata': {'simulator': 'ddm_sdv', 
                                                              'possible_choices': [-1, 1],
                                                              'boundary_fun_type': boundary_fun.__name__,
                                                              'n_samples': n_samples,
@@ -2025,6 +4103,12 @@ def ornstein_uhlenbeck(np.ndarray[float, ndim = 1] v, # drift parameter
                        random_state = None,
                        return_option = 'full',
                        smooth_unif = False,
+                       method = 'euler',
+                       record_trajectories = 0,
+                       trajectories_per_trial = False,
+                       return_steps = False,
+                       layout = 'sample_major',
+                       out = None,
                        **kwargs):
     """
     Simulate reaction times and choices from an Ornstein-Uhlenbeck process with flexible boundaries.
@@ -2044,9 +4128,28 @@ def ornstein_uhlenbeck(np.ndarray[float, ndim = 1] v, # drift parameter
         boundary_fun (callable): Function defining the shape of the boundary over time.
         boundary_multiplicative (bool): If True, boundary function is multiplicative; if False, additive.
         boundary_params (dict): Parameters for the boundary function.
-        random_state (int or None): Seed for random number generator (default: None).
+        random_state (int, numpy.random.Generator or None): Seed for random number generator (default: None).
         return_option (str): 'full' for complete output, 'minimal' for basic output (default: 'full').
         smooth_unif (bool): Whether to apply uniform smoothing to reaction times (default: False).
+        method (str): 'euler' for Euler-Maruyama steps of size delta_t, 'exact' for exact
+            Ornstein-Uhlenbeck transitions over steps of size delta_t with Brownian-bridge
+            crossing checks, or 'bridge' for Euler steps with Brownian-bridge crossing checks
+            and larger steps away from the bounds.
+        record_trajectories (int): Number of samples whose paths are returned as the 'trajectory'
+            metadata (default: 0).
+        trajectories_per_trial (bool): Whether to record the first record_trajectories samples
+            of every trial instead of only those of the first trial (default: False).
+        return_steps (bool): Whether to return the number of delta_t steps of every walk
+            under 'steps' instead of the reaction times, as uint16 (uint32 if max_t / delta_t
+            does not fit) with the largest value of the type for omissions, and the choices
+            as int8. Reaction times are steps * delta_t + t (default: False).
+        layout (str): 'sample_major' for outputs of shape (n_samples, n_trials, 1),
+            'trial_major' for C-contiguous outputs of shape (n_trials, n_samples), or 'records'
+            for a single float32 array of (rt, choice) rows of shape (n_trials * n_samples, 2),
+            trial by trial, under 'records' (default: 'sample_major').
+        out (np.ndarray or None): Optional preallocated C-contiguous float32 array of shape
+            (..., 2) with n_trials * n_samples rows that the records are written to, for layout
+            'records' (default: None).
         **kwargs: Additional keyword arguments.
 
     Returns:
@@ -2057,97 +4160,106 @@ def ornstein_uhlenbeck(np.ndarray[float, ndim = 1] v, # drift parameter
         ValueError: If return_option is not 'full' or 'minimal'.
     """
 
-    set_seed(random_state)
+    cdef int method_c = parse_method(method, ('euler', 'exact', 'bridge'))
+    cdef RngState rng
+    rng_init(&rng, random_state)
     # Data-structs for trajectory storage
-    traj = np.zeros((int(max_t / delta_t) + 1, 1), dtype = DTYPE)
-    traj[:, :] = -999 
-    cdef float[:,:] traj_view = traj
+    cdef Trajectories trajectories
+    cdef TrajectoryRow traj_row
+    cdef float traj_sink[1]
+    traj = init_trajectories(&trajectories, record_trajectories, trajectories_per_trial,
+                             n_samples, n_trials, max_t, delta_t, 1)
 
     # Param views
-    cdef float[:] v_view  = v
-    cdef float[:] a_view = a
-    cdef float[:] z_view = z
-    cdef float[:] g_view = g
-    cdef float[:] t_view = t
-    cdef float[:] deadline_view = deadline
-    cdef float[:] s_view = s
-
+    cdef const float[:] v_view = v
+    cdef const float[:] a_view = a
+    cdef const float[:] z_view = z
+    cdef const float[:] g_view = g
+    cdef const float[:] t_view = t
+    cdef const float[:] deadline_view = deadline
+    cdef const float[:] s_view = s
     # Initializations
-    rts = np.zeros((n_samples, n_trials, 1), dtype = DTYPE) # rt storage
-    choices = np.zeros((n_samples, n_trials, 1), dtype = np.intc) # choice storage
-
-    cdef float[:, :, :] rts_view = rts
-    cdef int[:, :, :] choices_view = choices
+    cdef SampleOutput sample_output
+    outputs = init_sample_output(&sample_output, return_steps, layout, n_samples, n_trials,
+                                 max_t, delta_t, out)
 
     cdef float delta_t_sqrt = np.sqrt(delta_t) # correct scalar so we can use standard normal samples for the brownian motion
     #cdef float sqrt_st = s * delta_t_sqrt
 
     # Boundary Storage
-    cdef int num_draws = int((max_t / delta_t) + 1)
+    cdef int num_draws = noise_buffer_size(max_t, delta_t)
     t_s = np.arange(0, max_t + delta_t, delta_t).astype(DTYPE)
     boundary = np.zeros(t_s.shape, dtype = DTYPE)
     cdef float[:] boundary_view = boundary
+    cdef BoundarySpec boundary_spec
+    boundary_coefs = init_boundary(&boundary_spec, boundary_fun, boundary_multiplicative, boundary_params,
+                                   n_trials, t_s.shape[0], delta_t)
+    cdef BoundaryBuffer boundary_buf = boundary_buffer(&boundary_spec, &boundary_view[0], boundary_view.shape[0],
+                                                       0, 0, 0.0)
 
-    cdef float y, t_particle, smooth_u, deadline_tmp, sqrt_st
+    cdef float y, t_particle, smooth_u, deadline_tmp, sqrt_st, rt
     cdef Py_ssize_t n, ix, k
     cdef Py_ssize_t m = 0
-    cdef float[:] gaussian_values = draw_gaussian(num_draws)
+    cdef float[:] gaussian_values = draw_gaussian(&rng, num_draws)
 
     for k in range(n_trials):
         # Precompute boundary evaluations
-        boundary_params_tmp = {key: boundary_params[key][k] for key in boundary_params.keys()}
 
         # Precompute boundary evaluations
-        if boundary_multiplicative:
-            boundary[:] = np.multiply(a_view[k], boundary_fun(t = t_s, **boundary_params_tmp)).astype(DTYPE)
-        else:
-            boundary[:] = np.add(a_view[k], boundary_fun(t = t_s, **boundary_params_tmp)).astype(DTYPE)
+        evaluate_boundary(&boundary_buf, boundary, k, a_view[k], t_s, boundary_fun, boundary_params, True)
     
         deadline_tmp = min(max_t, deadline_view[k] - t_view[k])
         sqrt_st = delta_t_sqrt * s_view[k]
         # Loop over samples
         for n in range(n_samples):
-            y = (-1) * boundary_view[0] + (z_view[k] * 2 * boundary_view[0])
+            y = (-1) * boundary_at(&boundary_buf, 0) + (z_view[k] * 2 * boundary_at(&boundary_buf, 0))
             t_particle = 0.0
             ix = 0
 
-            if n == 0:
-                if k == 0:
-                    traj_view[0, 0] = y
+            traj_row = trajectory_row(&trajectories, n, k, traj_sink)
+            record_state(&traj_row, 0, 0, y)
 
             # Random walker
-            while y >= (-1) * boundary_view[ix] and y <= boundary_view[ix] and t_particle <= deadline_tmp:
-                y += ((v_view[k] - (g_view[k] * y)) * delta_t) + sqrt_st * gaussian_values[m]
-                t_particle += delta_t
-                ix += 1
-                m += 1
+            if method_c == METHOD_BRIDGE:
+                t_particle = bridge_walk(&rng, &y, v_view[k], NULL, g_view[k], s_view[k],
+                                         &boundary_buf, delta_t, deadline_tmp,
+                                         &traj_row, &ix)
+            elif method_c == METHOD_EXACT:
+                t_particle = ou_exact_walk(&rng, &y, v_view[k], g_view[k], s_view[k],
+                                           &boundary_buf, delta_t, deadline_tmp, &traj_row, &ix)
+            else:
+                while y >= (-1) * boundary_at(&boundary_buf, ix) and y <= boundary_at(&boundary_buf, ix) and t_particle <= deadline_tmp:
+                    y += ((v_view[k] - (g_view[k] * y)) * delta_t) + sqrt_st * gaussian_values[m]
+                    t_particle += delta_t
+                    ix += 1
+                    m += 1
 
-                if n == 0:
-                    if k == 0:
-                        traj_view[ix, 0] = y
+                    record_state(&traj_row, ix, 0, y)
 
-                if m == num_draws:
-                    gaussian_values = draw_gaussian(num_draws)
-                    m = 0
+                    if m == num_draws:
+                        fill_gaussian(&rng, &gaussian_values[0], num_draws)
+                        m = 0
 
             if smooth_unif:
                 if t_particle == 0.0:
-                    smooth_u = random_uniform() * 0.5 * delta_t
+                    smooth_u = random_uniform(&rng) * 0.5 * delta_t
                 elif t_particle < deadline_tmp:
-                    smooth_u = (0.5 - random_uniform()) * delta_t
+                    smooth_u = (0.5 - random_uniform(&rng)) * delta_t
                 else:
                     smooth_u = 0.0
             else:
                 smooth_u = 0.0
 
-            rts_view[n, k, 0] = t_particle + t_view[k] + smooth_u
-            choices_view[n, k, 0] = sign(y)
+            rt = t_particle + t_view[k] + smooth_u
+            if (rt >= deadline_view[k]) | (deadline_view[k] <= 0):
+                rt = -999
+            store_sample(&sample_output, n, k, rt, ix, sign(y))
 
-            if (rts_view[n, k, 0] >= deadline_view[k]) | (deadline_view[k] <= 0):
-                rts_view[n, k, 0] = -999
+    # Whole boundary of the last trial for the metadata
+    fill_boundary(&boundary_buf, boundary_buf.n_bound)
 
     if return_option == 'full':
-        return { 'rts': rts, 'choices': choices, 'metadata': {'v': v,
+        return {**outputs, 'metadata': {'v': v,
                                                             'a': a,
                                                             'z': z,
                                                             'g': g,
@@ -2165,7 +4277,7 @@ def ornstein_uhlenbeck(np.ndarray[float, ndim = 1] v, # drift parameter
                                                             'trajectory': traj,
                                                             'boundary': boundary}}
     elif return_option == 'minimal':
-        return {'rts': rts, 'choices': choices,  'metadata': {'simulator': 'ornstein_uhlenbeck', 
+        return {**outputs, 'metadata': {'simulator': 'ornstein_uhlenbeck', 
                                                              'possible_choices': [-1, 1],
                                                              'boundary_fun_type': boundary_fun.__name__,
                                                              'n_samples': n_samples,
@@ -2182,12 +4294,12 @@ def ornstein_uhlenbeck(np.ndarray[float, ndim = 1] v, # drift parameter
 # @cythonwraparound(False)
 
 # Function that checks boundary crossing of particles
-cdef bint check_finished(float[:] particles, float boundary, int n):
+cdef inline bint check_finished(const float* particles, float boundary, int n) noexcept nogil:
     """
     Check if any particle has crossed the boundary.
 
     Args:
-        particles (float[:]): Array of particle positions.
+        particles (const float*): Array of particle positions.
         boundary (float): Boundary value to check against.
         n (int): Number of particles.
 
@@ -2214,6 +4326,193 @@ cdef bint check_finished(float[:] particles, float boundary, int n):
 #    end = time()
 #    print("numpy check: {}".format(start - end))
 
+# Lockstep stepping of accumulator samples ---------------------------------------------------------
+# race_model and lca advance a block of up to LOCKSTEP_LANES samples of the same trial
+# together. Positions are stored accumulator-major, particles[j * LOCKSTEP_LANES + lane], so
+# the update of an accumulator is one contiguous loop over the lanes that the compiler can
+# vectorize. All lanes share the time step, and hence the boundary value, and finished lanes
+# are retired by moving the last active lane into their slot. Every lane keeps the random
+# stream of its sample, so the results equal those of stepping the samples one at a time.
+# The leading accumulator of every lane is tracked while the positions are updated, so that
+# boundary crossings and choices need no extra pass over the accumulators. With a scalar
+# lateral inhibition a step costs O(n_particles) per sample; a full inhibition matrix costs
+# O(n_particles^2).
+
+cdef enum:
+    LOCKSTEP_LANES = 64
+
+cdef inline void track_max(const float* x, int j, float* lead, int* lead_ix,
+                           Py_ssize_t n_active) noexcept nogil:
+    """
+    Update the leading value and accumulator of every lane with accumulator j.
+    Ties keep the lower index. Written without branches so that it vectorizes.
+    """
+    cdef Py_ssize_t l
+    cdef bint ahead
+    if j == 0:
+        for l in range(n_active):
+            lead[l] = x[l]
+            lead_ix[l] = 0
+    else:
+        for l in range(n_active):
+            ahead = x[l] > lead[l]
+            lead_ix[l] = j if ahead else lead_ix[l]
+            lead[l] = x[l] if ahead else lead[l]
+
+cdef inline void retire_lane(RngState* rng, TrajectoryRow* traj, Py_ssize_t* lane,
+                             float* lead, int* lead_ix, float* particles, int n_particles,
+                             Py_ssize_t slot, Py_ssize_t last) noexcept nogil:
+    """
+    Move the lane in slot last into the (finished) slot.
+    """
+    cdef int j
+    rng[slot] = rng[last]
+    traj[slot] = traj[last]
+    lane[slot] = lane[last]
+    lead[slot] = lead[last]
+    lead_ix[slot] = lead_ix[last]
+    for j in range(n_particles):
+        particles[j * LOCKSTEP_LANES + slot] = particles[j * LOCKSTEP_LANES + last]
+
+cdef void accumulator_block(const uint64_t* key, uint64_t stream, Py_ssize_t n_lanes,
+                            const Trajectories* trajectories, Py_ssize_t n0, Py_ssize_t k,
+                            const float* v, const float* z, const float* s,
+                            bint leaky, float g, float b, const float* inhibition,
+                            float t, float deadline,
+                            const float* boundary, int n_particles,
+                            float* particles, float* noise, float* lateral, float* sink,
+                            float delta_t, float max_t, bint smooth_unif,
+                            const SampleOutput* out) noexcept nogil:
+    """
+    Simulate a block of (rt, choice) pairs of one trial from the race model or the LCA.
+
+    Args:
+        key (const uint64_t*): Seed key of the simulation.
+        stream (uint64_t): Stream id of the first sample of the block.
+        n_lanes (Py_ssize_t): Number of samples in the block, at most LOCKSTEP_LANES.
+        trajectories (const Trajectories*): Recording layout of the kernel.
+        n0, k (Py_ssize_t): Index of the first sample of the block and of the trial.
+        v, z, s (const float*): Per-accumulator parameters of the trial.
+        leaky (bool): Whether to apply the leak g and the lateral inhibition of the LCA.
+        g, b (float): Leak and lateral inhibition of the trial.
+        inhibition (const float*): Row-major n_particles x n_particles inhibition matrix of
+            the trial, used instead of b. NULL for a uniform lateral inhibition b.
+        t, deadline (float): Parameters of the trial.
+        boundary (const float*): Precomputed boundary of the trial.
+        n_particles (int): Number of accumulators.
+        particles (float*): Scratch buffer of n_particles * LOCKSTEP_LANES floats.
+        noise (float*): Scratch buffer of n_particles * LOCKSTEP_LANES floats.
+        lateral (float*): Scratch buffer of n_particles * LOCKSTEP_LANES floats, only used
+            with an inhibition matrix.
+        sink (float*): Scratch space for unrecorded paths.
+        delta_t (float): Time step size.
+        max_t (float): Maximum simulation time.
+        smooth_unif (bool): Whether to apply uniform smoothing to the reaction times.
+        out (const SampleOutput*): Output of the kernel.
+    """
+    cdef RngState rng[LOCKSTEP_LANES]
+    cdef RngState lane_rng
+    cdef TrajectoryRow traj[LOCKSTEP_LANES]
+    cdef Py_ssize_t lane[LOCKSTEP_LANES]
+    cdef float particles_sum[LOCKSTEP_LANES]
+    cdef float lead[LOCKSTEP_LANES]
+    cdef int lead_ix[LOCKSTEP_LANES]
+    cdef float t_particle = 0.0
+    cdef float deadline_tmp = min(max_t, deadline - t)
+    cdef float delta_t_sqrt = sqrt(delta_t)
+    cdef float rt, drift, sigma, w
+    cdef float* x
+    cdef float* e
+    cdef float* y
+    cdef Py_ssize_t ix = 0
+    cdef Py_ssize_t n_active = n_lanes
+    cdef Py_ssize_t l
+    cdef int i, j
+    cdef bint recording = False
+
+    for l in range(n_lanes):
+        rng_seed_stream(&rng[l], key, stream + l)
+        traj[l] = trajectory_row(trajectories, n0 + l, k, sink)
+        recording = recording or traj[l].step != 0
+        lane[l] = l
+        for j in range(n_particles):
+            particles[j * LOCKSTEP_LANES + l] = z[j] * boundary[0] # Reset particle starting points
+            record_state(&traj[l], 0, j, particles[j * LOCKSTEP_LANES + l])
+    for j in range(n_particles):
+        track_max(&particles[j * LOCKSTEP_LANES], j, lead, lead_ix, n_lanes)
+
+    while n_active > 0:
+        # Retire the lanes that crossed the boundary or ran out of time
+        l = 0
+        while l < n_active:
+            if t_particle <= deadline_tmp and lead[l] <= boundary[ix]:
+                l += 1
+                continue
+            rt = t_particle + t + smooth_rt(&rng[l], t_particle, deadline_tmp, delta_t, smooth_unif)
+            if rt >= deadline or deadline <= 0:
+                rt = -999
+            store_sample(out, n0 + lane[l], k, rt, ix, lead_ix[l])
+            n_active -= 1
+            retire_lane(rng, traj, lane, lead, lead_ix, particles, n_particles, l, n_active)
+
+        # Noise is drawn lane by lane, in the order of a single sample. The state is
+        # copied to a local so that it stays in registers across the accumulators.
+        for l in range(n_active):
+            lane_rng = rng[l]
+            for j in range(n_particles):
+                noise[j * LOCKSTEP_LANES + l] = random_gaussian(&lane_rng)
+            rng[l] = lane_rng
+
+        if leaky and inhibition != NULL:
+            # Inhibition of every accumulator by the others, from the positions before the step
+            for i in range(n_particles):
+                y = &lateral[i * LOCKSTEP_LANES]
+                for l in range(n_active):
+                    y[l] = 0.0
+                for j in range(n_particles):
+                    w = inhibition[i * n_particles + j]
+                    if w == 0.0:
+                        continue
+                    x = &particles[j * LOCKSTEP_LANES]
+                    for l in range(n_active):
+                        y[l] += w * x[l]
+        elif leaky:
+            for l in range(n_active):
+                particles_sum[l] = 0.0
+            for j in range(n_particles):
+                x = &particles[j * LOCKSTEP_LANES]
+                for l in range(n_active):
+                    particles_sum[l] += x[l]
+
+        for j in range(n_particles):
+            x = &particles[j * LOCKSTEP_LANES]
+            e = &noise[j * LOCKSTEP_LANES]
+            sigma = delta_t_sqrt * s[j]
+            # Particles are cut off at 0, written as a comparison (not fmax) so that it vectorizes
+            if leaky and inhibition != NULL:
+                y = &lateral[j * LOCKSTEP_LANES]
+                for l in range(n_active):
+                    x[l] += ((v[j] - (g * x[l]) - y[l]) * delta_t) + (sigma * e[l])
+                    x[l] = x[l] if x[l] > 0.0 else 0.0
+            elif leaky:
+                for l in range(n_active):
+                    x[l] += ((v[j] - (g * x[l]) - (b * (particles_sum[l] - x[l]))) * delta_t) + \
+                            (sigma * e[l])
+                    x[l] = x[l] if x[l] > 0.0 else 0.0
+            else:
+                drift = v[j] * delta_t
+                for l in range(n_active):
+                    x[l] += drift + sigma * e[l]
+                    x[l] = x[l] if x[l] > 0.0 else 0.0
+            track_max(x, j, lead, lead_ix, n_active)
+
+        t_particle += delta_t
+        ix += 1
+        if recording:
+            for l in range(n_active):
+                for j in range(n_particles):
+                    record_state(&traj[l], ix, j, particles[j * LOCKSTEP_LANES + l])
+
 # @cythonboundscheck(False)
 # @cythonwraparound(False)
 def race_model(np.ndarray[float, ndim = 2] v,  # np.array expected, one column of floats
@@ -2232,6 +4531,12 @@ def race_model(np.ndarray[float, ndim = 2] v,  # np.array expected, one column o
                random_state = None,
                return_option = 'full',
                smooth_unif = False,
+               int n_threads = 1,
+               record_trajectories = 0,
+               trajectories_per_trial = False,
+               return_steps = False,
+               layout = 'sample_major',
+               out = None,
                **kwargs):
     """
     Simulate reaction times and choices from a race model with N samples.
@@ -2250,9 +4555,25 @@ def race_model(np.ndarray[float, ndim = 2] v,  # np.array expected, one column o
         boundary_fun (callable): Function defining the shape of the boundary over time.
         boundary_multiplicative (bool): If True, boundary function is multiplicative; if False, additive.
         boundary_params (dict): Parameters for the boundary function.
-        random_state (int or None): Seed for random number generator (default: None).
+        random_state (int, numpy.random.Generator or None): Seed for random number generator (default: None).
         return_option (str): 'full' for complete output, 'minimal' for basic output (default: 'full').
         smooth_unif (bool): Whether to apply uniform smoothing to reaction times (default: False).
+        n_threads (int): Number of threads used to simulate samples in parallel (default: 1).
+        record_trajectories (int): Number of samples whose paths are returned as the 'trajectory'
+            metadata (default: 0).
+        trajectories_per_trial (bool): Whether to record the first record_trajectories samples
+            of every trial instead of only those of the first trial (default: False).
+        return_steps (bool): Whether to return the number of delta_t steps of every walk
+            under 'steps' instead of the reaction times, as uint16 (uint32 if max_t / delta_t
+            does not fit) with the largest value of the type for omissions, and the choices
+            as int8. Reaction times are steps * delta_t + t (default: False).
+        layout (str): 'sample_major' for outputs of shape (n_samples, n_trials, 1),
+            'trial_major' for C-contiguous outputs of shape (n_trials, n_samples), or 'records'
+            for a single float32 array of (rt, choice) rows of shape (n_trials * n_samples, 2),
+            trial by trial, under 'records' (default: 'sample_major').
+        out (np.ndarray or None): Optional preallocated C-contiguous float32 array of shape
+            (..., 2) with n_trials * n_samples rows that the records are written to, for layout
+            'records' (default: None).
         **kwargs: Additional keyword arguments.
 
     Returns:
@@ -2263,117 +4584,83 @@ def race_model(np.ndarray[float, ndim = 2] v,  # np.array expected, one column o
         ValueError: If return_option is not 'full' or 'minimal'.
     """
 
-    set_seed(random_state)
+    cdef uint64_t key[4]
+    rng_key_from_seed(random_state, key)
     # Param views
-    cdef float[:, :] v_view = v
-    cdef float[:, :] z_view = z
-    cdef float[:, :] a_view = a
-    cdef float[:, :] t_view = t
-    cdef float[:, :] s_view = s
-    cdef float[:] deadline_view = deadline
-
-    cdef float delta_t_sqrt = sqrt(delta_t)
-    sqrt_st = delta_t_sqrt * s
-    cdef float[:, :] sqrt_st_view = sqrt_st
-
+    cdef float[:, ::1] v_view = np.ascontiguousarray(v)
+    cdef float[:, ::1] z_view = np.ascontiguousarray(z)
+    cdef const float[:, :] t_view = t
+    cdef float[:, ::1] s_view = np.ascontiguousarray(s)
+    cdef const float[:] deadline_view = deadline
     cdef int n_particles = v.shape[1]
-    rts = np.zeros((n_samples, n_trials, 1), dtype = DTYPE)
-    cdef float[:, :, :] rts_view = rts
-    choices = np.zeros((n_samples, n_trials, 1), dtype = np.intc)
-    cdef int[:, :, :] choices_view = choices
-    
-    particles = np.zeros((n_particles), dtype = DTYPE)
-    cdef float [:] particles_view = particles
-
-    # TD: Add Trajectory
-    traj = np.zeros((int(max_t / delta_t) + 1, n_particles), dtype = DTYPE)
-    traj[:, :] = -999 
-    cdef float[:, :] traj_view = traj    
+    cdef SampleOutput sample_output
+    outputs = init_sample_output(&sample_output, return_steps, layout, n_samples, n_trials,
+                                 max_t, delta_t, out)
 
-    # Boundary storage
-    cdef int num_steps = int((max_t / delta_t) + 1)
+    # Particle positions and noise of a block of lanes, one row per thread
+    particles = np.zeros((max(1, n_threads), n_particles * LOCKSTEP_LANES), dtype = DTYPE)
+    cdef float[:, ::1] particles_view = particles
+    noise = np.zeros((max(1, n_threads), n_particles * LOCKSTEP_LANES), dtype = DTYPE)
+    cdef float[:, ::1] noise_view = noise
 
+    # TD: Add Trajectory
+    cdef Trajectories trajectories
+    traj = init_trajectories(&trajectories, record_trajectories, trajectories_per_trial,
+                             n_samples, n_trials, max_t, delta_t, n_particles)
+    # Per-thread sinks for the samples that are not recorded
+    traj_sink = np.empty((max(1, n_threads), n_particles + TRAJECTORY_SINK_PAD), dtype = DTYPE)
+    cdef float[:, ::1] traj_sink_view = traj_sink
+
+    # Boundary storage, evaluated for blocks of trials at a time
     t_s = np.arange(0, max_t + delta_t, delta_t).astype(DTYPE)
-    boundary = np.zeros(t_s.shape, dtype = DTYPE)
-    cdef float[:] boundary_view = boundary
+    cdef Py_ssize_t n_bound = t_s.shape[0] + 1
+    cdef int block_trials = boundary_block_trials(n_trials, n_bound)
+    boundary_block = np.zeros((block_trials, n_bound), dtype = DTYPE)
+    cdef float[:, ::1] boundary_view = boundary_block
+    cdef BoundarySpec boundary_spec
+    boundary_coefs = init_boundary(&boundary_spec, boundary_fun, boundary_multiplicative, boundary_params,
+                                   n_trials, t_s.shape[0], delta_t)
 
     # Initialize variables needed for for loop 
-    cdef float t_particle, smooth_u, deadline_tmp
-    cdef Py_ssize_t n, ix, j, k
-    cdef Py_ssize_t m = 0
-
-    cdef int num_draws = num_steps * n_particles
-    cdef float[:] gaussian_values = draw_gaussian(num_draws)
-
-    for k in range(n_trials):
-        # Precompute boundary evaluations
-        boundary_params_tmp = {key: boundary_params[key][k] for key in boundary_params.keys()}
+    cdef bint smooth_unif_c = smooth_unif
+    cdef Py_ssize_t i, n, k, k_start, k_end
+    # Samples are simulated in blocks of LOCKSTEP_LANES per trial
+    cdef Py_ssize_t n_blocks = (n_samples + LOCKSTEP_LANES - 1) // LOCKSTEP_LANES
 
+    for k_start in range(0, n_trials, block_trials):
+        k_end = min(n_trials, k_start + block_trials)
         # Precompute boundary evaluations
-        if boundary_multiplicative:
-            boundary[:] = np.multiply(a_view[k, 0], boundary_fun(t = t_s, **boundary_params_tmp)).astype(DTYPE)
-        else:
-            boundary[:] = np.add(a_view[k, 0], boundary_fun(t = t_s, **boundary_params_tmp)).astype(DTYPE)
-    
-        deadline_tmp = min(max_t, deadline_view[k] - t_view[k, 0])
-        # Loop over samples
-        for n in range(n_samples):
-            for j in range(n_particles):
-                particles_view[j] = z_view[k, j] * boundary_view[0] # Reset particle starting points
-            
-            t_particle = 0.0 # reset time
-            ix = 0
-
-            if n == 0:
-                if k == 0:
-                    for j in range(n_particles):
-                        traj_view[0, j] = particles[j]
-
-            # Random walker
-            while not check_finished(particles_view, boundary_view[ix], n_particles) and t_particle <= deadline_tmp:
-                for j in range(n_particles):
-                    particles_view[j] += (v_view[k, j] * delta_t) + sqrt_st_view[k, j] * gaussian_values[m]
-                    particles_view[j] = fmax(0.0, particles_view[j]) # Cut off particles at 0
-                    m += 1
-                    if m == num_draws:
-                        m = 0
-                        gaussian_values = draw_gaussian(num_draws)
-                t_particle += delta_t
-                ix += 1
-                if n == 0:
-                    if k == 0:
-                        for j in range(n_particles):
-                            traj_view[ix, j] = particles[j]
-
-            if smooth_unif:
-                if t_particle == 0.0:
-                    smooth_u = random_uniform() * 0.5 * delta_t
-                elif t_particle < deadline_tmp:
-                    smooth_u = (0.5 - random_uniform()) * delta_t
-                else:
-                    smooth_u = 0.0
-            else:
-                smooth_u = 0.0
-
-            rts_view[n , k, 0] = t_particle + t[k, 0] + smooth_u # for now no t per choice option
-            choices_view[n, k, 0] = np.argmax(particles)
-            #rts_view[n, 0] = t + t[choices_view[n, 0]]
-
-            if (rts_view[n, k, 0] >= deadline_view[k]) | (deadline_view[k] <= 0):
-                rts_view[n, k, 0] = -999
-            
+        compute_boundary_block(boundary_block, a[:, 0], k_start, k_end, t_s, &boundary_spec,
+                               boundary_fun, boundary_multiplicative, boundary_params)
+
+        for i in prange(k_start * n_blocks, k_end * n_blocks, nogil = True,
+                        schedule = 'dynamic', num_threads = n_threads):
+            k = i // n_blocks
+            n = (i % n_blocks) * LOCKSTEP_LANES
+            accumulator_block(key, k * n_samples + n, min(LOCKSTEP_LANES, n_samples - n),
+                              &trajectories, n, k,
+                              &v_view[k, 0], &z_view[k, 0], &s_view[k, 0],
+                              False, 0.0, 0.0, NULL, t_view[k, 0], deadline_view[k],
+                              &boundary_view[k - k_start, 0], n_particles,
+                              &particles_view[threadid(), 0], &noise_view[threadid(), 0], NULL,
+                              &traj_sink_view[threadid(), 0],
+                              delta_t, max_t, smooth_unif_c,
+                              &sample_output)
+
+    # Boundary of the last trial
+    boundary = boundary_block[(n_trials - 1) % block_trials, :t_s.shape[0]].copy()
 
-        # Create some dics
-        v_dict = {}
-        z_dict = {}
-        #t_dict = {}
-        for i in range(n_particles):
-            v_dict['v' + str(i)] = v[:, i]
-            z_dict['z' + str(i)] = z[:, i]
-            #t_dict['t_' + str(i)] = t[i] # for now no t by choice
+    # Create some dics
+    v_dict = {}
+    z_dict = {}
+    #t_dict = {}
+    for i in range(n_particles):
+        v_dict['v' + str(i)] = v[:, i]
+        z_dict['z' + str(i)] = z[:, i]
+        #t_dict['t_' + str(i)] = t[i] # for now no t by choice
 
     if return_option == 'full':
-        return {'rts': rts, 'choices': choices, 'metadata': {**v_dict,
+        return {**outputs, 'metadata': {**v_dict,
                                                             'a': a, 
                                                             **z_dict,
                                                             't': t,
@@ -2391,8 +4678,8 @@ def race_model(np.ndarray[float, ndim = 2] v,  # np.array expected, one column o
                                                             'trajectory': traj,
                                                             'boundary': boundary}}
     elif return_option == 'minimal':
-        return {'rts': rts, 'choices': choices, 'metadata': {'simulator': 'race_model', 
-                                                             'possible_choices': [-1, 1],
+        return {**outputs, 'metadata': {'simulator': 'race_model', 
+                                                             'possible_choices': list(np.arange(0, n_particles, 1)),
                                                              'boundary_fun_type': boundary_fun.__name__,
                                                              'n_samples': n_samples,
                                                              'n_trials': n_trials,
@@ -2423,6 +4710,13 @@ def lca(np.ndarray[float, ndim = 2] v, # drift parameters (np.array expect: one
         random_state = None,
         return_option = 'full',
         smooth_unif = False,
+        int n_threads = 1,
+        record_trajectories = 0,
+        trajectories_per_trial = False,
+        inhibition = None,
+        return_steps = False,
+        layout = 'sample_major',
+        out = None,
         **kwargs):
     """
     Simulate reaction times and choices from a Leaky Competing Accumulator (LCA) model.
@@ -2459,12 +4753,36 @@ def lca(np.ndarray[float, ndim = 2] v, # drift parameters (np.array expect: one
         If True, the boundary function is multiplicative; if False, it's additive (default: True).
     boundary_params : dict, optional
         Parameters for the boundary function (default: {}).
-    random_state : int or None, optional
+    random_state : int, numpy.random.Generator or None, optional
         Seed for random number generation (default: None).
     return_option : str, optional
         Determines the amount of data returned. Can be 'full' or 'minimal' (default: 'full').
     smooth_unif : bool, optional
         If True, applies uniform smoothing to reaction times (default: False).
+    n_threads : int, optional
+        Number of threads used to simulate samples in parallel (default: 1).
+    record_trajectories : int, optional
+        Number of samples whose paths are returned as the 'trajectory' metadata (default: 0).
+    trajectories_per_trial : bool, optional
+        If True, records the first record_trajectories samples of every trial instead of
+        only those of the first trial (default: False).
+    inhibition : np.ndarray, shape (n_particles, n_particles) or (n_trials, n_particles, n_particles), optional
+        Connectivity matrix, where inhibition[i, j] is the weight with which particle j
+        inhibits particle i. Replaces the uniform lateral inhibition b when given. The
+        diagonal acts as an additional leak (default: None).
+    return_steps : bool, optional
+        If True, returns the number of delta_t steps of every walk under 'steps' instead of
+        the reaction times, as uint16 (uint32 if max_t / delta_t does not fit) with the
+        largest value of the type for omissions, and the choices as int8. Reaction times
+        are steps * delta_t + t (default: False).
+    layout : str, optional
+        'sample_major' for outputs of shape (n_samples, n_trials, 1), 'trial_major' for
+        C-contiguous outputs of shape (n_trials, n_samples), or 'records' for a single float32
+        array of (rt, choice) rows of shape (n_trials * n_samples, 2), trial by trial, under
+        'records' (default: 'sample_major').
+    out : np.ndarray, optional
+        Preallocated C-contiguous float32 array of shape (..., 2) with n_trials * n_samples
+        rows that the records are written to, for layout 'records' (default: None).
 
     Returns:
     --------
@@ -2473,117 +4791,93 @@ def lca(np.ndarray[float, ndim = 2] v, # drift parameters (np.array expect: one
         The exact contents depend on the 'return_option' parameter.
     """
 
-    set_seed(random_state)
+    cdef uint64_t key[4]
+    rng_key_from_seed(random_state, key)
     # Param views
-    cdef float[:, :] v_view = v
-    cdef float[:, :] a_view = a
-    cdef float[:, :] z_view = z
-    cdef float[:, :] g_view = g
-    cdef float[:, :] b_view = b
-    cdef float[:, :] t_view = t
-    cdef float[:, :] s_view = s
-    cdef float[:] deadline_view = deadline
-
+    cdef float[:, ::1] v_view = np.ascontiguousarray(v)
+    cdef float[:, ::1] z_view = np.ascontiguousarray(z)
+    cdef const float[:, :] g_view = g
+    cdef const float[:, :] b_view = b
+    cdef const float[:, :] t_view = t
+    cdef float[:, ::1] s_view = np.ascontiguousarray(s)
+    cdef const float[:] deadline_view = deadline
     # Trajectory
     cdef int n_particles = v.shape[1]
-    traj = np.zeros((int(max_t / delta_t) + 1, n_particles), dtype = DTYPE)
-    traj[:, :] = -999 
-    cdef float[:, :] traj_view = traj
-
-    rts = np.zeros((n_samples, n_trials, 1), dtype = DTYPE)
-    cdef float[:, :, :] rts_view = rts
-    
-    choices = np.zeros((n_samples, n_trials, 1), dtype = np.intc)
-    cdef int[:, :, :] choices_view = choices
-
-    particles = np.zeros(n_particles, dtype = DTYPE)
-    cdef float[:] particles_view = particles
-    
-    particles_reduced_sum = np.zeros(n_particles, dtype = DTYPE)
-    cdef float[:] particles_reduced_sum_view = particles_reduced_sum
-    
-    cdef float delta_t_sqrt = sqrt(delta_t)
-    sqrt_st = s * delta_t_sqrt
-    cdef float[:, :] sqrt_st_view = sqrt_st
-    
-    cdef Py_ssize_t n, i, ix, k
-    cdef Py_ssize_t m = 0
-    cdef float t_par, particles_sum, smooth_u, deadline_tmp
-    
-    # Boundary storage                                                             
-    cdef int num_steps = int((max_t / delta_t) + 2)
+    cdef Trajectories trajectories
+    traj = init_trajectories(&trajectories, record_trajectories, trajectories_per_trial,
+                             n_samples, n_trials, max_t, delta_t, n_particles)
+    # Per-thread sinks for the samples that are not recorded
+    traj_sink = np.empty((max(1, n_threads), n_particles + TRAJECTORY_SINK_PAD), dtype = DTYPE)
+    cdef float[:, ::1] traj_sink_view = traj_sink
+
+    cdef SampleOutput sample_output
+    outputs = init_sample_output(&sample_output, return_steps, layout, n_samples, n_trials,
+                                 max_t, delta_t, out)
+
+    # Particle positions and noise of a block of lanes, one row per thread
+    particles = np.zeros((max(1, n_threads), n_particles * LOCKSTEP_LANES), dtype = DTYPE)
+    cdef float[:, ::1] particles_view = particles
+    noise = np.zeros((max(1, n_threads), n_particles * LOCKSTEP_LANES), dtype = DTYPE)
+    cdef float[:, ::1] noise_view = noise
+
+    # Inhibition matrix per trial, and the inhibition it exerts on a block of lanes
+    cdef bint use_inhibition = inhibition is not None
+    if use_inhibition:
+        inhibition = np.asarray(inhibition, dtype = DTYPE)
+        if (inhibition.ndim not in (2, 3)
+                or inhibition.shape[inhibition.ndim - 2] != n_particles
+                or inhibition.shape[inhibition.ndim - 1] != n_particles):
+            raise ValueError('inhibition must have shape (n_particles, n_particles) or '
+                             '(n_trials, n_particles, n_particles), got ' + str(inhibition.shape))
+        inhibition_trials = np.ascontiguousarray(
+            np.broadcast_to(inhibition, (n_trials, n_particles, n_particles)))
+    else:
+        inhibition_trials = np.zeros((n_trials, 1, 1), dtype = DTYPE)
+    cdef const float[:, :, ::1] inhibition_view = inhibition_trials
+    lateral = np.zeros((max(1, n_threads), n_particles * LOCKSTEP_LANES if use_inhibition else 1),
+                       dtype = DTYPE)
+    cdef float[:, ::1] lateral_view = lateral
 
+    # Boundary storage, evaluated for blocks of trials at a time
     t_s = np.arange(0, max_t + delta_t, delta_t).astype(DTYPE)
-    boundary = np.zeros(t_s.shape, dtype = DTYPE)
-    cdef float[:] boundary_view = boundary
-
-    cdef int num_draws = num_steps * n_particles
-    cdef float[:] gaussian_values = draw_gaussian(num_draws)
-
-    for k in range(n_trials):
-        # Precompute boundary evaluations
-        boundary_params_tmp = {key: boundary_params[key][k] for key in boundary_params.keys()}
-
+    cdef Py_ssize_t n_bound = t_s.shape[0] + 1
+    cdef int block_trials = boundary_block_trials(n_trials, n_bound)
+    boundary_block = np.zeros((block_trials, n_bound), dtype = DTYPE)
+    cdef float[:, ::1] boundary_view = boundary_block
+    cdef BoundarySpec boundary_spec
+    boundary_coefs = init_boundary(&boundary_spec, boundary_fun, boundary_multiplicative, boundary_params,
+                                   n_trials, t_s.shape[0], delta_t)
+
+    cdef bint smooth_unif_c = smooth_unif
+    cdef Py_ssize_t i, n, k, k_start, k_end
+    # Samples are simulated in blocks of LOCKSTEP_LANES per trial
+    cdef Py_ssize_t n_blocks = (n_samples + LOCKSTEP_LANES - 1) // LOCKSTEP_LANES
+
+    for k_start in range(0, n_trials, block_trials):
+        k_end = min(n_trials, k_start + block_trials)
         # Precompute boundary evaluations
-        if boundary_multiplicative:
-            boundary[:] = np.multiply(a_view[k, 0], boundary_fun(t = t_s, **boundary_params_tmp)).astype(DTYPE)
-        else:
-            boundary[:] = np.add(a_view[k, 0], boundary_fun(t = t_s, **boundary_params_tmp)).astype(DTYPE)
-
-        deadline_tmp = min(max_t, deadline_view[k] - t_view[k, 0])
-        for n in range(n_samples):
-            # Reset particle starting points
-            for i in range(n_particles):
-                particles_view[i] = z_view[k, i] * boundary_view[0]
-            
-            t_particle = 0.0 # reset time
-            ix = 0 # reset boundary index
+        compute_boundary_block(boundary_block, a[:, 0], k_start, k_end, t_s, &boundary_spec,
+                               boundary_fun, boundary_multiplicative, boundary_params)
+
+        for i in prange(k_start * n_blocks, k_end * n_blocks, nogil = True,
+                        schedule = 'dynamic', num_threads = n_threads):
+            k = i // n_blocks
+            n = (i % n_blocks) * LOCKSTEP_LANES
+            accumulator_block(key, k * n_samples + n, min(LOCKSTEP_LANES, n_samples - n),
+                              &trajectories, n, k,
+                              &v_view[k, 0], &z_view[k, 0], &s_view[k, 0],
+                              True, g_view[k, 0], b_view[k, 0],
+                              &inhibition_view[k, 0, 0] if use_inhibition else NULL,
+                              t_view[k, 0], deadline_view[k],
+                              &boundary_view[k - k_start, 0], n_particles,
+                              &particles_view[threadid(), 0], &noise_view[threadid(), 0],
+                              &lateral_view[threadid(), 0], &traj_sink_view[threadid(), 0],
+                              delta_t, max_t, smooth_unif_c,
+                              &sample_output)
+
+    # Boundary of the last trial
+    boundary = boundary_block[(n_trials - 1) % block_trials, :t_s.shape[0]].copy()
 
-            if n == 0:
-                if k == 0:
-                    for i in range(n_particles):
-                        traj_view[0, i] = particles[i]
-
-            while not check_finished(particles_view, boundary_view[ix], n_particles) and t_particle <= deadline_tmp:
-                # calculate current sum over particle positions
-                particles_sum = csum(particles_view)
-                
-                # update particle positions 
-                for i in range(n_particles):
-                    particles_reduced_sum_view[i] = (- 1) * particles_view[i] + particles_sum
-                    particles_view[i] += ((v_view[k, i] - (g_view[k, 0] * particles_view[i]) - \
-                            (b_view[k, 0] * particles_reduced_sum_view[i])) * delta_t) + (sqrt_st_view[k, i] * gaussian_values[m])
-                    particles_view[i] = fmax(0.0, particles_view[i])
-                    m += 1
-
-                    if m == num_draws:
-                        gaussian_values = draw_gaussian(num_draws)
-                        m = 0
-                
-                t_particle += delta_t # increment time
-                ix += 1 # increment boundary index
-
-                if n == 0:
-                    if k == 0:
-                        for i in range(n_particles):
-                            traj_view[ix, i] = particles[i]
-
-            if smooth_unif:
-                if t_particle == 0.0:
-                    smooth_u = random_uniform() * 0.5 * delta_t
-                elif t_particle < deadline_tmp:
-                    smooth_u = (0.5 - random_uniform()) * delta_t
-                else:
-                    smooth_u = 0.0
-            else:
-                smooth_u = 0.0
-        
-            choices_view[n, k, 0] = np.argmax(particles) # store choices for sample n
-            rts_view[n, k, 0] = t_particle + t_view[k, 0] + smooth_u # t[choices_view[n, 0]] # store reaction time for sample n
-
-            if (rts_view[n, k, 0] >= deadline_view[k]) | (deadline_view[k] <= 0):
-                rts_view[n, k, 0] = -999
-        
     # Create some dics
     v_dict = {}
     z_dict = {}
@@ -2594,11 +4888,12 @@ def lca(np.ndarray[float, ndim = 2] v, # drift parameters (np.array expect: one
         z_dict['z' + str(i)] = z[:, i]
 
     if return_option == 'full':
-        return {'rts': rts, 'choices': choices, 'metadata': {**v_dict,
+        return {**outputs, 'metadata': {**v_dict,
                                                             'a': a,
                                                             **z_dict,
                                                             'g': g,
                                                             'b': b,
+                                                            'inhibition': inhibition,
                                                             't': t,
                                                             'deadline': deadline,
                                                             's': s,
@@ -2613,8 +4908,8 @@ def lca(np.ndarray[float, ndim = 2] v, # drift parameters (np.array expect: one
                                                             'trajectory': traj,
                                                             'boundary': boundary}}
     elif return_option == 'minimal':
-        return {'rts': rts, 'choices': choices, 'metadata': {'simulator': 'lca', 
-                                                             'possible_choices': [-1, 1],
+        return {**outputs, 'metadata': {'simulator': 'lca', 
+                                                             'possible_choices': list(np.arange(0, n_particles, 1)),
                                                              'boundary_fun_type': boundary_fun.__name__,
                                                              'n_samples': n_samples,
                                                              'n_trials': n_trials,
@@ -2647,6 +4942,8 @@ def ddm_flexbound_seq2(np.ndarray[float, ndim = 1] vh,
                        random_state = None,
                        return_option = 'full',
                        smooth_unif = False,
+                       record_trajectories = 0,
+                       trajectories_per_trial = False,
                        **kwargs):
     """
     Simulate reaction times and choices from a sequential two-stage drift diffusion model with flexible boundaries.
@@ -2685,12 +4982,17 @@ def ddm_flexbound_seq2(np.ndarray[float, ndim = 1] vh,
         If True, the boundary function is multiplicative; if False, it's additive (default: True).
     boundary_params : dict, optional
         Parameters for the boundary function (default: {}).
-    random_state : int or None, optional
+    random_state : int, numpy.random.Generator or None, optional
         Seed for the random number generator (default: None).
     return_option : str, optional
         Determines the amount of data returned. Can be 'full' or 'minimal' (default: 'full').
     smooth_unif : bool, optional
         If True, applies uniform smoothing to reaction times (default: False).
+    record_trajectories : int, optional
+        Number of samples whose paths are returned as the 'trajectory' metadata (default: 0).
+    trajectories_per_trial : bool, optional
+        If True, records the first record_trajectories samples of every trial instead of
+        only those of the first trial (default: False).
 
     Returns:
     --------
@@ -2699,18 +5001,19 @@ def ddm_flexbound_seq2(np.ndarray[float, ndim = 1] vh,
         The exact contents depend on the 'return_option' parameter.
     """
 
-    set_seed(random_state)
+    cdef RngState rng
+    rng_init(&rng, random_state)
     # Param views
-    cdef float[:] vh_view = vh
-    cdef float[:] vl1_view = vl1
-    cdef float[:] vl2_view = vl2
-    cdef float[:] a_view = a
-    cdef float[:] zh_view = zh
-    cdef float[:] zl1_view = zl1
-    cdef float[:] zl2_view = zl2
-    cdef float[:] t_view = t
-    cdef float[:] deadline_view = deadline
-    cdef float[:] s_view = s
+    cdef const float[:] vh_view = vh
+    cdef const float[:] vl1_view = vl1
+    cdef const float[:] vl2_view = vl2
+    cdef const float[:] a_view = a
+    cdef const float[:] zh_view = zh
+    cdef const float[:] zl1_view = zl1
+    cdef const float[:] zl2_view = zl2
+    cdef const float[:] t_view = t
+    cdef const float[:] deadline_view = deadline
+    cdef const float[:] s_view = s
     rts = np.zeros((n_samples, n_trials, 1), dtype = DTYPE)
     choices = np.zeros((n_samples, n_trials, 1), dtype = np.intc)
 
@@ -2719,34 +5022,37 @@ def ddm_flexbound_seq2(np.ndarray[float, ndim = 1] vh,
     cdef int decision_taken = 0
 
     # TD: Add Trajectory
-    traj = np.zeros((int(max_t / delta_t) + 1, 3), dtype = DTYPE)
-    traj[:, :] = -999 
-    cdef float[:, :] traj_view = traj
+    cdef Trajectories trajectories
+    cdef TrajectoryRow traj_row
+    cdef float traj_sink[3]
+    traj = init_trajectories(&trajectories, record_trajectories, trajectories_per_trial,
+                             n_samples, n_trials, max_t, delta_t, 3)
 
     cdef float delta_t_sqrt = sqrt(delta_t) # correct scalar so we can use standard normal samples for the brownian motion
     #cdef float sqrt_st = delta_t_sqrt * s # scalar to ensure the correct variance for the gaussian step
 
     # Boundary storage for the upper bound
-    cdef int num_draws = int((max_t / delta_t) + 1)
+    cdef int num_draws = noise_buffer_size(max_t, delta_t)
     t_s = np.arange(0, max_t + delta_t, delta_t).astype(DTYPE)
     boundary = np.zeros(t_s.shape, dtype = DTYPE)
     cdef float[:] boundary_view = boundary
+    cdef BoundarySpec boundary_spec
+    boundary_coefs = init_boundary(&boundary_spec, boundary_fun, boundary_multiplicative, boundary_params,
+                                   n_trials, t_s.shape[0], delta_t)
+    cdef BoundaryBuffer boundary_buf = boundary_buffer(&boundary_spec, &boundary_view[0], boundary_view.shape[0],
+                                                       0, 0, 0.0)
 
     cdef float y_h, t_particle, t_particle1, t_particle2, y_l, y_l1, y_l2, smooth_u, deadline_tmp, sqrt_st
     cdef Py_ssize_t n, ix, ix1, ix2, k
     cdef Py_ssize_t m = 0
     #cdef Py_ssize_t traj_id
-    cdef float[:] gaussian_values = draw_gaussian(num_draws)
+    cdef float[:] gaussian_values = draw_gaussian(&rng, num_draws)
 
     for k in range(n_trials):
         # Precompute boundary evaluations
-        boundary_params_tmp = {key: boundary_params[key][k] for key in boundary_params.keys()}
 
         # Precompute boundary evaluations
-        if boundary_multiplicative:
-            boundary[:] = np.multiply(a_view[k], boundary_fun(t = t_s, **boundary_params_tmp)).astype(DTYPE)
-        else:
-            boundary[:] = np.add(a_view[k], boundary_fun(t = t_s, **boundary_params_tmp)).astype(DTYPE)
+        evaluate_boundary(&boundary_buf, boundary, k, a_view[k], t_s, boundary_fun, boundary_params, False)
     
         deadline_tmp = min(max_t, deadline_view[k] - t_view[k])
         sqrt_st = delta_t_sqrt * s_view[k]
@@ -2759,9 +5065,8 @@ def ddm_flexbound_seq2(np.ndarray[float, ndim = 1] vh,
             # Random walker 1 (high dimensional)
             y_h = (-1) * boundary_view[0] + (zh_view[k] * 2 * (boundary_view[0]))  # reset starting position 
             
-            if n == 0:
-                if k == 0:
-                    traj_view[0, 0] = y_h
+            traj_row = trajectory_row(&trajectories, n, k, traj_sink)
+            record_state(&traj_row, 0, 0, y_h)
 
             while y_h >= (-1) * boundary_view[ix] and y_h <= boundary_view[ix] and t_particle <= deadline_tmp:
                 y_h += (vh_view[k] * delta_t) + (sqrt_st * gaussian_values[m])
@@ -2770,39 +5075,37 @@ def ddm_flexbound_seq2(np.ndarray[float, ndim = 1] vh,
                 m += 1
                 
                 if m == num_draws:
-                    gaussian_values = draw_gaussian(num_draws)
+                    fill_gaussian(&rng, &gaussian_values[0], num_draws)
                     m = 0
 
-                if n == 0:
-                    if k == 0:
-                        traj_view[ix, 0] = y_h
+                record_state(&traj_row, ix, 0, y_h)
 
             # If we are already at maximum t, to generate a choice we just sample from a bernoulli
             if t_particle >= max_t:
                 # High dim choice depends on position of particle
                 if boundary_view[ix] <= 0:
-                    if random_uniform() <= 0.5:
+                    if random_uniform(&rng) <= 0.5:
                         choices_view[n, k, 0] += 2
-                elif random_uniform() <= ((y_h + boundary_view[ix]) / (2 * boundary_view[ix])):
+                elif random_uniform(&rng) <= ((y_h + boundary_view[ix]) / (2 * boundary_view[ix])):
                         choices_view[n, k, 0] += 2
 
                 # Low dim choice random (didn't even get to process it if rt is at max after first choice)
                 # so we just apply a priori bias
                 if choices_view[n, k, 0] == 0:
-                    if random_uniform() <= zl1_view[k]:
+                    if random_uniform(&rng) <= zl1_view[k]:
                         choices_view[n, k, 0] += 1
                 else:
-                    if random_uniform() <= zl2_view[k]:
+                    if random_uniform(&rng) <= zl2_view[k]:
                         choices_view[n, k, 0] += 1
                 rts_view[n, k, 0] = t_particle
                 decision_taken = 1
             else:
                 # If boundary is negative (or 0) already, we flip a coin
                 if boundary_view[ix] <= 0:
-                    if random_uniform() <= 0.5:
+                    if random_uniform(&rng) <= 0.5:
                         choices_view[n, k, 0] += 2
                 # Otherwise apply rule from above
-                elif random_uniform() <= ((y_h + boundary_view[ix]) / (2 * boundary_view[ix])):
+                elif random_uniform(&rng) <= ((y_h + boundary_view[ix]) / (2 * boundary_view[ix])):
                     choices_view[n, k, 0] += 2
 
                 y_l1 = (-1) * boundary_view[ix] + (zl1_view[k] * 2 * (boundary_view[ix]))
@@ -2817,53 +5120,45 @@ def ddm_flexbound_seq2(np.ndarray[float, ndim = 1] vh,
                 if choices_view[n, k, 0] == 0:
                     # In case boundary is negative already, we flip a coin with bias determined by w_l_ parameter
                     if (y_l1 >= boundary_view[ix]) or (y_l1 <= ((-1) * boundary_view[ix])):
-                        if random_uniform() < zl1_view[k]:
+                        if random_uniform(&rng) < zl1_view[k]:
                             choices_view[n, k, 0] += 1
                         decision_taken = 1
                     
-                    if n == 0:
-                        if k == 0:
-                            traj_view[ix, 1] = y_l1
+                    record_state(&traj_row, ix, 1, y_l1)
                 else:
                     # In case boundary is negative already, we flip a coin with bias determined by w_l_ parameter
                     if (y_l2 >= boundary_view[ix]) or (y_l2 <= ((-1) * boundary_view[ix])):
-                        if random_uniform() < zl2_view[k]:
+                        if random_uniform(&rng) < zl2_view[k]:
                             choices_view[n, k, 0] += 1
                         decision_taken = 1
 
-                    if n == 0:
-                        if k == 0:
-                            traj_view[ix, 2] = y_l2
+                    record_state(&traj_row, ix, 2, y_l2)
 
                 # Random walker low level (1)
-                if (choices_view[n, k, 0] == 0) | ((n == 0) & (k == 0)):
+                if (choices_view[n, k, 0] == 0) | (traj_row.step != 0):
                     while (y_l1 >= ((-1) * boundary_view[ix1])) and (y_l1 <= boundary_view[ix1]) and (t_particle1 <= deadline_tmp):
                         y_l1 += (vl1_view[k] * delta_t) + (sqrt_st * gaussian_values[m])
                         t_particle1 += delta_t
                         ix1 += 1
                         m += 1
                         if m == num_draws:
-                            gaussian_values = draw_gaussian(num_draws)
+                            fill_gaussian(&rng, &gaussian_values[0], num_draws)
                             m = 0
 
-                        if n == 0:
-                            if k == 0:
-                                traj_view[ix1, 1] = y_l1
+                        record_state(&traj_row, ix1, 1, y_l1)
 
                 # Random walker low level (2)
-                if (choices_view[n, k, 0] == 2) | ((n == 0) & (k == 0)):
+                if (choices_view[n, k, 0] == 2) | (traj_row.step != 0):
                     while (y_l2 >= ((-1) * boundary_view[ix2])) and (y_l2 <= boundary_view[ix2]) and (t_particle2 <= deadline_tmp):
                         y_l2 += (vl2_view[k] * delta_t) + (sqrt_st * gaussian_values[m])
                         t_particle2 += delta_t
                         ix2 += 1
                         m += 1
                         if m == num_draws:
-                            gaussian_values = draw_gaussian(num_draws)
+                            fill_gaussian(&rng, &gaussian_values[0], num_draws)
                             m = 0
 
-                        if n == 0:
-                            if k == 0:
-                                traj_view[ix2, 2] = y_l2
+                        record_state(&traj_row, ix2, 2, y_l2)
 
                 # Get back to single t_particle 
                 if (choices_view[n, k, 0] == 0):
@@ -2877,9 +5172,9 @@ def ddm_flexbound_seq2(np.ndarray[float, ndim = 1] vh,
 
             if smooth_unif:
                 if t_particle == 0.0:
-                    smooth_u = random_uniform() * 0.5 * delta_t
+                    smooth_u = random_uniform(&rng) * 0.5 * delta_t
                 elif t_particle < deadline_tmp:
-                    smooth_u = (0.5 - random_uniform()) * delta_t
+                    smooth_u = (0.5 - random_uniform(&rng)) * delta_t
                 else:
                     smooth_u = 0.0
             else:
@@ -2899,10 +5194,10 @@ def ddm_flexbound_seq2(np.ndarray[float, ndim = 1] vh,
             # If boundary is negative (or 0) already, we flip a coin
             if not decision_taken:
                 if boundary_view[ix] <= 0:
-                    if random_uniform() <= 0.5:
+                    if random_uniform(&rng) <= 0.5:
                         choices_view[n, k, 0] += 1
                 # Otherwise apply rule from above
-                elif random_uniform() <= ((y_l + boundary_view[ix]) / (2 * boundary_view[ix])):
+                elif random_uniform(&rng) <= ((y_l + boundary_view[ix]) / (2 * boundary_view[ix])):
                     choices_view[n, k, 0] += 1
 
     if return_option == 'full':
@@ -2961,6 +5256,8 @@ def ddm_flexbound_par2(np.ndarray[float, ndim = 1] vh,
                        random_state = None,
                        return_option = 'full',
                        smooth_unif = False,
+                       record_trajectories = 0,
+                       trajectories_per_trial = False,
                        **kwargs):
     """
     Simulate a parallel diffusion decision model with flexible boundaries.
@@ -2999,12 +5296,17 @@ def ddm_flexbound_par2(np.ndarray[float, ndim = 1] vh,
         If True, boundary function is multiplied by 'a'. If False, it's added. Default is True.
     boundary_params : dict, optional
         Additional parameters for the boundary function.
-    random_state : int or None, optional
+    random_state : int, numpy.random.Generator or None, optional
         Seed for random number generator. Default is None.
     return_option : str, optional
         Determines the content of the returned dictionary. Can be 'full' or 'minimal'. Default is 'full'.
     smooth_unif : bool, optional
         If True, adds uniform noise to simulate continuous time. Default is False.
+    record_trajectories : int, optional
+        Number of samples whose paths are returned as the 'trajectory' metadata (default: 0).
+    trajectories_per_trial : bool, optional
+        If True, records the first record_trajectories samples of every trial instead of
+        only those of the first trial (default: False).
 
     Returns:
     --------
@@ -3013,24 +5315,26 @@ def ddm_flexbound_par2(np.ndarray[float, ndim = 1] vh,
         'full' returns all simulation data and parameters, while 'minimal' returns only essential outputs.
     """
 
-    set_seed(random_state)
+    cdef RngState rng
+    rng_init(&rng, random_state)
     # Param views
-    cdef float[:] vh_view = vh
-    cdef float[:] vl1_view = vl1
-    cdef float[:] vl2_view = vl2
-    cdef float[:] a_view = a
-    cdef float[:] zh_view = zh
-    cdef float[:] zl1_view = zl1
-    cdef float[:] zl2_view = zl2
-    cdef float[:] t_view = t
-    cdef float[:] deadline_view = deadline
-    cdef float[:] s_view = s
-
+    cdef const float[:] vh_view = vh
+    cdef const float[:] vl1_view = vl1
+    cdef const float[:] vl2_view = vl2
+    cdef const float[:] a_view = a
+    cdef const float[:] zh_view = zh
+    cdef const float[:] zl1_view = zl1
+    cdef const float[:] zl2_view = zl2
+    cdef const float[:] t_view = t
+    cdef const float[:] deadline_view = deadline
+    cdef const float[:] s_view = s
     # TD: Add trajectory --> Tricky here because the simulator is optimized to include only two instead of three particles (high dimension choice determines which low dimension choice will matter for ultimate choice)
     # TD: Add Trajectory
-    traj = np.zeros((int(max_t / delta_t) + 1, 3), dtype = DTYPE)
-    traj[:, :] = -999 
-    cdef float[:, :] traj_view = traj
+    cdef Trajectories trajectories
+    cdef TrajectoryRow traj_row
+    cdef float traj_sink[3]
+    traj = init_trajectories(&trajectories, record_trajectories, trajectories_per_trial,
+                             n_samples, n_trials, max_t, delta_t, 3)
 
     rts = np.zeros((n_samples, n_trials, 1), dtype = DTYPE)
     rts_high = np.zeros((n_samples, n_trials, 1), dtype = DTYPE)
@@ -3046,26 +5350,27 @@ def ddm_flexbound_par2(np.ndarray[float, ndim = 1] vh,
     #cdef float sqrt_st = delta_t_sqrt * s # scalar to ensure the correct variance for the gaussian step
 
     # Boundary storage for the upper bound
-    cdef int num_draws = int((max_t / delta_t) + 1)
+    cdef int num_draws = noise_buffer_size(max_t, delta_t)
 
     t_s = np.arange(0, max_t + delta_t, delta_t).astype(DTYPE)
     boundary = np.zeros(t_s.shape, dtype = DTYPE)
     cdef float[:] boundary_view = boundary
+    cdef BoundarySpec boundary_spec
+    boundary_coefs = init_boundary(&boundary_spec, boundary_fun, boundary_multiplicative, boundary_params,
+                                   n_trials, t_s.shape[0], delta_t)
+    cdef BoundaryBuffer boundary_buf = boundary_buffer(&boundary_spec, &boundary_view[0], boundary_view.shape[0],
+                                                       0, 0, 0.0)
 
     cdef float y_h, y_l, y_l1, y_l2, v_l, v_l1, v_l2, t_h, t_l, t_l1, t_l2, smooth_u, deadline_tmp, sqrt_st
     cdef Py_ssize_t n, ix, ix1, ix2, k
     cdef Py_ssize_t m = 0
-    cdef float[:] gaussian_values = draw_gaussian(num_draws)
+    cdef float[:] gaussian_values = draw_gaussian(&rng, num_draws)
 
     for k in range(n_trials):
         # Precompute boundary evaluations
-        boundary_params_tmp = {key: boundary_params[key][k] for key in boundary_params.keys()}
 
         # Precompute boundary evaluations
-        if boundary_multiplicative:
-            boundary[:] = np.multiply(a_view[k], boundary_fun(t = t_s, **boundary_params_tmp)).astype(DTYPE)
-        else:
-            boundary[:] = np.add(a_view[k], boundary_fun(t = t_s, **boundary_params_tmp)).astype(DTYPE)
+        evaluate_boundary(&boundary_buf, boundary, k, a_view[k], t_s, boundary_fun, boundary_params, False)
         
         deadline_tmp = min(max_t, deadline_view[k] - t_view[k])
         sqrt_st = delta_t_sqrt * s_view[k]
@@ -3080,9 +5385,8 @@ def ddm_flexbound_par2(np.ndarray[float, ndim = 1] vh,
             # Initialize walkers
             y_h = (-1) * boundary_view[0] + (zh_view[k] * 2 * (boundary_view[0])) 
 
-            if n == 0:
-                if k == 0:
-                    traj_view[0, 0] = y_h
+            traj_row = trajectory_row(&trajectories, n, k, traj_sink)
+            record_state(&traj_row, 0, 0, y_h)
 
             # Random walks until y_h hits bound
             while (y_h >= (-1) * boundary_view[ix]) and (y_h <= boundary_view[ix]) and (t_h <= deadline_tmp):
@@ -3091,12 +5395,10 @@ def ddm_flexbound_par2(np.ndarray[float, ndim = 1] vh,
                 ix += 1
                 m += 1
                 if m == num_draws:
-                    gaussian_values = draw_gaussian(num_draws)
+                    fill_gaussian(&rng, &gaussian_values[0], num_draws)
                     m = 0
 
-                if n == 0:
-                    if k == 0:
-                        traj_view[ix, 0] = y_h
+                record_state(&traj_row, ix, 0, y_h)
 
             # The probability of making a 'mistake' 1 - (relative y position)
             # y at upper bound --> choices_view[n, k, 0] add 2 deterministically (correct)
@@ -3104,10 +5406,10 @@ def ddm_flexbound_par2(np.ndarray[float, ndim = 1] vh,
 
             # if boundary is negative (or 0) already, we flip a coin 
             if boundary_view[ix] <= 0:
-                if random_uniform() <= 0.5:
+                if random_uniform(&rng) <= 0.5:
                     choices_view[n, k, 0] += 2
             # Otherwise apply rule from above
-            elif random_uniform() <= ((y_h + boundary_view[ix]) / (2 * boundary_view[ix])):
+            elif random_uniform(&rng) <= ((y_h + boundary_view[ix]) / (2 * boundary_view[ix])):
                 choices_view[n, k, 0] += 2
 
             # Initialize lower level walkers
@@ -3115,7 +5417,7 @@ def ddm_flexbound_par2(np.ndarray[float, ndim = 1] vh,
             y_l2 = (-1) * boundary_view[0] + (zl2_view[k] * 2 * (boundary_view[0])) 
 
             # Random walker lower level (1)
-            if (choices_view[n, k, 0] == 0) | ((n == 0) & (k == 0)):
+            if (choices_view[n, k, 0] == 0) | (traj_row.step != 0):
                 ix1 = 0
                 while (y_l1 >= (-1) * boundary_view[ix1]) and (y_l1 <= boundary_view[ix1]) and (t_l1 <= deadline_tmp):
                     y_l1 += (vl1_view[k] * delta_t) + (sqrt_st * gaussian_values[m])
@@ -3123,15 +5425,13 @@ def ddm_flexbound_par2(np.ndarray[float, ndim = 1] vh,
                     ix1 += 1
                     m += 1
                     if m == num_draws:
-                        gaussian_values = draw_gaussian(num_draws)
+                        fill_gaussian(&rng, &gaussian_values[0], num_draws)
                         m = 0
 
-                    if n == 0:
-                        if k == 0:
-                            traj_view[ix1, 1] = y_l1
+                    record_state(&traj_row, ix1, 1, y_l1)
 
             # Random walker lower level (2)
-            if (choices_view[n, k, 0] == 2) | ((n == 0) & (k == 0)):
+            if (choices_view[n, k, 0] == 2) | (traj_row.step != 0):
                 ix2 = 0
                 while (y_l2 >= (-1) * boundary_view[ix2]) and (y_l2 <= boundary_view[ix2]) and (t_l2 <= deadline_tmp):
                     y_l2 += (vl2_view[k] * delta_t) + (sqrt_st * gaussian_values[m])
@@ -3139,12 +5439,10 @@ def ddm_flexbound_par2(np.ndarray[float, ndim = 1] vh,
                     ix2 += 1
                     m += 1
                     if m == num_draws:
-                        gaussian_values = draw_gaussian(num_draws)
+                        fill_gaussian(&rng, &gaussian_values[0], num_draws)
                         m = 0
 
-                    if n == 0:
-                        if k == 0:
-                            traj_view[ix2, 2] = y_l2
+                    record_state(&traj_row, ix2, 2, y_l2)
 
             # Consider only relevant lower-dim walker for final rt
             if (choices_view[n, k, 0] == 0):
@@ -3158,9 +5456,9 @@ def ddm_flexbound_par2(np.ndarray[float, ndim = 1] vh,
             
             if smooth_unif:
                 if t_h == 0.0:
-                    smooth_u = random_uniform() * 0.5 * delta_t
+                    smooth_u = random_uniform(&rng) * 0.5 * delta_t
                 elif fmax(t_h, t_l) < deadline_tmp:
-                    smooth_u = (0.5 - random_uniform()) * delta_t
+                    smooth_u = (0.5 - random_uniform(&rng)) * delta_t
                 else:
                     smooth_u = 0.0
             else:
@@ -3176,10 +5474,10 @@ def ddm_flexbound_par2(np.ndarray[float, ndim = 1] vh,
             
             # If boundary is negative (or 0) already, we flip a coin
             if boundary_view[ix] <= 0:
-                if random_uniform() <= 0.5:
+                if random_uniform(&rng) <= 0.5:
                     choices_view[n, k, 0] += 1
             # Otherwise apply rule from above
-            elif random_uniform() <= ((y_l + boundary_view[ix]) / (2 * boundary_view[ix])):
+            elif random_uniform(&rng) <= ((y_l + boundary_view[ix]) / (2 * boundary_view[ix])):
                 choices_view[n, k, 0] += 1
 
             if (rts_view[n, k, 0] >= deadline_view[k]) | (deadline_view[k] <= 0):
@@ -3246,6 +5544,8 @@ def ddm_flexbound_mic2_ornstein(np.ndarray[float, ndim = 1] vh,
                                 random_state = None,
                                 return_option = 'full',
                                 smooth_unif = False,
+                                record_trajectories = 0,
+                                trajectories_per_trial = False,
                                 **kwargs):
     """
     Simulate (rt, choice) tuples from a DDM with flexible boundaries and Ornstein-Uhlenbeck process.
@@ -3286,12 +5586,17 @@ def ddm_flexbound_mic2_ornstein(np.ndarray[float, ndim = 1] vh,
         Whether the boundary function is multiplicative (default: True).
     boundary_params : dict, optional
         Parameters for the boundary function (default: {}).
-    random_state : int or None, optional
+    random_state : int, numpy.random.Generator or None, optional
         Random seed for reproducibility (default: None).
     return_option : str, optional
         Determines what to return, either 'full' or 'minimal' (default: 'full').
     smooth_unif : bool, optional
         Whether to use smooth uniform distribution for RT jitter (default: False).
+    record_trajectories : int, optional
+        Number of samples whose paths are returned as the 'trajectory' metadata (default: 0).
+    trajectories_per_trial : bool, optional
+        If True, records the first record_trajectories samples of every trial instead of
+        only those of the first trial (default: False).
 
     Returns:
     --------
@@ -3299,22 +5604,22 @@ def ddm_flexbound_mic2_ornstein(np.ndarray[float, ndim = 1] vh,
         Dictionary containing simulated data and metadata. The exact contents depend on the return_option.
     """
 
-    set_seed(random_state)
+    cdef RngState rng
+    rng_init(&rng, random_state)
     # Param views
-    cdef float[:] vh_view = vh
-    cdef float[:] vl1_view = vl1
-    cdef float[:] vl2_view = vl2
-    cdef float[:] a_view = a
-    cdef float[:] zh_view = zh
-    cdef float[:] zl1_view = zl1
-    cdef float[:] zl2_view = zl2
-    cdef float[:] d_view = d
-    cdef float[:] g_view = g
-    cdef float[:] t_view = t
-    cdef float[:] s_view = s
-    cdef float[:] s_pre_high_level_choice_view = s_pre_high_level_choice
-    cdef float[:] deadline_view = deadline
-
+    cdef const float[:] vh_view = vh
+    cdef const float[:] vl1_view = vl1
+    cdef const float[:] vl2_view = vl2
+    cdef const float[:] a_view = a
+    cdef const float[:] zh_view = zh
+    cdef const float[:] zl1_view = zl1
+    cdef const float[:] zl2_view = zl2
+    cdef const float[:] d_view = d
+    cdef const float[:] g_view = g
+    cdef const float[:] t_view = t
+    cdef const float[:] s_view = s
+    cdef const float[:] s_pre_high_level_choice_view = s_pre_high_level_choice
+    cdef const float[:] deadline_view = deadline
     # TD: Add trajectory --> same issue as with par2 model above... might need to make a separate simulator for trajectories
     rts = np.zeros((n_samples, n_trials, 1), dtype = DTYPE)
     choices = np.zeros((n_samples, n_trials, 1), dtype = np.intc)
@@ -3326,9 +5631,11 @@ def ddm_flexbound_mic2_ornstein(np.ndarray[float, ndim = 1] vh,
     cdef float[:, :, :] rts_low_view = rts_low
     cdef int[:, :, :] choices_view = choices
 
-    traj = np.zeros((int(max_t / delta_t) + 1, 3), dtype = DTYPE)
-    traj[:, :] = -999 
-    cdef float[:, :] traj_view = traj
+    cdef Trajectories trajectories
+    cdef TrajectoryRow traj_row
+    cdef float traj_sink[3]
+    traj = init_trajectories(&trajectories, record_trajectories, trajectories_per_trial,
+                             n_samples, n_trials, max_t, delta_t, 3)
 
     cdef float delta_t_sqrt = sqrt(delta_t) # correct scalar so we can use standard normal samples for the brownian motion
     #cdef float sqrt_st = delta_t_sqrt * s # scalar to ensure the correct variance for the gaussian step
@@ -3338,6 +5645,11 @@ def ddm_flexbound_mic2_ornstein(np.ndarray[float, ndim = 1] vh,
     t_s = np.arange(0, max_t + delta_t, delta_t).astype(DTYPE)
     boundary = np.zeros(t_s.shape, dtype = DTYPE)
     cdef float[:] boundary_view = boundary
+    cdef BoundarySpec boundary_spec
+    boundary_coefs = init_boundary(&boundary_spec, boundary_fun, boundary_multiplicative, boundary_params,
+                                   n_trials, t_s.shape[0], delta_t)
+    cdef BoundaryBuffer boundary_buf = boundary_buffer(&boundary_spec, &boundary_view[0], boundary_view.shape[0],
+                                                       0, 0, 0.0)
 
     # Y particle trace
     bias_trace_l1 = np.zeros(num_draws, dtype = DTYPE)
@@ -3350,17 +5662,13 @@ def ddm_flexbound_mic2_ornstein(np.ndarray[float, ndim = 1] vh,
     cdef float t_h, t_l, t_l1, t_l2, smooth_u, deadline_tmp, sqrt_st
     cdef Py_ssize_t n, ix, ix1, ix2, ix_l, ix_tmp, ix1_tmp, ix2_tmp, k
     cdef Py_ssize_t m = 0
-    cdef float[:] gaussian_values = draw_gaussian(num_draws)
+    cdef float[:] gaussian_values = draw_gaussian(&rng, num_draws)
 
     for k in range(n_trials):
         # Precompute boundary evaluations
-        boundary_params_tmp = {key: boundary_params[key][k] for key in boundary_params.keys()}
 
         # Precompute boundary evaluations
-        if boundary_multiplicative:
-            boundary[:] = np.multiply(a_view[k], boundary_fun(t = t_s, **boundary_params_tmp)).astype(DTYPE)
-        else:
-            boundary[:] = np.add(a_view[k], boundary_fun(t = t_s, **boundary_params_tmp)).astype(DTYPE)
+        evaluate_boundary(&boundary_buf, boundary, k, a_view[k], t_s, boundary_fun, boundary_params, False)
     
         deadline_tmp = min(max_t, deadline_view[k] - t_view[k])
         sqrt_st = delta_t_sqrt * s_view[k]
@@ -3382,9 +5690,8 @@ def ddm_flexbound_mic2_ornstein(np.ndarray[float, ndim = 1] vh,
             bias_trace_l2_view[0] = ((y_h + boundary_view[0]) / (2 * boundary_view[0]))
             bias_trace_l1_view[0] = 1.0 - bias_trace_l2_view[0]
 
-            if n == 0:
-                if k == 0:
-                    traj_view[0, 0] = y_h
+            traj_row = trajectory_row(&trajectories, n, k, traj_sink)
+            record_state(&traj_row, 0, 0, y_h)
 
             # Random walks until y_h hits bound
             while (y_h >= ((-1) * boundary_view[ix])) and ((y_h <= boundary_view[ix])) and (t_h <= deadline_tmp):
@@ -3395,12 +5702,10 @@ def ddm_flexbound_mic2_ornstein(np.ndarray[float, ndim = 1] vh,
                 ix += 1
                 m += 1
                 if m == num_draws:
-                    gaussian_values = draw_gaussian(num_draws)
+                    fill_gaussian(&rng, &gaussian_values[0], num_draws)
                     m = 0
 
-                if n == 0:
-                    if k == 0:
-                        traj_view[ix, 0] = y_h
+                record_state(&traj_row, ix, 0, y_h)
 
             # The probability of making a 'mistake' 1 - (relative y position)
             # y at upper bound --> choices_view[n, k, 0] add 2 deterministically
@@ -3408,10 +5713,10 @@ def ddm_flexbound_mic2_ornstein(np.ndarray[float, ndim = 1] vh,
 
             # If boundary is negative (or 0) already, we flip a coin
             if boundary_view[ix] <= 0:
-                if random_uniform() <= 0.5:
+                if random_uniform(&rng) <= 0.5:
                     choices_view[n, k, 0] += 2
             # Otherwise, apply rule from above
-            elif random_uniform() <= ((y_h + boundary_view[ix]) / (2 * boundary_view[ix])):
+            elif random_uniform(&rng) <= ((y_h + boundary_view[ix]) / (2 * boundary_view[ix])):
                 choices_view[n, k, 0] += 2
 
             y_l2 = (- 1) * boundary_view[0] + (zl2_view[k] * 2 * (boundary_view[0]))
@@ -3434,7 +5739,7 @@ def ddm_flexbound_mic2_ornstein(np.ndarray[float, ndim = 1] vh,
                     ix2_tmp += 1
 
             # lower level random walker (1)
-            if (choices_view[n, k, 0] == 0) | ((n == 0) & (k == 0)):
+            if (choices_view[n, k, 0] == 0) | (traj_row.step != 0):
                 while (y_l1 >= ((-1) * boundary_view[ix1])) and (y_l1 <= boundary_view[ix1]) and (t_l1 <= deadline_tmp):
                     if (bias_trace_l1_view[ix1] < 1) and (bias_trace_l1_view[ix1] > 0):
                         # main propagation if bias_trace is between 0 and 1 (high level choice is not yet made)
@@ -3453,15 +5758,13 @@ def ddm_flexbound_mic2_ornstein(np.ndarray[float, ndim = 1] vh,
                     ix1 += 1
                     m += 1
                     if m == num_draws:
-                        gaussian_values = draw_gaussian(num_draws)
+                        fill_gaussian(&rng, &gaussian_values[0], num_draws)
                         m = 0
 
-                    if n == 0:
-                        if k == 0:
-                            traj_view[ix1, 1] = y_l1
+                    record_state(&traj_row, ix1, 1, y_l1)
 
             # lower level random walker (2)
-            if (choices_view[n, k, 0] == 2) | ((n == 0) & (k == 0)):
+            if (choices_view[n, k, 0] == 2) | (traj_row.step != 0):
                 while (y_l2 >= ((-1) * boundary_view[ix2])) and (y_l2 <= boundary_view[ix2]) and (t_l2 <= deadline_tmp):
                     if (bias_trace_l2_view[ix2] < 1) and (bias_trace_l2_view[ix2] > 0):
                         # main propagation if bias_trace is between 0 and 1 (high level choice is not yet made)
@@ -3479,12 +5782,10 @@ def ddm_flexbound_mic2_ornstein(np.ndarray[float, ndim = 1] vh,
                     ix2 += 1
                     m += 1
                     if m == num_draws:
-                        gaussian_values = draw_gaussian(num_draws)
+                        fill_gaussian(&rng, &gaussian_values[0], num_draws)
                         m = 0
 
-                    if n == 0:
-                        if k == 0:
-                            traj_view[ix2, 2] = y_l2
+                    record_state(&traj_row, ix2, 2, y_l2)
 
             # Get back to single y_l and t_l
             if (choices_view[n, k, 0] == 0):
@@ -3498,9 +5799,9 @@ def ddm_flexbound_mic2_ornstein(np.ndarray[float, ndim = 1] vh,
 
             if smooth_unif:
                 if t_h == 0.0:
-                    smooth_u = random_uniform() * 0.5 * delta_t
+                    smooth_u = random_uniform(&rng) * 0.5 * delta_t
                 elif fmax(t_h, t_l) < deadline_tmp:
-                    smooth_u = (0.5 - random_uniform()) * delta_t
+                    smooth_u = (0.5 - random_uniform(&rng)) * delta_t
                 else:
                     smooth_u = 0.0
             else:
@@ -3516,10 +5817,10 @@ def ddm_flexbound_mic2_ornstein(np.ndarray[float, ndim = 1] vh,
 
             # If boundary is negative (or 0) already, we flip a coin
             if boundary_view[ix] <= 0:
-                if random_uniform() <= 0.5:
+                if random_uniform(&rng) <= 0.5:
                     choices_view[n, k, 0] += 1
             # Otherwise apply rule from above
-            elif random_uniform() <= ((y_l + boundary_view[ix_l]) / (2 * boundary_view[ix_l])):
+            elif random_uniform(&rng) <= ((y_l + boundary_view[ix_l]) / (2 * boundary_view[ix_l])):
                 choices_view[n, k, 0] += 1
 
             if (rts_view[n, k, 0] >= deadline_view[k]) | (deadline_view[k] <= 0):
@@ -3585,6 +5886,8 @@ def ddm_flexbound_mic2_multinoise(np.ndarray[float, ndim = 1] vh,
                                   random_state = None,
                                   return_option = 'full',
                                   smooth_unif = False,
+                                  record_trajectories = 0,
+                                  trajectories_per_trial = False,
                                   **kwargs):
     """
     Simulates a multi-level decision-making process using a drift-diffusion model with flexible boundaries.
@@ -3621,12 +5924,17 @@ def ddm_flexbound_mic2_multinoise(np.ndarray[float, ndim = 1] vh,
         Whether the boundary function is multiplicative (default: True).
     boundary_params : dict, optional
         Parameters for the boundary function (default: {}).
-    random_state : int or None, optional
+    random_state : int, numpy.random.Generator or None, optional
         Seed for random number generator (default: None).
     return_option : str, optional
         Determines what to return, either 'full' or 'minimal' (default: 'full').
     smooth_unif : bool, optional
         Whether to use smooth uniform distribution for certain calculations (default: False).
+    record_trajectories : int, optional
+        Number of samples whose paths are returned as the 'trajectory' metadata (default: 0).
+    trajectories_per_trial : bool, optional
+        If True, records the first record_trajectories samples of every trial instead of
+        only those of the first trial (default: False).
 
     Returns:
     --------
@@ -3646,20 +5954,20 @@ def ddm_flexbound_mic2_multinoise(np.ndarray[float, ndim = 1] vh,
     incorporating flexible boundaries and multiple noise sources.
     """
 
-    set_seed(random_state)
+    cdef RngState rng
+    rng_init(&rng, random_state)
     # Param views
-    cdef float[:] vh_view = vh
-    cdef float[:] vl1_view = vl1
-    cdef float[:] vl2_view = vl2
-    cdef float[:] a_view = a
-    cdef float[:] zh_view = zh
-    cdef float[:] zl1_view = zl1
-    cdef float[:] zl2_view = zl2
-    cdef float[:] d_view = d
-    cdef float[:] t_view = t
-    cdef float[:] s_view = s
-    cdef float[:] deadline_view = deadline
-
+    cdef const float[:] vh_view = vh
+    cdef const float[:] vl1_view = vl1
+    cdef const float[:] vl2_view = vl2
+    cdef const float[:] a_view = a
+    cdef const float[:] zh_view = zh
+    cdef const float[:] zl1_view = zl1
+    cdef const float[:] zl2_view = zl2
+    cdef const float[:] d_view = d
+    cdef const float[:] t_view = t
+    cdef const float[:] s_view = s
+    cdef const float[:] deadline_view = deadline
     # TD: Add trajectory --> same issue as with par2 model above... might need to make a separate simulator for trajectories
     rts = np.zeros((n_samples, n_trials, 1), dtype = DTYPE)
     choices = np.zeros((n_samples, n_trials, 1), dtype = np.intc)
@@ -3671,9 +5979,11 @@ def ddm_flexbound_mic2_multinoise(np.ndarray[float, ndim = 1] vh,
     cdef float[:, :, :] rts_low_view = rts_low
     cdef int[:, :, :] choices_view = choices
 
-    traj = np.zeros((int(max_t / delta_t) + 1, 3), dtype = DTYPE)
-    traj[:, :] = -999 
-    cdef float[:, :] traj_view = traj
+    cdef Trajectories trajectories
+    cdef TrajectoryRow traj_row
+    cdef float traj_sink[3]
+    traj = init_trajectories(&trajectories, record_trajectories, trajectories_per_trial,
+                             n_samples, n_trials, max_t, delta_t, 3)
 
     cdef float delta_t_sqrt = sqrt(delta_t) # correct scalar so we can use standard normal samples for the brownian motion
     #cdef float sqrt_st = delta_t_sqrt * s # scalar to ensure the correct variance for the gaussian step
@@ -3683,6 +5993,11 @@ def ddm_flexbound_mic2_multinoise(np.ndarray[float, ndim = 1] vh,
     t_s = np.arange(0, max_t + delta_t, delta_t).astype(DTYPE)
     boundary = np.zeros(t_s.shape, dtype = DTYPE)
     cdef float[:] boundary_view = boundary
+    cdef BoundarySpec boundary_spec
+    boundary_coefs = init_boundary(&boundary_spec, boundary_fun, boundary_multiplicative, boundary_params,
+                                   n_trials, t_s.shape[0], delta_t)
+    cdef BoundaryBuffer boundary_buf = boundary_buffer(&boundary_spec, &boundary_view[0], boundary_view.shape[0],
+                                                       0, 0, 0.0)
 
     # Y particle trace
     bias_trace_l1 = np.zeros(num_draws, dtype = DTYPE)
@@ -3695,17 +6010,13 @@ def ddm_flexbound_mic2_multinoise(np.ndarray[float, ndim = 1] vh,
     cdef float t_h, t_l, t_l1, t_l2, smooth_u, deadline_tmp, sqrt_st
     cdef Py_ssize_t n, ix, ix1, ix2, ix_l, ix_tmp, ix1_tmp, ix2_tmp, k
     cdef Py_ssize_t m = 0
-    cdef float[:] gaussian_values = draw_gaussian(num_draws)
+    cdef float[:] gaussian_values = draw_gaussian(&rng, num_draws)
 
     for k in range(n_trials):
         # Precompute boundary evaluations
-        boundary_params_tmp = {key: boundary_params[key][k] for key in boundary_params.keys()}
 
         # Precompute boundary evaluations
-        if boundary_multiplicative:
-            boundary[:] = np.multiply(a_view[k], boundary_fun(t = t_s, **boundary_params_tmp)).astype(DTYPE)
-        else:
-            boundary[:] = np.add(a_view[k], boundary_fun(t = t_s, **boundary_params_tmp)).astype(DTYPE)
+        evaluate_boundary(&boundary_buf, boundary, k, a_view[k], t_s, boundary_fun, boundary_params, False)
     
         deadline_tmp = min(max_t, deadline_view[k] - t_view[k])
         sqrt_st = delta_t_sqrt * s_view[k]
@@ -3727,9 +6038,8 @@ def ddm_flexbound_mic2_multinoise(np.ndarray[float, ndim = 1] vh,
             bias_trace_l2_view[0] = ((y_h + boundary_view[0]) / (2 * boundary_view[0]))
             bias_trace_l1_view[0] = 1.0 - bias_trace_l2_view[0]
 
-            if n == 0:
-                if k == 0:
-                    traj_view[0, 0] = y_h
+            traj_row = trajectory_row(&trajectories, n, k, traj_sink)
+            record_state(&traj_row, 0, 0, y_h)
 
             # Random walks until y_h hits bound
             while (y_h >= ((-1) * boundary_view[ix])) and ((y_h <= boundary_view[ix])) and (t_h <= deadline_tmp):
@@ -3740,12 +6050,10 @@ def ddm_flexbound_mic2_multinoise(np.ndarray[float, ndim = 1] vh,
                 ix += 1
                 m += 1
                 if m == num_draws:
-                    gaussian_values = draw_gaussian(num_draws)
+                    fill_gaussian(&rng, &gaussian_values[0], num_draws)
                     m = 0
 
-                if n == 0:
-                    if k == 0:
-                        traj_view[ix, 0] = y_h
+                record_state(&traj_row, ix, 0, y_h)
 
             # The probability of making a 'mistake' 1 - (relative y position)
             # y at upper bound --> choices_view[n, k, 0] add 2 deterministically
@@ -3753,10 +6061,10 @@ def ddm_flexbound_mic2_multinoise(np.ndarray[float, ndim = 1] vh,
 
             # If boundary is negative (or 0) already, we flip a coin
             if boundary_view[ix] <= 0:
-                if random_uniform() <= 0.5:
+                if random_uniform(&rng) <= 0.5:
                     choices_view[n, k, 0] += 2
             # Otherwise, apply rule from above
-            elif random_uniform() <= ((y_h + boundary_view[ix]) / (2 * boundary_view[ix])):
+            elif random_uniform(&rng) <= ((y_h + boundary_view[ix]) / (2 * boundary_view[ix])):
                 choices_view[n, k, 0] += 2
 
             y_l2 = (- 1) * boundary_view[0] + (zl2_view[k] * 2 * (boundary_view[0]))
@@ -3779,7 +6087,7 @@ def ddm_flexbound_mic2_multinoise(np.ndarray[float, ndim = 1] vh,
                     ix2_tmp += 1
 
             # lower level random walker (1)
-            if (choices_view[n, k, 0] == 0) | ((n == 0) & (k == 0)):
+            if (choices_view[n, k, 0] == 0) | (traj_row.step != 0):
                 while (y_l1 >= ((-1) * boundary_view[ix1])) and (y_l1 <= boundary_view[ix1]) and (t_l1 <= deadline_tmp):
                     if (bias_trace_l1_view[ix1] < 1) and (bias_trace_l1_view[ix1] > 0):
                         # main propagation if bias_trace is between 0 and 1 (high level choice is not yet made)
@@ -3799,15 +6107,13 @@ def ddm_flexbound_mic2_multinoise(np.ndarray[float, ndim = 1] vh,
                     ix1 += 1
                     m += 1
                     if m == num_draws:
-                        gaussian_values = draw_gaussian(num_draws)
+                        fill_gaussian(&rng, &gaussian_values[0], num_draws)
                         m = 0
 
-                    if n == 0:
-                        if k == 0:
-                            traj_view[ix1, 1] = y_l1
+                    record_state(&traj_row, ix1, 1, y_l1)
 
             # lower level random walker (2)
-            if (choices_view[n, k, 0] == 2) | ((n == 0) & (k == 0)):
+            if (choices_view[n, k, 0] == 2) | (traj_row.step != 0):
                 while (y_l2 >= ((-1) * boundary_view[ix2])) and (y_l2 <= boundary_view[ix2]) and (t_l2 <= deadline_tmp):
                     if (bias_trace_l2_view[ix2] < 1) and (bias_trace_l2_view[ix2] > 0):
                         # main propagation if bias_trace is between 0 and 1 (high level choice is not yet made)
@@ -3827,12 +6133,10 @@ def ddm_flexbound_mic2_multinoise(np.ndarray[float, ndim = 1] vh,
                     ix2 += 1
                     m += 1
                     if m == num_draws:
-                        gaussian_values = draw_gaussian(num_draws)
+                        fill_gaussian(&rng, &gaussian_values[0], num_draws)
                         m = 0
 
-                    if n == 0:
-                        if k == 0:
-                            traj_view[ix2, 2] = y_l2
+                    record_state(&traj_row, ix2, 2, y_l2)
 
             # Get back to single y_l and t_l
             if (choices_view[n, k, 0] == 0):
@@ -3846,9 +6150,9 @@ def ddm_flexbound_mic2_multinoise(np.ndarray[float, ndim = 1] vh,
 
             if smooth_unif:
                 if t_h == 0.0:
-                    smooth_u = random_uniform() * 0.5 * delta_t
+                    smooth_u = random_uniform(&rng) * 0.5 * delta_t
                 elif fmax(t_h, t_l) < deadline_tmp:
-                    smooth_u = (0.5 - random_uniform()) * delta_t
+                    smooth_u = (0.5 - random_uniform(&rng)) * delta_t
                 else:
                     smooth_u = 0.0
             else:
@@ -3864,10 +6168,10 @@ def ddm_flexbound_mic2_multinoise(np.ndarray[float, ndim = 1] vh,
 
             # If boundary is negative (or 0) already, we flip a coin
             if boundary_view[ix] <= 0:
-                if random_uniform() <= 0.5:
+                if random_uniform(&rng) <= 0.5:
                     choices_view[n, k, 0] += 1
             # Otherwise apply rule from above
-            elif random_uniform() <= ((y_l + boundary_view[ix]) / (2 * boundary_view[ix])):
+            elif random_uniform(&rng) <= ((y_l + boundary_view[ix]) / (2 * boundary_view[ix])):
                 choices_view[n, k, 0] += 1
 
             if (rts_view[n, k, 0] >= deadline_view[k]) | (deadline_view[k] <= 0):
@@ -3934,6 +6238,8 @@ def ddm_flexbound_mic2_ornstein_multinoise(np.ndarray[float, ndim = 1] vh,
                                            random_state = None,
                                            return_option = 'full',
                                            smooth_unif = False,
+                                           record_trajectories = 0,
+                                           trajectories_per_trial = False,
                                            **kwargs):
     """
     Simulate reaction times and choices from a DDM with flexible boundaries and multiple noise sources.
@@ -3963,6 +6269,13 @@ def ddm_flexbound_mic2_ornstein_multinoise(np.ndarray[float, ndim = 1] vh,
         Time step for simulation (default is 0.001).
     max_t : float, optional
         Maximum time to simulate (default is 20).
+    random_state : int, numpy.random.Generator or None, optional
+        Seed for random number generation (default is None).
+    smooth_unif : bool, optional
+        Accepted for a uniform interface. LBA decision times are exact, not discretized,
+        so no smoothing is applied (default is False).
+    n_threads : int, optional
+        Number of threads used to simulate samples in parallel (default is 1).
     n_samples : int, optional
         Number of samples to generate (default is 20000).
     n_trials : int, optional
@@ -3975,12 +6288,17 @@ def ddm_flexbound_mic2_ornstein_multinoise(np.ndarray[float, ndim = 1] vh,
         Whether the boundary function is multiplicative (default is True).
     boundary_params : dict, optional
         Parameters for the boundary function.
-    random_state : int or None, optional
+    random_state : int, numpy.random.Generator or None, optional
         Seed for random number generator.
     return_option : str, optional
         Determines the amount of data returned ('full' or 'minimal', default is 'full').
     smooth_unif : bool, optional
         Whether to use smooth uniform distribution for certain calculations (default is False).
+    record_trajectories : int, optional
+        Number of samples whose paths are returned as the 'trajectory' metadata (default is 0).
+    trajectories_per_trial : bool, optional
+        If True, records the first record_trajectories samples of every trial instead of
+        only those of the first trial (default is False).
     **kwargs : dict
         Additional keyword arguments.
 
@@ -3997,20 +6315,21 @@ def ddm_flexbound_mic2_ornstein_multinoise(np.ndarray[float, ndim = 1] vh,
     high-dimensional and low-dimensional choice processes are of interest.
     """
 
-    set_seed(random_state)
+    cdef RngState rng
+    rng_init(&rng, random_state)
     # Param views
-    cdef float[:] vh_view = vh
-    cdef float[:] vl1_view = vl1
-    cdef float[:] vl2_view = vl2
-    cdef float[:] a_view = a
-    cdef float[:] zh_view = zh
-    cdef float[:] zl1_view = zl1
-    cdef float[:] zl2_view = zl2
-    cdef float[:] d_view = d
-    cdef float[:] g_view = g
-    cdef float[:] t_view = t
-    cdef float[:] deadline_view = deadline
-    cdef float[:] s_view = s
+    cdef const float[:] vh_view = vh
+    cdef const float[:] vl1_view = vl1
+    cdef const float[:] vl2_view = vl2
+    cdef const float[:] a_view = a
+    cdef const float[:] zh_view = zh
+    cdef const float[:] zl1_view = zl1
+    cdef const float[:] zl2_view = zl2
+    cdef const float[:] d_view = d
+    cdef const float[:] g_view = g
+    cdef const float[:] t_view = t
+    cdef const float[:] deadline_view = deadline
+    cdef const float[:] s_view = s
     # TD: Add trajectory --> same issue as with par2 model above... might need to make a separate simulator for trajectories
     rts = np.zeros((n_samples, n_trials, 1), dtype = DTYPE)
     choices = np.zeros((n_samples, n_trials, 1), dtype = np.intc)
@@ -4022,9 +6341,11 @@ def ddm_flexbound_mic2_ornstein_multinoise(np.ndarray[float, ndim = 1] vh,
     cdef float[:, :, :] rts_low_view = rts_low
     cdef int[:, :, :] choices_view = choices
 
-    traj = np.zeros((int(max_t / delta_t) + 1, 3), dtype = DTYPE)
-    traj[:, :] = -999
-    cdef float[:, :] traj_view = traj
+    cdef Trajectories trajectories
+    cdef TrajectoryRow traj_row
+    cdef float traj_sink[3]
+    traj = init_trajectories(&trajectories, record_trajectories, trajectories_per_trial,
+                             n_samples, n_trials, max_t, delta_t, 3)
 
     cdef float delta_t_sqrt = sqrt(delta_t) # correct scalar so we can use standard normal samples for the brownian motion
     #cdef float sqrt_st = delta_t_sqrt * s # scalar to ensure the correct variance for the gaussian step
@@ -4034,6 +6355,11 @@ def ddm_flexbound_mic2_ornstein_multinoise(np.ndarray[float, ndim = 1] vh,
     t_s = np.arange(0, max_t + delta_t, delta_t).astype(DTYPE)
     boundary = np.zeros(t_s.shape, dtype = DTYPE)
     cdef float[:] boundary_view = boundary
+    cdef BoundarySpec boundary_spec
+    boundary_coefs = init_boundary(&boundary_spec, boundary_fun, boundary_multiplicative, boundary_params,
+                                   n_trials, t_s.shape[0], delta_t)
+    cdef BoundaryBuffer boundary_buf = boundary_buffer(&boundary_spec, &boundary_view[0], boundary_view.shape[0],
+                                                       0, 0, 0.0)
 
     # Y particle trace
     bias_trace_l1 = np.zeros(num_draws, dtype = DTYPE)
@@ -4046,17 +6372,13 @@ def ddm_flexbound_mic2_ornstein_multinoise(np.ndarray[float, ndim = 1] vh,
     cdef float t_h, t_l, t_l1, t_l2, smooth_u, deadline_tmp, sqrt_st
     cdef Py_ssize_t n, ix, ix1, ix2, ix_l, ix_tmp, ix1_tmp, ix2_tmp, k
     cdef Py_ssize_t m = 0
-    cdef float[:] gaussian_values = draw_gaussian(num_draws)
+    cdef float[:] gaussian_values = draw_gaussian(&rng, num_draws)
 
     for k in range(n_trials):
         # Precompute boundary evaluations
-        boundary_params_tmp = {key: boundary_params[key][k] for key in boundary_params.keys()}
 
         # Precompute boundary evaluations
-        if boundary_multiplicative:
-            boundary[:] = np.multiply(a_view[k], boundary_fun(t = t_s, **boundary_params_tmp)).astype(DTYPE)
-        else:
-            boundary[:] = np.add(a_view[k], boundary_fun(t = t_s, **boundary_params_tmp)).astype(DTYPE)
+        evaluate_boundary(&boundary_buf, boundary, k, a_view[k], t_s, boundary_fun, boundary_params, False)
     
         deadline_tmp = min(max_t, deadline_view[k] - t_view[k])
         sqrt_st = delta_t_sqrt * s_view[k]
@@ -4078,9 +6400,8 @@ def ddm_flexbound_mic2_ornstein_multinoise(np.ndarray[float, ndim = 1] vh,
             bias_trace_l2_view[0] = ((y_h + boundary_view[0]) / (2 * boundary_view[0]))
             bias_trace_l1_view[0] = 1.0 - bias_trace_l2_view[0]
 
-            if n == 0:
-                if k == 0:
-                    traj_view[0, 0] = y_h
+            traj_row = trajectory_row(&trajectories, n, k, traj_sink)
+            record_state(&traj_row, 0, 0, y_h)
 
             # Random walks until y_h hits bound
             while (y_h >= ((-1) * boundary_view[ix])) and ((y_h <= boundary_view[ix])) and (t_h <= deadline_tmp):
@@ -4091,7 +6412,7 @@ def ddm_flexbound_mic2_ornstein_multinoise(np.ndarray[float, ndim = 1] vh,
                 ix += 1
                 m += 1
                 if m == num_draws:
-                    gaussian_values = draw_gaussian(num_draws)
+                    fill_gaussian(&rng, &gaussian_values[0], num_draws)
                     m = 0
 
             # The probability of making a 'mistake' 1 - (relative y position)
@@ -4100,10 +6421,10 @@ def ddm_flexbound_mic2_ornstein_multinoise(np.ndarray[float, ndim = 1] vh,
 
             # If boundary is negative (or 0) already, we flip a coin
             if boundary_view[ix] <= 0:
-                if random_uniform() <= 0.5:
+                if random_uniform(&rng) <= 0.5:
                     choices_view[n, k, 0] += 2
             # Otherwise, apply rule from above
-            elif random_uniform() <= ((y_h + boundary_view[ix]) / (2 * boundary_view[ix])):
+            elif random_uniform(&rng) <= ((y_h + boundary_view[ix]) / (2 * boundary_view[ix])):
                 choices_view[n, k, 0] += 2
            
             y_l2 = (- 1) * boundary_view[0] + (zl2_view[k] * 2 * (boundary_view[0]))
@@ -4126,7 +6447,7 @@ def ddm_flexbound_mic2_ornstein_multinoise(np.ndarray[float, ndim = 1] vh,
                     ix2_tmp += 1
 
             # lower level random walker (1)
-            if (choices_view[n, k, 0] == 0) | ((n == 0) & (k == 0)):
+            if (choices_view[n, k, 0] == 0) | (traj_row.step != 0):
                 while (y_l1 >= ((-1) * boundary_view[ix1])) and (y_l1 <= boundary_view[ix1]) and (t_l1 <= deadline_tmp):
                     if (bias_trace_l1_view[ix1] < 1) and (bias_trace_l1_view[ix1] > 0):
                         # main propagation if bias_trace is between 0 and 1 (high level choice is not yet made)
@@ -4145,15 +6466,13 @@ def ddm_flexbound_mic2_ornstein_multinoise(np.ndarray[float, ndim = 1] vh,
                     ix1 += 1
                     m += 1
                     if m == num_draws:
-                        gaussian_values = draw_gaussian(num_draws)
+                        fill_gaussian(&rng, &gaussian_values[0], num_draws)
                         m = 0
 
-                    if n == 0:
-                        if k == 0:
-                            traj_view[ix1, 1] = y_l1
+                    record_state(&traj_row, ix1, 1, y_l1)
 
             # lower level random walker (2)
-            if (choices_view[n, k, 0] == 2) | ((n == 0) & (k == 0)):
+            if (choices_view[n, k, 0] == 2) | (traj_row.step != 0):
                 while (y_l2 >= ((-1) * boundary_view[ix2])) and (y_l2 <= boundary_view[ix2]) and (t_l2 <= deadline_tmp):
                     if (bias_trace_l2_view[ix2] < 1) and (bias_trace_l2_view[ix2] > 0):
                         # main propagation if bias_trace is between 0 and 1 (high level choice is not yet made)
@@ -4171,12 +6490,10 @@ def ddm_flexbound_mic2_ornstein_multinoise(np.ndarray[float, ndim = 1] vh,
                     ix2 += 1
                     m += 1
                     if m == num_draws:
-                        gaussian_values = draw_gaussian(num_draws)
+                        fill_gaussian(&rng, &gaussian_values[0], num_draws)
                         m = 0
 
-                    if n == 0:
-                        if k == 0:
-                            traj_view[ix2, 2] = y_l2
+                    record_state(&traj_row, ix2, 2, y_l2)
 
             # Get back to single y_l and t_l
             if (choices_view[n, k, 0] == 0):
@@ -4190,9 +6507,9 @@ def ddm_flexbound_mic2_ornstein_multinoise(np.ndarray[float, ndim = 1] vh,
 
             if smooth_unif:
                 if t_h == 0.0:
-                    smooth_u = random_uniform() * 0.5 * delta_t
+                    smooth_u = random_uniform(&rng) * 0.5 * delta_t
                 elif fmax(t_h, t_l) < deadline_tmp:
-                    smooth_u = (0.5 - random_uniform()) * delta_t
+                    smooth_u = (0.5 - random_uniform(&rng)) * delta_t
                 else:
                     smooth_u = 0.0
             else:
@@ -4208,10 +6525,10 @@ def ddm_flexbound_mic2_ornstein_multinoise(np.ndarray[float, ndim = 1] vh,
 
             # If boundary is negative (or 0) already, we flip a coin
             if boundary_view[ix] <= 0:
-                if random_uniform() <= 0.5:
+                if random_uniform(&rng) <= 0.5:
                     choices_view[n, k, 0] += 1
             # Otherwise apply rule from above
-            elif random_uniform() <= ((y_l + boundary_view[ix]) / (2 * boundary_view[ix])):
+            elif random_uniform(&rng) <= ((y_l + boundary_view[ix]) / (2 * boundary_view[ix])):
                 choices_view[n, k, 0] += 1
 
             if (rts_view[n, k, 0] >= deadline_view[k]) | (deadline_view[k] <= 0):
@@ -4253,6 +6570,118 @@ def ddm_flexbound_mic2_ornstein_multinoise(np.ndarray[float, ndim = 1] vh,
 # ----------------------------------------------------------------------------------------------------
 
 
+# Linear ballistic accumulators --------------------------------------------------------------------
+# Each accumulator starts uniformly in [0, z] and rises linearly with a rate drawn from
+# |N(v, sd)|, so its crossing time of the threshold a is available in closed form.
+
+cdef object per_accumulator(np.ndarray x, int n_trials, int nact):
+    """
+    Parameter array of shape (n_trials, 1) or (n_trials, nact) as a contiguous (n_trials, nact) array.
+    """
+    return np.ascontiguousarray(np.broadcast_to(x, (n_trials, nact)), dtype = DTYPE)
+
+cdef inline float lba_rate(RngState* rng, float v, float sd) noexcept nogil:
+    """
+    Rate of an accumulator, |N(v, sd)|; the absolute value avoids negative rates.
+    """
+    return fabs(v + sd * random_gaussian(rng))
+
+cdef inline float lba_rt(float x, float t, float deadline) noexcept nogil:
+    """
+    Reaction time from a decision time, or -999 if it exceeds the deadline.
+    """
+    if x + t >= deadline:
+        return -999
+    return x + t
+
+cdef void lba_sample(const uint64_t* key, uint64_t stream, Py_ssize_t nact,
+                     const float* v, const float* a, const float* z, const float* sd,
+                     float collapse, float t, float deadline,
+                     float* rt_out, int* choice_out) noexcept nogil:
+    """
+    Simulate a single (rt, choice) pair from the LBA.
+
+    Args:
+        key (const uint64_t*): Seed key of the simulation.
+        stream (uint64_t): Stream id of this sample.
+        nact (Py_ssize_t): Number of accumulators.
+        v, a, z, sd (const float*): Per-accumulator parameters of the trial.
+        collapse (float): Speed at which the thresholds collapse, tan(theta), or 0.
+        t (float): Non-decision time.
+        deadline (float): Deadline of the trial.
+        rt_out (float*): Output location for the reaction time.
+        choice_out (int*): Output location for the choice.
+    """
+    cdef RngState rng
+    cdef float x
+    cdef float x_min = INFINITY
+    cdef int choice = 0
+    cdef Py_ssize_t j
+
+    rng_seed_stream(&rng, key, stream)
+    for j in range(nact):
+        x = (a[j] - z[j] * random_uniform(&rng)) / (lba_rate(&rng, v[j], sd[j]) + collapse)
+        if x < x_min:
+            x_min = x
+            choice = j
+    rt_out[0] = lba_rt(x_min, t, deadline)
+    choice_out[0] = choice
+
+cdef void rlwm_lba_sample(const uint64_t* key, uint64_t stream, Py_ssize_t nact,
+                          const float* v_rl, const float* v_wm, const float* a, const float* z,
+                          const float* sd, float t_wm, bint piecewise, float t, float deadline,
+                          float* rt_out, int* choice_out) noexcept nogil:
+    """
+    Simulate a single (rt, choice) pair from the RLWM LBA models.
+
+    Every accumulator has an RL and a WM rate and a shared starting point. In the race
+    model the faster of the RL and WM races wins. In the piece-wise model the RL race
+    decides unless it takes longer than t_wm, after which both rates add up.
+
+    Args:
+        key (const uint64_t*): Seed key of the simulation.
+        stream (uint64_t): Stream id of this sample.
+        nact (Py_ssize_t): Number of accumulators.
+        v_rl, v_wm, a, z, sd (const float*): Per-accumulator parameters of the trial.
+        t_wm (float): Onset of the WM contribution (piece-wise model only).
+        piecewise (bool): Whether to simulate the piece-wise instead of the race model.
+        t (float): Non-decision time.
+        deadline (float): Deadline of the trial.
+        rt_out (float*): Output location for the reaction time.
+        choice_out (int*): Output location for the choice.
+    """
+    cdef RngState rng
+    cdef float start, rate_rl, rate_wm, x_rl, x_wm
+    cdef float x_rl_min = INFINITY
+    cdef float x_wm_min = INFINITY
+    cdef int choice_rl = 0
+    cdef int choice_wm = 0
+    cdef Py_ssize_t j
+
+    rng_seed_stream(&rng, key, stream)
+    for j in range(nact):
+        start = z[j] * random_uniform(&rng)
+        rate_rl = lba_rate(&rng, v_rl[j], sd[j])
+        rate_wm = lba_rate(&rng, v_wm[j], sd[j])
+        x_rl = (a[j] - start) / rate_rl
+        if piecewise:
+            x_wm = t_wm + (a[j] - start - t_wm * rate_rl) / (rate_rl + rate_wm)
+        else:
+            x_wm = (a[j] - start) / rate_wm
+        if x_rl < x_rl_min:
+            x_rl_min = x_rl
+            choice_rl = j
+        if x_wm < x_wm_min:
+            x_wm_min = x_wm
+            choice_wm = j
+
+    if (x_rl_min < t_wm) if piecewise else (x_rl_min <= x_wm_min):
+        rt_out[0] = lba_rt(x_rl_min, t, deadline)
+        choice_out[0] = choice_rl
+    else:
+        rt_out[0] = lba_rt(x_wm_min, t, deadline)
+        choice_out[0] = choice_wm
+
 # Simulate (rt, choice) tuples from: Vanilla LBA Model without ndt -----------------------------
 def lba_vanilla(np.ndarray[float, ndim = 2] v, 
         np.ndarray[float, ndim = 2] a, 
@@ -4264,6 +6693,9 @@ def lba_vanilla(np.ndarray[float, ndim = 2] v,
         int n_samples = 2000,
         int n_trials = 1,
         float max_t = 20,
+        random_state = None,
+        smooth_unif = False,
+        int n_threads = 1,
         **kwargs
         ):
     """
@@ -4291,6 +6723,13 @@ def lba_vanilla(np.ndarray[float, ndim = 2] v,
         Number of trials to simulate (default is 1).
     max_t : float, optional
         Maximum time to simulate (default is 20).
+    random_state : int, numpy.random.Generator or None, optional
+        Seed for random number generation (default is None).
+    smooth_unif : bool, optional
+        Accepted for a uniform interface. LBA decision times are exact, not discretized,
+        so no smoothing is applied (default is False).
+    n_threads : int, optional
+        Number of threads used to simulate samples in parallel (default is 1).
     **kwargs : dict
         Additional keyword arguments.
 
@@ -4303,14 +6742,15 @@ def lba_vanilla(np.ndarray[float, ndim = 2] v,
         - 'metadata': dictionary with model parameters and simulation details
     """
 
-    # Param views
-    cdef float[:, :] v_view = v
-    cdef float[:, :] a_view = a
-    cdef float[:, :] z_view = z
-    cdef float[:] t_view = t
-    cdef float[:] deadline_view = deadline
-    cdef float[:, :] sd_view = sd
-
+    cdef uint64_t key[4]
+    rng_key_from_seed(random_state, key)
+    # Param views, one column per accumulator
+    cdef const float[:, ::1] v_view = per_accumulator(v, n_trials, nact)
+    cdef const float[:, ::1] a_view = per_accumulator(a, n_trials, nact)
+    cdef const float[:, ::1] z_view = per_accumulator(z, n_trials, nact)
+    cdef const float[:, ::1] sd_view = per_accumulator(sd, n_trials, nact)
+    cdef const float[:] t_view = t
+    cdef const float[:] deadline_view = deadline
     rts = np.zeros((n_samples, n_trials, 1), dtype = DTYPE)
     cdef float[:, :, :] rts_view = rts
     
@@ -4319,22 +6759,14 @@ def lba_vanilla(np.ndarray[float, ndim = 2] v,
     
     cdef Py_ssize_t n, k, i
 
-    for k in range(n_trials):
-        
-        for n in range(n_samples):
-            zs = np.random.uniform(0, z_view[k], nact)
-
-            vs = np.abs(np.random.normal(v_view[k], sd_view[k])) # np.abs() to avoid negative vs
-
-            x_t = ([a_view[k]]*nact - zs)/vs
-        
-            choices_view[n, k, 0] = np.argmin(x_t) # store choices for sample n
-            rts_view[n, k, 0] = np.min(x_t) + t_view[k]  # store reaction time for sample n
+    for i in prange(<Py_ssize_t> n_samples * n_trials, nogil = True, schedule = 'static',
+                    num_threads = n_threads):
+        k = i // n_samples
+        n = i % n_samples
+        lba_sample(key, i, nact, &v_view[k, 0], &a_view[k, 0], &z_view[k, 0], &sd_view[k, 0],
+                   0.0, t_view[k], deadline_view[k],
+                   &rts_view[n, k, 0], &choices_view[n, k, 0])
 
-            # If the rt exceeds the deadline, set rt to -999
-            if rts_view[n, k, 0] >= deadline_view[k]:
-                rts_view[n, k, 0] = -999
-        
 
     v_dict = {}    
     for i in range(nact):
@@ -4366,6 +6798,9 @@ def lba_angle(np.ndarray[float, ndim = 2] v,
         int n_samples = 2000,
         int n_trials = 1,
         float max_t = 20,
+        random_state = None,
+        smooth_unif = False,
+        int n_threads = 1,
         **kwargs
         ):
     """
@@ -4395,6 +6830,13 @@ def lba_angle(np.ndarray[float, ndim = 2] v,
         Number of trials to simulate (default is 1).
     max_t : float, optional
         Maximum time to simulate (default is 20).
+    random_state : int, numpy.random.Generator or None, optional
+        Seed for random number generation (default is None).
+    smooth_unif : bool, optional
+        Accepted for a uniform interface. LBA decision times are exact, not discretized,
+        so no smoothing is applied (default is False).
+    n_threads : int, optional
+        Number of threads used to simulate samples in parallel (default is 1).
 
     Returns:
     --------
@@ -4405,16 +6847,16 @@ def lba_angle(np.ndarray[float, ndim = 2] v,
         - 'metadata': additional information about the simulation
     """
 
-    # Param views
-    cdef float[:, :] v_view = v
-    cdef float[:, :] a_view = a
-    cdef float[:, :] z_view = z
-    cdef float[:, :] theta_view = theta
-    cdef float[:] t_view = t
-
-    cdef float[:] deadline_view = deadline
-    cdef float[:, :] sd_view = sd
-
+    cdef uint64_t key[4]
+    rng_key_from_seed(random_state, key)
+    # Param views, one column per accumulator
+    cdef const float[:, ::1] v_view = per_accumulator(v, n_trials, nact)
+    cdef const float[:, ::1] a_view = per_accumulator(a, n_trials, nact)
+    cdef const float[:, ::1] z_view = per_accumulator(z, n_trials, nact)
+    cdef const float[:, ::1] sd_view = per_accumulator(sd, n_trials, nact)
+    cdef float[:] collapse_view = np.tan(theta[:, 0]).astype(DTYPE)
+    cdef const float[:] t_view = t
+    cdef const float[:] deadline_view = deadline
     rts = np.zeros((n_samples, n_trials, 1), dtype = DTYPE)
     cdef float[:, :, :] rts_view = rts
     
@@ -4423,23 +6865,14 @@ def lba_angle(np.ndarray[float, ndim = 2] v,
     
     cdef Py_ssize_t n, k, i
 
-    for k in range(n_trials):
-        for n in range(n_samples):
-            zs = np.random.uniform(0, z_view[k], nact)
-            
-            vs = np.abs(np.random.normal(v_view[k], sd_view[k])) # np.abs() to avoid negative vs
-            x_t = ([a_view[k]]*nact - zs)/(vs + np.tan(theta_view[k, 0]))
-        
-            choices_view[n, k, 0] = np.argmin(x_t) # store choices for sample n
-            rts_view[n, k, 0] = np.min(x_t) + t_view[k] # store reaction time for sample n
-
-            # If the rt exceeds the deadline, set rt to -999
-            if rts_view[n, k, 0] >= deadline_view[k]:
-                rts_view[n, k, 0] = -999
+    for i in prange(<Py_ssize_t> n_samples * n_trials, nogil = True, schedule = 'static',
+                    num_threads = n_threads):
+        k = i // n_samples
+        n = i % n_samples
+        lba_sample(key, i, nact, &v_view[k, 0], &a_view[k, 0], &z_view[k, 0], &sd_view[k, 0],
+                   collapse_view[k], t_view[k], deadline_view[k],
+                   &rts_view[n, k, 0], &choices_view[n, k, 0])
 
-            # if np.min(x_t) <= 0:
-            #     print("\n ssms sim error: ", a[k], zs, vs, np.tan(theta[k]))
-    
     v_dict = {}  
     for i in range(nact):
         v_dict['v_' + str(i)] = v[:, i]
@@ -4471,26 +6904,23 @@ def rlwm_lba_pw_v1(np.ndarray[float, ndim = 2] vRL,
         int n_samples = 2000,
         int n_trials = 1,
         float max_t = 20,
+        random_state = None,
+        smooth_unif = False,
+        int n_threads = 1,
         **kwargs
         ):
 
-    # Param views
-    cdef float[:, :] v_RL_view = vRL
-    cdef float[:, :] v_WM_view = vWM
-    cdef float[:, :] a_view = a
-    cdef float[:, :] z_view = z
-    cdef float[:, :] t_WM_view = tWM
-    cdef float[:] t_view = t
-
-    cdef float[:] deadline_view = deadline
-    cdef float[:, :] sd_view = sd
-
-    cdef np.ndarray[float, ndim = 1] zs
-    cdef np.ndarray[double, ndim = 2] x_t_RL
-    cdef np.ndarray[double, ndim = 2] x_t_WM
-    cdef np.ndarray[double, ndim = 1] vs_RL
-    cdef np.ndarray[double, ndim = 1] vs_WM
-
+    cdef uint64_t key[4]
+    rng_key_from_seed(random_state, key)
+    # Param views, one column per accumulator
+    cdef const float[:, ::1] v_RL_view = per_accumulator(vRL, n_trials, nact)
+    cdef const float[:, ::1] v_WM_view = per_accumulator(vWM, n_trials, nact)
+    cdef const float[:, ::1] a_view = per_accumulator(a, n_trials, nact)
+    cdef const float[:, ::1] z_view = per_accumulator(z, n_trials, nact)
+    cdef const float[:, ::1] sd_view = per_accumulator(sd, n_trials, nact)
+    cdef const float[:, :] t_WM_view = tWM
+    cdef const float[:] t_view = t
+    cdef const float[:] deadline_view = deadline
     rts = np.zeros((n_samples, n_trials, 1), dtype = DTYPE)
     cdef float[:, :, :] rts_view = rts
     
@@ -4499,29 +6929,14 @@ def rlwm_lba_pw_v1(np.ndarray[float, ndim = 2] vRL,
     
     cdef Py_ssize_t n, k, i
 
-    for k in range(n_trials):
-        
-        for n in range(n_samples):
-            zs = np.random.uniform(0, z_view[k], nact).astype(DTYPE)
-
-            vs_RL = np.abs(np.random.normal(v_RL_view[k], sd_view[k])) # np.abs() to avoid negative vs
-            vs_WM = np.abs(np.random.normal(v_WM_view[k], sd_view[k])) # np.abs() to avoid negative vs
+    for i in prange(<Py_ssize_t> n_samples * n_trials, nogil = True, schedule = 'static',
+                    num_threads = n_threads):
+        k = i // n_samples
+        n = i % n_samples
+        rlwm_lba_sample(key, i, nact, &v_RL_view[k, 0], &v_WM_view[k, 0], &a_view[k, 0], &z_view[k, 0],
+                        &sd_view[k, 0], t_WM_view[k, 0], True, t_view[k], deadline_view[k],
+                        &rts_view[n, k, 0], &choices_view[n, k, 0])
 
-            x_t_RL = ([a_view[k]]*nact - zs)/vs_RL
-            # x_t_WM = ([a_view[k]]*nact - zs)/vs_WM
-
-            if np.min(x_t_RL) < t_WM_view[k]:
-                x_t = x_t_RL
-            else:
-                x_t = t_WM_view[k] + ( [a_view[k]]*nact - zs - ([t_WM_view[k]]*nact)*vs_RL ) / ( vs_RL + vs_WM )
-
-            choices_view[n, k, 0] = np.argmin(x_t) # store choices for sample n
-            rts_view[n, k, 0] = np.min(x_t) + t_view[k] # store reaction time for sample n
-            
-            # If the rt exceeds the deadline, set rt to -999
-            if rts_view[n, k, 0] >= deadline_view[k]:
-                rts_view[n, k, 0] = -999
-        
 
     v_dict = {}    
     for i in range(nact):
@@ -4553,6 +6968,9 @@ def rlwm_lba_race(np.ndarray[float, ndim = 2] vRL, # RL drift parameters (np.arr
         int n_samples = 2000,
         int n_trials = 1,
         float max_t = 20,
+        random_state = None,
+        smooth_unif = False,
+        int n_threads = 1,
         **kwargs
         ):
     """
@@ -4582,6 +7000,13 @@ def rlwm_lba_race(np.ndarray[float, ndim = 2] vRL, # RL drift parameters (np.arr
         Number of trials to simulate (default is 1).
     max_t : float, optional
         Maximum time to simulate (default is 20).
+    random_state : int, numpy.random.Generator or None, optional
+        Seed for random number generation (default is None).
+    smooth_unif : bool, optional
+        Accepted for a uniform interface. LBA decision times are exact, not discretized,
+        so no smoothing is applied (default is False).
+    n_threads : int, optional
+        Number of threads used to simulate samples in parallel (default is 1).
 
     Returns:
     --------
@@ -4592,21 +7017,16 @@ def rlwm_lba_race(np.ndarray[float, ndim = 2] vRL, # RL drift parameters (np.arr
         - 'metadata': additional information about the simulation
     """
 
-    # Param views
-    cdef float[:, :] v_RL_view = vRL
-    cdef float[:, :] v_WM_view = vWM
-    cdef float[:, :] a_view = a
-    cdef float[:, :] z_view = z
-    cdef float[:] t_view = t
-
-    cdef float[:] deadline_view = deadline
-    cdef float[:, :] sd_view = sd
-    cdef np.ndarray[float, ndim = 1] zs
-    cdef np.ndarray[double, ndim = 2] x_t_RL
-    cdef np.ndarray[double, ndim = 2] x_t_WM
-    cdef np.ndarray[double, ndim = 1] vs_RL
-    cdef np.ndarray[double, ndim = 1] vs_WM
-
+    cdef uint64_t key[4]
+    rng_key_from_seed(random_state, key)
+    # Param views, one column per accumulator
+    cdef const float[:, ::1] v_RL_view = per_accumulator(vRL, n_trials, nact)
+    cdef const float[:, ::1] v_WM_view = per_accumulator(vWM, n_trials, nact)
+    cdef const float[:, ::1] a_view = per_accumulator(a, n_trials, nact)
+    cdef const float[:, ::1] z_view = per_accumulator(z, n_trials, nact)
+    cdef const float[:, ::1] sd_view = per_accumulator(sd, n_trials, nact)
+    cdef const float[:] t_view = t
+    cdef const float[:] deadline_view = deadline
     rts = np.zeros((n_samples, n_trials, 1), dtype = DTYPE)
     cdef float[:, :, :] rts_view = rts
     
@@ -4615,28 +7035,14 @@ def rlwm_lba_race(np.ndarray[float, ndim = 2] vRL, # RL drift parameters (np.arr
     
     cdef Py_ssize_t n, k, i
 
-    for k in range(n_trials):
-        
-        for n in range(n_samples):
-            zs = np.random.uniform(0, z_view[k], nact).astype(DTYPE)
-
-            vs_RL = np.abs(np.random.normal(v_RL_view[k], sd_view[k])) # np.abs() to avoid negative vs
-            vs_WM = np.abs(np.random.normal(v_WM_view[k], sd_view[k])) # np.abs() to avoid negative vs
+    for i in prange(<Py_ssize_t> n_samples * n_trials, nogil = True, schedule = 'static',
+                    num_threads = n_threads):
+        k = i // n_samples
+        n = i % n_samples
+        rlwm_lba_sample(key, i, nact, &v_RL_view[k, 0], &v_WM_view[k, 0], &a_view[k, 0], &z_view[k, 0],
+                        &sd_view[k, 0], 0.0, False, t_view[k], deadline_view[k],
+                        &rts_view[n, k, 0], &choices_view[n, k, 0])
 
-            x_t_RL = ([a_view[k]]*nact - zs)/vs_RL
-            x_t_WM = ([a_view[k]]*nact - zs)/vs_WM
-
-            if np.min(x_t_RL) <= np.min(x_t_WM):
-                rts_view[n, k, 0] = np.min(x_t_RL) + t_view[k]  # store reaction time for sample n
-                choices_view[n, k, 0] = np.argmin(x_t_RL) # store choices for sample n
-            else:
-                rts_view[n, k, 0] = np.min(x_t_WM) + t_view[k]  # store reaction time for sample n
-                choices_view[n, k, 0] = np.argmin(x_t_WM) # store choices for sample n  
-            
-            # If the rt exceeds the deadline, set rt to -999
-            if rts_view[n, k, 0] >= deadline_view[k]:
-                rts_view[n, k, 0] = -999
-        
 
     v_dict = {}    
     for i in range(nact):
@@ -4683,6 +7089,8 @@ def ddm_flexbound_mic2_unnormalized_ornstein_multinoise(np.ndarray[float, ndim =
                                                         random_state = None,
                                                         return_option = 'full',
                                                         smooth_unif = False,
+                                                        record_trajectories = 0,
+                                                        trajectories_per_trial = False,
                                                         **kwargs):
     """
     Simulate a Drift Diffusion Model (DDM) with flexible boundaries for a multi-level decision process.
@@ -4725,12 +7133,17 @@ def ddm_flexbound_mic2_unnormalized_ornstein_multinoise(np.ndarray[float, ndim =
         If True, boundary function is multiplicative; if False, additive (default: True).
     boundary_params : dict, optional
         Parameters for the boundary function.
-    random_state : int or None, optional
+    random_state : int, numpy.random.Generator or None, optional
         Seed for random number generator (default: None).
     return_option : str, optional
         Determines the amount of data returned ('full' or 'minimal', default: 'full').
     smooth_unif : bool, optional
         If True, applies uniform smoothing to reaction times (default: False).
+    record_trajectories : int, optional
+        Number of samples whose paths are returned as the 'trajectory' metadata (default: 0).
+    trajectories_per_trial : bool, optional
+        If True, records the first record_trajectories samples of every trial instead of
+        only those of the first trial (default: False).
 
     Returns:
     --------
@@ -4745,20 +7158,21 @@ def ddm_flexbound_mic2_unnormalized_ornstein_multinoise(np.ndarray[float, ndim =
     modeling hierarchical decision-making scenarios.
     """
 
-    set_seed(random_state)
+    cdef RngState rng
+    rng_init(&rng, random_state)
     # Param views
-    cdef float[:] vh_view = vh
-    cdef float[:] vl1_view = vl1
-    cdef float[:] vl2_view = vl2
-    cdef float[:] a_view = a
-    cdef float[:] zh_view = zh
-    cdef float[:] zl1_view = zl1
-    cdef float[:] zl2_view = zl2
-    cdef float[:] d_view = d
-    cdef float[:] g_view = g
-    cdef float[:] t_view = t
-    cdef float[:] deadline_view = deadline
-    cdef float[:] s_view = s
+    cdef const float[:] vh_view = vh
+    cdef const float[:] vl1_view = vl1
+    cdef const float[:] vl2_view = vl2
+    cdef const float[:] a_view = a
+    cdef const float[:] zh_view = zh
+    cdef const float[:] zl1_view = zl1
+    cdef const float[:] zl2_view = zl2
+    cdef const float[:] d_view = d
+    cdef const float[:] g_view = g
+    cdef const float[:] t_view = t
+    cdef const float[:] deadline_view = deadline
+    cdef const float[:] s_view = s
     # TD: Add trajectory --> same issue as with par2 model above... might need to make a separate simulator for trajectories
     rts = np.zeros((n_samples, n_trials, 1), dtype = DTYPE)
     choices = np.zeros((n_samples, n_trials, 1), dtype = np.intc)
@@ -4770,9 +7184,11 @@ def ddm_flexbound_mic2_unnormalized_ornstein_multinoise(np.ndarray[float, ndim =
     cdef float[:, :, :] rts_low_view = rts_low
     cdef int[:, :, :] choices_view = choices
 
-    traj = np.zeros((int(max_t / delta_t) + 1, 3), dtype = DTYPE)
-    traj[:, :] = -999
-    cdef float[:, :] traj_view = traj
+    cdef Trajectories trajectories
+    cdef TrajectoryRow traj_row
+    cdef float traj_sink[3]
+    traj = init_trajectories(&trajectories, record_trajectories, trajectories_per_trial,
+                             n_samples, n_trials, max_t, delta_t, 3)
 
     cdef float delta_t_sqrt = sqrt(delta_t) # correct scalar so we can use standard normal samples for the brownian motion
     #cdef float sqrt_st = delta_t_sqrt * s # scalar to ensure the correct variance for the gaussian step
@@ -4782,6 +7198,11 @@ def ddm_flexbound_mic2_unnormalized_ornstein_multinoise(np.ndarray[float, ndim =
     t_s = np.arange(0, max_t + delta_t, delta_t).astype(DTYPE)
     boundary = np.zeros(t_s.shape, dtype = DTYPE)
     cdef float[:] boundary_view = boundary
+    cdef BoundarySpec boundary_spec
+    boundary_coefs = init_boundary(&boundary_spec, boundary_fun, boundary_multiplicative, boundary_params,
+                                   n_trials, t_s.shape[0], delta_t)
+    cdef BoundaryBuffer boundary_buf = boundary_buffer(&boundary_spec, &boundary_view[0], boundary_view.shape[0],
+                                                       0, 0, 0.0)
 
     # Y particle trace
     bias_trace_l1 = np.zeros(num_draws, dtype = DTYPE)
@@ -4794,17 +7215,13 @@ def ddm_flexbound_mic2_unnormalized_ornstein_multinoise(np.ndarray[float, ndim =
     cdef float t_h, t_l, t_l1, t_l2, smooth_u, deadline_tmp, sqrt_st
     cdef Py_ssize_t n, ix, ix1, ix2, ix_l, ix_tmp, ix1_tmp, ix2_tmp, k
     cdef Py_ssize_t m = 0
-    cdef float[:] gaussian_values = draw_gaussian(num_draws)
+    cdef float[:] gaussian_values = draw_gaussian(&rng, num_draws)
 
     for k in range(n_trials):
         # Precompute boundary evaluations
-        boundary_params_tmp = {key: boundary_params[key][k] for key in boundary_params.keys()}
 
         # Precompute boundary evaluations
-        if boundary_multiplicative:
-            boundary[:] = np.multiply(a_view[k], boundary_fun(t = t_s, **boundary_params_tmp)).astype(DTYPE)
-        else:
-            boundary[:] = np.add(a_view[k], boundary_fun(t = t_s, **boundary_params_tmp)).astype(DTYPE)
+        evaluate_boundary(&boundary_buf, boundary, k, a_view[k], t_s, boundary_fun, boundary_params, False)
     
         deadline_tmp = min(max_t, deadline_view[k] - t_view[k])
         sqrt_st = delta_t_sqrt * s_view[k]
@@ -4826,9 +7243,8 @@ def ddm_flexbound_mic2_unnormalized_ornstein_multinoise(np.ndarray[float, ndim =
             bias_trace_l2_view[0] = ((y_h + boundary_view[0]) / (2))
             bias_trace_l1_view[0] = boundary_view[0] - bias_trace_l2_view[0]
 
-            if n == 0:
-                if k == 0:
-                    traj_view[0, 0] = y_h
+            traj_row = trajectory_row(&trajectories, n, k, traj_sink)
+            record_state(&traj_row, 0, 0, y_h)
 
             # Random walks until y_h hits bound
             while (y_h >= ((-1) * boundary_view[ix])) and ((y_h <= boundary_view[ix])) and (t_h <= deadline_tmp):
@@ -4839,7 +7255,7 @@ def ddm_flexbound_mic2_unnormalized_ornstein_multinoise(np.ndarray[float, ndim =
                 ix += 1
                 m += 1
                 if m == num_draws:
-                    gaussian_values = draw_gaussian(num_draws)
+                    fill_gaussian(&rng, &gaussian_values[0], num_draws)
                     m = 0
 
             # The probability of making a 'mistake' 1 - (relative y position)
@@ -4848,10 +7264,10 @@ def ddm_flexbound_mic2_unnormalized_ornstein_multinoise(np.ndarray[float, ndim =
 
             # If boundary is negative (or 0) already, we flip a coin
             if boundary_view[ix] <= 0:
-                if random_uniform() <= 0.5:
+                if random_uniform(&rng) <= 0.5:
                     choices_view[n, k, 0] += 2
             # Otherwise, apply rule from above
-            elif random_uniform() <= ((y_h + boundary_view[ix]) / (2 * boundary_view[ix])):
+            elif random_uniform(&rng) <= ((y_h + boundary_view[ix]) / (2 * boundary_view[ix])):
                 choices_view[n, k, 0] += 2
            
             y_l2 = (- 1) * boundary_view[0] + (zl2_view[k] * 2 * (boundary_view[0]))
@@ -4874,7 +7290,7 @@ def ddm_flexbound_mic2_unnormalized_ornstein_multinoise(np.ndarray[float, ndim =
                     ix2_tmp += 1
 
             # lower level random walker (1)
-            if (choices_view[n, k, 0] == 0) | ((n == 0) & (k == 0)):
+            if (choices_view[n, k, 0] == 0) | (traj_row.step != 0):
                 while (y_l1 >= ((-1) * boundary_view[ix1])) and (y_l1 <= boundary_view[ix1]) and (t_l1 <= deadline_tmp):
                     if (bias_trace_l1_view[ix1] < boundary_view[ix1]) and (bias_trace_l1_view[ix1] > 0):
                         # main propagation if bias_trace is between 0 and 1 (high level choice is not yet made)
@@ -4892,15 +7308,13 @@ def ddm_flexbound_mic2_unnormalized_ornstein_multinoise(np.ndarray[float, ndim =
                     ix1 += 1
                     m += 1
                     if m == num_draws:
-                        gaussian_values = draw_gaussian(num_draws)
+                        fill_gaussian(&rng, &gaussian_values[0], num_draws)
                         m = 0
 
-                    if n == 0:
-                        if k == 0:
-                            traj_view[ix1, 1] = y_l1
+                    record_state(&traj_row, ix1, 1, y_l1)
 
             # lower level random walker (2)
-            if (choices_view[n, k, 0] == 2) | ((n == 0) & (k == 0)):
+            if (choices_view[n, k, 0] == 2) | (traj_row.step != 0):
                 while (y_l2 >= ((-1) * boundary_view[ix2])) and (y_l2 <= boundary_view[ix2]) and (t_l2 <= deadline_tmp):
                     if (bias_trace_l2_view[ix2] < boundary_view[ix2]) and (bias_trace_l2_view[ix2] > 0):
                         # main propagation if bias_trace is between 0 and 1 (high level choice is not yet made)
@@ -4918,12 +7332,10 @@ def ddm_flexbound_mic2_unnormalized_ornstein_multinoise(np.ndarray[float, ndim =
                     ix2 += 1
                     m += 1
                     if m == num_draws:
-                        gaussian_values = draw_gaussian(num_draws)
+                        fill_gaussian(&rng, &gaussian_values[0], num_draws)
                         m = 0
 
-                    if n == 0:
-                        if k == 0:
-                            traj_view[ix2, 2] = y_l2
+                    record_state(&traj_row, ix2, 2, y_l2)
 
             # Get back to single y_l and t_l
             if (choices_view[n, k, 0] == 0):
@@ -4937,9 +7349,9 @@ def ddm_flexbound_mic2_unnormalized_ornstein_multinoise(np.ndarray[float, ndim =
 
             if smooth_unif:
                 if t_h == 0.0:
-                    smooth_u = random_uniform() * 0.5 * delta_t
+                    smooth_u = random_uniform(&rng) * 0.5 * delta_t
                 elif fmax(t_h, t_l) < deadline_tmp:
-                    smooth_u = (0.5 - random_uniform()) * delta_t
+                    smooth_u = (0.5 - random_uniform(&rng)) * delta_t
                 else:
                     smooth_u = 0.0
             else:
@@ -4955,10 +7367,10 @@ def ddm_flexbound_mic2_unnormalized_ornstein_multinoise(np.ndarray[float, ndim =
 
             # If boundary is negative (or 0) already, we flip a coin
             if boundary_view[ix] <= 0:
-                if random_uniform() <= 0.5:
+                if random_uniform(&rng) <= 0.5:
                     choices_view[n, k, 0] += 1
             # Otherwise apply rule from above
-            elif random_uniform() <= ((y_l + boundary_view[ix]) / (2 * boundary_view[ix])):
+            elif random_uniform(&rng) <= ((y_l + boundary_view[ix]) / (2 * boundary_view[ix])):
                 choices_view[n, k, 0] += 1
 
             if (rts_view[n, k, 0] >= deadline_view[k]) | (deadline_view[k] <= 0):
@@ -5064,7 +7476,7 @@ def ddm_flexbound_tradeoff(np.ndarray[float, ndim = 1] vh,
         Whether the boundary function is multiplicative (default: True).
     boundary_params : dict, optional
         Parameters for the boundary function.
-    random_state : int or None, optional
+    random_state : int, numpy.random.Generator or None, optional
         Seed for random number generation (default: None).
     return_option : str, optional
         Determines the format of returned data ('full' or 'minimal', default: 'full').
@@ -5088,19 +7500,20 @@ def ddm_flexbound_tradeoff(np.ndarray[float, ndim = 1] vh,
     decision process, suitable for modeling tradeoff scenarios in decision-making.
     """
 
-    set_seed(random_state)
+    cdef RngState rng
+    rng_init(&rng, random_state)
     # Param views
-    cdef float[:] vh_view = vh
-    cdef float[:] vl1_view = vl1
-    cdef float[:] vl2_view = vl2
-    cdef float[:] a_view = a
-    cdef float[:] zh_view = zh
-    cdef float[:] zl1_view = zl1
-    cdef float[:] zl2_view = zl2
-    cdef float[:] d_view = d
-    cdef float[:] t_view = t
-    cdef float[:] deadline_view = deadline
-    cdef float[:] s_view = s
+    cdef const float[:] vh_view = vh
+    cdef const float[:] vl1_view = vl1
+    cdef const float[:] vl2_view = vl2
+    cdef const float[:] a_view = a
+    cdef const float[:] zh_view = zh
+    cdef const float[:] zl1_view = zl1
+    cdef const float[:] zl2_view = zl2
+    cdef const float[:] d_view = d
+    cdef const float[:] t_view = t
+    cdef const float[:] deadline_view = deadline
+    cdef const float[:] s_view = s
     # TD: Add trajectory --> same issue as with par2 model above... might need to make a separate simulator for trajectories
 
     rts = np.zeros((n_samples, n_trials, 1), dtype = DTYPE)
@@ -5117,6 +7530,11 @@ def ddm_flexbound_tradeoff(np.ndarray[float, ndim = 1] vh,
     t_s = np.arange(0, max_t + delta_t, delta_t).astype(DTYPE)
     boundary = np.zeros(t_s.shape, dtype = DTYPE)
     cdef float[:] boundary_view = boundary
+    cdef BoundarySpec boundary_spec
+    boundary_coefs = init_boundary(&boundary_spec, boundary_fun, boundary_multiplicative, boundary_params,
+                                   n_trials, t_s.shape[0], delta_t)
+    cdef BoundaryBuffer boundary_buf = boundary_buffer(&boundary_spec, &boundary_view[0], boundary_view.shape[0],
+                                                       0, 0, 0.0)
 
     # Y particle trace
     bias_trace = np.zeros(num_draws, dtype = DTYPE)
@@ -5125,17 +7543,13 @@ def ddm_flexbound_tradeoff(np.ndarray[float, ndim = 1] vh,
     cdef float y_h, y_l, v_l, t_h, t_l, tmp_pos_dep, smooth_u, deadline_tmp
     cdef Py_ssize_t n, ix, ix_tmp, k
     cdef Py_ssize_t m = 0
-    cdef float[:] gaussian_values = draw_gaussian(num_draws)
+    cdef float[:] gaussian_values = draw_gaussian(&rng, num_draws)
 
     for k in range(n_trials):
         # Precompute boundary evaluations
-        boundary_params_tmp = {key: boundary_params[key][k] for key in boundary_params.keys()}
 
         # Precompute boundary evaluations
-        if boundary_multiplicative:
-            boundary[:] = np.multiply(a_view[k], boundary_fun(t = t_s, **boundary_params_tmp)).astype(DTYPE)
-        else:
-            boundary[:] = np.add(a_view[k], boundary_fun(t = t_s, **boundary_params_tmp)).astype(DTYPE)
+        evaluate_boundary(&boundary_buf, boundary, k, a_view[k], t_s, boundary_fun, boundary_params, False)
     
         deadline_tmp = min(max_t, deadline_view[k] - t_view[k])
         sqrt_st = delta_t_sqrt * s_view[k]
@@ -5158,13 +7572,13 @@ def ddm_flexbound_tradeoff(np.ndarray[float, ndim = 1] vh,
                 ix += 1
                 m += 1
                 if m == num_draws:
-                    gaussian_values = draw_gaussian(num_draws)
+                    fill_gaussian(&rng, &gaussian_values[0], num_draws)
                     m = 0
 
             # The probability of making a 'mistake' 1 - (relative y position)
             # y at upper bound --> choices_view[n, k, 0] add 2 deterministically
             # y at lower bound --> choice_view[n, k, 0] stay the same deterministically
-            if random_uniform() <= ((y_h + boundary_view[ix]) / (2 * boundary_view[ix])):
+            if random_uniform(&rng) <= ((y_h + boundary_view[ix]) / (2 * boundary_view[ix])):
                 choices_view[n, k, 0] += 2
            
             if choices_view[n, k, 0] == 2:
@@ -5215,14 +7629,14 @@ def ddm_flexbound_tradeoff(np.ndarray[float, ndim = 1] vh,
                 m += 1 # update rv couter
 
                 if m == num_draws:
-                    gaussian_values = draw_gaussian(num_draws)
+                    fill_gaussian(&rng, &gaussian_values[0], num_draws)
                     m = 0
 
             if smooth_unif:
                 if t_h == 0.0:
-                    smooth_u = random_uniform() * 0.5 * delta_t
+                    smooth_u = random_uniform(&rng) * 0.5 * delta_t
                 elif fmax(t_h, t_l) < deadline_tmp:
-                    smooth_u = (0.5 - random_uniform()) * delta_t
+                    smooth_u = (0.5 - random_uniform(&rng)) * delta_t
                 else:
                     smooth_u = 0.0
             else:
@@ -5233,7 +7647,7 @@ def ddm_flexbound_tradeoff(np.ndarray[float, ndim = 1] vh,
             # The probability of making a 'mistake' 1 - (relative y position)
             # y at upper bound --> choices_view[n, k, 0] add one deterministically
             # y at lower bound --> choice_view[n, k, 0] stays the same deterministically
-            if random_uniform() <= ((y_l + boundary_view[ix]) / (2 * boundary_view[ix])):
+            if random_uniform(&rng) <= ((y_l + boundary_view[ix]) / (2 * boundary_view[ix])):
                 choices_view[n, k, 0] += 1
 
             if (rts_view[n, k, 0] >= deadline_view[k]) | (deadline_view[k] <= 0):
@@ -5259,7 +7673,7 @@ def ddm_flexbound_tradeoff(np.ndarray[float, ndim = 1] vh,
                                                             'simulator': 'ddm_flexbound_mic2_adj',
                                                             'boundary_fun_type': boundary_fun.__name__,
                                                             'possible_choices': [0, 1, 2, 3],
-                                                            'trajectory': 'This simulator does not yet allow for trajectory simulation',
+                                                            'trajectory': None,
                                                             'boundary': boundary}}
     elif return_option == 'minimal':
         return {'rts': rts, 'choices': choices, 'metadata': {'simulator': 'ddm_flexbound_mic2_adj', 
@@ -9,4 +9,105 @@ DEFAULT_SIM_PARAMS: dict[str, Any] = {
     "random_state": None,
     "return_option": "full",
     "smooth_unif": False,
+    "n_threads": 1,
+    "method": "euler",
+    "record_trajectories": 0,
+    "trajectories_per_trial": False,
+    "return_steps": False,
+    "layout": "sample_major",
 }
+
+# Simulation methods other than the default Euler-Maruyama scheme,
+# mapped to the cssm simulators that implement them
+SIMULATOR_METHODS: dict[str, set[str]] = {
+    "exact": {
+        "ddm",
+        "ddm_flexbound",
+        "full_ddm",
+        "full_ddm_hddm_base",
+        "ornstein_uhlenbeck",
+    },
+    "bridge": {
+        "ddm_flexbound",
+        "ddm_flex",
+        "ddm_flex_leak",
+        "ddm_flex_leak2",
+        "ddm_sdv",
+        "ornstein_uhlenbeck",
+    },
+}
+
+# cssm simulators that can return integer step counts instead of reaction times
+STEP_OUTPUT: set[str] = {
+    "ddm",
+    "ddm_flexbound",
+    "ddm_flex",
+    "ddm_flex_leak",
+    "ddm_flex_leak2",
+    "ddm_sdv",
+    "ornstein_uhlenbeck",
+    "levy_flexbound",
+    "race_model",
+    "lca",
+}
+
+# Output layouts other than the default sample-major one,
+# mapped to the cssm simulators that write them
+OUTPUT_LAYOUTS: dict[str, set[str]] = {
+    layout: STEP_OUTPUT | {"full_ddm", "full_ddm_hddm_base", "full_ddm_rv"}
+    for layout in ("trial_major", "records")
+}
+
+# cssm simulators whose only randomness, apart from the rt smoothing, is the
+# diffusion noise. Without noise all samples of a trial are identical, so a
+# single one is simulated and repeated.
+NOISELESS_DETERMINISTIC: set[str] = {
+    "ddm",
+    "ddm_flexbound",
+    "ddm_flex",
+    "ddm_flex_leak",
+    "ddm_flex_leak2",
+    "ornstein_uhlenbeck",
+    "levy_flexbound",
+    "race_model",
+    "lca",
+    "ddm_flexbound_seq2",
+    "ddm_flexbound_par2",
+    "ddm_flexbound_mic2_ornstein",
+    "ddm_flexbound_mic2_multinoise",
+    "ddm_flexbound_mic2_ornstein_multinoise",
+    "ddm_flexbound_mic2_unnormalized_ornstein_multinoise",
+    "ddm_flexbound_tradeoff",
+}
+
+# Those of the above that choose at random for walks still undecided at max_t;
+# without noise, such trials are simulated with all samples
+NOISELESS_RANDOM_UNDECIDED: set[str] = {
+    "ddm_flexbound_seq2",
+    "ddm_flexbound_par2",
+    "ddm_flexbound_mic2_ornstein",
+    "ddm_flexbound_mic2_multinoise",
+    "ddm_flexbound_mic2_ornstein_multinoise",
+    "ddm_flexbound_mic2_unnormalized_ornstein_multinoise",
+    "ddm_flexbound_tradeoff",
+}
+
+# cssm simulators that accept return_option='minimal', leaving the parameters and
+# the trajectory out of their metadata
+MINIMAL_METADATA: set[str] = NOISELESS_DETERMINISTIC | {
+    "full_ddm",
+    "full_ddm_hddm_base",
+    "full_ddm_rv",
+    "ddm_sdv",
+}
+
+# Outputs that simulator computes from the samples of the cssm simulators: the
+# choice probabilities of every trial, and histograms with their number of bins
+CHOICE_P_OUTPUTS: tuple[str, ...] = (
+    "choice_p",
+    "choice_p_no_omission",
+    "omission_p",
+    "nogo_p",
+    "go_p",
+)
+BINNED_OUTPUTS: dict[str, int] = {"binned_128": 128, "binned_256": 256}
@@ -17,7 +17,17 @@ from ssms.config import model_config
 from ssms.config._modelconfig.base import boundary_config, drift_config
 
 # Constants
-from ssms.basic_simulators.constants import DEFAULT_SIM_PARAMS
+from ssms.basic_simulators.constants import (
+    BINNED_OUTPUTS,
+    CHOICE_P_OUTPUTS,
+    DEFAULT_SIM_PARAMS,
+    MINIMAL_METADATA,
+    NOISELESS_DETERMINISTIC,
+    NOISELESS_RANDOM_UNDECIDED,
+    OUTPUT_LAYOUTS,
+    SIMULATOR_METHODS,
+    STEP_OUTPUT,
+)
 
 _global_rng = default_rng()
 _rng_lock = Lock()
@@ -43,27 +53,24 @@ def _make_valid_dict(dict_in: dict) -> dict:
 
     Returns:
     --------
-        dict_in: dict
+        dict_out: dict
             Aligned to same size np.float32 np.arrays for every parameter
     """
 
+    # Build a new dictionary so that the caller's one is left untouched;
+    # float32 arrays pass through without a copy
+    dict_out = {}
     collect_lengths: list[int] = []
     for key, value in dict_in.items():
-        # Turn all values into numpy arrays
-        if isinstance(value, list):
-            dict_in[key] = np.array(value).astype(np.float32)
-        elif isinstance(value, int | float):
-            dict_in[key] = np.array([value]).astype(np.float32)
-
         # Squeeze all values to make sure they are 1d arrays
-        dict_in[key] = np.squeeze(dict_in[key]).astype(np.float32)
+        dict_out[key] = np.squeeze(np.asarray(value, dtype=np.float32))
 
         # Check if all thetas are either scalars or vectors of the same length
-        if dict_in[key].ndim > 1:
+        if dict_out[key].ndim > 1:
             raise ValueError(f"Dimension of {key} is greater than 1")
-        elif dict_in[key].ndim > 0:
+        elif dict_out[key].ndim > 0:
             collect_lengths.append(
-                dict_in[key].shape[0]
+                dict_out[key].shape[0]
             )  # add vector parameters to list
 
     if len(set(collect_lengths)) > 1:
@@ -73,16 +80,12 @@ def _make_valid_dict(dict_in: dict) -> dict:
         )
 
     # If there were any thetas provided as vectors (and they had the same length),
-    # tile all scalar thetas to that length
-    if len(set(collect_lengths)) > 0:
-        for key, value in dict_in.items():
-            if value.ndim == 0:
-                dict_in[key] = np.tile(value, collect_lengths[0])
-    else:  # Expand scalars to 1d arrays
-        for key, value in dict_in.items():
-            if value.ndim == 0:
-                dict_in[key] = np.expand_dims(value, axis=0)
-    return dict_in
+    # broadcast all scalar thetas to that length (a read-only view, not a copy)
+    n_trials = collect_lengths[0] if collect_lengths else 1
+    for key, value in dict_out.items():
+        if value.ndim == 0:
+            dict_out[key] = np.broadcast_to(value, (n_trials,))
+    return dict_out
 
 
 def _theta_dict_to_array(
@@ -168,7 +171,7 @@ def _theta_array_to_dict(
         )
     else:
         if theta.ndim == 1:
-            theta = np.expand_dims(theta, axis=0).astype(np.float32)
+            theta = np.expand_dims(theta, axis=0)
         return {param: theta[:, i] for i, param in enumerate(model_param_list)}
 
 
@@ -192,15 +195,16 @@ def _preprocess_theta_generic(
         ValueError: If theta is not supplied as a list, numpy array, dictionary,
             or pandas DataFrame.
     """
-    if isinstance(theta, list):
-        theta = np.asarray(theta).astype(np.float32)
-    elif isinstance(theta, np.ndarray):
-        theta = theta.astype(np.float32)
+    # np.float32 inputs (including np.memmap and DataFrame columns) are used in place;
+    # the kernels only read them
+    if isinstance(theta, list | np.ndarray):
+        theta = np.asarray(theta, dtype=np.float32)
     elif isinstance(theta, dict):
-        theta = _make_valid_dict(deepcopy(theta))
+        theta = _make_valid_dict(theta)
     elif isinstance(theta, pd.DataFrame):
-        theta = theta.to_dict(orient="list")
-        theta = {k: np.array(v).astype(np.float32) for k, v in theta.items()}
+        theta = {
+            k: theta[k].to_numpy(dtype=np.float32, copy=False) for k in theta.columns
+        }
     else:
         raise ValueError(
             "theta is not supplied as list, numpy array, dictionary, or pandas DataFrame!"
@@ -231,7 +235,7 @@ def _preprocess_theta_deadline(
     n_trials = theta[config["params"][0]].shape[0]
 
     if not deadline:
-        theta["deadline"] = np.tile(np.array([999], dtype=np.float32), n_trials)
+        theta["deadline"] = np.full(n_trials, 999, dtype=np.float32)
 
     return n_trials, theta
 
@@ -304,6 +308,316 @@ def make_drift_dict(config: dict, theta: dict) -> dict:
     return drift_dict
 
 
+def _unique_theta_rows(
+    theta: dict, n_trials: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Find the distinct parameter rows among the trials of a processed theta.
+
+    Every numeric array in theta whose leading dimension equals n_trials
+    contributes its values for a trial to that trial's row.
+
+    Args:
+        theta (dict): Processed parameters, as passed to the simulator.
+        n_trials (int): Number of trials.
+
+    Returns:
+        tuple[np.ndarray, np.ndarray, np.ndarray]: The index of one trial per
+            distinct row, the distinct row of every trial and the number of
+            trials sharing each distinct row.
+    """
+    columns = [
+        value.reshape(n_trials, -1)
+        for value in theta.values()
+        if isinstance(value, np.ndarray)
+        and value.ndim > 0
+        and value.shape[0] == n_trials
+        and np.issubdtype(value.dtype, np.number)
+    ]
+    _, index, inverse, counts = np.unique(
+        np.hstack(columns),
+        axis=0,
+        return_index=True,
+        return_inverse=True,
+        return_counts=True,
+    )
+    return index, inverse.ravel(), counts
+
+
+def _take_trials(value, trials: np.ndarray, n_trials: int):
+    """
+    Select the values of some trials from an entry of a processed theta.
+
+    Arrays with leading dimension n_trials are indexed, also inside
+    distribution specs such as ("normal", 0.0, sv). Other values are shared
+    by all trials and returned as is.
+
+    Args:
+        value: Entry of the processed parameters.
+        trials (np.ndarray): Indices of the trials to select.
+        n_trials (int): Number of trials.
+
+    Returns:
+        The entry restricted to the selected trials.
+    """
+    if isinstance(value, np.ndarray) and value.ndim > 0 and value.shape[0] == n_trials:
+        return value[trials]
+    if isinstance(value, tuple):
+        return tuple(_take_trials(item, trials, n_trials) for item in value)
+    return value
+
+
+def _simulate_unique_rows(
+    config: dict, theta: dict, n_trials: int, sim_param_dict: dict
+) -> dict:
+    """
+    Simulate every distinct parameter row once and scatter the samples back.
+
+    Distinct rows shared by the same number of trials are simulated in one call,
+    with n_samples times that number of samples per row. The samples of a
+    distinct row are then split in order across the trials that share it.
+    Every call draws from its own child of the random_state seed sequence, or
+    continues the stream of a random_state generator.
+
+    Args:
+        config (dict): The model configuration.
+        theta (dict): Processed parameters of all trials.
+        n_trials (int): Number of trials.
+        sim_param_dict (dict): Simulator arguments common to all trials.
+
+    Returns:
+        dict: The simulator output, as if all trials had been simulated directly.
+            The metadata is that of the first call, with the recorded paths of
+            a single trial.
+    """
+    index, inverse, counts = _unique_theta_rows(theta, n_trials)
+    n_samples = sim_param_dict["n_samples"]
+    layout = sim_param_dict["layout"]
+    group_counts = np.unique(counts)
+    random_state = sim_param_dict["random_state"]
+    if isinstance(random_state, (np.random.Generator, np.random.BitGenerator)):
+        seeds = [random_state] * len(group_counts)
+    else:
+        seeds = np.random.SeedSequence(random_state).spawn(len(group_counts))
+
+    # Trials sorted by distinct row, keeping their order within a row
+    trials_by_row = np.argsort(inverse, kind="stable")
+    row_starts = np.cumsum(counts) - counts
+
+    x: dict = {}
+    for count, seed in zip(group_counts, seeds):
+        rows = np.flatnonzero(counts == count)
+        # Trials sharing each distinct row of the group, shape (len(rows), count)
+        trials = trials_by_row[row_starts[rows, None] + np.arange(count)]
+        theta_group = {
+            key: _take_trials(value, index[rows], n_trials)
+            for key, value in theta.items()
+        }
+        x_group = config["simulator"](
+            **theta_group,
+            **make_boundary_dict(config, theta_group),
+            **make_drift_dict(config, theta_group),
+            **{
+                **sim_param_dict,
+                "n_samples": n_samples * int(count),
+                "n_trials": len(rows),
+                "random_state": seed,
+            },
+        )
+        for key, value in x_group.items():
+            if key == "metadata":
+                x.setdefault(key, value)
+                continue
+            if layout == "sample_major":
+                # (count * n_samples, rows, ...) -> (n_samples, rows * count, ...)
+                value = value.reshape(count, n_samples, len(rows), *value.shape[2:])
+                value = np.moveaxis(value, 0, 2).reshape(
+                    n_samples, len(rows) * count, *value.shape[3:]
+                )
+                if key not in x:
+                    x[key] = np.empty(
+                        (n_samples, n_trials, *value.shape[2:]), value.dtype
+                    )
+                x[key][:, trials.ravel()] = value
+            else:
+                # (rows, count * n_samples) -> (rows * count, n_samples), and records
+                # to (rows * count, n_samples, 2)
+                fields = value.shape[1:] if key == "records" else ()
+                value = value.reshape(len(rows) * count, n_samples, *fields)
+                if key not in x:
+                    x[key] = np.empty((n_trials, n_samples, *fields), value.dtype)
+                x[key][trials.ravel()] = value
+
+    if layout == "records":
+        x["records"] = x["records"].reshape(n_trials * n_samples, 2)
+    traj = x["metadata"].get("trajectory")
+    if isinstance(traj, np.ndarray):
+        # The first call records the samples of all trials sharing its first row;
+        # keep those of the first of these trials
+        x["metadata"]["trajectory"] = traj[:n_samples]
+    x["metadata"]["n_samples"] = n_samples
+    x["metadata"]["n_trials"] = n_trials
+    return x
+
+
+def _repeat_samples(
+    x: dict, n_samples: int, record_trajectories: int, layout: str = "sample_major"
+) -> dict:
+    """
+    Repeat the single sample per trial of a noiseless simulation.
+
+    Args:
+        x (dict): Simulator output with one sample per trial.
+        n_samples (int): Number of samples per trial to return.
+        record_trajectories (int): Number of recorded paths per trial requested.
+        layout (str): Layout of the simulator output.
+
+    Returns:
+        dict: The output with every per-sample array repeated n_samples times.
+    """
+    # Samples are along the first axis, except in the trial-major layout
+    axis = 1 if layout == "trial_major" else 0
+    for key, value in x.items():
+        if key != "metadata":
+            x[key] = np.repeat(value, n_samples, axis=axis)
+    x["metadata"]["n_samples"] = n_samples
+    traj = x["metadata"].get("trajectory")
+    if isinstance(traj, np.ndarray):
+        # Paths have shape (record, time, columns), with a leading trial axis
+        # when recorded per trial. All of them follow the single noiseless path,
+        # of which more than one may have been recorded (e.g. with deduplicate)
+        x["metadata"]["trajectory"] = np.repeat(
+            traj[..., :1, :, :], min(record_trajectories, n_samples), axis=traj.ndim - 3
+        )
+    return x
+
+
+def _resimulate_undecided(
+    config: dict, theta: dict, n_trials: int, sim_param_dict: dict, x: dict
+) -> dict:
+    """
+    Simulate all samples of noiseless trials whose walk did not reach a decision.
+
+    Walks that are still undecided at max_t, or miss the deadline, get random
+    choices in some simulators, so their samples differ even without noise.
+
+    Args:
+        config (dict): The model configuration.
+        theta (dict): Processed parameters of all trials.
+        n_trials (int): Number of trials.
+        sim_param_dict (dict): Simulator arguments common to all trials.
+        x (dict): Output with the repeated sample of every trial, updated in place.
+
+    Returns:
+        dict: The output with the samples of undecided trials replaced.
+    """
+    rts = x["rts"][0, :, 0]
+    trials = np.flatnonzero((rts == -999) | (rts >= sim_param_dict["max_t"]))
+    if trials.size == 0:
+        return x
+
+    theta_undecided = {
+        key: _take_trials(value, trials, n_trials) for key, value in theta.items()
+    }
+    x_undecided = config["simulator"](
+        **theta_undecided,
+        **make_boundary_dict(config, theta_undecided),
+        **make_drift_dict(config, theta_undecided),
+        **{**sim_param_dict, "n_trials": len(trials)},
+    )
+    for key, value in x_undecided.items():
+        if key != "metadata":
+            x[key][:, trials] = value
+    return x
+
+
+def _choice_probabilities(
+    rts: np.ndarray, choices: np.ndarray, possible_choices: list
+) -> dict:
+    """
+    Compute the choice, omission and go / nogo probabilities of every trial.
+
+    All trials are counted in one pass: every sample is coded by its trial, its
+    choice and whether it is an omission, and the codes are counted with
+    np.bincount.
+
+    Args:
+        rts (np.ndarray): Reaction times of shape (n_trials, n_samples), -999 for
+            omissions.
+        choices (np.ndarray): Choices of shape (n_trials, n_samples).
+        possible_choices (list): The choices of the model.
+
+    Returns:
+        dict: choice_p and choice_p_no_omission of shape (n_trials, n_choices),
+            omission_p, nogo_p and go_p of shape (n_trials, 1). choice_p_no_omission
+            is -999 for trials in which every sample is an omission.
+    """
+    n_trials, n_samples = rts.shape
+    possible = np.asarray(possible_choices)
+    n_choices = possible.shape[0]
+
+    # Index of every choice in possible_choices, n_choices for other values
+    order = np.argsort(possible)
+    choice_idx = order[
+        np.minimum(np.searchsorted(possible, choices, sorter=order), n_choices - 1)
+    ]
+    choice_idx[possible[choice_idx] != choices] = n_choices
+
+    # Codes of the samples, built in place of the choice indices
+    codes = choice_idx
+    codes += np.arange(n_trials)[:, None] * (n_choices + 1)
+    codes *= 2
+    codes += rts == -999
+    counts = np.bincount(codes.ravel(), minlength=n_trials * (n_choices + 1) * 2)
+    counts = counts.reshape(n_trials, n_choices + 1, 2)
+
+    n_no_omission = counts[:, :, 0].sum(axis=1, keepdims=True)
+    choice_p_no_omission = np.full((n_trials, n_choices), -999.0)
+    # AF-TODO: Don't get why -999 is used for trials without any responses
+    np.divide(
+        counts[:, :n_choices, 0],
+        n_no_omission,
+        out=choice_p_no_omission,
+        where=n_no_omission > 0,
+    )
+    # NOTE: If deadline is set in simulator --> the nogo probability includes
+    # the omission probability
+    # AF-TODO: This should rather have a designated no-go choice instead of `max`
+    n_go = counts[:, [int(np.argmax(possible))], 0]
+    nogo_p = (n_samples - n_go) / n_samples
+    return {
+        "choice_p": counts[:, :n_choices].sum(axis=2) / n_samples,
+        "choice_p_no_omission": choice_p_no_omission,
+        "omission_p": counts[:, :, 1].sum(axis=1, keepdims=True) / n_samples,
+        "nogo_p": nogo_p,
+        "go_p": 1 - nogo_p,
+    }
+
+
+def steps_to_rts(
+    steps: np.ndarray, t: float | np.ndarray, delta_t: float
+) -> np.ndarray:
+    """
+    Convert the step counts returned with return_steps=True to reaction times.
+
+    Args:
+        steps (np.ndarray): Step counts, with the trials along the second to last
+            axis, e.g. of shape (n_samples, n_trials, 1). The largest value of the
+            dtype marks omissions.
+        t (float | np.ndarray): Non-decision time, a scalar or one value per trial.
+        delta_t (float): Time step of the simulation.
+
+    Returns:
+        np.ndarray: Reaction times steps * delta_t + t as float32, -999 for omissions.
+    """
+    t = np.asarray(t, dtype=np.float32).reshape(-1, 1)
+    if t.shape[0] == 1:
+        t = t[0, 0]
+    rts = (steps * np.float32(delta_t) + t).astype(np.float32)
+    rts[steps == np.iinfo(steps.dtype).max] = -999
+    return rts
+
+
 # TODO: Make useful as independent utility,
 # this is dropped from basic simulator call now
 def bin_simulator_output_pointwise(
@@ -528,22 +842,399 @@ def make_noise_vec(
     if n_particles == 1 or n_particles is None:
         shape_tuple = n_trials
     else:
-        shape_tuple = (n_trials, 1)
-
-    noise_vec = np.tile(
-        np.array(
-            (
-                [sigma_noise[0]] * n_particles
-                if isinstance(sigma_noise, np.ndarray)
-                else [sigma_noise] * n_particles
-            ),
-            dtype=np.float32,
-        ),
+        shape_tuple = (n_trials, n_particles)
+
+    noise_vec = np.full(
         shape_tuple,
+        sigma_noise[0] if isinstance(sigma_noise, np.ndarray) else sigma_noise,
+        dtype=np.float32,
     )
     return noise_vec
 
 
+class PreparedSimulator:
+    """
+    A simulator for one model and fixed settings, set up once and called many times.
+
+    Created by prepare. The deadline suffix of the model, its configuration, the
+    boundary and drift functions and the simulator settings are resolved and
+    validated on construction. Each call only processes the parameters of its
+    trials, simulates them and postprocesses the output like simulator.
+
+    Arguments
+    ---------
+        model: str <default='angle'>
+            Determines the model that will be simulated.
+        **settings
+            The remaining arguments of simulator except theta, random_state and
+            out, which are passed per call.
+    """
+
+    def __init__(
+        self,
+        model: str = "angle",
+        n_samples: int = 1000,
+        delta_t: float = 0.001,
+        max_t: float = 20,
+        no_noise: bool = False,
+        sigma_noise: float | None = None,
+        smooth_unif: bool = True,
+        n_threads: int = 1,
+        method: str = "euler",
+        record_trajectories: int = 0,
+        trajectories_per_trial: bool = False,
+        deduplicate: bool = False,
+        return_steps: bool = False,
+        layout: str = "sample_major",
+        outputs: list[str] | None = None,
+    ):
+        if "_deadline" in model:
+            deadline = True
+            model = model.replace("_deadline", "")
+        else:
+            deadline = False
+
+        # model_config deep-copies on lookup; nothing below mutates the values of the
+        # configuration, so a shallow copy of the stored one is enough
+        model_config_local = dict(dict.__getitem__(model_config, model))
+
+        if deadline:
+            model_config_local["params"] = [*model_config_local["params"], "deadline"]
+
+        if n_threads < 1:
+            raise ValueError(f"n_threads must be a positive integer, got {n_threads}")
+
+        if deduplicate and trajectories_per_trial:
+            raise ValueError(
+                "deduplicate cannot be combined with trajectories_per_trial"
+            )
+
+        simulator_name = model_config_local["simulator"].__name__
+        if method != "euler":
+            if method not in SIMULATOR_METHODS:
+                raise ValueError(
+                    f"method must be one of 'euler', {', '.join(map(repr, SIMULATOR_METHODS))}"
+                    f", got {method!r}"
+                )
+            if simulator_name not in SIMULATOR_METHODS[method]:
+                raise ValueError(
+                    f"method={method!r} is not supported for model {model!r}"
+                )
+
+        if layout != "sample_major":
+            if layout not in OUTPUT_LAYOUTS:
+                raise ValueError(
+                    f"layout must be one of 'sample_major', {', '.join(map(repr, OUTPUT_LAYOUTS))}"
+                    f", got {layout!r}"
+                )
+            if simulator_name not in OUTPUT_LAYOUTS[layout]:
+                raise ValueError(
+                    f"layout={layout!r} is not supported for model {model!r}"
+                )
+
+        if return_steps and simulator_name not in STEP_OUTPUT:
+            raise ValueError(f"return_steps is not supported for model {model!r}")
+        if return_steps:
+            # Step counts are exact, there is nothing to smooth
+            smooth_unif = False
+
+        # Collect the simulator inputs that are common across simulator functions
+        locals_dict = locals()
+        self.sim_params = {
+            key_: locals_dict[key_]
+            for key_ in DEFAULT_SIM_PARAMS
+            if key_ in locals_dict
+        }
+
+        if outputs is not None:
+            if layout == "records":
+                sample_outputs = ["records"]
+            else:
+                sample_outputs = ["steps" if return_steps else "rts", "choices"]
+            available = [
+                *sample_outputs,
+                *CHOICE_P_OUTPUTS,
+                *BINNED_OUTPUTS,
+                "metadata",
+            ]
+            unknown = [key for key in outputs if key not in available]
+            if unknown:
+                raise ValueError(
+                    f"outputs must be among {', '.join(map(repr, available))}"
+                    f", got {', '.join(map(repr, unknown))}"
+                )
+            outputs = set(outputs)
+            # The histograms and trajectories need the full metadata
+            if (
+                simulator_name in MINIMAL_METADATA
+                and "metadata" not in outputs
+                and outputs.isdisjoint(BINNED_OUTPUTS)
+                and not record_trajectories
+            ):
+                self.sim_params["return_option"] = "minimal"
+
+        # Boundary and drift functions, their parameters are taken from theta
+        boundary = boundary_config[model_config_local["boundary_name"]]
+        self.boundary_param_names = boundary["params"]
+        self.function_kwargs = {
+            "boundary_fun": boundary["fun"],
+            "boundary_multiplicative": boundary["multiplicative"],
+        }
+        self.drift_param_names = None
+        if "drift_name" in model_config_local:
+            drift = drift_config[model_config_local["drift_name"]]
+            self.drift_param_names = drift["params"]
+            self.function_kwargs["drift_fun"] = drift["fun"]
+
+        self.model = model
+        self.deadline = deadline
+        self.config = model_config_local
+        self.simulator_name = simulator_name
+        self.n_samples = n_samples
+        self.delta_t = delta_t
+        self.no_noise = no_noise
+        self.sigma_noise = sigma_noise
+        self.record_trajectories = record_trajectories
+        self.deduplicate = deduplicate
+        self.return_steps = return_steps
+        self.layout = layout
+        self.outputs = outputs
+        # Derived outputs to compute, all of them by default
+        self.choice_p = outputs is None or not outputs.isdisjoint(CHOICE_P_OUTPUTS)
+        self.binned = {
+            key: nbins
+            for key, nbins in BINNED_OUTPUTS.items()
+            if outputs is None or key in outputs
+        }
+        self.theta_processor = SimpleThetaProcessor()
+
+    def __call__(
+        self,
+        theta: list | np.ndarray | dict | pd.DataFrame,
+        random_state: int | np.random.Generator | None = None,
+        out: np.ndarray | None = None,
+    ) -> dict:
+        """
+        Simulate the trials of theta.
+
+        Arguments
+        ---------
+            theta : list, numpy.array, dict or pd.DataFrame
+                Parameters of the trials, as for simulator.
+            random_state: int | np.random.Generator | None <default=None>
+                Seed or generator of the random numbers, as for simulator.
+            out: np.ndarray | None <default=None>
+                Preallocated buffer of the records, as for simulator.
+
+        Return
+        ------
+            dict: The output of simulator for these trials.
+        """
+        model = self.model
+        n_samples = self.n_samples
+        delta_t = self.delta_t
+        layout = self.layout
+        return_steps = self.return_steps
+        record_trajectories = self.record_trajectories
+        simulator_name = self.simulator_name
+
+        if random_state is None:
+            random_state = _get_unique_seed()
+
+        theta = _preprocess_theta_generic(theta)
+        n_trials, theta = _preprocess_theta_deadline(theta, self.deadline, self.config)
+
+        if out is not None:
+            if layout != "records":
+                raise ValueError("out requires layout='records'")
+            if self.outputs is not None and "records" not in self.outputs:
+                raise ValueError("out requires 'records' in outputs")
+            if (
+                out.dtype != np.float32
+                or not out.flags.c_contiguous
+                or out.shape[-1:] != (2,)
+                or out.size != 2 * n_trials * n_samples
+            ):
+                raise ValueError(
+                    "out must be a C-contiguous float32 array of shape (..., 2) "
+                    "with n_trials * n_samples rows"
+                )
+
+        sim_param_dict = {
+            **self.sim_params,
+            "n_trials": n_trials,
+            "random_state": random_state,
+        }
+
+        # Fix up noise level
+        sigma_noise = self.sigma_noise
+        if "sd" in theta or "s" in theta:
+            if sigma_noise is not None:
+                raise ValueError(
+                    "sigma_noise parameter should be None if 'sd' or 's' is passed via theta dictionary"
+                )
+            elif self.no_noise:
+                sigma_noise = 0.0
+            elif "sd" in theta:
+                sigma_noise = theta["sd"]
+            elif "s" in theta:
+                sigma_noise = theta["s"]
+        else:
+            if self.no_noise:
+                sigma_noise = 0.0
+            elif "lba" in model and sigma_noise is None:
+                sigma_noise = 0.1
+            elif sigma_noise is None:
+                sigma_noise = 1.0
+
+        noise_vec = make_noise_vec(sigma_noise, n_trials, self.config["n_particles"])
+        if "lba" in model:
+            theta["sd"] = noise_vec
+        else:
+            theta["s"] = noise_vec
+
+        # Process theta
+        theta = self.theta_processor.process_theta(theta, self.config, n_trials)
+
+        # Check if parameters are valid
+        validate_ssm_parameters(model, theta)
+
+        # Without noise, all samples of a trial follow the same path
+        noiseless = simulator_name in NOISELESS_DETERMINISTIC and np.all(noise_vec == 0)
+        if noiseless:
+            sim_param_dict["n_samples"] = 1
+
+        if self.deduplicate:
+            x = _simulate_unique_rows(self.config, theta, n_trials, sim_param_dict)
+        else:
+            boundary_params = {
+                param_name: value
+                for param_name, value in theta.items()
+                if param_name in self.boundary_param_names
+            }
+            drift_kwargs = {}
+            if self.drift_param_names is not None:
+                drift_kwargs["drift_params"] = {
+                    param_name: value
+                    for param_name, value in theta.items()
+                    if param_name in self.drift_param_names
+                }
+
+            # Call to the simulator, writing straight into out where possible
+            x = self.config["simulator"](
+                **theta,
+                boundary_params=boundary_params,
+                **drift_kwargs,
+                **self.function_kwargs,
+                **sim_param_dict,
+                **({"out": out} if out is not None and not noiseless else {}),
+            )
+
+        # Ensure x is a dictionary
+        if not isinstance(x, dict):
+            raise TypeError(
+                f"Expected simulator to return a dictionary, got {type(x).__name__}"
+            )
+
+        if noiseless:
+            x = _repeat_samples(x, n_samples, record_trajectories, layout)
+            if simulator_name in NOISELESS_RANDOM_UNDECIDED:
+                sim_param_dict["n_samples"] = n_samples
+                x = _resimulate_undecided(
+                    self.config, theta, n_trials, sim_param_dict, x
+                )
+
+        x["metadata"]["model"] = model
+        if out is not None:
+            if x["records"] is not out:
+                np.copyto(out, x["records"].reshape(out.shape))
+            if self.outputs is None:
+                return {"records": out, "metadata": x["metadata"]}
+            x["records"] = out
+
+        # Postprocess simulator output ----------------------------
+        if self.choice_p or self.binned:
+            # Reaction times in seconds, only kept in the output without return_steps
+            if layout == "records":
+                rts = x["records"][:, 0]
+                choices = x["records"][:, 1]
+            else:
+                rts = (
+                    steps_to_rts(x["steps"], theta["t"], delta_t)
+                    if return_steps
+                    else x["rts"]
+                )
+                choices = x["choices"]
+            # Views of shape (n_trials, n_samples), contiguous unless sample-major
+            if layout == "sample_major":
+                rts, choices = rts[:, :, 0].T, choices[:, :, 0].T
+            else:
+                rts = rts.reshape(n_trials, n_samples)
+                choices = choices.reshape(n_trials, n_samples)
+
+        # Additional model outputs, easy to compute:
+        # Choice, omission and go / nogo probabilities by trial
+        if self.choice_p:
+            x.update(
+                _choice_probabilities(rts, choices, x["metadata"]["possible_choices"])
+            )
+
+        if self.outputs is not None:
+            # Let go of everything not asked for before the histograms are built
+            x = {
+                key: value
+                for key, value in x.items()
+                if key in self.outputs or key == "metadata"
+            }
+
+        # Output compatibility
+        if layout == "sample_major":
+            squeeze_axis = 1 if n_trials == 1 else 0 if n_samples == 1 else None
+            if squeeze_axis is not None:
+                for key in ("rts", "steps", "choices"):
+                    if key in x:
+                        x[key] = np.squeeze(x[key], axis=squeeze_axis)
+
+        for key, nbins in self.binned.items():
+            x[key] = np.expand_dims(
+                bin_simulator_output(
+                    {**x, "rts": rts, "choices": choices},
+                    nbins=nbins,
+                    max_t=-1,
+                    freq_cnt=True,
+                ),
+                axis=0,
+            )
+        return x
+
+
+def prepare(model: str = "angle", **settings) -> PreparedSimulator:
+    """
+    Prepare a simulator for many calls with the same model and settings.
+
+    The model-specific setup of simulator is done once here, so that inference
+    loops only pass the parameters of their trials on every call::
+
+        simulate = prepare("ddm", n_samples=1, layout="records")
+        x = simulate(theta, random_state=rng, out=buffer)
+
+    Calls give the same output as simulator with these arguments.
+
+    Arguments
+    ---------
+        model: str <default='angle'>
+            Determines the model that will be simulated.
+        **settings
+            The remaining arguments of simulator except theta, random_state and
+            out, which are passed per call.
+
+    Return
+    ------
+        PreparedSimulator: The callable prepared simulator.
+    """
+    return PreparedSimulator(model, **settings)
+
+
 def simulator(
     theta: list | np.ndarray | dict | pd.DataFrame,
     model: str = "angle",
@@ -553,7 +1244,16 @@ def simulator(
     no_noise: bool = False,
     sigma_noise: float | None = None,
     smooth_unif: bool = True,
-    random_state: int | None = None,
+    random_state: int | np.random.Generator | None = None,
+    n_threads: int = 1,
+    method: str = "euler",
+    record_trajectories: int = 0,
+    trajectories_per_trial: bool = False,
+    deduplicate: bool = False,
+    return_steps: bool = False,
+    layout: str = "sample_major",
+    outputs: list[str] | None = None,
+    out: np.ndarray | None = None,
 ) -> dict:
     """Basic data simulator for the models included in HDDM.
 
@@ -562,10 +1262,11 @@ def simulator(
         theta : list, numpy.array, dict or pd.DataFrame
             Parameters of the simulator. If 2d array, each row is treated as a 'trial'
             and the function runs n_sample * n_trials simulations.
-        deadline : numpy.array <default=None>
-            If supplied, the simulator will run a deadline model. RTs will be returned
         model: str <default='angle'>
-            Determines the model that will be simulated.
+            Determines the model that will be simulated. A '_deadline' suffix
+            (e.g. 'angle_deadline') runs the model with a deadline, taken from
+            an additional 'deadline' parameter in theta. Samples that miss it
+            are omissions, returned with rt -999.
         n_samples: int <default=1000>
             Number of simulation runs for each row in the theta argument.
         delta_t: float
@@ -573,16 +1274,102 @@ def simulator(
         max_t: float
             Maximum reaction the simulator can reach
         no_noise: bool <default=False>
-            Turn noise of (useful for plotting purposes mostly)
+            Turn noise of (useful for plotting purposes mostly). For models whose
+            samples are then identical (e.g. 'ddm', 'angle', race, LCA and the
+            seq2/par2/mic2 models), the path of every trial is simulated once and
+            repeated n_samples times, and so is the rt smoothing. The same holds
+            whenever all noise levels are zero.
         sigma_noise: float | None <default=None>
             Standard deviation of noise in the diffusion process. If None, defaults to 1.0 for most models
             and 0.1 for LBA models. If no_noise is True, sigma_noise will be set to 0.0.
             If 'sd' or 's' is passed via theta dictionary, sigma_noise must be None.
         smooth_unif: bool <default=True>
             Whether to add uniform random noise to RTs to smooth the distributions.
-        random_state: int | None <default=None>
+        random_state: int | np.random.Generator | None <default=None>
             Integer passed to random_seed function in the simulator.
-            Can be used for reproducibility.
+            Can be used for reproducibility. A numpy Generator is drawn from
+            directly, advancing its stream.
+        n_threads: int <default=1>
+            Number of threads used by simulators that support parallel
+            execution (currently ddm, ddm_flexbound, full_ddm, race_model
+            and lca). Results for a fixed random_state do not depend on
+            the number of threads. Other simulators ignore this argument.
+        method: str <default='euler'>
+            Simulation scheme. 'euler' takes Euler-Maruyama steps of size delta_t
+            and is available for all models. 'exact' draws first passage times
+            of the DDM exactly, without time discretization, and is available
+            for DDM simulators with a constant boundary (e.g. 'ddm', 'full_ddm').
+            For 'ornstein' it steps the Ornstein-Uhlenbeck process with its exact
+            transition density, with the crossing correction of 'bridge' taken
+            for the Ornstein-Uhlenbeck bridge. For large decay rates g this is
+            far more accurate than 'euler' at the same delta_t, but crossings
+            within a step stay approximate for constant bounds, so keep
+            g * delta_t small (e.g. below 0.1).
+            'bridge' corrects Euler steps for boundary crossings within a step
+            and takes larger steps far from the bounds, so that a coarse
+            delta_t stays accurate. It is available for single-accumulator
+            models with flexible boundaries (e.g. 'ddm', 'angle', 'weibull',
+            'ornstein', 'gamma_drift').
+        record_trajectories: int <default=0>
+            Number of samples whose paths are returned in
+            metadata['trajectory'], with shape (record_trajectories, time steps,
+            accumulators). Paths are padded with -999 after the walk ends.
+            Nothing is recorded by default, and metadata['trajectory'] is None.
+            Models without trajectory support ignore this argument; their
+            metadata['trajectory'] is None as well, except for the LBA models,
+            whose metadata has no 'trajectory' entry.
+        trajectories_per_trial: bool <default=False>
+            Whether to record the first record_trajectories samples of every
+            trial, adding a leading trial axis to metadata['trajectory'].
+        deduplicate: bool <default=False>
+            Whether to simulate trials with identical parameters together.
+            Each distinct parameter row is simulated once with the samples of
+            all its trials combined, and the samples are split back across
+            those trials in order. This saves work when trials repeat a few
+            conditions. The samples are drawn from different random streams
+            than without deduplication, and metadata entries describing the
+            parameters only cover the distinct rows of the first simulator call.
+            Recorded paths are those of a single trial, not necessarily the
+            first. Cannot be combined with trajectories_per_trial.
+        return_steps: bool <default=False>
+            Whether to return the number of delta_t steps of every walk under
+            'steps' instead of the reaction times under 'rts', with uint16
+            (uint32 for long max_t / delta_t) step counts and int8 choices.
+            The largest value of the dtype marks omissions. This quarters the
+            memory of large simulations; steps_to_rts(x['steps'], t, delta_t)
+            recovers the reaction times. Step counts are never smoothed, so
+            smooth_unif is ignored. Available for ddm, ddm_flexbound, ddm_flex,
+            ornstein_uhlenbeck, levy_flexbound, race_model and lca simulators.
+        layout: str <default='sample_major'>
+            Layout of the samples, written directly by the simulator.
+            'sample_major' returns 'rts' and 'choices' of shape
+            (n_samples, n_trials, 1), squeezed for a single trial or sample.
+            'trial_major' returns C-contiguous arrays of shape
+            (n_trials, n_samples), so the samples of each trial are adjacent.
+            'records' returns a single float32 array of (rt, choice) rows of
+            shape (n_trials * n_samples, 2), trial by trial, under 'records'.
+            The other layouts are available for the DDM family (e.g. 'ddm',
+            'angle', 'full_ddm', 'ornstein'), 'levy', race and LCA models.
+        outputs: list[str] | None <default=None>
+            Keys of the output to compute and return, e.g. ['rts', 'choices']
+            or ['choice_p']. Those of the samples ('rts', 'choices', 'steps'
+            or 'records', depending on return_steps and layout), 'choice_p',
+            'choice_p_no_omission', 'omission_p', 'nogo_p', 'go_p',
+            'binned_128' and 'binned_256'. Outputs that are not listed are
+            not computed. 'metadata' is always returned; listing it keeps the
+            parameters of the trials in it, which most models otherwise leave
+            out unless histograms or trajectories are requested. None returns
+            everything.
+        out: np.ndarray | None <default=None>
+            Preallocated C-contiguous float32 array of shape (..., 2) with
+            n_trials * n_samples rows, for layout='records'. The simulator
+            writes the (rt, choice) rows into it and returns only 'records'
+            (this array) and 'metadata', skipping the choice probabilities
+            and histograms unless they are listed in outputs. This is the
+            low-latency mode for many small calls, such as posterior
+            predictive sampling with n_samples=1: its fixed cost is a few tens
+            of microseconds on top of the simulation (see
+            benchmarks/simulator_overhead.py).
 
     Return
     ------
@@ -592,143 +1379,20 @@ def simulator(
         or     (rts binned pointwise, responses, metadata)
 
     """
-    # Preprocess theta to be a 2d numpy array with correct column ordering
-    # (if supplied as 2d array or list in the first place,
-    # user has to supply the correct ordering to begin with)
-
-    if "_deadline" in model:
-        deadline = True
-        model = model.replace("_deadline", "")
-    else:
-        deadline = False
-
-    model_config_local = deepcopy(model_config[model])
-
-    if deadline:
-        model_config_local["params"] += ["deadline"]
-
-    if random_state is None:
-        random_state = _get_unique_seed()
-
-    theta = _preprocess_theta_generic(theta)
-    n_trials, theta = _preprocess_theta_deadline(theta, deadline, model_config_local)
-
-    # Initialize dictionary that collects
-    # simulator inputs that are commong across simulator functions
-    sim_param_dict = deepcopy(DEFAULT_SIM_PARAMS)
-
-    # Update all values of sim_param_dict that are defined in locals()
-    locals_dict = locals()
-    sim_param_dict = {
-        key_: locals_dict[key_] for key_ in locals_dict if key_ in sim_param_dict
-    }
-
-    # Fix up noise level
-    if "sd" in theta or "s" in theta:
-        if sigma_noise is not None:
-            raise ValueError(
-                "sigma_noise parameter should be None if 'sd' or 's' is passed via theta dictionary"
-            )
-        elif no_noise:
-            sigma_noise = 0.0
-        elif "sd" in theta:
-            sigma_noise = theta["sd"]
-        elif "s" in theta:
-            sigma_noise = theta["s"]
-    else:
-        if no_noise:
-            sigma_noise = 0.0
-        elif "lba" in model and sigma_noise is None:
-            sigma_noise = 0.1
-        elif sigma_noise is None:
-            sigma_noise = 1.0
-
-    noise_vec = make_noise_vec(sigma_noise, n_trials, model_config_local["n_particles"])
-    if "lba" in model:
-        theta["sd"] = noise_vec
-    else:
-        theta["s"] = noise_vec
-
-    # Process theta
-    theta = SimpleThetaProcessor().process_theta(theta, model_config_local, n_trials)
-
-    # Make boundary dictionary
-    boundary_dict = make_boundary_dict(model_config_local, theta)
-    # Make drift dictionary
-    drift_dict = make_drift_dict(model_config_local, theta)
-
-    # Check if parameters are valid
-    validate_ssm_parameters(model, theta)
-
-    # Call to the simulator
-    x = model_config_local["simulator"](
-        **theta,
-        **boundary_dict,
-        **drift_dict,
-        **sim_param_dict,
-    )
-
-    # Ensure x is a dictionary
-    if not isinstance(x, dict):
-        raise TypeError(
-            f"Expected simulator to return a dictionary, got {type(x).__name__}"
-        )
-
-    # Postprocess simulator output ----------------------------
-    # Additional model outputs, easy to compute:
-    # Choice probability
-    x["choice_p"] = np.zeros((n_trials, len(x["metadata"]["possible_choices"])))
-    x["choice_p_no_omission"] = np.zeros(
-        (n_trials, len(x["metadata"]["possible_choices"]))
-    )
-    x["omission_p"] = np.zeros((n_trials, 1))
-    x["nogo_p"] = np.zeros((n_trials, 1))
-    x["go_p"] = np.zeros((n_trials, 1))
-
-    # Calculate choice probabilities by trial
-    # TODO: #79 vectorize this  # noqa: FIX002
-    for k in range(n_trials):
-        out_len = x["rts"][:, k, :].shape[0]
-        out_len_no_omission = x["rts"][:, k, :][x["rts"][:, k, :] != -999].shape[0]
-
-        for n, choice in enumerate(x["metadata"]["possible_choices"]):
-            x["choice_p"][k, n] = (x["choices"][:, k, :] == choice).sum() / out_len
-            if out_len_no_omission > 0:
-                x["choice_p_no_omission"][k, n] = (
-                    x["choices"][:, k, :][x["rts"][:, k, :] != -999] == choice
-                ).sum() / out_len_no_omission
-            else:
-                # AF-TODO: Don't get why -999 is used here
-                x["choice_p_no_omission"][k, n] = -999
-
-        # Omission Probability (deadline)
-        x["omission_p"][k, 0] = (x["rts"][:, k, :] == -999).sum() / out_len
-
-        # Nogo Probability
-        # NOTE: If deadline is set in simulator --> this is the nogo probability
-        # + the omission probability
-        x["nogo_p"][k, 0] = (
-            # AF-TODO: This should rather have a designated no-go choice
-            # instead of `max`
-            (x["choices"][:, k, :] != max(x["metadata"]["possible_choices"]))
-            | (x["rts"][:, k, :] == -999)
-        ).sum() / out_len
-        x["go_p"][k, 0] = 1 - x["nogo_p"][k, 0]
-
-    # Output compatibility
-    if n_trials == 1:
-        x["rts"] = np.squeeze(x["rts"], axis=1)
-        x["choices"] = np.squeeze(x["choices"], axis=1)
-    if n_trials > 1 and n_samples == 1:
-        x["rts"] = np.squeeze(x["rts"], axis=0)
-        x["choices"] = np.squeeze(x["choices"], axis=0)
-
-    x["metadata"]["model"] = model
-
-    x["binned_128"] = np.expand_dims(
-        bin_simulator_output(x, nbins=128, max_t=-1, freq_cnt=True), axis=0
-    )
-    x["binned_256"] = np.expand_dims(
-        bin_simulator_output(x, nbins=256, max_t=-1, freq_cnt=True), axis=0
-    )
-    return x
+    return prepare(
+        model,
+        n_samples=n_samples,
+        delta_t=delta_t,
+        max_t=max_t,
+        no_noise=no_noise,
+        sigma_noise=sigma_noise,
+        smooth_unif=smooth_unif,
+        n_threads=n_threads,
+        method=method,
+        record_trajectories=record_trajectories,
+        trajectories_per_trial=trajectories_per_trial,
+        deduplicate=deduplicate,
+        return_steps=return_steps,
+        layout=layout,
+        outputs=outputs,
+    )(theta, random_state=random_state, out=out)
@@ -349,16 +349,13 @@ class SimpleThetaProcessor(AbstractThetaProcessor):
             theta["g"] = np.expand_dims(theta["g"], axis=1)
             theta["b"] = np.expand_dims(theta["b"], axis=1)
 
-        # Seq / Parallel models (4 choice)
-        z_vec = np.tile(np.array([0.5], dtype=np.float32), reps=n_trials)
-        g_zero_vec = np.tile(np.array([0.0], dtype=np.float32), reps=n_trials)
-        g_vec_leak = np.tile(np.array([2.0], dtype=np.float32), reps=n_trials)
-        s_pre_high_level_choice_zero_vec = np.tile(
-            np.array([0.0], dtype=np.float32), reps=n_trials
-        )
-        s_pre_high_level_choice_one_vec = np.tile(
-            np.array([1.0], dtype=np.float32), reps=n_trials
-        )
+        # Seq / Parallel models (4 choice), the only users of these vectors
+        if model.startswith(("ddm_seq2", "ddm_par2", "ddm_mic2", "tradeoff")):
+            z_vec = np.full(n_trials, 0.5, dtype=np.float32)
+            g_zero_vec = np.full(n_trials, 0.0, dtype=np.float32)
+            g_vec_leak = np.full(n_trials, 2.0, dtype=np.float32)
+            s_pre_high_level_choice_zero_vec = np.full(n_trials, 0.0, dtype=np.float32)
+            s_pre_high_level_choice_one_vec = np.full(n_trials, 1.0, dtype=np.float32)
 
         # if model in ["ddm_seq2", "ddm_seq2_traj"]:
         #     sim_param_dict["s"] = noise_dict["1_particles"]
@@ -1,8 +1,6 @@
 """Configuration for DDM models with random variables."""
 
-import functools
 import numpy as np
-import scipy.stats as sps
 
 import cssm
 from ssms.basic_simulators import boundary_functions as bf
@@ -26,13 +24,11 @@ def get_ddm_st_config():
         "n_particles": 1,
         "simulator": cssm.full_ddm_rv,
         "simulator_fixed_params": {
-            "z_dist": functools.partial(sps.norm.rvs, loc=0, scale=0),
-            "v_dist": functools.partial(sps.norm.rvs, loc=0, scale=0),
+            "z_dist": None,
+            "v_dist": None,
         },
         "simulator_param_mappings": {
-            "t_dist": lambda st: functools.partial(
-                sps.uniform.rvs, loc=(-1) * st, scale=2 * st
-            ),
+            "t_dist": lambda st: ("uniform", (-1) * st, st),
         },
     }
 
@@ -55,18 +51,12 @@ def get_ddm_truncnormt_config():
         "n_particles": 1,
         "simulator": cssm.full_ddm_rv,
         "simulator_fixed_params": {
-            "z_dist": functools.partial(sps.norm.rvs, loc=0, scale=0),
-            "v_dist": functools.partial(sps.norm.rvs, loc=0, scale=0),
+            "z_dist": None,
+            "v_dist": None,
             "t": 0.0,
         },
         "simulator_param_mappings": {
-            "t_dist": lambda mt, st: functools.partial(
-                sps.truncnorm.rvs,
-                a=(-1) * np.divide(mt, st),
-                b=np.inf,
-                loc=mt,
-                scale=st,
-            ),
+            "t_dist": lambda mt, st: ("truncnorm", mt, st, 0.0, np.inf),
         },
     }
 
@@ -89,16 +79,12 @@ def get_ddm_rayleight_config():
         "n_particles": 1,
         "simulator": cssm.full_ddm_rv,
         "simulator_fixed_params": {
-            "z_dist": functools.partial(sps.norm.rvs, loc=0, scale=0),
-            "v_dist": functools.partial(sps.norm.rvs, loc=0, scale=0),
+            "z_dist": None,
+            "v_dist": None,
             "t": 0.0,
         },
         "simulator_param_mappings": {
-            "t_dist": lambda st: functools.partial(
-                sps.rayleigh.rvs,
-                loc=0,
-                scale=st,
-            ),
+            "t_dist": lambda st: ("rayleigh", st),
         },
     }
 
@@ -118,14 +104,10 @@ def get_ddm_sdv_config():
         "n_particles": 1,
         "simulator": cssm.full_ddm_rv,
         "simulator_fixed_params": {
-            "z_dist": functools.partial(sps.norm.rvs, loc=0, scale=0),
-            "t_dist": functools.partial(sps.norm.rvs, loc=0, scale=0),
+            "z_dist": None,
+            "t_dist": None,
         },
         "simulator_param_mappings": {
-            "v_dist": lambda sv: functools.partial(
-                sps.norm.rvs,
-                loc=0,
-                scale=sv,
-            ),
+            "v_dist": lambda sv: ("normal", 0.0, sv),
         },
     }
@@ -1,8 +1,5 @@
 """Full DDM model configuration."""
 
-import functools
-import scipy.stats as sps  # type: ignore
-
 import cssm
 from ssms.basic_simulators import boundary_functions as bf
 
@@ -51,16 +48,8 @@ def get_full_ddm_rv_config():
         "simulator": cssm.full_ddm_rv,
         "simulator_fixed_params": {},
         "simulator_param_mappings": {
-            "t_dist": lambda st: functools.partial(
-                sps.uniform.rvs, loc=(-1) * st, scale=2 * st
-            ),
-            "v_dist": lambda sv: functools.partial(
-                sps.norm.rvs,
-                loc=0,
-                scale=sv,
-            ),
-            "z_dist": lambda sz: functools.partial(
-                sps.uniform.rvs, loc=(-1) * sz, scale=2 * sz
-            ),
+            "t_dist": lambda st: ("uniform", (-1) * st, st),
+            "v_dist": lambda sv: ("normal", 0.0, sv),
+            "z_dist": lambda sz: ("uniform", (-1) * sz, sz),
         },
     }
@@ -4,6 +4,7 @@ import logging
 
 import numpy as np
 
+from .basic_simulators.constants import OUTPUT_LAYOUTS
 from .basic_simulators.simulator import simulator
 from .config import model_config as ssms_model_config
 
@@ -215,7 +216,7 @@ def hssm_sim_wrapper(simulator_fun, theta, model, n_replicas, random_state, **kw
         - theta: array-like, shape (n_trials, n_parameters)
         - model: str, name of the model to simulate
         - n_samples: int, number of replica datasets to generate
-        - random_state: int, to be used as the random seed internally
+        - random_state: int or numpy.random.Generator, the source of randomness
         - **kwargs: additional keyword arguments
     theta : array-like
         Model parameters, shape (n_trials, n_parameters)
@@ -231,9 +232,15 @@ def hssm_sim_wrapper(simulator_fun, theta, model, n_replicas, random_state, **kw
     Returns
     -------
     array-like
-        Array of shape (n_trials, 2) containing reaction times and choices
-        stacked column-wise
+        Array of shape (n_trials * n_replicas, 2) containing reaction times and
+        choices stacked column-wise, with the replicas of each trial in
+        consecutive rows as rng_fn expects. Simulators called with
+        layout="records" write this array directly, into a preallocated float32
+        buffer unless `out` is passed.
     """
+    if kwargs.get("layout") == "records" and kwargs.get("out") is None:
+        n_trials = np.atleast_2d(theta).shape[0]
+        kwargs["out"] = np.empty((n_trials * n_replicas, 2), dtype=np.float32)
     out = simulator_fun(
         theta=theta,
         model=model,
@@ -241,7 +248,12 @@ def hssm_sim_wrapper(simulator_fun, theta, model, n_replicas, random_state, **kw
         random_state=random_state,
         **kwargs,
     )
-    return np.stack([out["rts"], out["choices"]], axis=-1).squeeze()
+    if "records" in out:
+        return out["records"].squeeze()
+    # Samples come first in the default layout; put the replicas of each trial
+    # in consecutive rows like the records layout
+    records = np.stack([out["rts"], out["choices"]], axis=-1)
+    return records.reshape(n_replicas, -1, 2).swapaxes(0, 1).reshape(-1, 2).squeeze()
 
 
 def _build_decorated_simulator(
@@ -267,10 +279,19 @@ def _build_decorated_simulator(
         choices=choices,
         obs_dim=obs_dim,
     )
+    # Let the simulator write the stacked (rt, choice) rows where it can
+    layout_kwargs = {}
+    if (
+        model_name in ssms_model_config
+        and ssms_model_config[model_name]["simulator"].__name__
+        in OUTPUT_LAYOUTS["records"]
+    ):
+        layout_kwargs["layout"] = "records"
     sim_wrapper = partial(
         hssm_sim_wrapper,
         simulator_fun=simulator,
         model=model_name,
+        **layout_kwargs,
     )
     return decorated_simulator(sim_wrapper)
 
@@ -395,10 +416,10 @@ def rng_fn(
         arg_arrays, size
     )
     n_replicas = _calculate_n_replicas(is_all_args_scalar, size, new_data_size)
-    seed = _get_seed(rng)
+    # The kernels draw from the stream of rng itself
     sims_out = simulator_fun(
         theta=theta,
-        random_state=seed,
+        random_state=rng,
         n_replicas=n_replicas,
         **kwargs,
     )
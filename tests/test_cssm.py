@@ -0,0 +1,617 @@
+import cssm
+import numpy as np
+import pytest
+from scipy import stats
+
+
+def test_standard_normal_moments():
+    """Test that the ziggurat sampler produces standard normal samples"""
+    x = cssm._standard_normal(1_000_000, 123)
+    assert x.dtype == np.float32
+    assert abs(x.mean()) < 0.01
+    assert abs(x.var() - 1.0) < 0.01
+    assert stats.kstest(x, "norm").pvalue > 0.001
+    # Tail mass beyond the base layer of the ziggurat
+    assert (np.abs(x) > 3.6541528853610088).mean() == pytest.approx(
+        2 * stats.norm.sf(3.6541528853610088), rel=0.2
+    )
+
+
+def test_standard_normal_in_place():
+    """Test that a preallocated buffer is filled in place and reproducibly"""
+    out = np.zeros(1001, dtype=np.float32)
+    res = cssm._standard_normal(1001, 5, out=out)
+    assert res is out
+    np.testing.assert_array_equal(out, cssm._standard_normal(1001, 5))
+
+    with pytest.raises(ValueError):
+        cssm._standard_normal(10, 5, out=np.zeros(11, dtype=np.float32))
+
+
+def _cms_alpha_stable(n, alpha, rng):
+    """Reference Chambers-Mallows-Stuck sampler in double precision"""
+    u = np.pi * (rng.random(n) - 0.5)
+    w = rng.exponential(size=n)
+    return (
+        np.sin(alpha * u)
+        / np.cos(u) ** (1 / alpha)
+        * (np.cos(u - alpha * u) / w) ** ((1 - alpha) / alpha)
+    )
+
+
+@pytest.mark.parametrize("alpha", [0.7, 1.0, 1.5, 1.9, 2.0])
+def test_alpha_stable_matches_cms(alpha):
+    """Test the buffered alpha-stable sampler against a reference implementation"""
+    x = cssm._alpha_stable(200_000, alpha, 7)
+    assert x.dtype == np.float32
+    assert np.isfinite(x).all()
+    y = _cms_alpha_stable(200_000, alpha, np.random.default_rng(7))
+    assert stats.ks_2samp(x, y).pvalue > 0.001
+
+    with pytest.raises(ValueError):
+        cssm._alpha_stable(10, 2.5)
+
+
+def test_levy_flexbound_alpha_per_trial():
+    """Test that every trial draws noise with its own stability parameter"""
+    from ssms.basic_simulators import boundary_functions as bf
+
+    kwargs = {
+        "v": np.zeros(2, dtype=np.float32),
+        "a": np.full(2, 1.5, dtype=np.float32),
+        "z": np.full(2, 0.5, dtype=np.float32),
+        "t": np.zeros(2, dtype=np.float32),
+        "deadline": np.full(2, 999, dtype=np.float32),
+        "s": np.ones(2, dtype=np.float32),
+        # A noise buffer longer than all draws of a trial
+        "max_t": 500,
+        "n_samples": 1000,
+        "n_trials": 2,
+        "boundary_fun": bf.constant,
+        "random_state": 3,
+    }
+    mixed = cssm.levy_flexbound(alpha=np.array([1.0, 2.0], dtype=np.float32), **kwargs)
+    gaussian = cssm.levy_flexbound(alpha=np.full(2, 2.0, dtype=np.float32), **kwargs)
+    assert (
+        stats.ks_2samp(mixed["rts"][:, 1, 0], gaussian["rts"][:, 1, 0]).pvalue > 0.001
+    )
+    assert stats.ks_2samp(mixed["rts"][:, 0, 0], gaussian["rts"][:, 0, 0]).pvalue < 1e-6
+
+
+def _ddm_choice_p_and_mean_rt(v, a, x0):
+    """Probability of hitting the upper bound and mean decision time (s = 1)"""
+    p_upper = (1 - np.exp(-2 * v * x0)) / (1 - np.exp(-2 * v * a))
+    return p_upper, (a * p_upper - x0) / v
+
+
+@pytest.mark.parametrize(
+    "v, a, z", [(0.5, 1.5, 0.5), (2.0, 1.0, 0.3), (-1.0, 2.0, 0.7)]
+)
+def test_ddm_exact_matches_analytic(v, a, z):
+    """Test the exact first passage sampler against closed form DDM moments"""
+    n_samples = 100_000
+    ones = np.ones(1, dtype=np.float32)
+    out = cssm.ddm(
+        v=v * ones,
+        a=a * ones,
+        z=z * ones,
+        t=0 * ones,
+        deadline=999 * ones,
+        s=ones,
+        n_samples=n_samples,
+        n_trials=1,
+        random_state=1,
+        method="exact",
+    )
+    p_upper, mean_rt = _ddm_choice_p_and_mean_rt(v, a, z * a)
+    se_p = np.sqrt(p_upper * (1 - p_upper) / n_samples)
+    assert abs((out["choices"] == 1).mean() - p_upper) < 5 * se_p
+    assert out["rts"].mean() == pytest.approx(mean_rt, rel=0.02)
+
+
+def test_flexbound_exact_requires_constant_boundary():
+    """Test that the exact sampler rejects time varying boundaries"""
+    from ssms.basic_simulators import boundary_functions as bf
+
+    ones = np.ones(1, dtype=np.float32)
+    params = {
+        "v": ones,
+        "a": ones,
+        "z": 0.5 * ones,
+        "t": 0.3 * ones,
+        "deadline": 999 * ones,
+        "s": ones,
+        "n_samples": 10,
+        "method": "exact",
+    }
+    cssm.ddm_flexbound(**params, boundary_fun=bf.constant, boundary_params={})
+    with pytest.raises(ValueError):
+        cssm.ddm_flexbound(
+            **params, boundary_fun=bf.angle, boundary_params={"theta": 0.5 * ones}
+        )
+
+
+@pytest.mark.parametrize("v, a, z", [(1.0, 1.5, 0.5), (-0.5, 1.0, 0.3)])
+def test_flexbound_bridge_matches_analytic(v, a, z):
+    """Test that bridge-corrected coarse steps match closed form DDM moments"""
+    from ssms.basic_simulators import boundary_functions as bf
+
+    n_samples = 50_000
+    ones = np.ones(1, dtype=np.float32)
+    out = cssm.ddm_flexbound(
+        v=v * ones,
+        a=a * ones,
+        z=z * ones,
+        t=0 * ones,
+        deadline=999 * ones,
+        s=ones,
+        delta_t=0.01,
+        n_samples=n_samples,
+        random_state=1,
+        boundary_fun=bf.constant,
+        boundary_params={},
+        method="bridge",
+    )
+    # Bounds are at -a and a
+    p_upper, mean_rt = _ddm_choice_p_and_mean_rt(v, 2 * a, 2 * z * a)
+    se_p = np.sqrt(p_upper * (1 - p_upper) / n_samples)
+    assert abs((out["choices"] == 1).mean() - p_upper) < 5 * se_p
+    assert out["rts"].mean() == pytest.approx(mean_rt, rel=0.02)
+
+
+def test_ddm_sdv_bridge():
+    """Test that the bridge method runs for ddm_sdv and rejects unknown methods"""
+    from ssms.basic_simulators import boundary_functions as bf
+
+    ones = np.ones(2, dtype=np.float32)
+    params = {
+        "v": ones,
+        "a": ones,
+        "z": 0.5 * ones,
+        "t": 0.3 * ones,
+        "sv": 0.5 * ones,
+        "deadline": 999 * ones,
+        "s": ones,
+        "delta_t": 0.01,
+        "n_samples": 100,
+        "n_trials": 2,
+        "boundary_fun": bf.constant,
+        "boundary_params": {},
+        "random_state": 1,
+    }
+    out = cssm.ddm_sdv(**params, method="bridge")
+    assert np.all(out["rts"] > 0.3)
+    assert set(np.unique(out["choices"])) <= {-1, 1}
+    with pytest.raises(ValueError):
+        cssm.ddm_sdv(**params, method="exact")
+
+
+def test_ornstein_exact_transitions():
+    """Test that exact Ornstein-Uhlenbeck steps follow the transition density on a coarse grid"""
+    from ssms.basic_simulators import boundary_functions as bf
+
+    v, g, delta_t = 1.0, 2.0, 0.25
+    ones = np.ones(1, dtype=np.float32)
+    # Distant bounds and a deadline of 1: walkers stop at the first grid time past it
+    out = cssm.ornstein_uhlenbeck(
+        v=v * ones,
+        a=50 * ones,
+        z=0.5 * ones,
+        g=g * ones,
+        t=0 * ones,
+        deadline=ones,
+        s=ones,
+        delta_t=delta_t,
+        n_samples=200_000,
+        boundary_fun=bf.constant,
+        random_state=11,
+        method="exact",
+    )
+    t_end = 1.0 + delta_t
+    mean = v / g * (1 - np.exp(-g * t_end))
+    sd = np.sqrt((1 - np.exp(-2 * g * t_end)) / (2 * g))
+    assert np.all(out["rts"] == -999)
+    assert (out["choices"] == 1).mean() == pytest.approx(
+        stats.norm.cdf(mean / sd), abs=0.005
+    )
+
+
+@pytest.mark.parametrize(
+    "name, boundary_params, multiplicative",
+    [
+        ("constant", {}, True),
+        ("angle", {"theta": [0.2, 0.8]}, False),
+        ("weibull_cdf", {"alpha": [0.8, 2.5], "beta": [1.0, 3.0]}, True),
+        (
+            "generalized_logistic",
+            {"B": [1.0, 2.5], "M": [1.0, 2.0], "v": [0.5, 1.0]},
+            True,
+        ),
+        (
+            "conflict_gamma",
+            {
+                "theta": [0.2, 0.5],
+                "scale": [1.0, 2.0],
+                "alphaGamma": [1.01, 2.5],
+                "scaleGamma": [0.3, 0.5],
+            },
+            False,
+        ),
+    ],
+)
+@pytest.mark.parametrize(
+    "simulator", ["ddm_flexbound", "ddm_flex", "ddm_flexbound_par2"]
+)
+def test_native_boundaries_match_python(
+    name, boundary_params, multiplicative, simulator
+):
+    """Test that native boundaries reproduce the Python boundary functions"""
+    from ssms.basic_simulators import boundary_functions as bf
+
+    fun = getattr(bf, name)
+    ones = np.ones(2, dtype=np.float32)
+    params = {
+        "a": 1.5 * ones,
+        "t": 0.3 * ones,
+        "deadline": 999 * ones,
+        "s": ones,
+        "max_t": 5.0,
+        "n_samples": 200,
+        "n_trials": 2,
+        "random_state": 7,
+        "boundary_multiplicative": multiplicative,
+        "boundary_params": {
+            key: np.asarray(value, dtype=np.float32)
+            for key, value in boundary_params.items()
+        },
+    }
+    if simulator == "ddm_flexbound_par2":
+        params.update(
+            {
+                "vh": ones,
+                "vl1": ones,
+                "vl2": -ones,
+                "zh": 0.5 * ones,
+                "zl1": 0.5 * ones,
+                "zl2": 0.5 * ones,
+            }
+        )
+    else:
+        params.update({"v": 0.5 * ones, "z": 0.5 * ones})
+    if simulator == "ddm_flex":
+        params.update({"drift_fun": lambda t: np.zeros(t.shape[0]), "drift_params": {}})
+
+    native = getattr(cssm, simulator)(boundary_fun=fun, **params)
+    # Wrapping the function hides it from the native dispatch
+    python = getattr(cssm, simulator)(
+        boundary_fun=lambda t, **kwargs: fun(t=t, **kwargs), **params
+    )
+    np.testing.assert_allclose(
+        native["metadata"]["boundary"],
+        python["metadata"]["boundary"],
+        rtol=1e-5,
+        atol=1e-5,
+    )
+    np.testing.assert_allclose(native["rts"], python["rts"], atol=1e-4)
+    np.testing.assert_array_equal(native["choices"], python["choices"])
+
+
+@pytest.mark.parametrize(
+    "name, drift_params",
+    [
+        ("constant", {}),
+        ("gamma_drift", {"shape": [2.0, 3.0], "scale": [0.2, 0.5], "c": [1.0, 2.0]}),
+        (
+            "conflict_ds_drift",
+            {
+                "tinit": [0.5, 0.0],
+                "dinit": [1.0, 0.5],
+                "tslope": [1.0, 2.0],
+                "dslope": [2.0, 1.0],
+                "tfixedp": [1.0, 0.5],
+                "tcoh": [0.5, 1.0],
+                "dcoh": [-0.5, 1.0],
+            },
+        ),
+        (
+            "conflict_dsstimflex_drift",
+            {
+                "tinit": [0.5, 0.0],
+                "dinit": [1.0, 0.5],
+                "tslope": [1.0, 2.0],
+                "dslope": [2.0, 1.0],
+                "tfixedp": [1.0, 0.5],
+                "tcoh": [0.5, 1.0],
+                "dcoh": [-0.5, 1.0],
+                "tonset": [0.2, 0.5],
+                "donset": [0.4, 0.1],
+            },
+        ),
+        (
+            "conflict_stimflexrel1_drift",
+            {
+                "vt": [1.0, 2.0],
+                "vd": [2.0, -1.0],
+                "tcoh": [0.5, -1.0],
+                "dcoh": [-0.5, 1.0],
+                "tonset": [0.1, 0.3],
+                "donset": [0.2, 0.0],
+                "toffset": [0.5, 1.0],
+            },
+        ),
+        (
+            "attend_drift",
+            {
+                "ptarget": [-0.3, 0.5],
+                "pouter": [-0.3, 0.2],
+                "pinner": [0.3, 0.1],
+                "r": [0.5, 2.0],
+                "sda": [2.0, 1.0],
+            },
+        ),
+        (
+            "attend_drift_simple",
+            {
+                "ptarget": [-0.3, 0.5],
+                "pouter": [-0.3, 0.2],
+                "r": [0.5, 2.0],
+                "sda": [2.0, 1.0],
+            },
+        ),
+    ],
+)
+@pytest.mark.parametrize("simulator", ["ddm_flex", "ddm_flex_leak"])
+def test_native_drifts_match_python(name, drift_params, simulator):
+    """Test that native drifts reproduce the Python drift functions"""
+    from ssms.basic_simulators import boundary_functions as bf
+    from ssms.basic_simulators import drift_functions as df
+
+    fun = getattr(df, name)
+    ones = np.ones(2, dtype=np.float32)
+    params = {
+        "v": np.array([0.5, -0.2], dtype=np.float32),
+        "a": 1.5 * ones,
+        "z": 0.5 * ones,
+        "t": 0.3 * ones,
+        "deadline": 999 * ones,
+        "s": ones,
+        "max_t": 5.0,
+        "n_samples": 200,
+        "n_trials": 2,
+        "random_state": 7,
+        "boundary_fun": bf.constant,
+        "boundary_params": {},
+        "drift_params": {
+            key: np.asarray(value, dtype=np.float32)
+            for key, value in drift_params.items()
+        },
+    }
+    if simulator == "ddm_flex_leak":
+        params["g"] = 0.2 * ones
+
+    native = getattr(cssm, simulator)(drift_fun=fun, **params)
+    # Wrapping the function hides it from the native dispatch
+    python = getattr(cssm, simulator)(
+        drift_fun=lambda t, **kwargs: fun(t=t, **kwargs), **params
+    )
+    np.testing.assert_allclose(
+        native["metadata"]["drift"], python["metadata"]["drift"], rtol=1e-5, atol=1e-5
+    )
+    np.testing.assert_allclose(native["rts"], python["rts"], atol=1e-4)
+    np.testing.assert_array_equal(native["choices"], python["choices"])
+
+
+def test_native_dual_drift_matches_python():
+    """Test the separate target and distractor drifts of ddm_flex_leak2"""
+    from ssms.basic_simulators import boundary_functions as bf
+    from ssms.basic_simulators import drift_functions as df
+
+    fun = df.conflict_stimflexrel1_dual_drift
+    ones = np.ones(2, dtype=np.float32)
+    params = {
+        "vt": ones,
+        "vd": ones,
+        "a": 1.5 * ones,
+        "z": 0.5 * ones,
+        "gt": 0.1 * ones,
+        "gd": 0.2 * ones,
+        "t": 0.3 * ones,
+        "deadline": 999 * ones,
+        "s": ones,
+        "max_t": 5.0,
+        "n_samples": 200,
+        "n_trials": 2,
+        "random_state": 7,
+        "boundary_fun": bf.constant,
+        "boundary_params": {},
+        "drift_params": {
+            "vt": np.array([1.0, 2.0], dtype=np.float32),
+            "vd": np.array([2.0, -1.0], dtype=np.float32),
+            "tonset": np.array([0.1, 0.3], dtype=np.float32),
+            "donset": np.array([0.2, 0.0], dtype=np.float32),
+            "doffset": np.array([0.6, 1.0], dtype=np.float32),
+        },
+    }
+    native = cssm.ddm_flex_leak2(drift_fun=fun, **params)
+    python = cssm.ddm_flex_leak2(
+        drift_fun=lambda t, **kwargs: fun(t=t, **kwargs), **params
+    )
+    assert native["metadata"]["drift"].shape == (5001, 2)
+    np.testing.assert_array_equal(
+        native["metadata"]["drift"], python["metadata"]["drift"]
+    )
+    np.testing.assert_array_equal(native["rts"], python["rts"])
+
+
+@pytest.mark.parametrize(
+    "spec, reference",
+    [
+        (("uniform", -0.2, 0.1), stats.uniform(-0.2, 0.3)),
+        (("normal", 0.1, 0.2), stats.norm(0.1, 0.2)),
+        (("rayleigh", 0.3), stats.rayleigh(scale=0.3)),
+        (
+            ("truncnorm", 0.05, 0.5, 0.0, np.inf),
+            stats.truncnorm(-0.1, np.inf, loc=0.05, scale=0.5),
+        ),
+        # Tail intervals use the exponential and uniform proposals
+        (("truncnorm", 0.0, 0.1, 0.3, np.inf), stats.truncnorm(3, np.inf, scale=0.1)),
+        (("truncnorm", 0.0, 0.1, -0.32, -0.3), stats.truncnorm(-3.2, -3, scale=0.1)),
+    ],
+)
+def test_full_ddm_rv_native_distributions(spec, reference):
+    """Test that distribution specs are sampled natively with the right law"""
+    from ssms.basic_simulators import boundary_functions as bf
+
+    ones = np.ones(1, dtype=np.float32)
+    params = {
+        "v": 0 * ones,
+        # Walkers cross the tiny bound at the first step, so rt = delta_t + t + offset
+        "a": 1e-6 * ones,
+        "z": 0.5 * ones,
+        "t": ones,
+        "z_dist": None,
+        "v_dist": None,
+        "deadline": 999 * ones,
+        "s": ones,
+        "delta_t": 1e-4,
+        "n_samples": 50_000,
+        "boundary_fun": bf.constant,
+        "random_state": 5,
+    }
+    out = cssm.full_ddm_rv(t_dist=spec, **params)
+    offsets = out["rts"][:, 0, 0] - 1.0 - 1e-4
+    assert stats.kstest(offsets, reference.cdf).pvalue > 0.001
+
+    # Callables returning arrays of offsets are still supported
+    out = cssm.full_ddm_rv(
+        t_dist=lambda size: reference.rvs(size=size, random_state=5), **params
+    )
+    offsets = out["rts"][:, 0, 0] - 1.0 - 1e-4
+    assert stats.kstest(offsets, reference.cdf).pvalue > 0.001
+
+    with pytest.raises(ValueError):
+        cssm.full_ddm_rv(t_dist=("gamma", 1.0), **params)
+
+
+def test_lba_matches_analytic():
+    """Test LBA decision times and their reproducibility across seeds and threads"""
+    ones = np.ones((1, 1), dtype=np.float32)
+    params = {
+        "v": 2.0 * ones,
+        "a": 1.5 * ones,
+        "z": 0.5 * ones,
+        "t": np.array([0.3], dtype=np.float32),
+        "deadline": np.array([999.0], dtype=np.float32),
+        "sd": 0.0 * ones,
+        "nact": 1,
+        "n_samples": 20_000,
+        "random_state": 11,
+    }
+    # Without rate noise a single accumulator crosses uniformly in [(a - z) / v, a / v]
+    out = cssm.lba_vanilla(**params)
+    rts = out["rts"].ravel()
+    assert stats.kstest(rts, stats.uniform(0.5 + 0.3, 0.25).cdf).pvalue > 0.001
+
+    threaded = cssm.lba_vanilla(n_threads=4, **params)
+    np.testing.assert_array_equal(out["rts"], threaded["rts"])
+    angle = cssm.lba_angle(theta=0.0 * ones, **params)
+    np.testing.assert_array_equal(out["rts"], angle["rts"])
+    params["random_state"] = 12
+    assert not np.array_equal(out["rts"], cssm.lba_vanilla(**params)["rts"])
+
+
+@pytest.mark.parametrize("simulator", ["race_model", "lca"])
+def test_accumulator_blocks_keep_samples(simulator):
+    """Test that samples stepped in lockstep blocks keep their own random streams"""
+    from ssms.basic_simulators import boundary_functions as bf
+
+    ones = np.ones((1, 3), dtype=np.float32)
+    params = {
+        "v": np.array([[1.0, 0.5, 0.2]], dtype=np.float32),
+        "a": 2.0 * ones[:, :1],
+        "z": 0.1 * ones,
+        "t": 0.3 * ones[:, :1],
+        "s": ones,
+        "deadline": np.array([999.0], dtype=np.float32),
+        "boundary_fun": bf.constant,
+        "boundary_params": {},
+        "random_state": 5,
+    }
+    if simulator == "lca":
+        params.update({"g": 0.2 * ones[:, :1], "b": 0.1 * ones[:, :1]})
+    fun = getattr(cssm, simulator)
+    # 150 samples span a partial block; the first 70 do not fill the second block
+    out = fun(n_samples=150, **params)
+    partial = fun(n_samples=70, n_threads=2, **params)
+    np.testing.assert_array_equal(out["rts"][:70], partial["rts"])
+    np.testing.assert_array_equal(out["choices"][:70], partial["choices"])
+    assert len(np.unique(out["rts"])) > 100
+
+
+def test_lca_inhibition_matrix():
+    """Test the LCA with a connectivity matrix for many accumulators"""
+    from ssms.basic_simulators import boundary_functions as bf
+
+    n_particles = 12
+    ones = np.ones((1, n_particles), dtype=np.float32)
+    params = {
+        "v": np.linspace(1.5, 0.5, n_particles, dtype=np.float32)[None],
+        "a": 1.5 * ones[:, :1],
+        "z": 0.1 * ones,
+        "t": 0.3 * ones[:, :1],
+        "s": ones,
+        "deadline": np.array([999.0], dtype=np.float32),
+        "n_samples": 2000,
+        "boundary_fun": bf.constant,
+        "boundary_params": {},
+        "random_state": 5,
+    }
+    # Without leak and inhibition the LCA is a race
+    race = cssm.race_model(**params)
+    lca = cssm.lca(
+        g=0.0 * ones[:, :1],
+        b=0.5 * ones[:, :1],
+        inhibition=np.zeros((n_particles, n_particles)),
+        **params,
+    )
+    np.testing.assert_array_equal(race["rts"], lca["rts"])
+    np.testing.assert_array_equal(race["choices"], lca["choices"])
+    assert race["metadata"]["possible_choices"] == list(range(n_particles))
+
+    # A uniform matrix matches the scalar lateral inhibition
+    uniform = cssm.lca(
+        g=0.2 * ones[:, :1],
+        b=0.0 * ones[:, :1],
+        inhibition=0.3 * (1 - np.eye(n_particles)),
+        **params,
+    )
+    scalar = cssm.lca(g=0.2 * ones[:, :1], b=0.3 * ones[:, :1], **params)
+    np.testing.assert_allclose(uniform["rts"], scalar["rts"], atol=1e-2)
+    assert (uniform["choices"] == scalar["choices"]).mean() > 0.99
+
+    for inhibition in (np.zeros((3, 3)), np.zeros(n_particles)):
+        with pytest.raises(ValueError):
+            cssm.lca(g=ones[:, :1], b=ones[:, :1], inhibition=inhibition, **params)
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [{}, {"return_steps": True}, {"layout": "trial_major"}, {"layout": "records"}],
+)
+def test_ddm_without_samples(kwargs):
+    """Test that a simulation without samples returns empty outputs"""
+    params = {
+        key: np.full(3, value, dtype=np.float32)
+        for key, value in {
+            "v": 0.5,
+            "a": 1.0,
+            "z": 0.5,
+            "t": 0.3,
+            "deadline": 999.0,
+            "s": 1.0,
+        }.items()
+    }
+    out = cssm.ddm(n_samples=0, n_trials=3, random_state=1, **params, **kwargs)
+    for key, value in out.items():
+        if key != "metadata":
+            assert value.size == 0
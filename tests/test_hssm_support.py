@@ -6,6 +6,7 @@ import numpy as np
 import pytest
 from unittest.mock import Mock, patch
 
+from ssms.basic_simulators.simulator import simulator
 from ssms.hssm_support import (
     _extract_size_val,
     _calculate_n_replicas,
@@ -340,6 +341,58 @@ class TestBuildDecoratedSimulator:
         assert result.choices == [0, 1]
         assert result.obs_dim == 2
 
+    def test_build_decorated_simulator_records(self):
+        """Test that the simulator writes the stacked (rt, choice) rows itself."""
+        result = _build_decorated_simulator("ddm", [-1, 1])
+        theta = np.array([[0.5, 1.0, 0.5, 0.3], [-0.5, 1.5, 0.5, 0.4]])
+        out = result(theta=theta, n_replicas=50, random_state=3)
+
+        assert out.shape == (100, 2)
+        assert out.dtype == np.float32
+        # The replicas of each trial are in consecutive rows
+        assert np.all(out[:50, 0] > 0.3)
+        assert np.all(out[50:, 0] > 0.4)
+
+        buffer = np.empty((100, 2), dtype=np.float32)
+        filled = result(theta=theta, n_replicas=50, random_state=3, out=buffer)
+        assert np.shares_memory(filled, buffer)
+        assert np.all(buffer[:50, 0] > 0.3)
+
+    def test_build_decorated_simulator_trial_major(self):
+        """Test that models without the records layout group replicas by trial."""
+        result = _build_decorated_simulator("ddm_seq2", [0, 1, 2, 3])
+        theta = np.array(
+            [
+                [1.0, 0.5, -0.5, 1.0, 0.5, 0.5, 0.5, 0.3],
+                [-1.0, 0.5, -0.5, 1.5, 0.5, 0.5, 0.5, 1.2],
+            ]
+        )
+        out = result(theta=theta, n_replicas=50, random_state=3)
+        sims = simulator(theta, model="ddm_seq2", n_samples=50, random_state=3)
+
+        assert out.shape == (100, 2)
+        for k in range(2):
+            np.testing.assert_array_equal(
+                out[50 * k : 50 * (k + 1), 0], sims["rts"][:, k, 0]
+            )
+            np.testing.assert_array_equal(
+                out[50 * k : 50 * (k + 1), 1], sims["choices"][:, k, 0]
+            )
+
+    def test_build_decorated_simulator_generator(self):
+        """Test that a Generator is drawn from directly, advancing its stream."""
+        result = _build_decorated_simulator("ddm", [-1, 1])
+        theta = np.array([0.5, 1.0, 0.5, 0.3])
+        rng = np.random.default_rng(5)
+        first = result(theta=theta, n_replicas=20, random_state=rng)
+        second = result(theta=theta, n_replicas=20, random_state=rng)
+        again = result(
+            theta=theta, n_replicas=20, random_state=np.random.default_rng(5)
+        )
+
+        np.testing.assert_array_equal(first, again)
+        assert not np.array_equal(first, second)
+
 
 class TestGetSimulatorFunInternal:
     """Tests for get_simulator_fun_internal function."""
@@ -5,7 +5,13 @@ import numpy as np
 import pandas as pd
 import pytest
 
-from ssms.basic_simulators.simulator import simulator
+import ssms
+from ssms.basic_simulators.simulator import (
+    _choice_probabilities,
+    _preprocess_theta_generic,
+    simulator,
+    steps_to_rts,
+)
 from ssms.config import model_config
 
 logger = logging.getLogger(__name__)
@@ -116,3 +122,560 @@ def test_simulator_runs(sim_input_data):
                     assert "metadata" in out
                     assert "rts" in out
                     assert "choices" in out
+
+
+@pytest.mark.parametrize("model", ["ddm", "angle", "full_ddm", "levy", "race_3"])
+def test_simulator_reproducible(model):
+    """Test that a fixed random_state reproduces the same samples"""
+    theta = model_config[model]["default_params"]
+    out_a = simulator(theta=theta, model=model, n_samples=200, random_state=42)
+    out_b = simulator(theta=theta, model=model, n_samples=200, random_state=42)
+    out_c = simulator(theta=theta, model=model, n_samples=200, random_state=43)
+
+    np.testing.assert_array_equal(out_a["rts"], out_b["rts"])
+    np.testing.assert_array_equal(out_a["choices"], out_b["choices"])
+    assert not np.array_equal(out_a["rts"], out_c["rts"])
+
+
+def test_simulator_keeps_model_config():
+    """Test that simulating leaves the stored model configuration untouched"""
+    params = model_config["ddm"]["params"]
+    simulator([1.0, 1.0, 0.5, 0.3, 0.5], model="ddm_deadline", n_samples=10)
+    assert model_config["ddm"]["params"] == params
+    assert "deadline" not in params
+
+
+@pytest.mark.parametrize("model", ["ddm", "angle_deadline", "race_3", "lba2"])
+def test_prepare(model):
+    """Test that a prepared simulator matches simulator over repeated calls"""
+    params = model_config[model.replace("_deadline", "")]["default_params"]
+    if model.endswith("_deadline"):
+        params = [*params, 2.0]
+    settings = {"n_samples": 50, "max_t": 10.0}
+    prepared = ssms.prepare(model, **settings)
+    for seed, n_trials in [(1, 3), (2, 1)]:
+        theta = np.tile(params, (n_trials, 1))
+        expected = simulator(theta, model=model, random_state=seed, **settings)
+        result = prepared(theta, random_state=seed)
+        assert result.keys() == expected.keys()
+        for key in ("rts", "choices", "choice_p", "binned_128"):
+            np.testing.assert_array_equal(result[key], expected[key])
+        assert result["metadata"]["model"] == model.replace("_deadline", "")
+
+
+def test_prepare_invalid():
+    """Test that settings are validated when preparing, before any theta is seen"""
+    with pytest.raises(ValueError, match="layout must be one of"):
+        ssms.prepare("ddm", layout="column_major")
+    with pytest.raises(ValueError, match="return_steps is not supported"):
+        ssms.prepare("lba2", return_steps=True)
+    with pytest.raises(KeyError):
+        ssms.prepare("not_a_model")
+
+
+def test_simulator_thread_safe():
+    """Test that concurrent simulations do not share random state"""
+    from concurrent.futures import ThreadPoolExecutor
+
+    theta = model_config["angle"]["default_params"]
+    seeds = list(range(8))
+
+    def run(seed):
+        return simulator(theta=theta, model="angle", n_samples=500, random_state=seed)
+
+    serial = [run(seed) for seed in seeds]
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        threaded = list(executor.map(run, seeds))
+
+    for out_serial, out_threaded in zip(serial, threaded):
+        np.testing.assert_array_equal(out_serial["rts"], out_threaded["rts"])
+        np.testing.assert_array_equal(out_serial["choices"], out_threaded["choices"])
+
+
+@pytest.mark.parametrize("model", ["ddm", "ddm_legacy", "full_ddm", "race_3", "lca_3"])
+def test_simulator_n_threads_reproducible(model):
+    """Test that parallel simulators give identical results for any n_threads"""
+    theta = np.tile(model_config[model]["default_params"], (5, 1))
+    outs = [
+        simulator(theta=theta, model=model, n_samples=100, random_state=7, n_threads=n)
+        for n in [1, 2, 3]
+    ]
+    for out in outs[1:]:
+        np.testing.assert_array_equal(outs[0]["rts"], out["rts"])
+        np.testing.assert_array_equal(outs[0]["choices"], out["choices"])
+
+
+@pytest.mark.parametrize("model", ["ddm", "lba2", "levy"])
+@pytest.mark.parametrize("deduplicate", [False, True])
+def test_simulator_generator(model, deduplicate):
+    """Test that a Generator is drawn from directly and advanced by each call"""
+    theta = np.tile(model_config[model]["default_params"], (3, 1))
+
+    def run(random_state):
+        return simulator(
+            theta=theta,
+            model=model,
+            n_samples=100,
+            random_state=random_state,
+            deduplicate=deduplicate,
+        )
+
+    rng_a, rng_b = np.random.default_rng(3), np.random.default_rng(3)
+    first, again = run(rng_a), run(rng_b)
+    np.testing.assert_array_equal(first["rts"], again["rts"])
+    np.testing.assert_array_equal(first["choices"], again["choices"])
+    assert not np.array_equal(first["rts"], run(rng_a)["rts"])
+    # The bit generator alone gives the same stream
+    bit_generator = run(np.random.default_rng(3).bit_generator)
+    np.testing.assert_array_equal(first["rts"], bit_generator["rts"])
+
+
+def test_simulator_n_threads_invalid():
+    """Test that a non-positive number of threads is rejected"""
+    with pytest.raises(ValueError):
+        simulator(theta=model_config["ddm"]["default_params"], model="ddm", n_threads=0)
+
+
+@pytest.mark.parametrize("model", ["ddm", "ddm_legacy", "angle", "race_3"])
+def test_simulator_record_trajectories(model):
+    """Test that trajectories are opt-in and do not change the samples"""
+    kwargs = {
+        "theta": model_config[model]["default_params"],
+        "model": model,
+        "n_samples": 50,
+        "max_t": 5.0,
+        "delta_t": 0.01,
+        "smooth_unif": False,
+        "random_state": 3,
+    }
+    out = simulator(**kwargs)
+    assert out["metadata"]["trajectory"] is None
+
+    out_traj = simulator(**kwargs, record_trajectories=4)
+    np.testing.assert_array_equal(out["rts"], out_traj["rts"])
+    np.testing.assert_array_equal(out["choices"], out_traj["choices"])
+
+    traj = out_traj["metadata"]["trajectory"]
+    assert traj.shape == (4, 501, model_config[model]["n_particles"])
+    # A path holds the starting point and one value per step until termination
+    config = model_config[model]
+    t = config["default_params"][config["params"].index("t")]
+    n_steps = np.round((out["rts"][:4, 0] - t) / 0.01).astype(int)
+    n_recorded = (traj[:, :, 0] != -999).sum(axis=1) - 1
+    np.testing.assert_array_equal(n_recorded, n_steps)
+
+
+def test_simulator_record_trajectories_unsupported():
+    """Test that models without trajectory support report no paths"""
+    out = simulator(
+        model_config["tradeoff_no_bias"]["default_params"],
+        model="tradeoff_no_bias",
+        n_samples=10,
+        record_trajectories=2,
+        random_state=3,
+    )
+    assert out["metadata"]["trajectory"] is None
+
+
+def test_simulator_record_trajectories_per_trial():
+    """Test recording the first samples of every trial"""
+    theta = {"v": [0.5, 1.0, 1.5], "a": 1.5, "z": 0.5, "t": 0.3}
+    out = simulator(
+        theta,
+        model="ddm",
+        n_samples=10,
+        max_t=5.0,
+        delta_t=0.01,
+        record_trajectories=2,
+        trajectories_per_trial=True,
+        random_state=1,
+    )
+    traj = out["metadata"]["trajectory"]
+    assert traj.shape == (3, 2, 501, 1)
+    assert np.all(traj[:, :, 0, 0] == 0.0)
+    assert np.all((traj[:, :, 1:, 0] != -999).any(axis=-1))
+
+    with pytest.raises(ValueError):
+        simulator(theta, model="ddm", n_samples=10, record_trajectories=-1)
+
+
+@pytest.mark.parametrize(
+    "model",
+    [
+        "ddm",
+        "angle",
+        "weibull",
+        "ornstein",
+        "gamma_drift",
+        "conflict_stimflexrel1_leak",
+        "conflict_stimflexrel1_leak2",
+    ],
+)
+def test_simulator_method_bridge(model):
+    """Test bridge-corrected stepping for single-accumulator models"""
+    kwargs = {
+        "theta": model_config[model]["default_params"],
+        "model": model,
+        "n_samples": 200,
+        "delta_t": 0.01,
+        "method": "bridge",
+        "random_state": 1,
+    }
+    out = simulator(**kwargs)
+    assert out["rts"].shape == (200, 1)
+    assert set(np.unique(out["choices"])) <= {-1, 1}
+    np.testing.assert_array_equal(out["rts"], simulator(**kwargs)["rts"])
+
+
+def test_simulator_method_bridge_unsupported():
+    """Test that bridge stepping is rejected for multi-accumulator models"""
+    with pytest.raises(ValueError):
+        simulator(
+            theta=model_config["race_3"]["default_params"],
+            model="race_3",
+            n_samples=10,
+            method="bridge",
+        )
+
+
+def test_simulator_method_exact():
+    """Test that exact sampling is available for constant-boundary DDMs only"""
+    out = simulator(
+        theta=model_config["ddm"]["default_params"],
+        model="ddm",
+        n_samples=100,
+        method="exact",
+        random_state=1,
+    )
+    assert out["rts"].shape == (100, 1)
+    assert set(np.unique(out["choices"])) <= {-1, 1}
+
+    with pytest.raises(ValueError):
+        simulator(
+            theta={"v": 1.0, "a": 1.5, "z": 0.5, "t": 0.3, "theta": 0.5},
+            model="angle",
+            n_samples=10,
+            method="exact",
+        )
+    with pytest.raises(ValueError):
+        simulator(
+            theta=model_config["race_3"]["default_params"],
+            model="race_3",
+            n_samples=10,
+            method="exact",
+        )
+    with pytest.raises(ValueError):
+        simulator(
+            theta=model_config["ddm"]["default_params"],
+            model="ddm",
+            n_samples=10,
+            method="unknown",
+        )
+
+
+@pytest.mark.parametrize("model", ["ddm", "race_3", "ddm_seq2"])
+def test_simulator_no_noise(model):
+    """Test that noiseless trials are simulated once and repeated"""
+    theta = np.tile(np.asarray(model_config[model]["default_params"]), (2, 1))
+    # Decided walks in trial 0; ddm_seq2's default walks stay undecided in trial 1
+    n_drifts = 3 if model == "ddm_seq2" else 1
+    theta[0, :n_drifts] += 1.0
+    out = simulator(
+        theta,
+        model=model,
+        n_samples=500,
+        no_noise=True,
+        record_trajectories=2,
+        random_state=1,
+    )
+    assert out["rts"].shape == (500, 2, 1)
+    assert out["metadata"]["n_samples"] == 500
+    assert out["metadata"]["trajectory"].shape[0] == 2
+    assert np.all(out["rts"][:, 0] == out["rts"][0, 0])
+    assert np.all(out["choices"][:, 0] == out["choices"][0, 0])
+    if model == "ddm_seq2":
+        # Undecided walks still choose at random
+        assert len(np.unique(out["choices"][:, 1])) > 1
+
+
+@pytest.mark.parametrize("n_samples", [1, 3])
+def test_simulator_deduplicate_trajectories(n_samples):
+    """Test that deduplicated calls record the paths of a single trial"""
+    theta = np.tile(np.asarray(model_config["ddm"]["default_params"]), (4, 1))
+    result = simulator(
+        theta,
+        model="ddm",
+        n_samples=n_samples,
+        record_trajectories=5,
+        deduplicate=True,
+        random_state=2,
+    )
+    # Not the 4 * n_samples of all trials simulated together
+    assert result["metadata"]["trajectory"].shape[0] == min(5, n_samples)
+
+
+@pytest.mark.parametrize("n_samples", [1, 7])
+def test_simulator_no_noise_deduplicate_trajectories(n_samples):
+    """Test that noiseless paths are recorded once per requested sample"""
+    theta = np.tile(np.asarray(model_config["ddm"]["default_params"]), (4, 1))
+    kwargs = {
+        "theta": theta,
+        "model": "ddm",
+        "n_samples": n_samples,
+        "no_noise": True,
+        "record_trajectories": 2,
+        "random_state": 1,
+    }
+    direct = simulator(**kwargs)["metadata"]["trajectory"]
+    dedup = simulator(deduplicate=True, **kwargs)["metadata"]["trajectory"]
+    assert direct.shape[0] == min(2, n_samples)
+    np.testing.assert_array_equal(dedup, direct)
+
+
+@pytest.mark.parametrize("model", ["ddm", "gamma_drift", "ornstein", "race_3"])
+def test_simulator_return_steps(model):
+    """Test that step counts reproduce the reaction times of the same walks"""
+    theta = np.tile(np.asarray(model_config[model]["default_params"]), (3, 1))
+    kwargs = {"theta": theta, "model": model, "n_samples": 500, "random_state": 4}
+    seconds = simulator(smooth_unif=False, **kwargs)
+    steps = simulator(return_steps=True, **kwargs)
+    assert "rts" not in steps
+    assert steps["steps"].dtype == np.uint16
+    assert steps["choices"].dtype == np.int8
+    np.testing.assert_array_equal(steps["choices"], seconds["choices"])
+    np.testing.assert_array_equal(steps["choice_p"], seconds["choice_p"])
+    t = theta[:, model_config[model]["params"].index("t")]
+    # Up to the float32 rounding accumulated by the Euler steps
+    np.testing.assert_allclose(
+        steps_to_rts(steps["steps"], t, 0.001), seconds["rts"], atol=1e-3
+    )
+
+
+def test_simulator_return_steps_omissions():
+    """Test the dtype for long simulations and the marking of omissions"""
+    out = simulator(
+        [0.0, 2.0, 0.5, 0.3, 0.5],
+        model="ddm_deadline",
+        n_samples=200,
+        max_t=100,
+        return_steps=True,
+        random_state=2,
+    )
+    assert out["steps"].dtype == np.uint32
+    omitted = out["steps"] == np.iinfo(np.uint32).max
+    assert omitted.any()
+    assert np.all(steps_to_rts(out["steps"], 0.3, 0.001)[omitted] == -999)
+    assert out["omission_p"][0, 0] == omitted.mean()
+
+    with pytest.raises(ValueError, match="return_steps"):
+        simulator([1.0, 1.0, 0.5, 0.3], model="lba2", return_steps=True)
+
+
+@pytest.mark.parametrize("model", ["ddm", "full_ddm", "race_3"])
+@pytest.mark.parametrize("deduplicate", [False, True])
+def test_simulator_layout(model, deduplicate):
+    """Test that all layouts hold the same samples"""
+    theta = np.tile(np.asarray(model_config[model]["default_params"]), (4, 1))
+    theta[::2, 0] += 0.5
+    kwargs = {
+        "theta": theta,
+        "model": model,
+        "n_samples": 200,
+        "random_state": 6,
+        "deduplicate": deduplicate,
+    }
+    sample_major = simulator(**kwargs)
+    trial_major = simulator(layout="trial_major", **kwargs)
+    records = simulator(layout="records", **kwargs)
+
+    assert trial_major["rts"].shape == (4, 200)
+    assert trial_major["rts"].flags.c_contiguous
+    np.testing.assert_array_equal(trial_major["rts"], sample_major["rts"][..., 0].T)
+    np.testing.assert_array_equal(
+        trial_major["choices"], sample_major["choices"][..., 0].T
+    )
+    assert records["records"].shape == (800, 2)
+    np.testing.assert_array_equal(records["records"][:, 0], trial_major["rts"].ravel())
+    np.testing.assert_array_equal(
+        records["records"][:, 1], trial_major["choices"].ravel()
+    )
+    for key in ("choice_p", "omission_p", "binned_128"):
+        np.testing.assert_array_equal(trial_major[key], sample_major[key])
+        np.testing.assert_array_equal(records[key], sample_major[key])
+
+
+def test_simulator_layout_unsupported():
+    """Test that layouts are only offered by the simulators that write them"""
+    with pytest.raises(ValueError, match="layout must be one of"):
+        simulator([1.0, 1.0, 0.5, 0.3], model="ddm", layout="column_major")
+    with pytest.raises(ValueError, match="not supported for model 'lba2'"):
+        simulator([1.0, 1.0, 0.5, 0.3], model="lba2", layout="records")
+
+
+@pytest.mark.parametrize("option", ["direct", "deduplicate", "no_noise"])
+def test_simulator_out(option):
+    """Test that the records are written into the buffer of the caller"""
+    theta = np.tile(np.asarray(model_config["ddm"]["default_params"]), (4, 1))
+    kwargs = {
+        "theta": theta,
+        "model": "ddm",
+        "n_samples": 50,
+        "layout": "records",
+        "random_state": 8,
+        "deduplicate": option == "deduplicate",
+        "no_noise": option == "no_noise",
+    }
+    expected = simulator(**kwargs)
+    buffer = np.empty((4, 50, 2), dtype=np.float32)
+    result = simulator(out=buffer, **kwargs)
+
+    assert set(result) == {"records", "metadata"}
+    assert result["records"] is buffer
+    np.testing.assert_array_equal(buffer.reshape(-1, 2), expected["records"])
+
+
+def test_simulator_out_invalid():
+    """Test that buffers the kernels cannot write into are rejected"""
+    kwargs = {"theta": [1.0, 1.0, 0.5, 0.3], "model": "ddm", "n_samples": 10}
+    with pytest.raises(ValueError, match="out requires layout='records'"):
+        simulator(out=np.empty((10, 2), dtype=np.float32), **kwargs)
+    for buffer in (
+        np.empty((10, 2)),
+        np.empty((10, 3), dtype=np.float32),
+        np.empty((5, 2), dtype=np.float32),
+        np.empty((2, 10), dtype=np.float32).T,
+    ):
+        with pytest.raises(ValueError, match="out must be"):
+            simulator(out=buffer, layout="records", **kwargs)
+
+
+def test_choice_probabilities():
+    """Test the per-trial choice statistics against counts by hand"""
+    rts = np.array(
+        [[0.5, 0.7, -999, 1.2], [-999, -999, -999, -999], [0.3, 0.4, 0.5, 0.6]],
+        dtype=np.float32,
+    )
+    choices = np.array([[1, -1, 1, 1], [1, -1, -1, -1], [-1, -1, -1, 1]])
+    result = _choice_probabilities(rts, choices, [-1, 1])
+
+    np.testing.assert_array_equal(
+        result["choice_p"], [[0.25, 0.75], [0.75, 0.25], [0.75, 0.25]]
+    )
+    np.testing.assert_array_equal(
+        result["choice_p_no_omission"], [[1 / 3, 2 / 3], [-999, -999], [0.75, 0.25]]
+    )
+    np.testing.assert_array_equal(result["omission_p"], [[0.25], [1.0], [0.0]])
+    np.testing.assert_array_equal(result["nogo_p"], [[0.5], [1.0], [0.75]])
+    np.testing.assert_array_equal(result["go_p"], [[0.5], [0.0], [0.25]])
+
+
+@pytest.mark.parametrize("model", ["ddm", "angle", "race_3"])
+def test_simulator_theta_zero_copy(model, tmp_path):
+    """Test that float32 parameters are simulated from without being copied"""
+    params = model_config[model]["params"]
+    theta = np.tile(np.asarray(model_config[model]["default_params"]), (6, 1))
+    theta[:, 0] += np.linspace(-0.5, 0.5, 6)
+    theta = theta.astype(np.float32)
+    expected = simulator(theta.astype(np.float64), model=model, random_state=5)
+
+    read_only = theta.copy()
+    read_only.flags.writeable = False
+    memmap = np.memmap(tmp_path / "theta.dat", np.float32, "w+", shape=theta.shape)
+    memmap[:] = theta
+    frame = pd.DataFrame(theta, columns=params)
+    scalars = dict(zip(params, theta[0], strict=True))
+    scalars[params[0]] = theta[:, 0]
+    for theta_in in (read_only, memmap, frame, scalars):
+        theta_before = deepcopy(theta_in)
+        preprocessed = _preprocess_theta_generic(theta_in)
+        if isinstance(theta_in, np.ndarray):
+            assert np.shares_memory(preprocessed, theta_in)
+        else:
+            column = np.asarray(theta_in[params[0]])
+            assert np.shares_memory(preprocessed[params[0]], column)
+        result = simulator(theta_in, model=model, random_state=5)
+        np.testing.assert_array_equal(result["rts"], expected["rts"])
+        np.testing.assert_array_equal(result["choices"], expected["choices"])
+        if isinstance(theta_in, dict):
+            assert theta_in.keys() == theta_before.keys()
+        else:
+            np.testing.assert_array_equal(theta_in, theta_before)
+
+
+@pytest.mark.parametrize("model", ["ddm", "angle", "race_3", "lba3"])
+@pytest.mark.parametrize(
+    "outputs",
+    [["rts", "choices"], ["choice_p", "go_p"], ["binned_128"], ["metadata", "rts"]],
+)
+def test_simulator_outputs(model, outputs):
+    """Test that only the requested outputs are returned, unchanged"""
+    theta = np.tile(np.asarray(model_config[model]["default_params"]), (3, 1))
+    kwargs = {"theta": theta, "model": model, "n_samples": 20, "random_state": 4}
+    expected = simulator(**kwargs)
+    result = simulator(outputs=outputs, **kwargs)
+
+    assert set(result) == {*outputs, "metadata"}
+    for key in outputs:
+        if key != "metadata":
+            np.testing.assert_array_equal(result[key], expected[key])
+    assert (
+        result["metadata"]["possible_choices"]
+        == (expected["metadata"]["possible_choices"])
+    )
+    if "metadata" in outputs:
+        assert result["metadata"].keys() == expected["metadata"].keys()
+    elif model != "lba3" and "binned_128" not in outputs:
+        assert "v" not in result["metadata"]
+
+
+def test_simulator_outputs_invalid():
+    """Test that outputs the simulator does not produce are rejected"""
+    kwargs = {"theta": [1.0, 1.0, 0.5, 0.3], "model": "ddm", "n_samples": 10}
+    with pytest.raises(ValueError, match="outputs must be among"):
+        simulator(outputs=["rt"], **kwargs)
+    with pytest.raises(ValueError, match="outputs must be among"):
+        simulator(outputs=["rts"], layout="records", **kwargs)
+    out = np.empty((10, 2), dtype=np.float32)
+    with pytest.raises(ValueError, match="out requires 'records' in outputs"):
+        simulator(out=out, layout="records", outputs=["choice_p"], **kwargs)
+    result = simulator(out=out, layout="records", outputs=["records", "go_p"], **kwargs)
+    assert result["records"] is out
+    assert result["go_p"].shape == (1, 1)
+
+
+@pytest.mark.parametrize("model", ["ddm", "angle", "ddm_sdv", "race_3", "lba3"])
+def test_simulator_deduplicate(model):
+    """Test that trials with identical parameters are simulated together"""
+    conditions = np.tile(np.asarray(model_config[model]["default_params"]), (3, 1))
+    conditions[1, 0] += 0.5
+    conditions[2, 0] -= 0.5
+    # Condition 2 is repeated for fewer trials than the others
+    theta = np.vstack([np.tile(conditions[:2], (40, 1)), conditions[[2] * 10]])
+    kwargs = {"theta": theta, "model": model, "n_samples": 100, "random_state": 3}
+
+    direct = simulator(**kwargs)
+    dedup = simulator(deduplicate=True, **kwargs)
+    assert dedup["rts"].shape == direct["rts"].shape
+    assert dedup["choices"].shape == direct["choices"].shape
+    assert dedup["metadata"]["n_trials"] == theta.shape[0]
+    assert dedup["choice_p"].shape == direct["choice_p"].shape
+    # Repeated trials draw different samples
+    assert not np.array_equal(dedup["rts"][:, 0], dedup["rts"][:, 2])
+    np.testing.assert_array_equal(
+        dedup["rts"], simulator(deduplicate=True, **kwargs)["rts"]
+    )
+    # Same distribution per condition as without deduplication
+    for trials in [slice(0, 80, 2), slice(1, 80, 2), slice(80, 90)]:
+        np.testing.assert_allclose(
+            dedup["choice_p"][trials].mean(axis=0),
+            direct["choice_p"][trials].mean(axis=0),
+            atol=0.05,
+        )
+
+    with pytest.raises(ValueError):
+        simulator(
+            deduplicate=True,
+            trajectories_per_trial=True,
+            record_trajectories=1,
+            **kwargs,
+        )